@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compare the eigh and analytic eigensolver backends on stacks of inertia tensors.
+
+Run with ``python scripts/benchmark_eigens.py``. For each stack size the best
+of several repeats is reported, together with the first stack size at which
+the analytic backend is faster than ``np.linalg.eigh``.
+"""
+
+# ========= #
+#  Imports  #
+# ========= #
+import argparse
+import timeit
+
+import numpy as np
+
+from com_pac.diagonalize import get_eigens, get_eigens_batch, get_inertia_matrix_batch
+
+
+def random_inertia_tensors(n_matrices, n_atoms=12, seed=0):
+    rng = np.random.default_rng(seed)
+    coordinates = rng.normal(scale=2.0, size=(n_matrices, n_atoms, 3))
+    masses = rng.uniform(1.0, 130.0, size=(n_matrices, n_atoms))
+    masses_sum = masses.sum(axis=-1)[:, np.newaxis]
+    COM = np.einsum("ki,kia->ka", masses, coordinates) / masses_sum
+    return get_inertia_matrix_batch(coordinates - COM[:, np.newaxis], masses)
+
+
+def best_time(function, repeat):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-power", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    matrix = random_inertia_tensors(1)[0]
+    single = {
+        backend: best_time(
+            lambda backend=backend: get_eigens(matrix, backend=backend), args.repeat
+        )
+        for backend in ("eigh", "analytic")
+    }
+    print("get_eigens, single matrix")
+    print(f"  eigh     {single['eigh'] * 1e6:10.2f} us")
+    print(f"  analytic {single['analytic'] * 1e6:10.2f} us")
+    print()
+
+    print("get_eigens_batch")
+    print(f"{'N':>8} {'eigh (us)':>12} {'analytic (us)':>14} {'speedup':>8}")
+    crossover = None
+    for power in range(args.max_power + 1):
+        n_matrices = 2**power
+        matrices = random_inertia_tensors(n_matrices)
+        times = {
+            backend: best_time(
+                lambda matrices=matrices, backend=backend: get_eigens_batch(
+                    matrices, backend=backend
+                ),
+                args.repeat,
+            )
+            for backend in ("eigh", "analytic")
+        }
+        speedup = times["eigh"] / times["analytic"]
+        if crossover is None and speedup > 1:
+            crossover = n_matrices
+        print(
+            f"{n_matrices:>8} {times['eigh'] * 1e6:>12.2f} "
+            f"{times['analytic'] * 1e6:>14.2f} {speedup:>8.2f}"
+        )
+
+    print()
+    if crossover is None:
+        print("The analytic backend was not faster for any stack size.")
+    else:
+        print(f"The analytic backend is faster from N = {crossover} matrices.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Time parse_input_file on synthetic inputs with growing Isotopologues sections.
+
+Run with ``python scripts/benchmark_parser.py``. Both the dict path and the
+``as_arrays`` path are timed for 10^3 up to 10^max-power isotopologues, and
+the slope of log(time) against log(N) is reported for each: a slope close to
+1 means the parse time grows linearly with the number of isotopologues.
+The peak memory allocated while parsing, as traced by ``tracemalloc`` in a
+separate untimed run, is reported for both paths as well.
+With ``--compact``, the isotopologues are written as compact lines relative
+to the parent, and the input sizes are printed as well.
+"""
+
+# ========= #
+#  Imports  #
+# ========= #
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from com_pac.parser import parse_input_file
+
+
+def synthetic_input(n_isotopologues, n_atoms=12, seed=0, compact=False):
+    rng = np.random.default_rng(seed)
+    symbols = ["C", "H"] * (n_atoms // 2) + ["C"] * (n_atoms % 2)
+    parent = {"C": (12, 13), "H": (1, 2)}
+    coordinates = rng.normal(scale=2.0, size=(n_atoms, 3))
+
+    lines = ["Coordinates"]
+    lines += [
+        f"{s} {x:.6f} {y:.6f} {z:.6f}" for s, (x, y, z) in zip(symbols, coordinates)
+    ]
+    lines += ["", "Dipole", "0.1 1.2 0.0", "", "Isotopologues"]
+    if compact:
+        lines.append(" ".join(str(parent[s][0]) for s in symbols) + " parent")
+    heavy = (rng.random((n_isotopologues, n_atoms)) < 0.1).tolist()
+    for i, row in enumerate(heavy):
+        if compact:
+            substitutions = " ".join(
+                f"{s}{j + 1}:{parent[s][1]}"
+                for j, (s, h) in enumerate(zip(symbols, row))
+                if h
+            )
+            lines.append(f"iso{i:07d} = parent {substitutions}")
+        else:
+            masses = " ".join(str(parent[s][h]) for s, h in zip(symbols, row))
+            lines.append(f"{masses} iso{i:07d}")
+    return "\n".join(lines + ["", ""])
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-power", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n-atoms", type=int, default=12)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [10**power for power in range(3, args.max_power + 1)]
+    times = {"dict": [], "arrays": []}
+    peaks = {"dict": [], "arrays": []}
+    print(
+        f"{'N':>8} {'dict (s)':>10} {'arrays (s)':>11} {'arrays (us/iso)':>16} "
+        f"{'dict (MiB)':>11} {'arrays (MiB)':>13}"
+    )
+    for n_isotopologues in sizes:
+        input_file = synthetic_input(
+            n_isotopologues, n_atoms=args.n_atoms, compact=args.compact
+        )
+        if args.compact:
+            full_size = len(synthetic_input(n_isotopologues, n_atoms=args.n_atoms))
+            print(f"Input size: {len(input_file)} bytes, {full_size} written out")
+        for path, as_arrays in (("dict", False), ("arrays", True)):
+
+            def parse(input_file=input_file, as_arrays=as_arrays):
+                return parse_input_file(input_file, as_arrays)
+
+            times[path].append(best_time(parse, args.repeat))
+            peaks[path].append(peak_memory(parse) / 2**20)
+        print(
+            f"{n_isotopologues:>8} {times['dict'][-1]:>10.4f} "
+            f"{times['arrays'][-1]:>11.4f} "
+            f"{times['arrays'][-1] / n_isotopologues * 1e6:>16.3f} "
+            f"{peaks['dict'][-1]:>11.1f} {peaks['arrays'][-1]:>13.1f}"
+        )
+
+    if len(sizes) > 1:
+        print()
+        for path, path_times in times.items():
+            slope = np.polyfit(np.log(sizes), np.log(path_times), 1)[0]
+            print(f"Scaling exponent of the {path} path: {slope:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Regenerate the vendored isotope mass and abundance tables from mendeleev.
+
+Run from the repository root (or via ``hatch run data:isotopes``):
+
+    python scripts/generate_isotope_table.py
+
+This is the only place that needs ``mendeleev``; the package itself reads
+the generated ``.npy`` files through ``com_pac.isotopes``.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from mendeleev.fetch import fetch_table
+
+from com_pac.isotopes import (
+    ELEMENT_SYMBOLS,
+    ISOTOPE_ABUNDANCES_PATH,
+    ISOTOPE_INDEX_PATH,
+    ISOTOPE_MASSES_PATH,
+)
+
+
+def build_isotope_table(isotopes_df, column="mass"):
+    """Pack a column of the mendeleev isotopes table into an index and a flat array.
+
+    Returns
+    -------
+    index : np.ndarray[int64], shape (n_elements + 1, 3)
+        Row ``Z`` holds ``(first_mass_number, last_mass_number, offset)``.
+        Row 0 is an empty placeholder so rows can be indexed by atomic number.
+    values : np.ndarray[float64]
+        Values of ``column``; the value of ``(Z, A)`` is at
+        ``offset + A - first``.  Mass numbers missing from the middle of a
+        range are stored as NaN.
+    """
+    isotopes_df = isotopes_df.sort_values(["atomic_number", "mass_number"])
+
+    index = np.zeros((len(ELEMENT_SYMBOLS) + 1, 3), dtype=np.int64)
+    index[0] = (1, 0, 0)
+    value_blocks = []
+    offset = 0
+    for atomic_number in range(1, len(ELEMENT_SYMBOLS) + 1):
+        element_df = isotopes_df[isotopes_df["atomic_number"] == atomic_number]
+        if element_df.empty:
+            index[atomic_number] = (1, 0, offset)
+            continue
+
+        first = int(element_df["mass_number"].min())
+        last = int(element_df["mass_number"].max())
+        block = np.full(last - first + 1, np.nan)
+        block[element_df["mass_number"].to_numpy() - first] = element_df[
+            column
+        ].to_numpy()
+
+        index[atomic_number] = (first, last, offset)
+        value_blocks.append(block)
+        offset += len(block)
+
+    return index, np.concatenate(value_blocks)
+
+
+def main():
+    elements_df = fetch_table("elements")
+    if tuple(elements_df["symbol"]) != ELEMENT_SYMBOLS:
+        raise ValueError(
+            "com_pac.isotopes.ELEMENT_SYMBOLS is out of date with mendeleev."
+        )
+
+    isotopes_df = fetch_table("isotopes")
+    index, masses = build_isotope_table(isotopes_df)
+    # Percent to fraction; isotopes without a natural abundance get 0
+    isotopes_df["abundance_fraction"] = isotopes_df["abundance"].fillna(0.0) / 100
+    _, abundances = build_isotope_table(isotopes_df, column="abundance_fraction")
+
+    Path(ISOTOPE_INDEX_PATH).parent.mkdir(parents=True, exist_ok=True)
+    np.save(ISOTOPE_INDEX_PATH, index)
+    np.save(ISOTOPE_MASSES_PATH, masses)
+    np.save(ISOTOPE_ABUNDANCES_PATH, abundances)
+    print(f"Wrote {len(masses)} isotope masses to {ISOTOPE_MASSES_PATH}")
+    print(f"Wrote {len(abundances)} isotope abundances to {ISOTOPE_ABUNDANCES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
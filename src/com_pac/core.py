@@ -3,12 +3,12 @@
 # ========= #
 #  Imports  #
 # ========= #
-from com_pac.writer import generate_output_file, generate_csv_output
-from com_pac.dataframes import get_dataframes
-from com_pac.diagonalize import get_principal_axes, get_theta_values
-from com_pac.parser import parse_input_file
-
+# The calculation modules pull in numpy and pandas, so they are imported inside
+# main() as each stage runs. This keeps `com-pac --help`/`--version` and the
+# argument parsing in this module free of the heavy dependencies.
 import argparse
+import math
+import sys
 from pathlib import Path
 
 from com_pac.__about__ import __version__
@@ -25,6 +25,25 @@ def _non_negative_int(value: str) -> int:
     return ivalue
 
 
+def _positive_int(value: str) -> int:
+    """Validate and convert a string to a positive integer for argparse."""
+    ivalue = _non_negative_int(value)
+    if ivalue == 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a positive integer")
+    return ivalue
+
+
+def _positive_float(value: str) -> float:
+    """Validate and convert a string to a positive float for argparse."""
+    try:
+        fvalue = float(value)
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(f"'{value}' is not a valid number")
+    if not fvalue > 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a positive number")
+    return fvalue
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Build and return the argument parser for com-pac."""
     parser = argparse.ArgumentParser(
@@ -63,7 +82,9 @@ listed in the Coordinates section.
 To use an experimental dipole value, first use this tool to obtain the principal axes
 Cartesian coordinates for the corresponding isotopologue. That guarantees that the
 axes are in A, B, C ordering and you can simply set the dipole values to the
-experimental mu_A, mu_B, mu_C.\
+experimental mu_A, mu_B, mu_C.
+
+Run `com-pac match --help` to query an index written with --index.\
 """,
     )
 
@@ -99,29 +120,239 @@ experimental mu_A, mu_B, mu_C.\
         dest="theta",
         help="Calculate and include theta values in the output.",
     )
+    parser.add_argument(
+        "--kraitchman",
+        action="store_true",
+        default=False,
+        dest="kraitchman",
+        help=(
+            "Calculate Kraitchman substitution coordinates for every isotopologue "
+            "that differs from the first (parent) isotopologue at exactly one atom."
+        ),
+    )
+    parser.add_argument(
+        "--rotation",
+        action="store_true",
+        default=False,
+        dest="rotation",
+        help=(
+            "Calculate the rotation from the principal axes of the first (parent) "
+            "isotopologue to those of every isotopologue."
+        ),
+    )
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        default=False,
+        dest="symmetry",
+        help=(
+            "Detect the symmetry-equivalent atoms of the first (parent) isotopologue "
+            "and compute each set of equivalent isotopologues only once."
+        ),
+    )
+    parser.add_argument(
+        "--symmetry-tolerance",
+        type=_positive_float,
+        default=None,
+        metavar="TOL",
+        dest="symmetry_tolerance",
+        help=(
+            "Relative tolerance of the --symmetry detection (default: 1e-8). "
+            "Isotopologues that a looser tolerance would get wrong are still "
+            "computed directly."
+        ),
+    )
+    parser.add_argument(
+        "--monte-carlo",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        dest="monte_carlo",
+        help=(
+            "Propagate the coordinate standard deviations of the Uncertainties "
+            "section to the rotational constants and dipole components with N "
+            "Monte Carlo samples."
+        ),
+    )
+    parser.add_argument(
+        "--trajectory",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        dest="trajectory",
+        help=(
+            "Multi-frame XYZ trajectory, with atoms in the order of the Coordinates "
+            "section, over which to average the rotational constants, dipole "
+            "components and principal axes coordinates of every isotopologue."
+        ),
+    )
+    parser.add_argument(
+        "--spectrum",
+        type=_non_negative_int,
+        default=None,
+        metavar="JMAX",
+        dest="spectrum",
+        help=(
+            "Predict the rigid rotor a-, b- and c-type transitions, up to J = JMAX, "
+            "of every isotopologue with the corresponding nonzero dipole component."
+        ),
+    )
+    parser.add_argument(
+        "--frequency-window",
+        type=float,
+        nargs=2,
+        default=None,
+        metavar=("MIN", "MAX"),
+        dest="frequency_window",
+        help="Only list --spectrum transitions between MIN and MAX MHz.",
+    )
+    parser.add_argument(
+        "--temperatures",
+        type=_positive_float,
+        nargs="+",
+        default=None,
+        metavar="T",
+        dest="temperatures",
+        help=(
+            "Write the rotational partition functions and the relative, natural "
+            "abundance weighted intensities of every isotopologue at the "
+            "temperatures T (Kelvin) to the .csv file."
+        ),
+    )
+    parser.add_argument(
+        "--symmetry-number",
+        type=_positive_int,
+        default=None,
+        metavar="SIGMA",
+        dest="symmetry_number",
+        help="Rotational symmetry number of the --temperatures partition functions (default: 1).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        dest="index",
+        help=(
+            "Write a sorted index of the predicted rotational constants to PATH "
+            "(.npz), to query later with `com-pac match`."
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=_non_negative_int,
+        default=None,
+        dest="seed",
+        help="Seed of the Monte Carlo random number generator, for reproducible output.",
+    )
 
     return parser
 
 
+def build_match_parser() -> argparse.ArgumentParser:
+    """Build and return the argument parser for `com-pac match`."""
+    parser = argparse.ArgumentParser(
+        prog="com-pac match",
+        description=(
+            "Find the candidates of a constants index (written with --index) whose "
+            "rotational constants best match observed ones."
+        ),
+    )
+    parser.add_argument(
+        "index",
+        type=Path,
+        help="Path to the .npz index written with --index.",
+    )
+    for label in ("A", "B", "C"):
+        parser.add_argument(
+            label,
+            type=float,
+            help=f"Observed {label} in MHz; use nan if it was not observed.",
+        )
+    parser.add_argument(
+        "--tolerance",
+        type=_positive_float,
+        default=1.0,
+        metavar="MHZ",
+        help="Largest accepted |observed - predicted| in MHz (default: 1.0).",
+    )
+    parser.add_argument(
+        "--top",
+        type=_positive_int,
+        default=10,
+        metavar="K",
+        dest="top",
+        help="Number of candidates to report (default: 10).",
+    )
+    return parser
+
+
+def match_main(argv=None):
+    parser = build_match_parser()
+    args = parser.parse_args(argv)
+    if all(math.isnan(x) for x in (args.A, args.B, args.C)):
+        parser.error("at least one of A, B and C must be observed (not nan)")
+
+    from com_pac.matching import (
+        format_matches,
+        load_constants_index,
+        query_constants_index,
+    )
+
+    constants_index = load_constants_index(args.index)
+    matches = query_constants_index(
+        constants_index, [args.A, args.B, args.C], args.tolerance, k=args.top
+    )
+    print(format_matches(matches))
+
+
 def _set_output_dir(output_dir: Path) -> None:
     """Set a custom output directory for generated files."""
     raise NotImplementedError("Custom output directory is not yet supported.")
 
 
-def read_args() -> tuple[Path, int, bool]:
+def parse_args(argv=None) -> argparse.Namespace:
     """Parse command-line arguments using argparse.
 
-    Returns a tuple of (input_file_path, num_of_decimals, theta).
+    Returns the full argparse.Namespace, including the optional calculations.
     """
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.symmetry_tolerance is not None and not args.symmetry:
+        parser.error("--symmetry-tolerance requires --symmetry")
+    if args.seed is not None and args.monte_carlo is None:
+        parser.error("--seed requires --monte-carlo")
+    if args.frequency_window is not None and args.spectrum is None:
+        parser.error("--frequency-window requires --spectrum")
+    if args.symmetry_number is not None and args.temperatures is None:
+        parser.error("--symmetry-number requires --temperatures")
     if args.output_dir is not None:
         _set_output_dir(args.output_dir)
+    return args
+
+
+def read_args() -> tuple[Path, int, bool]:
+    """Parse command-line arguments using argparse.
+
+    Returns a tuple of (input_file_path, num_of_decimals, theta).
+    """
+    args = parse_args()
     return args.input_file, args.num_of_decimals, args.theta
 
 
-def main():
-    input_file_path, num_of_decimals, theta = read_args()
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    # `com-pac match ...` queries an index instead of reading an input file
+    if argv and argv[0] == "match":
+        return match_main(argv[1:])
+
+    args = parse_args(argv)
+    input_file_path, num_of_decimals, theta = (
+        args.input_file,
+        args.num_of_decimals,
+        args.theta,
+    )
 
     # ================================ #
     #  reading contents of input file  #
@@ -136,15 +367,28 @@ def main():
     with open(input_file_path, "r") as infile:
         input_file = infile.read()
 
+    from com_pac.parser import parse_input_file
+
+    # Mass numbers are read into one int16 array rather than a list per line
     (
         isotopologue_names,
-        isotopologue_dict,
+        mass_numbers,
         n_atoms,
         atom_symbols,
         mol_coordinates,
         mol_dipole,
         atom_numbering,
-    ) = parse_input_file(input_file)
+    ) = parse_input_file(input_file, as_arrays=True)
+    isotopologue_names = isotopologue_names.tolist()
+
+    from com_pac.diagonalize import (
+        get_mass_matrix_from_mass_numbers,
+        get_principal_axes,
+        get_theta_values,
+    )
+
+    # Resolve every unique isotope once for the whole input file
+    mass_matrix = get_mass_matrix_from_mass_numbers(mass_numbers, atom_symbols)
 
     (
         atom_masses,
@@ -159,11 +403,14 @@ def main():
         COM_values,
     ) = get_principal_axes(
         isotopologue_names,
-        isotopologue_dict,
+        None,
         n_atoms,
         atom_symbols,
         mol_coordinates,
         mol_dipole,
+        mass_matrix=mass_matrix,
+        symmetry=args.symmetry,
+        symmetry_tolerance=args.symmetry_tolerance,
     )
 
     if theta:
@@ -175,6 +422,111 @@ def main():
     else:
         theta_data = None
 
+    if args.rotation:
+        from com_pac.rotation import get_rotation_values
+
+        rotation_data = get_rotation_values(isotopologue_names, eigenvectors)
+    else:
+        rotation_data = None
+
+    if args.kraitchman:
+        from com_pac.kraitchman import get_kraitchman_values
+
+        kraitchman_data = get_kraitchman_values(
+            isotopologue_names,
+            dict(zip(isotopologue_names, mass_numbers)),
+            atom_masses,
+            eigenvalues,
+            atom_numbering,
+        )
+    else:
+        kraitchman_data = None
+
+    if args.monte_carlo is not None:
+        from com_pac.montecarlo import get_monte_carlo_values
+        from com_pac.parser import (
+            parse_input_uncertainty_section,
+            uncertainty_error_message,
+        )
+
+        coordinate_errors = parse_input_uncertainty_section(input_file, atom_symbols)
+        if coordinate_errors is None:
+            raise ValueError(
+                uncertainty_error_message(
+                    "--monte-carlo requires an Uncertainties section in the input file."
+                )
+            )
+        monte_carlo_data = get_monte_carlo_values(
+            isotopologue_names,
+            mass_matrix,
+            mol_coordinates,
+            coordinate_errors,
+            mol_dipole,
+            args.monte_carlo,
+            seed=args.seed,
+        )
+    else:
+        monte_carlo_data = None
+
+    if args.trajectory is not None:
+        from com_pac.trajectory import get_trajectory_values
+
+        trajectory_data, trajectory_pa_data = get_trajectory_values(
+            isotopologue_names,
+            mass_matrix,
+            mol_coordinates,
+            mol_dipole,
+            args.trajectory,
+            atom_symbols,
+            atom_numbering,
+        )
+    else:
+        trajectory_data = None
+
+    if args.spectrum is not None:
+        from com_pac.spectrum import get_spectrum_values
+
+        spectrum_data = get_spectrum_values(
+            isotopologue_names,
+            rotational_constants,
+            pa_dipoles,
+            args.spectrum,
+            frequency_window=(
+                args.frequency_window
+                if args.frequency_window is not None
+                else (0.0, float("inf"))
+            ),
+        )
+    else:
+        spectrum_data = None
+
+    if args.temperatures is not None:
+        from com_pac.partition import get_partition_values
+
+        partition_data = get_partition_values(
+            isotopologue_names,
+            dict(zip(isotopologue_names, mass_numbers)),
+            atom_symbols,
+            rotational_constants,
+            pa_dipoles,
+            args.temperatures,
+            symmetry_number=(
+                args.symmetry_number if args.symmetry_number is not None else 1
+            ),
+        )
+    else:
+        partition_data = None
+
+    from com_pac.dataframes import (
+        get_dataframes,
+        get_kraitchman_df,
+        get_monte_carlo_df,
+        get_partition_df,
+        get_rotation_df,
+        get_spectrum_df,
+        get_trajectory_df,
+    )
+
     (
         atom_masses_df,
         rotational_constants_df,
@@ -186,6 +538,7 @@ def main():
         pa_coordinates_df_dict,
         com_values_df,
         theta_df_dict,
+        inertial_df,
     ) = get_dataframes(
         atom_masses,
         atom_symbols,
@@ -200,12 +553,34 @@ def main():
         pa_coordinates,
         COM_values,
         theta_data=theta_data,
+        eigenvalues=eigenvalues,
+    )
+    rotation_df = get_rotation_df(rotation_data) if rotation_data is not None else None
+    kraitchman_df = (
+        get_kraitchman_df(kraitchman_data) if kraitchman_data is not None else None
+    )
+    monte_carlo_df = (
+        get_monte_carlo_df(monte_carlo_data) if monte_carlo_data is not None else None
+    )
+    trajectory_df, trajectory_pa_df = (
+        get_trajectory_df(trajectory_data, trajectory_pa_data)
+        if trajectory_data is not None
+        else (None, None)
+    )
+
+    spectrum_df = get_spectrum_df(spectrum_data) if spectrum_data is not None else None
+    partition_df = (
+        get_partition_df(isotopologue_names, partition_data)
+        if partition_data is not None
+        else None
     )
 
     # ==================== #
     #  Outputting results  #
     # ==================== #
 
+    from com_pac.writer import generate_csv_output, generate_output_file
+
     if input_file_name.count(".") != 1:
         input_file_base_name = str(input_file_name)
     else:
@@ -235,6 +610,13 @@ def main():
         com_values_df,
         text_output_path,
         theta_df_dict=theta_df_dict,
+        kraitchman_df=kraitchman_df,
+        monte_carlo_df=monte_carlo_df,
+        trajectory_df=trajectory_df,
+        trajectory_pa_df=trajectory_pa_df,
+        rotation_df=rotation_df,
+        inertial_df=inertial_df,
+        spectrum_df=spectrum_df,
     )
 
     generate_csv_output(
@@ -243,8 +625,21 @@ def main():
         dipole_components_df,
         atom_masses_df,
         csv_output_path,
+        kraitchman_df=kraitchman_df,
+        monte_carlo_df=monte_carlo_df,
+        trajectory_df=trajectory_df,
+        trajectory_pa_df=trajectory_pa_df,
+        rotation_df=rotation_df,
+        inertial_df=inertial_df,
+        spectrum_df=spectrum_df,
+        partition_df=partition_df,
     )
 
+    if args.index is not None:
+        from com_pac.matching import build_constants_index, save_constants_index
+
+        save_constants_index(build_constants_index(rotational_constants), args.index)
+
 
 if __name__ == "__main__":
     main()
@@ -4,8 +4,11 @@
 #  Imports  #
 # ========= #
 
+import numpy as np
 import pandas as pd
 
+from com_pac.diagonalize import get_inertial_quantities_batch
+
 
 def get_atom_masses_df(atom_masses, atom_symbols):
     """Convert atom masses dictionary to DataFrame
@@ -173,6 +176,196 @@ def get_theta_df(isotopologue_names, theta_data):
     return theta_df
 
 
+def get_rotation_df(rotation_data):
+    """Convert frame rotation data dictionary to DataFrame.
+
+    Parameters
+    ----------
+    rotation_data : dict
+        key = isotopologue_name: str
+        value = dict of rotation label to value, see ``get_rotation_values``
+
+    Returns
+    -------
+    rotation_df : pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = rotation label: str
+        Values = quaternion components, angles (degrees) and axis components
+    """
+    rotation_df = pd.DataFrame.from_dict(rotation_data, orient="index")
+    rotation_df.index.name = "Isotopologue"
+    return rotation_df.astype(float)
+
+
+def get_inertial_quantities_df(isotopologue_names, inertial_data):
+    """Convert inertial quantities arrays to DataFrame.
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names, in the row order of the arrays.
+    inertial_data : dict
+        The output of ``get_inertial_quantities_batch``.
+
+    Returns
+    -------
+    inertial_df : pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = "P_aa", "P_bb", "P_cc", "Delta", "kappa"
+        Values = planar moments and inertial defect (amu Angstrom^2), Ray's kappa
+    """
+    planar_moments = inertial_data["planar_moments"]
+    inertial_df = pd.DataFrame(
+        {
+            "P_aa": planar_moments[:, 0],
+            "P_bb": planar_moments[:, 1],
+            "P_cc": planar_moments[:, 2],
+            "Delta": inertial_data["inertial_defect"],
+            "kappa": inertial_data["kappa"],
+        },
+        index=pd.Index(isotopologue_names, name="Isotopologue"),
+    )
+    return inertial_df
+
+
+def get_kraitchman_df(kraitchman_data):
+    """Convert Kraitchman substitution data dictionary to DataFrame.
+
+    Parameters
+    ----------
+    kraitchman_data : dict
+        key = isotopologue_name: str
+        value = dict with the substituted "atom" label and the
+            substitution coordinates and Costain errors
+
+    Returns
+    -------
+    kraitchman_df : pd.DataFrame
+        RowLabel = (Isotopologue, Atom)
+        ColumnLabel = "|a|", "|b|", "|c|", "d|a|", "d|b|", "d|c|"
+        Values = SubstitutionCoordinate or CostainError
+    """
+    kraitchman_df = pd.DataFrame.from_dict(kraitchman_data, orient="index")
+    kraitchman_df.index.name = "Isotopologue"
+    kraitchman_df = kraitchman_df.rename(columns={"atom": "Atom"})
+    kraitchman_df = kraitchman_df.set_index("Atom", append=True)
+    return kraitchman_df.astype(float)
+
+
+def get_monte_carlo_df(monte_carlo_data):
+    """Convert Monte Carlo uncertainty data dictionary to DataFrame.
+
+    Parameters
+    ----------
+    monte_carlo_data : dict
+        key = (isotopologue_name, quantity): tuple[str, str]
+        value = dict of statistic name to value
+
+    Returns
+    -------
+    monte_carlo_df : pd.DataFrame
+        RowLabel = (Isotopologue, Quantity)
+        ColumnLabel = "mean", "std", and "p<percentile>" labels
+        Values = Statistic
+    """
+    monte_carlo_df = pd.DataFrame.from_dict(monte_carlo_data, orient="index")
+    monte_carlo_df.index = pd.MultiIndex.from_tuples(
+        monte_carlo_df.index, names=["Isotopologue", "Quantity"]
+    )
+    return monte_carlo_df.astype(float)
+
+
+def get_trajectory_df(trajectory_data, trajectory_pa_data):
+    """Convert trajectory average dictionaries to DataFrames.
+
+    Parameters
+    ----------
+    trajectory_data : dict
+        key = (isotopologue_name, quantity): tuple[str, str]
+        value = dict with the "mean" and "std" over the frames
+    trajectory_pa_data : dict
+        key = (isotopologue_name, atom_label): tuple[str, str]
+        value = dict of mean principal axes coordinates and their deviations
+
+    Returns
+    -------
+    trajectory_df : pd.DataFrame
+        RowLabel = (Isotopologue, Quantity)
+        ColumnLabel = "mean", "std"
+    trajectory_pa_df : pd.DataFrame
+        RowLabel = (Isotopologue, Atom)
+        ColumnLabel = "a", "b", "c", "std_a", "std_b", "std_c"
+    """
+    trajectory_df = pd.DataFrame.from_dict(trajectory_data, orient="index")
+    trajectory_df.index = pd.MultiIndex.from_tuples(
+        trajectory_df.index, names=["Isotopologue", "Quantity"]
+    )
+    trajectory_pa_df = pd.DataFrame.from_dict(trajectory_pa_data, orient="index")
+    trajectory_pa_df.index = pd.MultiIndex.from_tuples(
+        trajectory_pa_df.index, names=["Isotopologue", "Atom"]
+    )
+    return trajectory_df.astype(float), trajectory_pa_df.astype(float)
+
+
+def get_spectrum_df(spectrum_data):
+    """Convert predicted transitions arrays to DataFrame.
+
+    Parameters
+    ----------
+    spectrum_data : dict
+        The output of ``get_spectrum_values``.
+
+    Returns
+    -------
+    spectrum_df : pd.DataFrame
+        RowLabel = (Isotopologue, Type, J', Ka', Kc', J", Ka", Kc")
+        ColumnLabel = "Frequency"
+        Values = transition frequency (MHz)
+    """
+    upper = spectrum_data["upper"]
+    lower = spectrum_data["lower"]
+    index = pd.MultiIndex.from_arrays(
+        [
+            spectrum_data["isotopologue"],
+            spectrum_data["type"],
+            *upper.T,
+            *lower.T,
+        ],
+        names=["Isotopologue", "Type", "J'", "Ka'", "Kc'", 'J"', 'Ka"', 'Kc"'],
+    )
+    return pd.DataFrame(
+        {"Frequency": spectrum_data["frequency"]}, index=index, dtype=float
+    )
+
+
+def get_partition_df(isotopologue_names, partition_data):
+    """Convert partition function arrays to DataFrame.
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names, in the row order of the arrays.
+    partition_data : dict
+        The output of ``get_partition_values``.
+
+    Returns
+    -------
+    partition_df : pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = "abundance", then "Q(T K)" and "I(T K)" for every
+            temperature T
+        Values = natural abundance, partition functions and relative intensities
+    """
+    temperatures = partition_data["temperatures"]
+    columns = {"abundance": partition_data["abundances"]}
+    for label, key in (("Q", "partition_functions"), ("I", "intensities")):
+        for i, temperature in enumerate(temperatures):
+            columns[f"{label}({temperature:g} K)"] = partition_data[key][:, i]
+    return pd.DataFrame(
+        columns, index=pd.Index(isotopologue_names, name="Isotopologue")
+    )
+
+
 def get_dataframes(
     atom_masses,
     atom_symbols,
@@ -187,6 +380,7 @@ def get_dataframes(
     pa_coordinates,
     COM_values,
     theta_data=None,
+    eigenvalues=None,
 ):
     """Composite function to obtain dataframes for computed data
 
@@ -235,6 +429,10 @@ def get_dataframes(
         key = isotopologue_name: str
         value = dict: [str, float] theta values
         If None, theta dataframes are not computed.
+    eigenvalues: dict or None, optional
+        key = isotopologue_name: str
+        value = np.array[float] of length 3, principal moments of inertia
+        If None, the diagonals of ``pa_inertias`` are used.
 
     Returns
     -------
@@ -290,6 +488,10 @@ def get_dataframes(
         ColumnLabel = theta_label: str
         Values = theta_value: float
         None if theta_data was not provided.
+    inertial_df: pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = "P_aa", "P_bb", "P_cc", "Delta", "kappa"
+        Values = planar moments, inertial defect and Ray's asymmetry parameter
     """
     # Atomic masses
     atom_masses_df = get_atom_masses_df(atom_masses, atom_symbols)
@@ -346,6 +548,20 @@ def get_dataframes(
         get_theta_df(isotopologue_names, theta_data) if theta_data is not None else None
     )
 
+    # Planar moments, inertial defect and asymmetry, over the stacked isotopologues
+    if eigenvalues is None:
+        principal_moments = [
+            np.diagonal(pa_inertias[iso]) for iso in isotopologue_names
+        ]
+    else:
+        principal_moments = [eigenvalues[iso] for iso in isotopologue_names]
+    inertial_data = get_inertial_quantities_batch(
+        [atom_masses[iso] for iso in isotopologue_names],
+        [pa_coordinates[iso] for iso in isotopologue_names],
+        principal_moments,
+    )
+    inertial_df = get_inertial_quantities_df(isotopologue_names, inertial_data)
+
     return (
         atom_masses_df,
         rotational_constants_df,
@@ -357,4 +573,5 @@ def get_dataframes(
         pa_coordinates_df_dict,
         com_values_df,
         theta_df,
+        inertial_df,
     )
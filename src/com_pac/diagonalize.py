@@ -3,19 +3,56 @@
 # ========= #
 #  Imports  #
 # ========= #
-from mendeleev.mendeleev import isotope
+import hashlib
+import os
+from collections import OrderedDict
 
 import numpy as np
 
-import warnings
+from com_pac.isotopes import lookup_isotope_mass
 
 ISOTOPE_MASS_CACHE = {}
+# Least recently used results of get_principal_axes(cache=True), one entry per
+# (geometry digest, mass row), and the lookup counters reported by
+# get_principal_axes_cache_info
+PRINCIPAL_AXES_CACHE = OrderedDict()
+PRINCIPAL_AXES_CACHE_STATS = {"hits": 0, "misses": 0}
+PRINCIPAL_AXES_CACHE_MAXSIZE = 4096
+
+# Eigensolver used by get_eigens/get_eigens_batch when no backend is given.
+EIGEN_BACKEND_ENV_VAR = "COM_PAC_EIGEN_BACKEND"
+EIGEN_BACKENDS = ("eigh", "analytic")
+# Matrices whose eigenvalues are closer than this (relative to the largest
+# eigenvalue) are handed to eigh by the analytic backend: the closed-form
+# eigenvectors lose accuracy as the gap closes (symmetric and linear tops).
+ANALYTIC_EIGEN_GAP_TOLERANCE = 1e-4
+# Rotational constant in MHz of a principal moment of 1 amu Angstrom^2
+ROT_CONST_CONVERSION = 505379.0046
+# Reason codes of get_theta_values_batch, combined bitwise per isotopologue
+THETA_7_UNDEFINED = 1
+THETA_8_UNDEFINED = 2
+THETA_9_UNDEFINED = 4
+THETA_NONPLANAR_PARENT = 8
 
 
 def clear_isotope_mass_cache():
     ISOTOPE_MASS_CACHE.clear()
 
 
+def clear_principal_axes_cache():
+    PRINCIPAL_AXES_CACHE.clear()
+    PRINCIPAL_AXES_CACHE_STATS.update(hits=0, misses=0)
+
+
+def get_principal_axes_cache_info():
+    """Hits, misses, current size and maximum size of PRINCIPAL_AXES_CACHE"""
+    return {
+        **PRINCIPAL_AXES_CACHE_STATS,
+        "size": len(PRINCIPAL_AXES_CACHE),
+        "maxsize": PRINCIPAL_AXES_CACHE_MAXSIZE,
+    }
+
+
 def get_inertia_matrix(coordinates_array, masses_array):
     """Calculate the inertia matrix
 
@@ -74,11 +111,144 @@ def get_inertia_matrix(coordinates_array, masses_array):
     return mr2_trace - weighted_transpose_broadcast
 
 
+def get_inertia_matrix_batch(coordinates_array, masses_array):
+    """Calculate the inertia matrices of a stack of isotopologues
+
+    Parameters
+    ----------
+    coordinates_array : array-like
+        Array of shape (n_iso, n_atoms, 3) containing the Cartesian coordinates
+        of the atoms for each isotopologue.
+    masses_array : array-like
+        Array of shape (n_iso, n_atoms) containing the masses of the atoms for
+        each isotopologue.
+
+    Returns
+    -------
+    np.ndarray
+        Inertia matrices of shape (n_iso, 3, 3).
+
+    Notes
+    -----
+    Uses the same identity as ``get_inertia_matrix``, with the per-isotopologue
+    ``sum_i m_i r_i r_i^T`` computed for the whole stack with one ``einsum``.
+    The trace of that tensor is ``sum_i m_i r_i^2``, so the diagonal term does
+    not need a second pass over the coordinates.
+    """
+    coordinates = np.asarray(coordinates_array)
+    masses = np.asarray(masses_array)
+
+    weighted_transpose_broadcast = np.einsum(
+        "kia,kib->kab", coordinates * masses[..., np.newaxis], coordinates
+    )
+    mr2_sum = np.einsum("kaa->k", weighted_transpose_broadcast)
+    mr2_trace = mr2_sum[:, np.newaxis, np.newaxis] * np.eye(3)
+    return mr2_trace - weighted_transpose_broadcast
+
+
 def inertia_to_rot_const(inertia):
-    rot_constant = 505379.0046 / inertia
+    rot_constant = ROT_CONST_CONVERSION / inertia
     return rot_constant
 
 
+def get_eigenvalue_jacobians(masses, com_coordinates, eigenvectors):
+    """Derivatives of the principal moments with respect to coordinates and masses
+
+    Parameters
+    ----------
+    masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses.
+    com_coordinates : array-like
+        Array of shape (n_iso, n_atoms, 3) of Center of Mass coordinates.
+    eigenvectors : array-like
+        Array of shape (n_iso, 3, 3) of the eigenvectors (as columns) of the
+        Center of Mass inertia matrices.
+
+    Returns
+    -------
+    coordinate_jacobians : np.ndarray, shape (n_iso, 3, n_atoms, 3)
+        ``d I_g / d x_{k,alpha}`` for principal moment ``g``, atom ``k`` and
+        Cartesian component ``alpha`` of the input coordinates.
+    mass_jacobians : np.ndarray, shape (n_iso, 3, n_atoms)
+        ``d I_g / d m_k``.
+
+    Notes
+    -----
+    First-order perturbation theory gives ``dI_g = v_g^T dI v_g`` for the
+    eigenvector ``v_g`` of a non-degenerate principal moment.  The inertia
+    matrix is stationary with respect to a shift of the reference point at
+    the Center of Mass, so the implicit change of the Center of Mass drops
+    out and, with ``r_k`` the COM coordinates and ``p_kg = r_k . v_g`` the
+    principal axes coordinates,
+
+    ``d I_g / d r_k = 2 m_k (r_k - p_kg v_g)``
+
+    ``d I_g / d m_k = |r_k|^2 - p_kg^2``
+
+    The derivatives are undefined for degenerate principal moments (symmetric
+    tops), where the eigenvectors are not unique.
+    """
+    masses = np.asarray(masses, dtype=float)
+    com_coordinates = np.asarray(com_coordinates, dtype=float)
+    eigenvectors = np.asarray(eigenvectors, dtype=float)
+
+    # pa_coordinates[n, g, k] = p_kg, axis_vectors[n, g, :] = v_g
+    pa_coordinates = np.swapaxes(com_coordinates @ eigenvectors, -1, -2)
+    axis_vectors = np.swapaxes(eigenvectors, -1, -2)
+
+    coordinate_jacobians = (
+        2
+        * masses[:, np.newaxis, :, np.newaxis]
+        * (
+            com_coordinates[:, np.newaxis, :, :]
+            - pa_coordinates[..., np.newaxis] * axis_vectors[:, :, np.newaxis, :]
+        )
+    )
+    mass_jacobians = (
+        np.sum(com_coordinates**2, axis=-1)[:, np.newaxis, :] - pa_coordinates**2
+    )
+    return coordinate_jacobians, mass_jacobians
+
+
+def get_rot_const_jacobians(masses, com_coordinates, eigenvectors, eigenvalues):
+    """Derivatives of the rotational constants with respect to coordinates and masses
+
+    Parameters
+    ----------
+    masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses.
+    com_coordinates : array-like
+        Array of shape (n_iso, n_atoms, 3) of Center of Mass coordinates.
+    eigenvectors : array-like
+        Array of shape (n_iso, 3, 3) of eigenvectors as columns.
+    eigenvalues : array-like
+        Array of shape (n_iso, 3) of principal moments of inertia.
+
+    Returns
+    -------
+    coordinate_jacobians : np.ndarray, shape (n_iso, 3, n_atoms, 3)
+        ``d B_g / d x_{k,alpha}`` in MHz per Angstrom.
+    mass_jacobians : np.ndarray, shape (n_iso, 3, n_atoms)
+        ``d B_g / d m_k`` in MHz per amu.
+
+    Notes
+    -----
+    The inputs are outputs of ``get_principal_axes_batch``.  The chain rule
+    ``dB = -B / I dI`` of ``inertia_to_rot_const`` is applied to
+    ``get_eigenvalue_jacobians``.
+    """
+    coordinate_jacobians, mass_jacobians = get_eigenvalue_jacobians(
+        masses, com_coordinates, eigenvectors
+    )
+    eigenvalues = np.asarray(eigenvalues, dtype=float)
+    rot_const_slopes = -ROT_CONST_CONVERSION / eigenvalues**2
+
+    return (
+        rot_const_slopes[..., np.newaxis, np.newaxis] * coordinate_jacobians,
+        rot_const_slopes[..., np.newaxis] * mass_jacobians,
+    )
+
+
 def get_isotopes_dict(atom_symbols, atom_mass_numbers, n_atoms):
     # TODO: When pulled into a proper data structure, add type checking.
     isotopes_dict = {
@@ -100,7 +270,7 @@ def get_isotopes_mass(symbol, mass_number):
         return ISOTOPE_MASS_CACHE[cache_key]
 
     try:
-        mass = isotope(symbol, mass_number).mass
+        mass = lookup_isotope_mass(symbol, mass_number)
     except Exception as exc:
         raise ValueError(
             f"Isotopic mass not found for {symbol} with mass number {mass_number}."
@@ -112,10 +282,7 @@ def get_isotopes_mass(symbol, mass_number):
 
 
 def get_unique_isotopes_mass_dict(unique_isotopes):
-    # TODO: This can be done for **all** the isotopologues in the input file
-    #       right after parsing the input file - that way, each isotopologue
-    #       isn't repeating the lookup for its atoms; only has to read the
-    #       main dictionary.
+    # For whole input files, get_mass_matrix resolves every unique isotope once.
     mass_dict = {
         iso_tuple: get_isotopes_mass(*iso_tuple) for iso_tuple in unique_isotopes
     }
@@ -123,7 +290,7 @@ def get_unique_isotopes_mass_dict(unique_isotopes):
 
 
 def get_mol_masses(atom_symbols, atom_mass_numbers, n_atoms):
-    # TODO: Should be able to inherit the `isotopes` data structure from the input parser.
+    # Masses of a single isotopologue; see get_mass_matrix for all of them at once.
     isotopes_dict = get_isotopes_dict(atom_symbols, atom_mass_numbers, n_atoms)
     unique_isos_dict = get_unique_isotopes_mass_dict(get_unique_isotopes(isotopes_dict))
     masses = [
@@ -133,6 +300,99 @@ def get_mol_masses(atom_symbols, atom_mass_numbers, n_atoms):
     return np.array(masses)
 
 
+def get_mass_matrix_from_mass_numbers(mass_numbers, atom_symbols):
+    """Resolve a dense array of mass numbers into isotopic masses
+
+    Parameters
+    ----------
+    mass_numbers : array-like[int]
+        Array of shape (n_iso, n_atoms) of mass numbers, one row per isotopologue.
+    atom_symbols : list[str]
+        Element symbols of the ``n_atoms`` atoms, shared by all isotopologues.
+
+    Returns
+    -------
+    np.ndarray[float], shape (n_iso, n_atoms)
+        Isotopic masses of every atom of every isotopologue.
+
+    Notes
+    -----
+    Each ``(symbol, mass_number)`` pair is packed into a single integer code,
+    ``symbol_code * span + (mass_number - min_mass_number)``.  ``np.unique``
+    then yields the unique isotopes in the whole array, each of which is looked
+    up once, and ``np.take`` with the inverse indices expands them back into the
+    dense matrix.
+    """
+    mass_numbers = np.asarray(mass_numbers)
+    if mass_numbers.size and mass_numbers.dtype.kind not in "iu":
+        raise ValueError(f"Mass numbers must be integers, not {mass_numbers.dtype}.")
+    if mass_numbers.ndim != 2:
+        raise ValueError(
+            f"Mass numbers must be a 2D (n_iso, n_atoms) array, not {mass_numbers.ndim}D."
+        )
+    check_for_length_mismatch(
+        atom_symbols,
+        mass_numbers.shape[1],
+        "Number of atom symbols does not match number of mass numbers per isotopologue.",
+    )
+    if mass_numbers.size == 0:
+        return np.zeros(mass_numbers.shape)
+
+    unique_symbols, symbol_codes = np.unique(
+        np.asarray(atom_symbols, dtype=str), return_inverse=True
+    )
+    min_mass_number = mass_numbers.min()
+    span = mass_numbers.max() - min_mass_number + 1
+    isotope_codes = symbol_codes.astype(np.int64) * span + (
+        mass_numbers - min_mass_number
+    )
+
+    unique_codes, inverse = np.unique(isotope_codes, return_inverse=True)
+    unique_masses = np.array(
+        [
+            get_isotopes_mass(
+                str(unique_symbols[code // span]),
+                int(code % span + min_mass_number),
+            )
+            for code in unique_codes
+        ]
+    )
+    return np.take(unique_masses, inverse).reshape(mass_numbers.shape)
+
+
+def get_mass_matrix(isotopologue_names, isotopologue_dict, n_atoms, atom_symbols):
+    """Build the (n_iso, n_atoms) mass matrix for all isotopologues of an input file
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        Names of the isotopologues, in output order.
+    isotopologue_dict : dict[str, list[int]]
+        Mass numbers of each isotopologue, as returned by ``parse_input_file``.
+    n_atoms : int
+        Number of atoms in the molecule.
+    atom_symbols : list[str]
+        Element symbols of the atoms.
+
+    Returns
+    -------
+    np.ndarray[float], shape (n_iso, n_atoms)
+        Row ``i`` holds the atomic masses of ``isotopologue_names[i]``.
+    """
+    for iso in isotopologue_names:
+        # validate data
+        check_for_length_mismatch(
+            isotopologue_dict[iso],
+            n_atoms,
+            f"Number of atoms in isotopologue_dict[{iso}] does not match number of atoms in coordinates.",
+        )
+
+    mass_numbers = np.array(
+        [isotopologue_dict[iso] for iso in isotopologue_names]
+    ).reshape(len(isotopologue_names), n_atoms)
+    return get_mass_matrix_from_mass_numbers(mass_numbers, atom_symbols)
+
+
 def get_COM_coordinates(masses, coordinates):
     if len(masses) != len(coordinates):
         raise ValueError(
@@ -148,7 +408,284 @@ def get_COM_coordinates(masses, coordinates):
     return np.subtract(coordinates, COM), COM
 
 
-def get_eigens(matrix, sign_convention=False, right_handed=True):
+def get_COM_coordinates_batch(masses, coordinates):
+    """Shift the coordinates into the Center of Mass system of every isotopologue
+
+    Parameters
+    ----------
+    masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, one row per isotopologue.
+    coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates shared by all
+        isotopologues.
+
+    Returns
+    -------
+    com_coordinates : np.ndarray, shape (n_iso, n_atoms, 3)
+        Coordinates of each isotopologue in its own Center of Mass system.
+    COM : np.ndarray, shape (n_iso, 3)
+        Center of Mass of each isotopologue in the original coordinate system.
+    """
+    masses = np.asarray(masses)
+    coordinates = np.asarray(coordinates)
+    if masses.shape[-1] != len(coordinates):
+        raise ValueError(
+            'Length of "masses" array must match length of "coordinates" array.'
+        )
+
+    masses_sum = masses.sum(axis=-1)
+    if np.any(np.isclose(0, masses_sum)):
+        raise ValueError('Sum of "masses" array is zero!')
+
+    COM = (1 / masses_sum)[:, np.newaxis] * (masses @ coordinates)
+    return coordinates[np.newaxis, :, :] - COM[:, np.newaxis, :], COM
+
+
+def get_atom_inertia_tensors(coordinates):
+    """Precompute the per-atom inertia tensors of a geometry, flattened to rows
+
+    Parameters
+    ----------
+    coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates, or a stack of
+        geometries of shape (n_geometries, n_atoms, 3).
+
+    Returns
+    -------
+    centroid : np.ndarray, shape (3,) or (n_geometries, 3)
+        Unweighted mean of the coordinates, used as the reference point.
+    centered_coordinates : np.ndarray, shape (..., n_atoms, 3)
+        ``coordinates - centroid``.
+    atom_tensors : np.ndarray, shape (..., n_atoms, 9)
+        Row ``i`` is ``|r_i|^2 * 1 - r_i r_i^T`` for the centered ``r_i``,
+        flattened, so that ``masses @ atom_tensors`` is the inertia tensor
+        about the centroid.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    centroid = coordinates.mean(axis=-2)
+    centered_coordinates = coordinates - centroid[..., np.newaxis, :]
+
+    outer_products = (
+        centered_coordinates[..., :, np.newaxis]
+        * centered_coordinates[..., np.newaxis, :]
+    )
+    r2 = np.einsum("...aa->...", outer_products)
+    atom_tensors = r2[..., np.newaxis, np.newaxis] * np.eye(3) - outer_products
+    return centroid, centered_coordinates, atom_tensors.reshape(*r2.shape, 9)
+
+
+def get_COM_inertia_matrices_gemm(masses, coordinates, atom_inertia_tensors=None):
+    """Calculate the Center of Mass inertia matrices of every isotopologue with
+    a single matrix multiply
+
+    Parameters
+    ----------
+    masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, one row per isotopologue.
+    coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates shared by all
+        isotopologues, or a stack of geometries of shape
+        (n_geometries, n_atoms, 3).
+    atom_inertia_tensors : tuple, optional
+        The output of ``get_atom_inertia_tensors(coordinates)``, to reuse it
+        across calls (e.g. chunks of a large screen) for the same geometry.
+
+    Returns
+    -------
+    com_inertias : np.ndarray, shape (n_iso, 3, 3) or (n_geometries, n_iso, 3, 3)
+        Inertia matrix of each isotopologue in its Center of Mass system.
+    COM : np.ndarray, shape (n_iso, 3) or (n_geometries, n_iso, 3)
+        Center of Mass of each isotopologue in the original coordinate system.
+
+    Notes
+    -----
+    The inertia tensor about a fixed reference point is linear in the masses,
+    ``I_ref = sum_i m_i T_i``, so for all isotopologues at once it is the
+    ``(n_iso, n_atoms) @ (n_atoms, 9)`` product of the mass matrix with the
+    precomputed per-atom tensors ``T_i``.  The parallel axis theorem then moves
+    each tensor to its Center of Mass with a rank-one correction built from the
+    first moment ``s = sum_i m_i r_i`` and the total mass ``M``:
+
+    ``I_com = I_ref - (|s|^2 * 1 - s s^T) / M``
+
+    The centroid of the geometry is used as the reference point to keep the
+    correction small relative to ``I_ref``.  For a stack of geometries, the
+    per-atom tensors of all geometries are contracted with the mass matrix
+    in the same single product.
+    """
+    masses = np.asarray(masses, dtype=float)
+    coordinates = np.asarray(coordinates, dtype=float)
+    if masses.shape[-1] != coordinates.shape[-2]:
+        raise ValueError(
+            'Length of "masses" array must match length of "coordinates" array.'
+        )
+
+    masses_sum = masses.sum(axis=-1)
+    if np.any(np.isclose(0, masses_sum)):
+        raise ValueError('Sum of "masses" array is zero!')
+
+    if atom_inertia_tensors is None:
+        atom_inertia_tensors = get_atom_inertia_tensors(coordinates)
+    centroid, centered_coordinates, atom_tensors = atom_inertia_tensors
+
+    # tensordot contracts the atoms of every geometry in one GEMM; the
+    # isotopologue axis comes out first and is moved next to the components.
+    reference_inertias = np.moveaxis(
+        np.tensordot(masses, atom_tensors, axes=(-1, -2)), 0, -2
+    )
+    reference_inertias = reference_inertias.reshape(
+        *reference_inertias.shape[:-1], 3, 3
+    )
+    first_moments = np.moveaxis(
+        np.tensordot(masses, centered_coordinates, axes=(-1, -2)), 0, -2
+    )
+    s2 = np.sum(first_moments**2, axis=-1)
+    correction = s2[..., np.newaxis, np.newaxis] * np.eye(3) - (
+        first_moments[..., :, np.newaxis] * first_moments[..., np.newaxis, :]
+    )
+    com_inertias = (
+        reference_inertias - correction / masses_sum[:, np.newaxis, np.newaxis]
+    )
+
+    COM = centroid[..., np.newaxis, :] + first_moments / masses_sum[:, np.newaxis]
+    return com_inertias, COM
+
+
+def get_eigen_backend(backend=None):
+    """Resolve the eigensolver backend name
+
+    ``None`` selects the backend named by the ``COM_PAC_EIGEN_BACKEND``
+    environment variable, or ``"eigh"`` if it is unset.
+    """
+    if backend is None:
+        backend = os.environ.get(EIGEN_BACKEND_ENV_VAR) or "eigh"
+    backend = backend.strip().lower()
+    if backend not in EIGEN_BACKENDS:
+        raise ValueError(
+            f"Unknown eigensolver backend {backend!r}; expected one of {EIGEN_BACKENDS}."
+        )
+    return backend
+
+
+def get_eigens_analytic(matrices, gap_tolerance=ANALYTIC_EIGEN_GAP_TOLERANCE):
+    """Diagonalize a stack of real symmetric 3×3 matrices in closed form
+
+    Parameters
+    ----------
+    matrices : array-like
+        Array of shape (N, 3, 3) of real symmetric matrices.
+    gap_tolerance : float, optional
+        Matrices with a relative eigenvalue gap below this are solved with
+        ``np.linalg.eigh`` instead.
+
+    Returns
+    -------
+    evals : np.ndarray, shape (N, 3)
+        Eigenvalues sorted in ascending order.
+    evecs : np.ndarray, shape (N, 3, 3)
+        Corresponding eigenvectors as columns, forming a right-handed system.
+
+    Notes
+    -----
+    The eigenvalues come from the trigonometric solution of the characteristic
+    cubic.  With ``q = tr(A) / 3``, ``p = sqrt(tr((A - qI)^2) / 6)`` and
+    ``B = (A - qI) / p``, the eigenvalues are
+
+    ``q + 2 p cos(phi + 2 pi k / 3)``, with ``phi = arccos(det(B) / 2) / 3``.
+
+    The eigenvectors of the smallest and largest eigenvalues are the largest
+    cross product of two rows of ``A - lambda I``; the middle eigenvector
+    completes the right-handed frame.  The eigenvalues are then refined as
+    Rayleigh quotients of the normalized eigenvectors.
+
+    All of this is elementwise arithmetic over the stack, so it beats the
+    per-matrix LAPACK calls of ``eigh`` only for stacks of a few hundred
+    matrices or more (see ``scripts/benchmark_eigens.py``).  The eigenvector
+    signs are not the ones ``eigh`` picks; use ``sign_convention=True`` in
+    ``get_eigens``/``get_eigens_batch`` when the orientation must not depend
+    on the backend.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.shape[0] == 0:
+        return np.empty(matrices.shape[:-1]), np.empty(matrices.shape)
+
+    # Work on the six independent elements as 1D arrays over the stack
+    a, b, c = matrices[:, 0, 0], matrices[:, 1, 1], matrices[:, 2, 2]
+    d, e, f = matrices[:, 0, 1], matrices[:, 0, 2], matrices[:, 1, 2]
+
+    q = (a + b + c) / 3
+    aq, bq, cq = a - q, b - q, c - q
+    p = np.sqrt((aq * aq + bq * bq + cq * cq + 2 * (d * d + e * e + f * f)) / 6)
+    shifted_det = aq * (bq * cq - f * f) - d * (d * cq - e * f) + e * (d * f - bq * e)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        half_det = shifted_det / (2 * p**3)
+    phi = np.arccos(np.clip(half_det, -1.0, 1.0)) / 3
+    largest = q + 2 * p * np.cos(phi)
+    smallest = q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    middle = 3 * q - largest - smallest
+
+    gaps = np.minimum(middle - smallest, largest - middle)
+    scale = np.maximum(np.abs(smallest), np.abs(largest))
+    analytic = gaps > gap_tolerance * scale
+
+    # Eigenvectors of the outer eigenvalues from cross products of the rows of
+    # A - lambda I, shaped (candidate, component, [smallest, largest], N)
+    outer_roots = np.stack([smallest, largest])
+    al, bl, cl = a - outer_roots, b - outer_roots, c - outer_roots
+    candidates = np.array(
+        [
+            [d * f - e * bl, e * d - al * f, al * bl - d * d],
+            [d * cl - e * f, e * e - al * cl, al * f - d * e],
+            [bl * cl - f * f, f * e - d * cl, d * f - bl * e],
+        ]
+    )
+    norms_sq = np.einsum("iakn,iakn->ikn", candidates, candidates)
+    outer = np.where(norms_sq[1] > norms_sq[0], candidates[1], candidates[0])
+    outer_norm_sq = np.maximum(norms_sq[0], norms_sq[1])
+    outer = np.where(norms_sq[2] > outer_norm_sq, candidates[2], outer)
+    outer_norm_sq = np.maximum(outer_norm_sq, norms_sq[2])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outer /= np.sqrt(outer_norm_sq)
+        v_small, v_large = outer[:, 0], outer[:, 1]
+        # Re-orthogonalize against v_small before completing the frame
+        v_large -= np.einsum("an,an->n", v_large, v_small) * v_small
+        v_large /= np.sqrt(np.einsum("an,an->n", v_large, v_large))
+    (xs, ys, zs), (xl, yl, zl) = v_small, v_large
+    v_middle = np.array([yl * zs - zl * ys, zl * xs - xl * zs, xl * ys - yl * xs])
+    # (component, N, column) -> (N, component, column)
+    evecs = np.stack([v_small, v_middle, v_large], axis=-1).transpose(1, 0, 2)
+
+    # Rayleigh quotients v^T A v of the normalized eigenvectors
+    x, y, z = evecs[:, 0], evecs[:, 1], evecs[:, 2]
+    evals = (
+        a[:, np.newaxis] * x * x
+        + b[:, np.newaxis] * y * y
+        + c[:, np.newaxis] * z * z
+        + 2
+        * (
+            d[:, np.newaxis] * x * y
+            + e[:, np.newaxis] * x * z
+            + f[:, np.newaxis] * y * z
+        )
+    )
+
+    if not analytic.all():
+        fallback_evals, fallback_evecs = np.linalg.eigh(matrices[~analytic])
+        # eigh may return a reflection; keep the frames right-handed as above
+        fallback_evecs[np.linalg.det(fallback_evecs) < 0, :, -1] *= -1
+        evals[~analytic], evecs[~analytic] = fallback_evals, fallback_evecs
+
+    return evals, evecs
+
+
+def solve_eigens(matrices, backend=None):
+    """Solve a stack of symmetric 3×3 matrices with the selected backend"""
+    if get_eigen_backend(backend) == "analytic":
+        return get_eigens_analytic(matrices)
+    return np.linalg.eigh(matrices)
+
+
+def get_eigens(matrix, sign_convention=False, right_handed=True, backend=None):
     """Diagonalize a real symmetric matrix and return eigenvalues and eigenvectors
     with an optionally standardized orientation.
 
@@ -165,6 +702,10 @@ def get_eigens(matrix, sign_convention=False, right_handed=True):
         form a right-handed coordinate system (det = +1).  If the determinant
         is −1 the last column is negated to correct the orientation.
         Defaults to ``True``.
+    backend : {"eigh", "analytic"}, optional
+        Eigensolver to use.  ``"analytic"`` uses the closed-form solver of
+        ``get_eigens_analytic``.  Defaults to the ``COM_PAC_EIGEN_BACKEND``
+        environment variable, or ``"eigh"`` if it is unset.
 
     Returns
     -------
@@ -193,7 +734,11 @@ def get_eigens(matrix, sign_convention=False, right_handed=True):
        the principal axis frame is consistently right-handed across all
        isotopologues so that relative atomic positions are not mirror-inverted.
     """
-    evals, evecs = np.linalg.eigh(matrix)
+    if get_eigen_backend(backend) == "analytic":
+        evals, evecs = get_eigens_analytic(np.asarray(matrix)[np.newaxis])
+        evals, evecs = evals[0], evecs[0]
+    else:
+        evals, evecs = np.linalg.eigh(matrix)
 
     # Step 1: deterministic sign convention per eigenvector column.
     if sign_convention:
@@ -209,6 +754,49 @@ def get_eigens(matrix, sign_convention=False, right_handed=True):
     return evals, evecs
 
 
+def get_eigens_batch(matrices, sign_convention=False, right_handed=True, backend=None):
+    """Diagonalize a stack of real symmetric 3×3 matrices
+
+    Parameters
+    ----------
+    matrices : array-like
+        Array of shape (n_iso, 3, 3) of real symmetric matrices.
+    sign_convention : bool, optional
+        See ``get_eigens``.  Defaults to ``False``.
+    right_handed : bool, optional
+        See ``get_eigens``.  Defaults to ``True``.
+    backend : {"eigh", "analytic"}, optional
+        See ``get_eigens``.
+
+    Returns
+    -------
+    evals : np.ndarray, shape (n_iso, 3)
+        Eigenvalues of each matrix sorted in ascending order.
+    evecs : np.ndarray, shape (n_iso, 3, 3)
+        Corresponding eigenvectors as columns.
+
+    Notes
+    -----
+    ``np.linalg.eigh`` solves every matrix of the stack in one call, and the
+    two normalisation steps of ``get_eigens`` are applied as whole-array
+    operations, so the results match ``get_eigens`` matrix by matrix.
+    """
+    evals, evecs = solve_eigens(matrices, backend)
+
+    # Step 1: deterministic sign convention per eigenvector column.
+    if sign_convention:
+        leading_rows = np.argmax(np.abs(evecs), axis=-2)[..., np.newaxis, :]
+        leading = np.take_along_axis(evecs, leading_rows, axis=-2)
+        evecs = np.where(leading < 0, -evecs, evecs)
+
+    # Step 2: enforce right-handed coordinate system.
+    if right_handed:
+        left_handed = np.linalg.det(evecs) < 0
+        evecs[left_handed, :, -1] *= -1
+
+    return evals, evecs
+
+
 def rotate_coordinates(coordinates, rotation):
     rotated_coordinates = np.dot(coordinates, rotation)
     return rotated_coordinates
@@ -242,6 +830,147 @@ def get_isotopologue_principal_axes(
     )
 
 
+def get_inertial_quantities_batch(mass_matrix, pa_coordinates, eigenvalues):
+    """Calculate planar moments, inertial defects and Ray's asymmetry parameters
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses.
+    pa_coordinates : array-like
+        Array of shape (n_iso, n_atoms, 3) of principal axes coordinates.
+    eigenvalues : array-like
+        Array of shape (n_iso, 3) of principal moments ``I_a <= I_b <= I_c``.
+
+    Returns
+    -------
+    inertial_data : dict
+        "planar_moments": np.ndarray (n_iso, 3), ``P_gg = sum_i m_i g_i^2``
+        "inertial_defect": np.ndarray (n_iso,), ``I_c - I_a - I_b``
+        "kappa": np.ndarray (n_iso,), ``(2B - A - C) / (A - C)``; NaN for a
+        spherical top
+
+    Notes
+    -----
+    Ray's kappa is evaluated from the moments as
+    ``(2 I_a I_c - I_b (I_a + I_c)) / (I_b (I_c - I_a))``, which stays finite
+    (-1) for a linear molecule with ``I_a = 0``.
+    """
+    mass_matrix = np.asarray(mass_matrix, dtype=float)
+    pa_coordinates = np.asarray(pa_coordinates, dtype=float)
+    ia, ib, ic = np.moveaxis(np.asarray(eigenvalues, dtype=float), -1, 0)
+
+    planar_moments = np.einsum("ik,ikg->ig", mass_matrix, pa_coordinates**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kappa = (2 * ia * ic - ib * (ia + ic)) / (ib * (ic - ia))
+
+    return {
+        "planar_moments": planar_moments,
+        "inertial_defect": ic - ia - ib,
+        "kappa": kappa,
+    }
+
+
+def get_theta_values_batch(mass_matrix, pa_coordinates):
+    """Calculate theta values for a stack of isotopologues.
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses; the first row is the
+        parent isotopologue.
+    pa_coordinates : array-like
+        Array of shape (n_iso, n_atoms, 3) of the principal axes coordinates
+        of each isotopologue in its own principal axes frame.
+
+    Returns
+    -------
+    theta_data : dict
+        "theta_7", "theta_8", "theta_9_par": np.ndarray (n_iso,) in degrees,
+        NaN where undefined
+        "iaa", "ibb", "iab": np.ndarray (n_iso,), inertia tensor elements of
+        each isotopologue in the parent principal axes frame
+        "ia", "ib": np.ndarray (n_iso,), inertia tensor diagonal of each
+        isotopologue in its own principal axes frame
+        "reason_codes": np.ndarray[int] (n_iso,), bitwise OR of the
+        ``THETA_*`` flags explaining the NaN values; 0 if all are defined
+
+    Notes
+    -----
+    The parent-frame and own-frame inertia tensors are built as stacks with
+    ``get_inertia_matrix_batch``, and the ratios are evaluated under
+    ``np.errstate`` so zero denominators and out-of-domain ratios become NaN
+    and reason codes rather than warnings.  A non-planar parent sets
+    ``THETA_NONPLANAR_PARENT`` and leaves every theta undefined.
+    """
+    mass_matrix = np.asarray(mass_matrix, dtype=float)
+    pa_coordinates = np.asarray(pa_coordinates, dtype=float)
+
+    # The paper says that the all the coordinates need to be in the
+    # principal axes frame of the parent species, i.e., the first isotopologue;
+    # pairing the parent coordinates with each set of masses gives that frame.
+    parent_coordinates = np.broadcast_to(pa_coordinates[0], pa_coordinates.shape)
+    parent_inertias = get_inertia_matrix_batch(parent_coordinates, mass_matrix)
+    iso_pa_inertias = get_inertia_matrix_batch(pa_coordinates, mass_matrix)
+
+    iaa = parent_inertias[:, 0, 0]
+    ibb = parent_inertias[:, 1, 1]
+    iab = parent_inertias[:, 0, 1]
+    # The implication here is that I{e}_a and I{e}_b are the moments of inertia
+    # in the *isotopologue's principal axes frame*
+    ia = iso_pa_inertias[:, 0, 0]
+    ib = iso_pa_inertias[:, 1, 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # tan(2*theta_7) = (2 * I{e}_ab) / (I{e}_aa - I{e}bb)
+        ratio_7 = (2 * iab) / (iaa - ibb)
+        # I{e}_aa - I{e}_bb = (I{e}_a - I{e}_b)*cos(2*theta_8)
+        ratio_8 = (iaa - ibb) / (ia - ib)
+        # I{e}_ab = (1/2)*(I{e}_a - I{e}_b)*sin(2*theta_9), with I{e}_ab taken
+        # in the parent PA frame (in the iso PA frame it is zero to precision)
+        ratio_9 = (2 * iab) / (ia - ib)
+
+    undefined_7 = ~np.isfinite(ratio_7)
+    undefined_8 = ~(np.abs(ratio_8) <= 1)
+    undefined_9 = ~(np.abs(ratio_9) <= 1)
+
+    # Need to check if planar - paper does not describe how to handle non-planar...
+    parent_off_diagonals = parent_inertias[0, [0, 2, 1, 2], [2, 0, 2, 1]]
+    if not np.allclose(parent_off_diagonals, 0):
+        undefined_7 = undefined_8 = undefined_9 = np.ones(len(mass_matrix), bool)
+        nonplanar = THETA_NONPLANAR_PARENT
+    else:
+        nonplanar = 0
+
+    theta_7 = np.where(
+        undefined_7, np.nan, np.degrees(np.arctan(np.where(undefined_7, 0, ratio_7)))
+    )
+    theta_8 = np.where(
+        undefined_8, np.nan, np.degrees(np.arccos(np.where(undefined_8, 1, ratio_8)))
+    )
+    theta_9 = np.where(
+        undefined_9, np.nan, np.degrees(np.arcsin(np.where(undefined_9, 0, ratio_9)))
+    )
+    reason_codes = (
+        undefined_7 * THETA_7_UNDEFINED
+        | undefined_8 * THETA_8_UNDEFINED
+        | undefined_9 * THETA_9_UNDEFINED
+        | nonplanar
+    )
+
+    return {
+        "theta_7": theta_7 / 2,
+        "theta_8": theta_8 / 2,
+        "theta_9_par": theta_9 / 2,
+        "iaa": iaa,
+        "ibb": ibb,
+        "iab": iab,
+        "ia": ia,
+        "ib": ib,
+        "reason_codes": reason_codes,
+    }
+
+
 def get_theta_values(
     isotopologue_names,
     atom_masses,
@@ -264,141 +993,38 @@ def get_theta_values(
     -------
     theta_data : dict or None
         key = isotopologue_name: str
-        value = theta results (TBD)
+        value = dict of the theta values (degrees, NaN where undefined) and
+        the inertia elements they are derived from, see
+        ``get_theta_values_batch``
         None if parent isotopologue is not planar in it's principal axes frame.
 
     """
-    # The paper says that the all the coordinates need to be in the
-    # principal axes frame of the parent species, i.e., the first isotopologue
-    parent_iso = isotopologue_names[0]
-    parent_coordinates = pa_coordinates[parent_iso]
-    parent_masses = atom_masses[parent_iso]
-    # Need to check if planar - paper does not describe how to handle non-planar...
-    parent_inertia_matrix = get_inertia_matrix(parent_coordinates, parent_masses)
-    piac = parent_inertia_matrix[0, 2]
-    pica = parent_inertia_matrix[2, 0]
-    pibc = parent_inertia_matrix[1, 2]
-    picb = parent_inertia_matrix[2, 1]
-    if not np.allclose([0, 0, 0, 0], [piac, pica, pibc, picb]):
+    theta_batch = get_theta_values_batch(
+        [atom_masses[iso] for iso in isotopologue_names],
+        [pa_coordinates[iso] for iso in isotopologue_names],
+    )
+    reason_codes = theta_batch.pop("reason_codes")
+    if np.any(reason_codes & THETA_NONPLANAR_PARENT):
         print(
             "WARNING: Parent isotopologue is non-planar - skipping Theta calculation!"
         )
         return None
 
-    # To get the isos in the parent coordinates, just need to pair with the
-    # correct masses.
-    #
-    theta_results_dict = {}
-    iso_inertia_in_parent_dict: dict = {}
-    theta_7_dict: dict = {}
-    theta_8_dict: dict = {}
-    theta_9_parent_dict: dict = {}
-    theta_9_iso_dict: dict = {}
-    for iso in isotopologue_names:
-        # Next, need to calculate the inertia tensor for each iso
-        inertia_matrix = get_inertia_matrix(parent_coordinates, atom_masses[iso])
-        # theta_equilibrium in equation 7 is given by
-        #   tan(2*theta_7) = (2 * I{e}_ab) / (I{e}_aa - I{e}bb)
-        # or
-        #   theta_7 = (1/2) * arctan((2 * I{e}_ab) / (I{e}_aa - I{e}bb))
-        iab = inertia_matrix[0, 1]
-        iaa = inertia_matrix[0, 0]
-        ibb = inertia_matrix[1, 1]
-        with warnings.catch_warnings():
-            warnings.simplefilter("error", RuntimeWarning)
-            try:
-                theta_7 = (1 / 2) * np.arctan((2 * iab) / (iaa - ibb))
-                theta_7 = np.degrees(theta_7)
-            except Exception as e:
-                print(f"""{iso} encountered error while calculating theta_7
-    {iab=}
-    {iaa=}
-    {ibb=}
-    (2 * iab) / (iaa - ibb) = {(2*iab) / (iaa - ibb)}
-Exception: {e}""")
-                theta_7 = None
-
-        # theta_equilibrium in equation 8 is given by
-        #   I{e}_aa - I{e}_bb = (I{e}_a - I{e}_b)*cos(2*theta_8)
-        # or
-        #   theta_8 = (1/2)*arccos( (I{e}_aa - I{e}_bb) / (I{e}_a - I{e}_b) )
-        # The implication here is that I{e}_a and I{e}_b are the moments of inertia
-        # in the *isotopologue's principal axes frame*
-        iso_pa_inertia = get_inertia_matrix(pa_coordinates[iso], atom_masses[iso])
-        ia = iso_pa_inertia[0, 0]
-        ib = iso_pa_inertia[1, 1]
-        with warnings.catch_warnings():
-            warnings.simplefilter("error", RuntimeWarning)
-            try:
-                theta_8 = (1 / 2) * np.arccos((iaa - ibb) / (ia - ib))
-                theta_8 = np.degrees(theta_8)
-            except Exception as e:
-                print(f"""{iso} encountered error while calculating theta_8
-    {iaa=}
-    {ibb=}
-    {ia=}
-    {ib=}
-    (iaa - ibb) / (ia - ib) = {(iaa - ibb) / (ia - ib)}
-Exception: {e}""")
-                theta_8 = None
-
-        # theta_equilibrium in equation 9 is given by
-        #   I{e}_ab = (1/2)*(I{e}_a - I{e}_b)*sin(2*theta_9)
-        # or
-        #   theta_9 = (1/2)*arcsin((2*I{e}_ab) / (I{e}_a - I{e}_b))
-        # The problem, however, is that it is not clear from context whether I{e}_ab
-        # is the off-diagonal element in the parent PA frame, or in the iso PA frame!
-        # So I guess we'll calculate it twice
-        #
-        # Edit: nvm, the values of theta_9_iso are all within floating point precision of zero!
-        #
-        #   theta_9_parent_frame = (1/2)*arcsin((2*I{e, parent}_ab) / (I{e}_a - I{e}_b))
-        iab_parent = iab
-        with warnings.catch_warnings():
-            warnings.simplefilter("error", RuntimeWarning)
-            try:
-                theta_9_parent_frame = (1 / 2) * np.arcsin((2 * iab_parent) / (ia - ib))
-                theta_9_parent_frame = np.degrees(theta_9_parent_frame)
-            except Exception as e:
-                print(f"""{iso} encountered error while calculating theta_9_parent
-    {iab_parent=}
-    {ia=}
-    {ib=}
-    (2 * iab_parent) / (ia - ib) = {(2*iab_parent) / (ia - ib)}
-Exception: {e}""")
-                theta_9_parent_frame = None
-
-        #         #   theta_9_iso_frame = (1/2)*arcsin((2*I{e, iso}_ab) / (I{e}_a - I{e}_b))
-        #         iab_iso = iso_pa_inertia[0, 1]
-        #         with warnings.catch_warnings():
-        #             warnings.simplefilter("error", RuntimeWarning)
-        #             try:
-        #                 theta_9_iso_frame = (1 / 2) * np.arcsin((2 * iab_iso) / (ia - ib))
-        #             except Exception as e:
-        #                 print(f"""{iso} encountered error while calculating theta_9_iso
-        #     {iab_iso=}
-        #     {ia=}
-        #     {ib=}
-        #     (2 * iab_iso) / (ia - ib) = {(2*iab_iso) / (ia - ib)}
-        # Exception: {e}""")
-        #                 theta_9_iso_frame = None
-
-        # TODO: Andrew's naive vector approach
-
-        # Update dictionaries
-        theta_results_dict[iso] = {
-            "theta_7": theta_7,
-            "theta_8": theta_8,
-            "theta_9_par": theta_9_parent_frame,
-            # "theta_9_iso": theta_9_iso_frame,
-            "iaa": iaa,
-            "ibb": ibb,
-            "iab": iab,
-            "ia": ia,
-            "ib": ib,
-        }
-
-    return theta_results_dict
+    for theta_label, flag in (
+        ("theta_7", THETA_7_UNDEFINED),
+        ("theta_8", THETA_8_UNDEFINED),
+        ("theta_9_par", THETA_9_UNDEFINED),
+    ):
+        undefined = [
+            iso for iso, code in zip(isotopologue_names, reason_codes) if code & flag
+        ]
+        if undefined:
+            print(f"WARNING: {theta_label} is undefined for {', '.join(undefined)}")
+
+    return {
+        iso: {label: values[i] for label, values in theta_batch.items()}
+        for i, iso in enumerate(isotopologue_names)
+    }
 
 
 def check_for_length_mismatch(listlike, expected_length: int, message: str):
@@ -419,6 +1045,180 @@ def transform_dipole(dipole, vectors):
     return abs(np.dot(dipole, vectors))
 
 
+def get_bad_diagonal_mask(matrices, eigenvalues):
+    """Flag which matrices of a stack are not diagonal with the given eigenvalues
+
+    Parameters
+    ----------
+    matrices : array-like
+        Array of shape (n_iso, 3, 3).
+    eigenvalues : array-like
+        Array of shape (n_iso, 3).
+
+    Returns
+    -------
+    np.ndarray[bool], shape (n_iso,)
+        ``True`` where ``check_for_bad_diagonal`` would print its warning.
+    """
+    eigenvalues = np.asarray(eigenvalues)
+    diagonals = eigenvalues[..., np.newaxis] * np.eye(eigenvalues.shape[-1])
+    return ~np.isclose(matrices, diagonals).all(axis=(-2, -1))
+
+
+def get_principal_axes_batch(
+    mol_masses,
+    mol_coordinates,
+    mol_dipole,
+    eigen_backend=None,
+    inertia_method="direct",
+):
+    """Calculate the principal axes systems of all isotopologues at once
+
+    Parameters
+    ----------
+    mol_masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, one row per isotopologue.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates shared by all
+        isotopologues.
+    mol_dipole : array-like
+        Dipole vector of length 3 in the frame of ``mol_coordinates``.
+    eigen_backend : {"eigh", "analytic"}, optional
+        Eigensolver backend, see ``get_eigens``.
+    inertia_method : {"direct", "gemm"}, optional
+        ``"direct"`` (the default) sums over the COM coordinates of each
+        isotopologue with ``get_inertia_matrix_batch``.  ``"gemm"`` uses the
+        mass-linear formulation of ``get_COM_inertia_matrices_gemm``.
+
+    Returns
+    -------
+    atom_masses : np.ndarray, shape (n_iso, n_atoms)
+    rotational_constants : np.ndarray, shape (n_iso, 3)
+    pa_dipoles : np.ndarray, shape (n_iso, 3)
+    pa_coordinates : np.ndarray, shape (n_iso, n_atoms, 3)
+    pa_inertias : np.ndarray, shape (n_iso, 3, 3)
+    com_coordinates : np.ndarray, shape (n_iso, n_atoms, 3)
+    com_inertias : np.ndarray, shape (n_iso, 3, 3)
+    eigenvectors : np.ndarray, shape (n_iso, 3, 3)
+    eigenvalues : np.ndarray, shape (n_iso, 3)
+    COM_values : np.ndarray, shape (n_iso, 3)
+
+    Notes
+    -----
+    The steps are the same as ``get_isotopologue_principal_axes``, but every
+    step operates on the whole stack of isotopologues, so there is no Python
+    loop over the isotopologues.  The outputs are in the same order as
+    ``get_principal_axes``, with a leading isotopologue axis instead of dicts.
+    """
+    mol_masses = np.asarray(mol_masses, dtype=float)
+
+    if inertia_method == "direct":
+        # Shift into Center of Mass coordinate systems
+        com_coordinates, COM_values = get_COM_coordinates_batch(
+            mol_masses, mol_coordinates
+        )
+        # Calculate inertia matrices in COM systems
+        com_inertias = get_inertia_matrix_batch(com_coordinates, mol_masses)
+    elif inertia_method == "gemm":
+        # Inertia matrices in COM systems straight from the mass matrix
+        com_inertias, COM_values = get_COM_inertia_matrices_gemm(
+            mol_masses, mol_coordinates
+        )
+        com_coordinates = np.asarray(mol_coordinates) - COM_values[:, np.newaxis, :]
+    else:
+        raise ValueError(
+            f"Unknown inertia_method {inertia_method!r}; expected 'direct' or 'gemm'."
+        )
+    # Diagonalize said matrices
+    eigenvalues, eigenvectors = get_eigens_batch(com_inertias, backend=eigen_backend)
+    # Use resulting eigenvectors to rotate COM systems into Principal Axes systems
+    pa_coordinates = com_coordinates @ eigenvectors
+    # Calculate inertia matrices in PA systems, to later check if actually diagonalized
+    pa_inertias = get_inertia_matrix_batch(pa_coordinates, mol_masses)
+
+    pa_dipoles = transform_dipole(mol_dipole, eigenvectors)
+    rotational_constants = inertia_to_rot_const(eigenvalues)
+
+    return (
+        mol_masses,
+        rotational_constants,
+        pa_dipoles,
+        pa_coordinates,
+        pa_inertias,
+        com_coordinates,
+        com_inertias,
+        eigenvectors,
+        eigenvalues,
+        COM_values,
+    )
+
+
+def get_unique_mass_rows(mol_masses):
+    """Distinct rows of a mass matrix, in order of first appearance
+
+    Parameters
+    ----------
+    mol_masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses or mass numbers.
+
+    Returns
+    -------
+    unique_rows : np.ndarray, shape (n_unique, n_atoms)
+    inverse : np.ndarray[int], shape (n_iso,)
+        ``unique_rows[inverse]`` reproduces ``mol_masses``.
+    """
+    mol_masses = np.asarray(mol_masses)
+    _, first, inverse = np.unique(
+        mol_masses, axis=0, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return mol_masses[first[order]], ranks[inverse.reshape(-1)]
+
+
+def get_geometry_digest(mol_coordinates, mol_dipole, *options):
+    """Hex digest of the geometry, dipole and options of a calculation"""
+    digest = hashlib.sha1()
+    for array in (mol_coordinates, mol_dipole):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    digest.update(repr(options).encode())
+    return digest.hexdigest()
+
+
+def get_principal_axes_batch_cached(
+    mol_masses, mol_coordinates, mol_dipole, batch_function, geometry_digest
+):
+    """``batch_function`` over the mass rows missing from PRINCIPAL_AXES_CACHE
+
+    The rows of ``mol_masses`` must be distinct.  Results are looked up by
+    ``(geometry_digest, row bytes)``, and the least recently used entries
+    are evicted beyond ``PRINCIPAL_AXES_CACHE_MAXSIZE``.  Row 0 is always
+    passed first to ``batch_function``, which may treat it as the parent.
+    """
+    keys = [(geometry_digest, row.tobytes()) for row in mol_masses]
+    entries = {}
+    for key in keys:
+        if key in PRINCIPAL_AXES_CACHE:
+            PRINCIPAL_AXES_CACHE.move_to_end(key)
+            entries[key] = PRINCIPAL_AXES_CACHE[key]
+    missing = [i for i, key in enumerate(keys) if key not in entries]
+    PRINCIPAL_AXES_CACHE_STATS["hits"] += len(keys) - len(missing)
+    PRINCIPAL_AXES_CACHE_STATS["misses"] += len(missing)
+
+    if missing:
+        rows = missing if missing[0] == 0 else [0, *missing]
+        results = batch_function(mol_masses[rows], mol_coordinates, mol_dipole)
+        # Skip the parent row when it was only added for batch_function
+        for j, i in enumerate(missing, len(rows) - len(missing)):
+            entries[keys[i]] = tuple(np.copy(result[j]) for result in results)
+            PRINCIPAL_AXES_CACHE[keys[i]] = entries[keys[i]]
+        while len(PRINCIPAL_AXES_CACHE) > PRINCIPAL_AXES_CACHE_MAXSIZE:
+            PRINCIPAL_AXES_CACHE.popitem(last=False)
+
+    return tuple(np.stack([entries[key][k] for key in keys]) for k in range(10))
+
+
 def get_principal_axes(
     isotopologue_names,
     isotopologue_dict,
@@ -426,64 +1226,60 @@ def get_principal_axes(
     atom_symbols,
     mol_coordinates,
     mol_dipole,
+    mass_matrix=None,
+    eigen_backend=None,
+    inertia_method="direct",
+    symmetry=False,
+    cache=False,
+    symmetry_tolerance=None,
 ):
-    # initialize empty data structures
-    atom_masses = {}
-    com_coordinates = {}
-    com_inertias = {}
-    eigenvectors = {}
-    eigenvalues = {}
-    pa_dipoles = {}
-    pa_coordinates = {}
-    pa_inertias = {}
-    rotational_constants = {}
-    COM_values = {}
-
-    bad_diagonal_warnings = {}
-
-    for iso in isotopologue_names:
-        # validate data
-        atom_mass_numbers = isotopologue_dict[iso]
-        check_for_length_mismatch(
-            atom_mass_numbers,
-            n_atoms,
-            f"Number of atoms in isotopologue_dict[{iso}] does not match number of atoms in coordinates.",
+    # Lookup exact masses, unless they were already resolved by get_mass_matrix
+    if mass_matrix is None:
+        mol_masses = get_mass_matrix(
+            isotopologue_names, isotopologue_dict, n_atoms, atom_symbols
         )
-
-        # do calculations
-
-        (
-            mol_masses,
-            com_coordinate,
-            com_inertia,
-            evecs,
-            evals,
-            pa_coordinate,
-            pa_inertia,
-            COM,
-        ) = get_isotopologue_principal_axes(
-            mol_coordinates, atom_mass_numbers, atom_symbols, n_atoms
+    else:
+        mol_masses = np.asarray(mass_matrix, dtype=float)
+        if mol_masses.shape != (len(isotopologue_names), n_atoms):
+            raise ValueError(
+                f"Shape of mass_matrix {mol_masses.shape} does not match "
+                f"{(len(isotopologue_names), n_atoms)} (isotopologues, atoms)."
+            )
+
+    # do calculations, once per set of symmetry-equivalent isotopologues if asked
+    options = {"eigen_backend": eigen_backend, "inertia_method": inertia_method}
+    if symmetry:
+        from com_pac.symmetry import get_principal_axes_batch_symmetric
+
+        batch_function = get_principal_axes_batch_symmetric
+        if symmetry_tolerance is not None:
+            options["tolerance"] = symmetry_tolerance
+    else:
+        batch_function = get_principal_axes_batch
+
+    def compute(masses, coordinates, dipole):
+        return batch_function(masses, coordinates, dipole, **options)
+
+    # Isotopologues with identical masses under different labels, and
+    # isotopologues already computed for this geometry, are computed once
+    unique_masses, inverse = get_unique_mass_rows(mol_masses)
+    if cache:
+        geometry_digest = get_geometry_digest(
+            mol_coordinates,
+            mol_dipole,
+            get_eigen_backend(eigen_backend),
+            inertia_method,
+            symmetry and (mol_masses[0].tobytes(), symmetry_tolerance),
         )
-
-        # update data structures with results of calculations
-        atom_masses[iso] = mol_masses
-        com_coordinates[iso] = com_coordinate
-        com_inertias[iso] = com_inertia
-        eigenvectors[iso] = evecs
-        eigenvalues[iso] = evals
-        pa_coordinates[iso] = pa_coordinate
-        pa_inertias[iso] = pa_inertia
-        pa_dipoles[iso] = transform_dipole(mol_dipole, evecs)
-        rotational_constants[iso] = list(map(inertia_to_rot_const, evals))
-        COM_values[iso] = COM
-
-        check_for_bad_diagonal(
-            pa_inertia,
-            evals,
-            f"WARNING! The inertia matrix calculated using the principal axes system is not diagonal for {iso}",
+        results = get_principal_axes_batch_cached(
+            unique_masses, mol_coordinates, mol_dipole, compute, geometry_digest
         )
-
-    return (
+    elif len(unique_masses) < len(mol_masses):
+        results = compute(unique_masses, mol_coordinates, mol_dipole)
+    else:
+        results = compute(mol_masses, mol_coordinates, mol_dipole)
+        inverse = slice(None)
+    (
         atom_masses,
         rotational_constants,
         pa_dipoles,
@@ -494,4 +1290,29 @@ def get_principal_axes(
         eigenvectors,
         eigenvalues,
         COM_values,
+    ) = (result[inverse] for result in results)
+
+    bad_diagonal_mask = get_bad_diagonal_mask(pa_inertias, eigenvalues)
+    for i in np.flatnonzero(bad_diagonal_mask):
+        check_for_bad_diagonal(
+            pa_inertias[i],
+            eigenvalues[i],
+            f"WARNING! The inertia matrix calculated using the principal axes system is not diagonal for {isotopologue_names[i]}",
+        )
+
+    # update data structures with results of calculations
+    return (
+        dict(zip(isotopologue_names, atom_masses)),
+        {
+            iso: list(rot_consts)
+            for iso, rot_consts in zip(isotopologue_names, rotational_constants)
+        },
+        dict(zip(isotopologue_names, pa_dipoles)),
+        dict(zip(isotopologue_names, pa_coordinates)),
+        dict(zip(isotopologue_names, pa_inertias)),
+        dict(zip(isotopologue_names, com_coordinates)),
+        dict(zip(isotopologue_names, com_inertias)),
+        dict(zip(isotopologue_names, eigenvectors)),
+        dict(zip(isotopologue_names, eigenvalues)),
+        dict(zip(isotopologue_names, COM_values)),
     )
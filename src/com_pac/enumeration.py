@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+from com_pac.diagonalize import (
+    get_mass_matrix_from_mass_numbers,
+    get_principal_axes_batch,
+)
+
+ENUMERATION_MODES = ("single", "double", "all")
+PARENT_NAME = "parent"
+# Mass numbers are stored compactly; every known isotope fits easily.
+MASS_NUMBER_DTYPE = np.int16
+
+
+def build_enumeration(atom_symbols, isotopes, mode="single", atom_numbering=None):
+    """Describe a set of isotopologues generated from per-element isotope lists
+
+    Parameters
+    ----------
+    atom_symbols : list[str]
+        Element symbols of the atoms, in the order of the Coordinates section.
+    isotopes : dict[str, list[int]]
+        Mass numbers to use for each element.  The first mass number of each
+        element is its isotope in the parent; the others are substitutions.
+    mode : {"single", "double", "all"}, optional
+        ``"single"`` enumerates every singly-substituted isotopologue,
+        ``"double"`` every isotopologue substituted at exactly two atoms, and
+        ``"all"`` the full Cartesian product over the isotopes of every atom.
+    atom_numbering : list[str], optional
+        Atom labels used in the generated names; defaults to "<Symbol><AtomNumber>".
+
+    Returns
+    -------
+    enumeration : dict
+        "mode": str
+        "atom_numbering": list[str]
+        "parent": np.array[int16] of the parent mass numbers
+        "alternatives": np.array[int16], shape (n_atoms, max_alternatives)
+            Substitution mass numbers of each atom, padded with the parent's.
+        "n_alternatives": np.array[int] of the number of alternatives per atom
+        "blocks": tuple of np.array[int] describing the id blocks of ``mode``
+            (substituted atom, pair of atoms, or mixed-radix radices)
+        "block_offsets": np.array[int] of the first id of each block
+        "count": int, number of isotopologues including the parent
+
+    Notes
+    -----
+    Isotopologues are identified by integer ids: id 0 is always the parent and
+    ids ``1..count-1`` are the substituted isotopologues of ``mode``.  Nothing
+    is generated here; ids are decoded into mass numbers on demand by
+    ``decode_isotopologue_ids``.
+    """
+    if mode not in ENUMERATION_MODES:
+        raise ValueError(
+            f"Unknown enumeration mode {mode!r}; expected one of {ENUMERATION_MODES}."
+        )
+
+    missing_elements = sorted(set(atom_symbols) - set(isotopes))
+    if missing_elements:
+        raise ValueError(f"No isotopes listed for elements: {missing_elements}")
+
+    repeated_isotopes = sorted(
+        symbol
+        for symbol, mass_numbers in isotopes.items()
+        if len(set(mass_numbers)) != len(mass_numbers) or len(mass_numbers) == 0
+    )
+    if repeated_isotopes:
+        raise ValueError(
+            f"Isotope lists must be non-empty without repeats: {repeated_isotopes}"
+        )
+
+    if atom_numbering is None:
+        atom_numbering = [f"{symbol}{i + 1}" for i, symbol in enumerate(atom_symbols)]
+
+    n_atoms = len(atom_symbols)
+    parent = np.array([isotopes[symbol][0] for symbol in atom_symbols])
+    n_alternatives = np.array([len(isotopes[symbol]) - 1 for symbol in atom_symbols])
+    alternatives = np.repeat(parent[:, np.newaxis], max(n_alternatives.max(), 1), 1)
+    for i, symbol in enumerate(atom_symbols):
+        alternatives[i, : n_alternatives[i]] = isotopes[symbol][1:]
+
+    if mode == "single":
+        # Block per atom: ids of the atom's alternatives
+        block_sizes = n_alternatives
+        blocks = (np.arange(n_atoms),)
+    elif mode == "double":
+        # Block per pair of atoms: product of both atoms' alternatives
+        first, second = np.triu_indices(n_atoms, k=1)
+        block_sizes = n_alternatives[first] * n_alternatives[second]
+        blocks = (first, second)
+    else:
+        # Mixed radix over every atom, with digit 0 the parent isotope
+        radices = n_alternatives + 1
+        count = int(np.prod(radices.astype(object)))
+        if count > np.iinfo(np.int64).max:
+            raise ValueError(
+                f"Enumerating all {count} isotopologues does not fit in 64-bit ids."
+            )
+        block_sizes = np.array([count - 1])
+        blocks = (radices,)
+
+    block_offsets = np.concatenate([[1], 1 + np.cumsum(block_sizes)])
+
+    return {
+        "mode": mode,
+        "atom_numbering": list(atom_numbering),
+        "parent": parent.astype(MASS_NUMBER_DTYPE),
+        "alternatives": alternatives.astype(MASS_NUMBER_DTYPE),
+        "n_alternatives": n_alternatives,
+        "blocks": blocks,
+        "block_offsets": block_offsets,
+        "count": int(block_offsets[-1]),
+    }
+
+
+def _decode_substitutions(enumeration, ids):
+    """Decode non-parent ids into (row, atom, alternative index) triples"""
+    mode = enumeration["mode"]
+    n_alternatives = enumeration["n_alternatives"]
+    block_offsets = enumeration["block_offsets"]
+
+    if mode == "all":
+        (radices,) = enumeration["blocks"]
+        digits = np.empty((len(ids), len(radices)), dtype=np.int64)
+        remainder = ids.copy()
+        for atom in range(len(radices) - 1, -1, -1):
+            remainder, digits[:, atom] = np.divmod(remainder, radices[atom])
+        rows, atoms = np.nonzero(digits)
+        return rows, atoms, digits[rows, atoms] - 1
+
+    block = np.searchsorted(block_offsets, ids, side="right") - 1
+    within = ids - block_offsets[block]
+    rows = np.arange(len(ids))
+    if mode == "single":
+        (block_atoms,) = enumeration["blocks"]
+        return rows, block_atoms[block], within
+
+    first, second = (atoms[block] for atoms in enumeration["blocks"])
+    first_alternative, second_alternative = np.divmod(within, n_alternatives[second])
+    return (
+        np.concatenate([rows, rows]),
+        np.concatenate([first, second]),
+        np.concatenate([first_alternative, second_alternative]),
+    )
+
+
+def decode_isotopologue_ids(enumeration, ids):
+    """Decode isotopologue ids into a block of mass numbers
+
+    Parameters
+    ----------
+    enumeration : dict
+        The output of ``build_enumeration``.
+    ids : array-like[int]
+        Isotopologue ids in ``[0, enumeration["count"])``.
+
+    Returns
+    -------
+    np.ndarray[int16], shape (len(ids), n_atoms)
+        Mass numbers of each isotopologue.
+    """
+    ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+    if np.any((ids < 0) | (ids >= enumeration["count"])):
+        raise ValueError(
+            f"Isotopologue ids must be in [0, {enumeration['count']}) for this enumeration."
+        )
+
+    mass_numbers = np.repeat(enumeration["parent"][np.newaxis, :], len(ids), axis=0)
+    substituted = np.flatnonzero(ids)
+    rows, atoms, alternatives = _decode_substitutions(enumeration, ids[substituted])
+    mass_numbers[substituted[rows], atoms] = enumeration["alternatives"][
+        atoms, alternatives
+    ]
+    return mass_numbers
+
+
+def get_isotopologue_names(enumeration, ids):
+    """Render the names of isotopologues from their ids, e.g. ``"H6:2_C3:13"``
+
+    The parent is named "parent"; other isotopologues list each substituted
+    atom label and its mass number.
+    """
+    mass_numbers = decode_isotopologue_ids(enumeration, ids)
+    atom_numbering = enumeration["atom_numbering"]
+    substituted = mass_numbers != enumeration["parent"]
+    return [
+        "_".join(
+            f"{atom_numbering[atom]}:{row[atom]}" for atom in np.flatnonzero(is_sub)
+        )
+        or PARENT_NAME
+        for row, is_sub in zip(mass_numbers.tolist(), substituted)
+    ]
+
+
+def get_isotopologue_name(enumeration, iso_id):
+    """Render the name of one isotopologue, see ``get_isotopologue_names``"""
+    return get_isotopologue_names(enumeration, [iso_id])[0]
+
+
+def iterate_isotopologue_blocks(enumeration, chunk_size=4096):
+    """Generate the mass numbers of an enumeration chunk by chunk
+
+    Parameters
+    ----------
+    enumeration : dict
+        The output of ``build_enumeration``.
+    chunk_size : int, optional
+        Maximum number of isotopologues per chunk.
+
+    Yields
+    ------
+    ids : np.ndarray[int64], shape (n_chunk,)
+        Isotopologue ids of the chunk; names can be rendered from them with
+        ``get_isotopologue_names``.
+    mass_numbers : np.ndarray[int16], shape (n_chunk, n_atoms)
+        Mass numbers of the chunk's isotopologues.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    for start in range(0, enumeration["count"], chunk_size):
+        ids = np.arange(start, min(start + chunk_size, enumeration["count"]))
+        yield ids, decode_isotopologue_ids(enumeration, ids)
+
+
+def iterate_principal_axes(
+    enumeration,
+    atom_symbols,
+    mol_coordinates,
+    mol_dipole,
+    chunk_size=4096,
+    **batch_kwargs,
+):
+    """Calculate the principal axes of an enumeration chunk by chunk
+
+    Parameters
+    ----------
+    enumeration : dict
+        The output of ``build_enumeration``.
+    atom_symbols : list[str]
+        Element symbols of the atoms.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    mol_dipole : array-like
+        Dipole vector of length 3.
+    chunk_size : int, optional
+        Maximum number of isotopologues per chunk; bounds the memory use.
+    **batch_kwargs
+        Passed on to ``get_principal_axes_batch`` (e.g. ``inertia_method``).
+
+    Yields
+    ------
+    ids : np.ndarray[int64], shape (n_chunk,)
+        Isotopologue ids of the chunk.
+    results : tuple
+        The outputs of ``get_principal_axes_batch`` for the chunk.
+    """
+    for ids, mass_numbers in iterate_isotopologue_blocks(enumeration, chunk_size):
+        mass_matrix = get_mass_matrix_from_mass_numbers(mass_numbers, atom_symbols)
+        yield ids, get_principal_axes_batch(
+            mass_matrix, mol_coordinates, mol_dipole, **batch_kwargs
+        )
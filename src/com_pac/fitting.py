@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import warnings
+
+import numpy as np
+
+from com_pac.diagonalize import get_principal_axes_batch, get_rot_const_jacobians
+
+# Levenberg-Marquardt damping: starting value and the factor by which it is
+# lowered after an accepted step and raised after a rejected one.
+FIT_INITIAL_DAMPING = 1e-3
+FIT_DAMPING_FACTOR = 10.0
+FIT_MAX_DAMPING = 1e12
+
+
+def get_coordinate_displacements(coordinate_mask):
+    """Build unit displacements for a subset of the Cartesian coordinates
+
+    Parameters
+    ----------
+    coordinate_mask : array-like[bool]
+        Array of shape (n_atoms, 3); ``True`` marks a coordinate to refine.
+
+    Returns
+    -------
+    np.ndarray, shape (n_params, n_atoms, 3)
+        One unit displacement per refined coordinate, in row-major order of
+        the mask.
+    """
+    coordinate_mask = np.asarray(coordinate_mask, dtype=bool)
+    atoms, axes = np.nonzero(coordinate_mask)
+    displacements = np.zeros((len(atoms), *coordinate_mask.shape))
+    displacements[np.arange(len(atoms)), atoms, axes] = 1.0
+    return displacements
+
+
+def get_internal_displacements(mol_coordinates):
+    """Build orthonormal displacements free of rigid translations and rotations
+
+    Parameters
+    ----------
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+
+    Returns
+    -------
+    np.ndarray, shape (n_params, n_atoms, 3)
+        Orthonormal displacement patterns spanning the complement of the
+        rigid-body modes, which leave the rotational constants unchanged:
+        ``n_params`` is ``3 n_atoms - 6``, or ``3 n_atoms - 5`` for a linear
+        molecule.
+    """
+    mol_coordinates = np.asarray(mol_coordinates, dtype=float)
+    n_atoms = len(mol_coordinates)
+    axes = np.eye(3)[:, np.newaxis, :]
+    centered = mol_coordinates - mol_coordinates.mean(axis=0)
+    rigid_modes = np.concatenate(
+        [np.broadcast_to(axes, (3, n_atoms, 3)), np.cross(axes, centered)]
+    ).reshape(6, -1)
+    # The right singular vectors past the rank span the orthogonal complement
+    rank = np.linalg.matrix_rank(rigid_modes)
+    return np.linalg.svd(rigid_modes)[2][rank:].reshape(-1, n_atoms, 3)
+
+
+def get_predicted_constants(mass_matrix, mol_coordinates, eigen_backend=None):
+    """Calculate rotational constants and their coordinate Jacobian
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    eigen_backend : {"eigh", "analytic"}, optional
+        Eigensolver backend, see ``get_eigens``.
+
+    Returns
+    -------
+    rotational_constants : np.ndarray, shape (n_iso, 3)
+    coordinate_jacobians : np.ndarray, shape (n_iso, 3, n_atoms, 3)
+    """
+    (
+        atom_masses,
+        rotational_constants,
+        _,
+        _,
+        _,
+        com_coordinates,
+        _,
+        eigenvectors,
+        eigenvalues,
+        _,
+    ) = get_principal_axes_batch(
+        mass_matrix, mol_coordinates, np.zeros(3), eigen_backend=eigen_backend
+    )
+    coordinate_jacobians, _ = get_rot_const_jacobians(
+        atom_masses, com_coordinates, eigenvectors, eigenvalues
+    )
+    return rotational_constants, coordinate_jacobians
+
+
+def fit_structure(
+    mass_matrix,
+    mol_coordinates,
+    observed_constants,
+    constant_uncertainties=1.0,
+    coordinate_mask=None,
+    displacements=None,
+    max_iterations=100,
+    tolerance=1e-10,
+    eigen_backend=None,
+):
+    """Refine a structure so its rotational constants match observed ones
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, see ``get_mass_matrix``.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of starting Cartesian coordinates.
+    observed_constants : array-like
+        Array of shape (n_iso, 3) of observed A, B, C in MHz; NaN marks a
+        constant that was not observed and is left out of the fit.
+    constant_uncertainties : float or array-like, optional
+        Uncertainties of the observed constants in MHz, broadcastable to
+        (n_iso, 3); the residuals are weighted by their inverse.
+    coordinate_mask : array-like[bool], optional
+        Array of shape (n_atoms, 3) selecting the coordinates to refine.
+        Defaults to the displacements of ``get_internal_displacements``,
+        i.e. every coordinate change but the rigid translations and rotations.
+    displacements : array-like, optional
+        Array of shape (n_params, n_atoms, 3) of displacement patterns, so that
+        the fitted structure is ``mol_coordinates + sum_j p_j displacements[j]``.
+        Use this to refine symmetry-adapted or internal-coordinate-like
+        combinations; overrides ``coordinate_mask``.
+    max_iterations : int, optional
+        Maximum number of Levenberg-Marquardt iterations.
+    tolerance : float, optional
+        Convergence threshold on the relative change of chi^2.
+    eigen_backend : {"eigh", "analytic"}, optional
+        Eigensolver backend, see ``get_eigens``.
+
+    Returns
+    -------
+    fit_results : dict
+        "coordinates": np.ndarray (n_atoms, 3), the fitted structure
+        "parameters": np.ndarray (n_params,), fitted displacement amplitudes
+        "uncertainties": np.ndarray (n_params,), standard errors of the parameters
+        "covariance": np.ndarray (n_params, n_params)
+        "correlation": np.ndarray (n_params, n_params)
+        "predicted_constants": np.ndarray (n_iso, 3)
+        "residuals": np.ndarray (n_iso, 3), observed - predicted, NaN if unobserved
+        "chi_squared": float, weighted sum of squared residuals
+        "rank": int, rank of the Jacobian at the solution
+        "iterations": int
+        "converged": bool
+
+    Notes
+    -----
+    Every iteration evaluates the rotational constants of all isotopologues
+    with one ``get_principal_axes_batch`` call and the Jacobian analytically
+    with ``get_rot_const_jacobians``, then solves the damped normal equations
+    ``(J^T J + lambda diag(J^T J)) dp = -J^T r``.  The covariance is the
+    pseudo-inverse of ``J^T J`` scaled by the reduced chi^2 when there are
+    more observations than parameters.  Rigid translations and rotations do
+    not change the rotational constants, so a ``coordinate_mask`` refining
+    every coordinate would leave the Jacobian rank deficient.  Parameter
+    combinations the constants still do not determine, such as out-of-plane
+    displacements of a planar molecule, show up as a ``"rank"`` below
+    ``n_params`` and a RuntimeWarning; their uncertainties come from the
+    pseudo-inverse and are not meaningful.
+    """
+    mass_matrix = np.asarray(mass_matrix, dtype=float)
+    mol_coordinates = np.asarray(mol_coordinates, dtype=float)
+    observed_constants = np.asarray(observed_constants, dtype=float)
+    if observed_constants.shape != (len(mass_matrix), 3):
+        raise ValueError(
+            f"Shape of observed_constants {observed_constants.shape} does not match "
+            f"{(len(mass_matrix), 3)} (isotopologues, axes)."
+        )
+    uncertainties = np.broadcast_to(
+        np.asarray(constant_uncertainties, dtype=float), observed_constants.shape
+    )
+    if np.any(uncertainties <= 0):
+        raise ValueError("Uncertainties of the observed constants must be positive.")
+
+    if displacements is None:
+        if coordinate_mask is None:
+            displacements = get_internal_displacements(mol_coordinates)
+        else:
+            displacements = get_coordinate_displacements(coordinate_mask)
+    displacements = np.asarray(displacements, dtype=float)
+    if displacements.shape[1:] != mol_coordinates.shape:
+        raise ValueError(
+            f"Shape of displacements {displacements.shape} does not match the "
+            f"coordinates {mol_coordinates.shape}."
+        )
+
+    observed = ~np.isnan(observed_constants)
+    n_obs, n_params = int(observed.sum()), len(displacements)
+    if n_params == 0 or n_obs == 0:
+        raise ValueError("Nothing to fit: no parameters or no observed constants.")
+
+    weights = 1 / uncertainties[observed]
+
+    def evaluate(parameters):
+        coordinates = mol_coordinates + np.tensordot(parameters, displacements, 1)
+        predicted, coordinate_jacobians = get_predicted_constants(
+            mass_matrix, coordinates, eigen_backend
+        )
+        parameter_jacobians = np.tensordot(
+            coordinate_jacobians, displacements, axes=([2, 3], [1, 2])
+        )
+        residuals = (predicted - observed_constants)[observed] * weights
+        jacobian = parameter_jacobians[observed] * weights[:, np.newaxis]
+        return predicted, residuals, jacobian
+
+    parameters = np.zeros(n_params)
+    predicted, residuals, jacobian = evaluate(parameters)
+    chi_squared = residuals @ residuals
+    damping = FIT_INITIAL_DAMPING
+    converged = False
+    iteration = 0
+
+    for iteration in range(1, max_iterations + 1):
+        normal_matrix = jacobian.T @ jacobian
+        gradient = jacobian.T @ residuals
+        # Scale the damping by the curvature, with a floor for flat parameters
+        curvature = np.maximum(np.diag(normal_matrix), 1e-12 * np.trace(normal_matrix))
+
+        while True:
+            step = -np.linalg.lstsq(
+                normal_matrix + damping * np.diag(curvature), gradient, rcond=None
+            )[0]
+            trial = evaluate(parameters + step)
+            trial_chi_squared = trial[1] @ trial[1]
+            if trial_chi_squared <= chi_squared or damping > FIT_MAX_DAMPING:
+                break
+            damping *= FIT_DAMPING_FACTOR
+
+        if trial_chi_squared > chi_squared:
+            # No downhill step left at any damping: at the minimum
+            converged = True
+            break
+
+        change = chi_squared - trial_chi_squared
+        parameters = parameters + step
+        predicted, residuals, jacobian = trial
+        chi_squared = trial_chi_squared
+        damping = max(damping / FIT_DAMPING_FACTOR, 1e-12)
+        if change <= tolerance * max(chi_squared, 1e-300):
+            converged = True
+            break
+
+    normal_matrix = jacobian.T @ jacobian
+    rank = int(np.linalg.matrix_rank(jacobian))
+    if rank < n_params:
+        warnings.warn(
+            f"Jacobian has rank {rank} < {n_params} parameters - "
+            "some parameter combinations are not determined by the constants.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    dof = n_obs - n_params
+    scale = chi_squared / dof if dof > 0 else 1.0
+    covariance = np.linalg.pinv(normal_matrix) * scale
+    parameter_uncertainties = np.sqrt(np.clip(np.diag(covariance), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(
+            parameter_uncertainties, parameter_uncertainties
+        )
+
+    all_residuals = np.where(observed, observed_constants - predicted, np.nan)
+    return {
+        "coordinates": mol_coordinates + np.tensordot(parameters, displacements, 1),
+        "parameters": parameters,
+        "uncertainties": parameter_uncertainties,
+        "covariance": covariance,
+        "correlation": correlation,
+        "predicted_constants": predicted,
+        "residuals": all_residuals,
+        "chi_squared": float(chi_squared),
+        "rank": rank,
+        "iterations": iteration,
+        "converged": converged,
+    }
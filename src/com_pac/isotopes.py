@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+from operator import index as as_integer
+from pathlib import Path
+
+import numpy as np
+
+# The tables in ``data/`` are generated by ``scripts/generate_isotope_table.py``
+# from mendeleev, so that normal runs never need to import mendeleev.
+DATA_DIR = Path(__file__).parent / "data"
+ISOTOPE_INDEX_PATH = DATA_DIR / "isotope_index.npy"
+ISOTOPE_MASSES_PATH = DATA_DIR / "isotope_masses.npy"
+ISOTOPE_ABUNDANCES_PATH = DATA_DIR / "isotope_abundances.npy"
+
+# fmt: off
+ELEMENT_SYMBOLS = (
+    "H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne",
+    "Na", "Mg", "Al", "Si", "P", "S", "Cl", "Ar", "K", "Ca",
+    "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn",
+    "Ga", "Ge", "As", "Se", "Br", "Kr", "Rb", "Sr", "Y", "Zr",
+    "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd", "In", "Sn",
+    "Sb", "Te", "I", "Xe", "Cs", "Ba", "La", "Ce", "Pr", "Nd",
+    "Pm", "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm", "Yb",
+    "Lu", "Hf", "Ta", "W", "Re", "Os", "Ir", "Pt", "Au", "Hg",
+    "Tl", "Pb", "Bi", "Po", "At", "Rn", "Fr", "Ra", "Ac", "Th",
+    "Pa", "U", "Np", "Pu", "Am", "Cm", "Bk", "Cf", "Es", "Fm",
+    "Md", "No", "Lr", "Rf", "Db", "Sg", "Bh", "Hs", "Mt", "Ds",
+    "Rg", "Cn", "Nh", "Fl", "Mc", "Lv", "Ts", "Og",
+)
+# fmt: on
+
+ATOMIC_NUMBERS = {symbol: z for z, symbol in enumerate(ELEMENT_SYMBOLS, start=1)}
+
+ISOTOPE_TABLE_CACHE = {}
+
+
+def clear_isotope_table_cache():
+    ISOTOPE_TABLE_CACHE.clear()
+
+
+def load_isotope_table():
+    """Load the vendored isotope table, memory-mapping it on first use
+
+    Returns
+    -------
+    index : np.ndarray[int64], shape (n_elements + 1, 3)
+        Row ``Z`` holds ``(first_mass_number, last_mass_number, offset)``.
+    masses : np.memmap[float64]
+        Flat array of isotopic masses; the mass of ``(Z, A)`` is stored at
+        ``offset + A - first_mass_number``.  Unknown isotopes are NaN.
+    """
+    if "index" not in ISOTOPE_TABLE_CACHE:
+        ISOTOPE_TABLE_CACHE["index"] = np.load(ISOTOPE_INDEX_PATH)
+        ISOTOPE_TABLE_CACHE["masses"] = np.load(ISOTOPE_MASSES_PATH, mmap_mode="r")
+
+    return ISOTOPE_TABLE_CACHE["index"], ISOTOPE_TABLE_CACHE["masses"]
+
+
+def load_isotope_abundances():
+    """Load the vendored natural abundances, laid out like the isotope masses
+
+    Returns
+    -------
+    np.memmap[float64]
+        Flat array of natural abundances (fractions), indexed like the masses
+        of ``load_isotope_table``.  Isotopes without a natural abundance are 0.
+    """
+    if "abundances" not in ISOTOPE_TABLE_CACHE:
+        ISOTOPE_TABLE_CACHE["abundances"] = np.load(
+            ISOTOPE_ABUNDANCES_PATH, mmap_mode="r"
+        )
+
+    return ISOTOPE_TABLE_CACHE["abundances"]
+
+
+def get_atomic_numbers(atom_symbols):
+    """Convert element symbols to atomic numbers, raising ValueError on unknown symbols"""
+    unknown_symbols = sorted(
+        {str(symbol) for symbol in atom_symbols if symbol not in ATOMIC_NUMBERS}
+    )
+    if unknown_symbols:
+        raise ValueError(f"Unknown element symbols: {unknown_symbols}")
+
+    return np.array([ATOMIC_NUMBERS[symbol] for symbol in atom_symbols], dtype=int)
+
+
+def _lookup_isotope_values(values, atomic_numbers, mass_numbers):
+    """Look up a flat isotope table for arrays of atomic and mass numbers"""
+    index, _ = load_isotope_table()
+    atomic_numbers, mass_numbers = np.broadcast_arrays(
+        np.asarray(atomic_numbers, dtype=np.int64),
+        np.asarray(mass_numbers, dtype=np.int64),
+    )
+
+    known_element = (atomic_numbers > 0) & (atomic_numbers < len(index))
+    rows = index[np.where(known_element, atomic_numbers, 0)]
+    first, last, offset = rows[..., 0], rows[..., 1], rows[..., 2]
+    known = known_element & (mass_numbers >= first) & (mass_numbers <= last)
+
+    positions = np.where(known, offset + mass_numbers - first, 0)
+    return np.where(known, values[positions], np.nan)
+
+
+def lookup_isotope_masses(atomic_numbers, mass_numbers):
+    """Look up isotopic masses for arrays of atomic and mass numbers
+
+    Parameters
+    ----------
+    atomic_numbers : array-like[int]
+        Atomic numbers ``Z``; broadcast against ``mass_numbers``.
+    mass_numbers : array-like[int]
+        Mass numbers ``A``.
+
+    Returns
+    -------
+    np.ndarray[float]
+        Isotopic masses with the broadcast shape of the inputs.  Isotopes that
+        are not in the table (including unknown atomic numbers) are NaN.
+    """
+    _, masses = load_isotope_table()
+    return _lookup_isotope_values(masses, atomic_numbers, mass_numbers)
+
+
+def lookup_isotope_abundances(atomic_numbers, mass_numbers):
+    """Look up natural abundances for arrays of atomic and mass numbers
+
+    Parameters
+    ----------
+    atomic_numbers : array-like[int]
+        Atomic numbers ``Z``; broadcast against ``mass_numbers``.
+    mass_numbers : array-like[int]
+        Mass numbers ``A``.
+
+    Returns
+    -------
+    np.ndarray[float]
+        Natural abundances (fractions) with the broadcast shape of the inputs.
+        Isotopes without a natural abundance are 0; isotopes that are not in
+        the table are NaN.
+    """
+    return _lookup_isotope_values(
+        load_isotope_abundances(), atomic_numbers, mass_numbers
+    )
+
+
+def is_known_isotope(atomic_numbers, mass_numbers):
+    """Check arrays of atomic and mass numbers against the vendored isotope table
+
+    Parameters
+    ----------
+    atomic_numbers : array-like[int]
+        Atomic numbers ``Z``; broadcast against ``mass_numbers``.
+    mass_numbers : array-like[int]
+        Mass numbers ``A``.
+
+    Returns
+    -------
+    np.ndarray[bool]
+        True where ``(Z, A)`` is an isotope of the table, with the broadcast
+        shape of the inputs.
+    """
+    return ~np.isnan(lookup_isotope_masses(atomic_numbers, mass_numbers))
+
+
+def lookup_isotope_mass(symbol, mass_number):
+    """Look up the mass of a single isotope, raising KeyError if it is unknown
+
+    Like ``mendeleev.isotope``, ``symbol`` may also be given as an atomic number.
+    """
+    if isinstance(symbol, (int, np.integer)):
+        atomic_number = as_integer(symbol)
+    else:
+        atomic_number = ATOMIC_NUMBERS[symbol]
+
+    mass = lookup_isotope_masses(atomic_number, as_integer(mass_number))
+    if np.isnan(mass):
+        raise KeyError((symbol, mass_number))
+
+    return float(mass)
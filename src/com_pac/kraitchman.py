@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+# Costain's empirical uncertainty of a substitution coordinate, dz = K / |z|,
+# with K in Angstrom^2.
+COSTAIN_CONSTANT = 0.0015
+
+
+def get_planar_moments(principal_moments):
+    """Convert principal moments of inertia into planar moments
+
+    Parameters
+    ----------
+    principal_moments : array-like
+        Array of shape (..., 3) of principal moments ``I_a, I_b, I_c``.
+
+    Returns
+    -------
+    np.ndarray, shape (..., 3)
+        Planar moments ``P_g = sum_i m_i g_i^2``, i.e.
+        ``P_a = (I_b + I_c - I_a) / 2`` and cyclic permutations.
+    """
+    principal_moments = np.asarray(principal_moments, dtype=float)
+    return principal_moments.sum(axis=-1, keepdims=True) / 2 - principal_moments
+
+
+def get_single_substitutions(mass_numbers):
+    """Find the isotopologues that differ from the parent at exactly one atom
+
+    Parameters
+    ----------
+    mass_numbers : array-like[int]
+        Array of shape (n_iso, n_atoms) of mass numbers; row 0 is the parent.
+
+    Returns
+    -------
+    iso_indices : np.ndarray[int]
+        Row indices of the singly-substituted isotopologues.
+    sites : np.ndarray[int]
+        Index of the substituted atom of each of those isotopologues.
+    """
+    mass_numbers = np.asarray(mass_numbers)
+    substituted = mass_numbers != mass_numbers[0]
+    iso_indices = np.flatnonzero(substituted.sum(axis=-1) == 1)
+    sites = np.argmax(substituted[iso_indices], axis=-1)
+    return iso_indices, sites
+
+
+def get_kraitchman_coordinates(
+    parent_moments, substituted_moments, parent_mass, mass_differences
+):
+    """Calculate Kraitchman substitution coordinates for a stack of substitutions
+
+    Parameters
+    ----------
+    parent_moments : array-like
+        Principal moments ``I_a, I_b, I_c`` of the parent, shape (3,).
+    substituted_moments : array-like
+        Principal moments of each singly-substituted isotopologue, shape (n_sub, 3).
+    parent_mass : float
+        Total mass of the parent.
+    mass_differences : array-like
+        Mass change at the substituted atom of each isotopologue, shape (n_sub,).
+
+    Returns
+    -------
+    coordinates : np.ndarray, shape (n_sub, 3)
+        ``|a|, |b|, |c|`` of each substituted atom in the parent principal axes
+        frame.  Coordinates whose square comes out negative (imaginary) are NaN.
+    costain_errors : np.ndarray, shape (n_sub, 3)
+        Costain uncertainties ``0.0015 / |g|`` of the coordinates.
+    squared_coordinates : np.ndarray, shape (n_sub, 3)
+        ``a^2, b^2, c^2`` before taking the square root, to judge how imaginary
+        the NaN coordinates are.
+
+    Notes
+    -----
+    With planar moments ``P_g``, ``dP_g = P'_g - P_g`` and the reduced mass
+    ``mu = M dm / (M + dm)``, Kraitchman's equations for an asymmetric top are
+
+    ``a^2 = (dP_a / mu) (1 + dP_b / (P_b - P_a)) (1 + dP_c / (P_c - P_a))``
+
+    and cyclic permutations for ``b^2`` and ``c^2``.  All substitutions are
+    evaluated together as whole-array operations.
+    """
+    parent_planar = get_planar_moments(parent_moments)
+    delta_planar = get_planar_moments(substituted_moments) - parent_planar
+    mass_differences = np.asarray(mass_differences, dtype=float)
+    reduced_masses = parent_mass * mass_differences / (parent_mass + mass_differences)
+
+    # planar_gaps[g, h] = P_h - P_g
+    planar_gaps = parent_planar[np.newaxis, :] - parent_planar[:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # factors[k, g, h] = 1 + dP_h / (P_h - P_g), with the g == h terms set to 1
+        factors = 1 + delta_planar[:, np.newaxis, :] / planar_gaps
+        factors[:, np.arange(3), np.arange(3)] = 1
+        squared_coordinates = (
+            delta_planar / reduced_masses[:, np.newaxis] * factors.prod(axis=-1)
+        )
+        coordinates = np.sqrt(
+            np.where(squared_coordinates >= 0, squared_coordinates, np.nan)
+        )
+        costain_errors = COSTAIN_CONSTANT / coordinates
+
+    return coordinates, costain_errors, squared_coordinates
+
+
+def get_kraitchman_values(
+    isotopologue_names,
+    isotopologue_dict,
+    atom_masses,
+    eigenvalues,
+    atom_numbering,
+):
+    """Calculate Kraitchman substitution coordinates of every singly-substituted
+    isotopologue.
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names; the first one is the parent.
+    isotopologue_dict : dict
+        key = isotopologue_name: str
+        value = list[int] of mass numbers
+    atom_masses : dict
+        key = isotopologue_name: str
+        value = np.array[float] of atom masses
+    eigenvalues : dict
+        key = isotopologue_name: str
+        value = np.array[float] of principal moments of inertia (Ia <= Ib <= Ic)
+    atom_numbering : list[str]
+        List of length n_atoms containing labels of the form "<Symbol><AtomNumber>"
+
+    Returns
+    -------
+    kraitchman_data : dict or None
+        key = isotopologue_name: str
+        value = dict with the substituted "atom" label, the coordinates
+        "|a|", "|b|", "|c|" and their Costain errors "d|a|", "d|b|", "d|c|"
+        None if no isotopologue differs from the parent at exactly one atom.
+    """
+    mass_numbers = np.array([isotopologue_dict[iso] for iso in isotopologue_names])
+    iso_indices, sites = get_single_substitutions(mass_numbers)
+    if len(iso_indices) == 0:
+        print(
+            "WARNING: No singly-substituted isotopologues - skipping Kraitchman calculation!"
+        )
+        return None
+
+    masses = np.array([atom_masses[iso] for iso in isotopologue_names])
+    moments = np.array([eigenvalues[iso] for iso in isotopologue_names])
+    mass_differences = masses[iso_indices, sites] - masses[0, sites]
+
+    coordinates, costain_errors, _ = get_kraitchman_coordinates(
+        moments[0], moments[iso_indices], masses[0].sum(), mass_differences
+    )
+
+    kraitchman_data = {}
+    for i, (iso_index, site) in enumerate(zip(iso_indices, sites)):
+        kraitchman_data[isotopologue_names[iso_index]] = {
+            "atom": atom_numbering[site],
+            **dict(zip(["|a|", "|b|", "|c|"], coordinates[i])),
+            **dict(zip(["d|a|", "d|b|", "d|c|"], costain_errors[i])),
+        }
+
+    return kraitchman_data
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+CONSTANT_LABELS = ("A", "B", "C")
+
+
+def build_constants_index(rotational_constants, labels=None):
+    """Build a sorted index over predicted rotational constants
+
+    Parameters
+    ----------
+    rotational_constants : dict or array-like
+        Either the ``rotational_constants`` dict of ``get_principal_axes``
+        (isotopologue name to A, B, C), or an array of shape (n_candidates, 3).
+    labels : list[str], optional
+        Candidate labels for an array input; defaults to the row numbers.
+
+    Returns
+    -------
+    constants_index : dict
+        "constants": np.ndarray (n_candidates, 3) of A, B, C in MHz
+        "labels": np.ndarray[str] (n_candidates,)
+        "orders": np.ndarray[int] (3, n_candidates), candidates sorted by
+            each constant
+        "sorted_constants": np.ndarray (3, n_candidates), each constant in
+            ascending order
+
+    Notes
+    -----
+    Keeping one sort order per constant lets a query bisect the constant
+    whose tolerance window holds the fewest candidates and only compute
+    residuals for that window.
+    """
+    if isinstance(rotational_constants, dict):
+        labels = list(rotational_constants)
+        rotational_constants = [rotational_constants[label] for label in labels]
+    constants = np.asarray(rotational_constants, dtype=float).reshape(-1, 3)
+    if labels is None:
+        labels = np.arange(len(constants)).astype(str)
+    labels = np.asarray(labels, dtype=str)
+    if len(labels) != len(constants):
+        raise ValueError(
+            f"Number of labels ({len(labels)}) does not match the number of "
+            f"candidates ({len(constants)})."
+        )
+
+    orders = np.argsort(constants.T, axis=-1, kind="stable")
+    return {
+        "constants": constants,
+        "labels": labels,
+        "orders": orders,
+        "sorted_constants": np.take_along_axis(constants.T, orders, axis=-1),
+    }
+
+
+def save_constants_index(constants_index, path):
+    """Write an index of ``build_constants_index`` to an ``.npz`` file"""
+    np.savez(path, **constants_index)
+
+
+def load_constants_index(path):
+    """Read an index written by ``save_constants_index``"""
+    with np.load(path, allow_pickle=False) as index_file:
+        return {key: index_file[key] for key in index_file.files}
+
+
+def query_constants_index(constants_index, observed_constants, tolerance, k=10):
+    """Find the candidates whose constants best match observed ones
+
+    Parameters
+    ----------
+    constants_index : dict
+        The output of ``build_constants_index`` or ``load_constants_index``.
+    observed_constants : array-like
+        Observed A, B, C in MHz; NaN marks a constant that was not observed.
+    tolerance : float or array-like
+        Largest accepted ``|observed - predicted|`` in MHz, for all three
+        constants or per constant.
+    k : int, optional
+        Maximum number of candidates to return.
+
+    Returns
+    -------
+    matches : dict
+        "indices": np.ndarray[int], rows of the matching candidates
+        "labels": np.ndarray[str]
+        "residuals": np.ndarray (n_matches, 3), observed - predicted
+            (NaN for unobserved constants)
+        "scores": np.ndarray, root sum of squares of the residuals in units
+            of the tolerance, ascending
+        Only candidates within tolerance for every observed constant are
+        returned, so there may be fewer than ``k``.
+    """
+    observed_constants = np.asarray(observed_constants, dtype=float).reshape(3)
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=float), (3,))
+    observed = ~np.isnan(observed_constants)
+    if not np.any(observed):
+        raise ValueError("At least one observed constant is required.")
+    if np.any(tolerance[observed] <= 0):
+        raise ValueError("Tolerances must be positive.")
+    if k < 1:
+        raise ValueError("k must be a positive integer.")
+
+    # Bisect every observed constant and keep the narrowest window
+    sorted_constants = constants_index["sorted_constants"]
+    starts = np.full(3, 0)
+    stops = np.full(3, len(constants_index["constants"]))
+    for axis in np.flatnonzero(observed):
+        starts[axis] = np.searchsorted(
+            sorted_constants[axis],
+            observed_constants[axis] - tolerance[axis],
+            side="left",
+        )
+        stops[axis] = np.searchsorted(
+            sorted_constants[axis],
+            observed_constants[axis] + tolerance[axis],
+            side="right",
+        )
+    axis = np.argmin(np.where(observed, stops - starts, np.iinfo(np.int64).max))
+    candidates = constants_index["orders"][axis, starts[axis] : stops[axis]]
+
+    residuals = observed_constants - constants_index["constants"][candidates]
+    scaled = np.where(observed, np.abs(residuals) / tolerance, 0.0)
+    within = np.all(scaled <= 1, axis=-1)
+    candidates, residuals, scaled = (
+        candidates[within],
+        residuals[within],
+        scaled[within],
+    )
+    scores = np.sqrt(np.sum(scaled**2, axis=-1))
+
+    if len(scores) > k:
+        best = np.argpartition(scores, k - 1)[:k]
+        candidates, residuals, scores = candidates[best], residuals[best], scores[best]
+    ranking = np.lexsort((candidates, scores))
+
+    return {
+        "indices": candidates[ranking],
+        "labels": constants_index["labels"][candidates[ranking]],
+        "residuals": residuals[ranking],
+        "scores": scores[ranking],
+    }
+
+
+def format_matches(matches):
+    """Render the output of ``query_constants_index`` as a text table"""
+    header = f"{'Rank':>4}  {'Candidate':<24}" + "".join(
+        f"{'d' + label + ' (MHz)':>14}" for label in CONSTANT_LABELS
+    )
+    lines = [header + f"{'Score':>10}"]
+    for rank, (label, residuals, score) in enumerate(
+        zip(matches["labels"], matches["residuals"], matches["scores"]), start=1
+    ):
+        lines.append(
+            f"{rank:>4}  {label:<24}"
+            + "".join(f"{residual:>14.4f}" for residual in residuals)
+            + f"{score:>10.4f}"
+        )
+    if len(lines) == 1:
+        lines.append("No candidates within tolerance.")
+    return "\n".join(lines)
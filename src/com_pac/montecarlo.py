@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+from com_pac.diagonalize import (
+    get_COM_inertia_matrices_gemm,
+    get_eigens_batch,
+    inertia_to_rot_const,
+    transform_dipole,
+)
+
+MONTE_CARLO_QUANTITIES = ("A", "B", "C", "mu_A", "mu_B", "mu_C")
+MONTE_CARLO_PERCENTILES = (2.5, 50.0, 97.5)
+# Geometries per chunk; bounds the (chunk, n_iso, 3, 3) inertia stacks.
+MONTE_CARLO_CHUNK_SIZE = 1024
+
+
+def get_perturbed_geometries(mol_coordinates, coordinate_errors, n_samples, rng):
+    """Draw geometries with normally distributed coordinate errors
+
+    Parameters
+    ----------
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    coordinate_errors : array-like
+        Standard deviations of the coordinates, shape (n_atoms, 3).
+    n_samples : int
+        Number of geometries to draw.
+    rng : np.random.Generator
+
+    Returns
+    -------
+    np.ndarray, shape (n_samples, n_atoms, 3)
+    """
+    mol_coordinates = np.asarray(mol_coordinates, dtype=float)
+    coordinate_errors = np.asarray(coordinate_errors, dtype=float)
+    if coordinate_errors.shape != mol_coordinates.shape:
+        raise ValueError(
+            f"Shape of coordinate_errors {coordinate_errors.shape} does not match "
+            f"the coordinates {mol_coordinates.shape}."
+        )
+
+    noise = rng.standard_normal((n_samples, *mol_coordinates.shape))
+    return mol_coordinates + noise * coordinate_errors
+
+
+def get_monte_carlo_samples(
+    mol_masses,
+    mol_coordinates,
+    coordinate_errors,
+    mol_dipole,
+    n_samples,
+    seed=None,
+    chunk_size=MONTE_CARLO_CHUNK_SIZE,
+    eigen_backend=None,
+):
+    """Propagate coordinate errors to rotational constants and dipole components
+
+    Parameters
+    ----------
+    mol_masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, one row per isotopologue.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    coordinate_errors : array-like
+        Standard deviations of the coordinates, shape (n_atoms, 3).
+    mol_dipole : array-like
+        Dipole vector of length 3 in the frame of ``mol_coordinates``.
+    n_samples : int
+        Number of perturbed geometries.
+    seed : int, optional
+        Seed of the random number generator, for reproducible samples.
+    chunk_size : int, optional
+        Number of geometries processed together.
+    eigen_backend : {"eigh", "analytic"}, optional
+        Eigensolver backend, see ``get_eigens``.
+
+    Returns
+    -------
+    rotational_constants : np.ndarray, shape (n_samples, n_iso, 3)
+    pa_dipoles : np.ndarray, shape (n_samples, n_iso, 3)
+
+    Notes
+    -----
+    Every chunk of geometries goes through the same steps as
+    ``get_principal_axes_batch``, for all isotopologues at once: the Center of
+    Mass inertia tensors of the whole ``(chunk, n_iso)`` stack come from one
+    ``get_COM_inertia_matrices_gemm`` product and are diagonalized in a single
+    ``get_eigens_batch`` call.  Only the rotational constants and dipole
+    components of each sample are kept.
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be a positive integer.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    mol_masses = np.asarray(mol_masses, dtype=float)
+    rng = np.random.default_rng(seed)
+
+    n_iso = len(mol_masses)
+    rotational_constants = np.empty((n_samples, n_iso, 3))
+    pa_dipoles = np.empty((n_samples, n_iso, 3))
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        geometries = get_perturbed_geometries(
+            mol_coordinates, coordinate_errors, stop - start, rng
+        )
+        com_inertias, _ = get_COM_inertia_matrices_gemm(mol_masses, geometries)
+        eigenvalues, eigenvectors = get_eigens_batch(
+            com_inertias.reshape(-1, 3, 3), backend=eigen_backend
+        )
+        rotational_constants[start:stop] = inertia_to_rot_const(eigenvalues).reshape(
+            -1, n_iso, 3
+        )
+        pa_dipoles[start:stop] = transform_dipole(mol_dipole, eigenvectors).reshape(
+            -1, n_iso, 3
+        )
+
+    return rotational_constants, pa_dipoles
+
+
+def get_sample_statistics(samples, percentiles=MONTE_CARLO_PERCENTILES):
+    """Summarize Monte Carlo samples along their first axis
+
+    Parameters
+    ----------
+    samples : array-like
+        Array of shape (n_samples, ...).
+    percentiles : sequence of float, optional
+        Percentiles to report, in [0, 100].
+
+    Returns
+    -------
+    statistics : dict
+        "mean", "std" (sample standard deviation) and "p<percentile>" for each
+        percentile, each an array of shape ``samples.shape[1:]``.
+    """
+    samples = np.asarray(samples, dtype=float)
+    statistics = {
+        "mean": samples.mean(axis=0),
+        "std": (
+            samples.std(axis=0, ddof=1)
+            if len(samples) > 1
+            else np.full(samples.shape[1:], np.nan)
+        ),
+    }
+    for percentile, values in zip(
+        percentiles, np.percentile(samples, percentiles, axis=0)
+    ):
+        statistics[f"p{percentile:g}"] = values
+    return statistics
+
+
+def get_monte_carlo_values(
+    isotopologue_names,
+    mass_matrix,
+    mol_coordinates,
+    coordinate_errors,
+    mol_dipole,
+    n_samples,
+    seed=None,
+    percentiles=MONTE_CARLO_PERCENTILES,
+    chunk_size=MONTE_CARLO_CHUNK_SIZE,
+    eigen_backend=None,
+):
+    """Calculate Monte Carlo uncertainties of every isotopologue
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names, in the row order of ``mass_matrix``.
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, see ``get_mass_matrix``.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    coordinate_errors : array-like
+        Standard deviations of the coordinates, shape (n_atoms, 3).
+    mol_dipole : array-like
+        Dipole vector of length 3.
+    n_samples : int
+        Number of perturbed geometries.
+    seed : int, optional
+        Seed of the random number generator.
+    percentiles : sequence of float, optional
+        Percentiles to report.
+    chunk_size : int, optional
+        Number of geometries processed together.
+    eigen_backend : {"eigh", "analytic"}, optional
+        Eigensolver backend.
+
+    Returns
+    -------
+    monte_carlo_data : dict
+        key = (isotopologue_name, quantity): tuple[str, str], with quantity one
+        of "A", "B", "C" (MHz) or "mu_A", "mu_B", "mu_C"
+        value = dict of the statistics of ``get_sample_statistics``
+    """
+    rotational_constants, pa_dipoles = get_monte_carlo_samples(
+        mass_matrix,
+        mol_coordinates,
+        coordinate_errors,
+        mol_dipole,
+        n_samples,
+        seed=seed,
+        chunk_size=chunk_size,
+        eigen_backend=eigen_backend,
+    )
+    samples = np.concatenate([rotational_constants, pa_dipoles], axis=-1)
+    statistics = get_sample_statistics(samples, percentiles)
+
+    monte_carlo_data = {}
+    for i, iso in enumerate(isotopologue_names):
+        for j, quantity in enumerate(MONTE_CARLO_QUANTITIES):
+            monte_carlo_data[(iso, quantity)] = {
+                statistic: float(values[i, j])
+                for statistic, values in statistics.items()
+            }
+
+    return monte_carlo_data
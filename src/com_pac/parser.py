@@ -4,9 +4,52 @@
 #  Imports  #
 # ========= #
 
+import itertools
 import re
+import warnings
+from collections import Counter
+
 import numpy as np
 
+# Isotopologues an Enumerate section may expand to in the CLI; every one is
+# materialized into the isotopologue dict and written to the output.
+MAX_ENUMERATED_ISOTOPOLOGUES = 100_000
+
+# Section headers, in the order of check_for_duplicate_sections
+SECTION_NAMES = ("coordinates", "dipole", "isotopologues", "enumerate", "uncertainties")
+# Isotopologues per block of iterate_isotopologue_section_blocks
+ISOTOPOLOGUE_CHUNK_SIZE = 4096
+# Lines with more than blanks and a comment
+ISOTOPOLOGUE_LINE_PATTERN = re.compile(
+    r"^(?![^\S\n]*#)[^\n]*\S[^\n]*", flags=re.MULTILINE
+)
+# Comments run from a "#" that starts a token (not one inside a label, as in
+# "iso#1") to the end of the line
+COMMENT_PATTERN = re.compile(r"(?<!\S)#[^\n]*")
+# An isotopologue line of n_atoms (formatted in) mass numbers and a label
+ISOTOPOLOGUE_FIELDS_PATTERN = r"^[^\S\n]*((?:[+-]?\d+[^\S\n]+){{{}}})(\S+)[^\S\n]*$"
+# A compact isotopologue line, "label = parent Atom:mass ...", with or without
+# its comment; other lines with a "=", e.g. in a label, are full lines
+COMPACT_ISOTOPOLOGUE_LINE_PATTERN = re.compile(
+    r"^[^\S\n]*(?P<label>\S+)[^\S\n]*=[^\S\n]*(?P<parent>\S+)"
+    r"(?P<substitutions>(?:[^\S\n]+[A-Za-z]+\d+:\d+)*)"
+    r"[^\S\n]*(?:(?<!\S)#[^\n]*)?$",
+    flags=re.MULTILINE,
+)
+COMPACT_ISOTOPOLOGUE_FORMAT = (
+    "Compact lines have the form: label = parent Atom:mass Atom:mass ..."
+)
+# A section header at the start of a line, or the blank line(s) ending a
+# section; both start at a newline, which lets re skip quickly between lines
+SECTION_TOKEN_PATTERN = re.compile(
+    r"\n(?:(?P<blank>\s*(?=\n))|(?P<header>{}))".format("|".join(SECTION_NAMES)),
+    flags=re.IGNORECASE,
+)
+# A section header on the first line of the file
+FIRST_SECTION_HEADER_PATTERN = re.compile(
+    r"(?P<header>{})".format("|".join(SECTION_NAMES)), flags=re.IGNORECASE
+)
+
 
 def coordinates_error_message(*args):
     message = """
@@ -69,6 +112,79 @@ def isotopologue_error_message(*args):
         return "{}\n\t{}".format(message, "\n\t".join([str(x) for x in args]))
 
 
+def enumerate_error_message(*args):
+    message = """
+    There was an error reading in the isotopologue enumeration.
+
+    Proper format of the enumerate section is:
+        Enumerate mode  # comments
+        Symbol1 mass1 mass2 ... # more comments
+        Symbol2 mass1 mass2 ...
+        ...
+        (blank line)
+    where mode is one of single, double, or all (default single),
+    Symbol# is an atomic symbol from the Coordinates section, and
+    mass# are atomic mass numbers. The first mass number of each
+    element is its isotope in the parent isotopologue.
+
+    The Enumerate section replaces the Isotopologues section;
+    an input file may contain only one of the two.
+    """
+    if len(args) == 0:
+        return message
+    else:
+        return "{}\n\t{}".format(message, "\n\t".join([str(x) for x in args]))
+
+
+def uncertainty_error_message(*args):
+    message = """
+    There was an error reading in the coordinate uncertainties.
+
+    Proper format of the uncertainties section is:
+        Uncertainties   # comments
+        Atom1   dx1 dy1 dz1     # more comments
+        Atom2   d2
+        ...
+        AtomZ   dxZ dyZ dzZ
+        (blank line)
+    where Atom# is the atomic symbol, in the same order as the
+    Coordinates section, and dx#, dy#, dz# are the standard deviations
+    of its Cartesian coordinates; a single value d# applies to all three.
+    """
+    if len(args) == 0:
+        return message
+    else:
+        return "{}\n\t{}".format(message, "\n\t".join([str(x) for x in args]))
+
+
+def convert_numeric_fields(fields, dtype):
+    """Convert whitespace-separated numbers in a single C-level pass
+
+    Returns None if any field is not a number of the given dtype, so that the
+    caller can fall back to converting (and reporting) line by line.
+    """
+    with warnings.catch_warnings():
+        # Older numpy versions only warn about unparsed trailing data
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(fields, dtype=dtype, sep=" ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def get_line_error_detail(line_number, line):
+    return f"Could not read line {line_number} of the section: {line.strip()!r}"
+
+
+def get_section_rows(section):
+    """Line numbers and tokens of the non-blank lines after the header line
+
+    Comments are stripped from the whole section at once.
+    """
+    lines = COMMENT_PATTERN.sub("", section).split("\n")[1:]
+    return [(i, x.split()) for i, x in enumerate(lines, 1) if x and not x.isspace()]
+
+
 def get_coordinate_matches(input_file):
     coordinate_splits = re.split(
         "(?m)^coordinates", input_file, flags=re.IGNORECASE
@@ -106,24 +222,33 @@ def get_coordinate_section(coordinate_matches):
 
 def get_coordinate_info(coordinate_section):
     try:
-        coordinate_lines = [
-            i
-            for i in coordinate_section.split("\n")[1:]
-            if ((not i.isspace()) and (i != ""))
-        ]
-        coordinate_list = [x.split() for x in coordinate_lines]
+        coordinate_rows = get_section_rows(coordinate_section)
+        coordinate_list = [x for _, x in coordinate_rows]
 
         atom_symbols = [x[0] for x in coordinate_list]
         n_atoms = len(atom_symbols)
         atom_numbering = [atom_symbols[x] + str(x + 1) for x in range(0, n_atoms)]
-
-        mol_coordinates = np.array(
-            [[float(x[1]), float(x[2]), float(x[3])] for x in coordinate_list]
-        )
     except (Exception,) as exc:
         raise ValueError(coordinates_error_message()) from exc
 
-    return n_atoms, atom_symbols, mol_coordinates, atom_numbering
+    # Convert every coordinate at once, then line by line to find a bad one
+    mol_coordinates = convert_numeric_fields(
+        " ".join(" ".join(x[1:4]) for x in coordinate_list), float
+    )
+    if mol_coordinates is None or mol_coordinates.size != 3 * n_atoms:
+        rows = []
+        for line_number, x in coordinate_rows:
+            try:
+                rows.append([float(x[1]), float(x[2]), float(x[3])])
+            except (Exception,) as exc:
+                raise ValueError(
+                    coordinates_error_message(
+                        get_line_error_detail(line_number, " ".join(x))
+                    )
+                ) from exc
+        mol_coordinates = np.array(rows)
+
+    return n_atoms, atom_symbols, mol_coordinates.reshape(-1, 3), atom_numbering
 
 
 def parse_input_coordinate_section(input_file):
@@ -223,25 +348,212 @@ def get_isotopologue_section(isotopologue_matches):
     return isotopologue_sections[0]
 
 
-def get_isotopologue_info(isotopologue_section, n_atoms):
-    try:
-        isotopologue_lines = [
-            i
-            for i in isotopologue_section.split("\n")[1:]
-            if ((not i.isspace()) and (i != ""))
-        ]
-        isotopologue_list = [x.split() for x in isotopologue_lines]
-        isotopologue_names = [x[n_atoms] for x in isotopologue_list]
+def read_isotopologue_lines(
+    lines, n_atoms, line_numbers=None, atom_numbering=None, parents=None
+):
+    """Labels and mass numbers of isotopologue lines
+
+    Parameters
+    ----------
+    lines : list[str]
+        Non-blank lines of an isotopologue section, without the header line.
+    n_atoms : int
+        Number of mass numbers per line.
+    line_numbers : callable, optional
+        Line number of ``lines[i]`` for error messages; ``i + 1`` by default.
+    atom_numbering : list[str], optional
+        Atom labels (H1, N2, ...) of the substitutions of compact lines.
+    parents : dict[str, np.ndarray], optional
+        Mass numbers of the full lines of earlier blocks, which compact lines
+        may name as parent; the full lines of ``lines`` are added to it.
+
+    Returns
+    -------
+    isotopologue_names : list[str]
+    mass_numbers : np.ndarray[int64], shape (len(lines), n_atoms)
+
+    Notes
+    -----
+    Comments are stripped and all mass numbers converted at once.  Only if
+    that fails are the lines read one by one, like ``get_isotopologue_info``
+    used to, which also finds the offending line for the error message.
+    Compact lines are passed to ``expand_compact_isotopologue_lines``.
+    """
+    text = COMMENT_PATTERN.sub("", "\n".join(lines))
+    if "=" in text and COMPACT_ISOTOPOLOGUE_LINE_PATTERN.search(text):
+        return expand_compact_isotopologue_lines(
+            lines, text.split("\n"), n_atoms, line_numbers, atom_numbering, parents
+        )
 
-        isotopologue_dict = {
-            x[n_atoms]: [int(y) for y in x[:n_atoms]] for x in isotopologue_list
-        }
-        # isotopologue_names = [key for key in isotopologue_dict.keys()]
-    except (Exception,) as exc:
-        raise ValueError(isotopologue_error_message()) from exc
+    fields = re.findall(
+        ISOTOPOLOGUE_FIELDS_PATTERN.format(n_atoms), text, flags=re.MULTILINE
+    )
+    # Blank and comment-only lines have no fields, so count them out only if
+    # the fields do not already match the lines
+    n_rows = len(lines)
+    if len(fields) != n_rows:
+        n_rows = sum(1 for line in text.split("\n") if line and not line.isspace())
+    if len(fields) == n_rows:
+        mass_numbers = convert_numeric_fields(" ".join(x for x, _ in fields), np.int64)
+        if mass_numbers is not None and mass_numbers.size == n_rows * n_atoms:
+            names = [name for _, name in fields]
+            mass_numbers = mass_numbers.reshape(-1, n_atoms)
+            if parents is not None:
+                parents.update(zip(names, mass_numbers))
+            return names, mass_numbers
+
+    names, rows = [], []
+    for i, line in enumerate(lines):
+        x = COMMENT_PATTERN.sub("", line).split()
+        if not x:
+            continue
+        try:
+            names.append(x[n_atoms])
+            rows.append([int(y) for y in x[:n_atoms]])
+        except (Exception,) as exc:
+            line_number = i + 1 if line_numbers is None else line_numbers(i)
+            # Likely a mistyped compact line
+            hints = [COMPACT_ISOTOPOLOGUE_FORMAT] if "=" in " ".join(x) else []
+            raise ValueError(
+                isotopologue_error_message(
+                    get_line_error_detail(line_number, line), *hints
+                )
+            ) from exc
+    mass_numbers = np.array(rows, dtype=np.int64).reshape(-1, n_atoms)
+    if parents is not None:
+        parents.update(zip(names, mass_numbers))
+    return names, mass_numbers
+
+
+def expand_compact_isotopologue_lines(
+    lines, stripped_lines, n_atoms, line_numbers=None, atom_numbering=None, parents=None
+):
+    """Read isotopologue lines, some of which are compact
+
+    A compact line ``label = parent Atom:mass Atom:mass ...`` has the mass
+    numbers of the full line labelled ``parent``, which must come before it,
+    with the atoms labelled as in ``atom_numbering`` (e.g. ``H6:2 C3:13``)
+    substituted.  Lines that do not match ``COMPACT_ISOTOPOLOGUE_LINE_PATTERN``
+    are full lines, even if they contain a "=".
+
+    Parameters
+    ----------
+    lines : list[str]
+        As for ``read_isotopologue_lines``.
+    stripped_lines : list[str]
+        ``lines`` without comments.
+    n_atoms, line_numbers, atom_numbering, parents
+        As for ``read_isotopologue_lines``.
+
+    Returns
+    -------
+    isotopologue_names : list[str]
+    mass_numbers : np.ndarray[int64], shape (n_iso, n_atoms)
+
+    Notes
+    -----
+    The full lines are read together by ``read_isotopologue_lines``.  Each
+    compact line then only collects its parent row and its substitutions,
+    and the substituted rows are filled in with one fancy-indexed
+    assignment.
+    """
+
+    def line_number(i):
+        return i + 1 if line_numbers is None else line_numbers(i)
+
+    def line_error(i, reason):
+        return ValueError(
+            isotopologue_error_message(
+                get_line_error_detail(line_number(i), lines[i]), reason
+            )
+        )
 
+    kept = [i for i, line in enumerate(stripped_lines) if line and not line.isspace()]
+    compact_matches = [
+        COMPACT_ISOTOPOLOGUE_LINE_PATTERN.match(stripped_lines[i]) for i in kept
+    ]
+    is_compact = np.array([match is not None for match in compact_matches], dtype=bool)
+    full_positions = np.flatnonzero(~is_compact)
+    full_lines = [kept[k] for k in full_positions]
+    full_names, full_mass_numbers = read_isotopologue_lines(
+        [lines[i] for i in full_lines],
+        n_atoms,
+        lambda k: line_number(full_lines[k]),
+        parents=parents,
+    )
+
+    names = [None] * len(kept)
+    mass_numbers = np.empty((len(kept), n_atoms), dtype=np.int64)
+    mass_numbers[full_positions] = full_mass_numbers
+    block_parents = {}
+    for position, name in zip(full_positions.tolist(), full_names):
+        names[position] = name
+        block_parents.setdefault(name, position)
+
+    atom_indices = {label: j for j, label in enumerate(atom_numbering or [])}
+    compact_positions = np.flatnonzero(is_compact)
+    parent_rows = []
+    substituted_rows, substituted_atoms, substituted_masses = [], [], []
+    for position in compact_positions.tolist():
+        i = kept[position]
+        label, parent, substitutions = compact_matches[position].groups()
+        if atom_numbering is None:
+            raise line_error(
+                i, "Compact lines need the atom labels of the Coordinates section."
+            )
+
+        if block_parents.get(parent, position) < position:
+            parent_rows.append(mass_numbers[block_parents[parent]])
+        elif parents is not None and parent in parents:
+            parent_rows.append(parents[parent])
+        else:
+            raise line_error(
+                i, f"The parent {parent!r} is not the label of a full line above."
+            )
+
+        for substitution in substitutions.split():
+            atom, _, mass_number = substitution.partition(":")
+            if atom not in atom_indices:
+                raise line_error(
+                    i,
+                    f"{atom!r} is not one of the atom labels "
+                    f"{', '.join(atom_numbering)}.",
+                )
+            substituted_rows.append(position)
+            substituted_atoms.append(atom_indices[atom])
+            substituted_masses.append(int(mass_number))
+        names[position] = label
+
+    if parent_rows:
+        mass_numbers[compact_positions] = parent_rows
+        mass_numbers[substituted_rows, substituted_atoms] = substituted_masses
+    return names, mass_numbers
+
+
+def get_isotopologue_info(isotopologue_section, n_atoms, atom_numbering=None):
+    # Compact lines ("label = parent H6:2 C3:13") are expanded in place, so
+    # atom_numbering is only needed if the section has any
+    isotopologue_lines = isotopologue_section.split("\n")[1:]
+    line_numbers = [
+        i
+        for i, line in enumerate(isotopologue_lines, 1)
+        if line.strip()[:1] not in ("", "#")
+    ]
+    isotopologue_names, mass_numbers = read_isotopologue_lines(
+        [isotopologue_lines[i - 1] for i in line_numbers],
+        n_atoms,
+        line_numbers.__getitem__,
+        atom_numbering,
+    )
+
+    isotopologue_dict = dict(zip(isotopologue_names, mass_numbers.tolist()))
+    check_for_duplicate_labels(isotopologue_names)
+    return isotopologue_names, isotopologue_dict
+
+
+def check_for_duplicate_labels(isotopologue_names):
     duplicate_names = [
-        i for i in set(isotopologue_names) if isotopologue_names.count(i) > 1
+        name for name, count in Counter(isotopologue_names).items() if count > 1
     ]
     if duplicate_names:
         raise ValueError(
@@ -249,7 +561,120 @@ def get_isotopologue_info(isotopologue_section, n_atoms):
                 f"Isotopologue section contains duplicate labels: {duplicate_names}"
             )
         )
-    return isotopologue_names, isotopologue_dict
+
+
+def iterate_isotopologue_section_blocks(
+    isotopologue_section,
+    n_atoms,
+    chunk_size=ISOTOPOLOGUE_CHUNK_SIZE,
+    atom_numbering=None,
+):
+    """Read an isotopologue section block by block
+
+    Parameters
+    ----------
+    isotopologue_section : str
+        Section as returned by ``get_isotopologue_section``; its first line is
+        the rest of the header line.
+    n_atoms : int
+        Number of atoms, i.e. of mass numbers per line.
+    chunk_size : int, optional
+        Maximum number of isotopologues per block.
+    atom_numbering : list[str], optional
+        Atom labels of the substitutions of compact lines.
+
+    Yields
+    ------
+    names : list[str]
+        Labels of the block's isotopologues.
+    mass_numbers : np.ndarray[int16], shape (n_chunk, n_atoms)
+        Mass numbers of the block's isotopologues.
+
+    Notes
+    -----
+    Lines are read lazily, so only one block of mass numbers is held in
+    memory at a time, besides the set of labels read so far.  A label that
+    repeats one of an earlier line raises the same ValueError as
+    ``get_isotopologue_info`` when its block is read.  If the section has
+    compact lines, the ``parents`` dict keeps the row of every full line for
+    the compact lines below it, so memory then grows with the number of full
+    lines and is no longer bounded by ``chunk_size``.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    seen_names = set()
+    # Rows of the full lines, kept only if compact lines may refer to them
+    has_compact_lines = COMPACT_ISOTOPOLOGUE_LINE_PATTERN.search(isotopologue_section)
+    parents = {} if has_compact_lines else None
+    header_end = isotopologue_section.find("\n")
+    lines = (
+        ISOTOPOLOGUE_LINE_PATTERN.finditer(isotopologue_section, header_end)
+        if header_end >= 0
+        else iter(())
+    )
+    while True:
+        block = [match for _, match in zip(range(chunk_size), lines)]
+        if not block:
+            return
+        names, mass_numbers = read_isotopologue_lines(
+            [match.group() for match in block],
+            n_atoms,
+            lambda i, block=block: isotopologue_section.count(
+                "\n", 0, block[i].start()
+            ),
+            atom_numbering,
+            parents,
+        )
+        out_of_range = np.any(np.abs(mass_numbers) > np.iinfo(np.int16).max, axis=-1)
+        if np.any(out_of_range):
+            match = block[np.argmax(out_of_range)]
+            line_number = isotopologue_section.count("\n", 0, match.start())
+            raise ValueError(
+                isotopologue_error_message(
+                    get_line_error_detail(line_number, match.group()),
+                    "Mass numbers beyond +/-32767 are not known isotopes.",
+                )
+            )
+
+        block_names = Counter(names)
+        duplicate_names = [
+            name
+            for name, count in block_names.items()
+            if count > 1 or name in seen_names
+        ]
+        if duplicate_names:
+            raise ValueError(
+                isotopologue_error_message(
+                    f"Isotopologue section contains duplicate labels: {duplicate_names}"
+                )
+            )
+        seen_names.update(block_names)
+        yield names, mass_numbers.astype(np.int16)
+
+
+def get_isotopologue_arrays(isotopologue_section, n_atoms, atom_numbering=None):
+    """Read an isotopologue section into arrays
+
+    ``atom_numbering`` labels the atoms of compact lines, as for
+    ``get_isotopologue_info``.
+
+    Returns
+    -------
+    isotopologue_names : np.ndarray[str], shape (n_iso,)
+    mass_numbers : np.ndarray[int16], shape (n_iso, n_atoms)
+        Mass numbers, in the order of ``isotopologue_names``.
+    """
+    names = []
+    # Every isotopologue takes one line, so the line count bounds n_iso
+    mass_numbers = np.empty((isotopologue_section.count("\n"), n_atoms), np.int16)
+    for block_names, block_mass_numbers in iterate_isotopologue_section_blocks(
+        isotopologue_section, n_atoms, atom_numbering=atom_numbering
+    ):
+        mass_numbers[len(names) : len(names) + len(block_names)] = block_mass_numbers
+        names.extend(block_names)
+
+    return np.array(names, dtype=str), mass_numbers[: len(names)]
 
 
 def parse_input_isotopologue_section(input_file, n_atoms):
@@ -260,49 +685,445 @@ def parse_input_isotopologue_section(input_file, n_atoms):
     return get_isotopologue_info(isotopologue_section, n_atoms)
 
 
-def check_for_duplicate_sections(input_file):
+def get_enumerate_matches(input_file):
+    enumerate_splits = re.split("(?m)^enumerate", input_file, flags=re.IGNORECASE)
+    if len(enumerate_splits) > 2:
+        raise ValueError(
+            enumerate_error_message("Input file contains multiple enumerate sections.")
+        )
+    if len(enumerate_splits) < 2:
+        # The Enumerate section is optional
+        return None
+
+    return enumerate_splits[1]
+
+
+def get_enumerate_section(enumerate_matches):
+    enumerate_sections: list = re.split(r"\n\s*\n", enumerate_matches)
+    if len(enumerate_sections) < 2:
+        raise ValueError(
+            enumerate_error_message(
+                "Could not find end of enumerate section; make sure there is a blank line at the end of the section."
+            )
+        )
+
+    return enumerate_sections[0]
+
+
+def get_enumerate_info(enumerate_section):
+    from com_pac.enumeration import ENUMERATION_MODES
+
+    enumerate_lines = [i.split("#")[0].split() for i in enumerate_section.split("\n")]
+    header, isotope_lines = enumerate_lines[0], [x for x in enumerate_lines[1:] if x]
+
+    mode = header[0].lower() if header else "single"
+    if mode not in ENUMERATION_MODES or len(header) > 1:
+        raise ValueError(
+            enumerate_error_message(
+                f"Unknown enumeration mode {' '.join(header)!r}; expected one of {ENUMERATION_MODES}."
+            )
+        )
+
+    try:
+        isotopes = {x[0]: [int(y) for y in x[1:]] for x in isotope_lines}
+    except (Exception,) as exc:
+        raise ValueError(enumerate_error_message()) from exc
+
+    symbols = [x[0] for x in isotope_lines]
+    duplicate_symbols = [i for i in set(symbols) if symbols.count(i) > 1]
+    if duplicate_symbols:
+        raise ValueError(
+            enumerate_error_message(
+                f"Enumerate section contains duplicate elements: {duplicate_symbols}"
+            )
+        )
+    return mode, isotopes
+
+
+def parse_input_enumerate_section(input_file):
+    # reading in isotopologue enumeration, if any
+    enumerate_matches = get_enumerate_matches(input_file)
+    if enumerate_matches is None:
+        return None
+    enumerate_section = get_enumerate_section(enumerate_matches)
+
+    return get_enumerate_info(enumerate_section)
+
+
+def get_enumerated_isotopologues(
+    enumerate_info, atom_symbols, atom_numbering, as_arrays=False
+):
+    """Materialize the isotopologues of an Enumerate section for the CLI
+
+    Larger sets should be computed chunk by chunk with
+    ``com_pac.enumeration.iterate_principal_axes`` instead.  With
+    ``as_arrays``, returns the outputs of ``get_isotopologue_arrays``
+    instead of a name list and dict.
+    """
+    from com_pac.enumeration import (
+        build_enumeration,
+        decode_isotopologue_ids,
+        get_isotopologue_names,
+    )
+
+    mode, isotopes = enumerate_info
+    try:
+        enumeration = build_enumeration(atom_symbols, isotopes, mode, atom_numbering)
+    except ValueError as exc:
+        raise ValueError(enumerate_error_message(str(exc))) from exc
+
+    if enumeration["count"] > MAX_ENUMERATED_ISOTOPOLOGUES:
+        raise ValueError(
+            enumerate_error_message(
+                f"Enumeration yields {enumeration['count']} isotopologues, more than "
+                f"the {MAX_ENUMERATED_ISOTOPOLOGUES} an input file may generate; "
+                "use com_pac.enumeration.iterate_principal_axes for larger sets."
+            )
+        )
+
+    ids = np.arange(enumeration["count"])
+    isotopologue_names = get_isotopologue_names(enumeration, ids)
+    mass_numbers = decode_isotopologue_ids(enumeration, ids)
+    if as_arrays:
+        return np.array(isotopologue_names, dtype=str), mass_numbers
+    isotopologue_dict = dict(zip(isotopologue_names, mass_numbers.tolist()))
+    return isotopologue_names, isotopologue_dict
+
+
+def get_uncertainty_matches(input_file):
+    uncertainty_splits = re.split("(?m)^uncertainties", input_file, flags=re.IGNORECASE)
+    if len(uncertainty_splits) > 2:
+        raise ValueError(
+            uncertainty_error_message(
+                "Input file contains multiple uncertainties sections."
+            )
+        )
+    if len(uncertainty_splits) < 2:
+        # The Uncertainties section is optional
+        return None
+
+    return uncertainty_splits[1]
+
+
+def get_uncertainty_section(uncertainty_matches):
+    uncertainty_sections: list = re.split(r"\n\s*\n", uncertainty_matches)
+    if len(uncertainty_sections) < 2:
+        raise ValueError(
+            uncertainty_error_message(
+                "Could not find end of uncertainties section; make sure there is a blank line at the end of the section."
+            )
+        )
+
+    return uncertainty_sections[0]
+
+
+def get_uncertainty_info(uncertainty_section, atom_symbols):
+    try:
+        uncertainty_lines = [
+            i.split("#")[0].split() for i in uncertainty_section.split("\n")[1:]
+        ]
+        uncertainty_list = [x for x in uncertainty_lines if x]
+
+        uncertainty_symbols = [x[0] for x in uncertainty_list]
+        # A single value is an isotropic uncertainty
+        coordinate_errors = np.array(
+            [
+                [float(x[1])] * 3 if len(x) == 2 else [float(y) for y in x[1:4]]
+                for x in uncertainty_list
+            ]
+        ).reshape(len(uncertainty_list), 3)
+    except (Exception,) as exc:
+        raise ValueError(uncertainty_error_message()) from exc
+
+    if uncertainty_symbols != list(atom_symbols):
+        raise ValueError(
+            uncertainty_error_message(
+                f"Atoms of the uncertainties section {uncertainty_symbols} do not "
+                f"match the coordinates section {list(atom_symbols)}."
+            )
+        )
+    if np.any(coordinate_errors < 0) or not np.all(np.isfinite(coordinate_errors)):
+        raise ValueError(
+            uncertainty_error_message(
+                "Coordinate uncertainties must be finite and non-negative."
+            )
+        )
+    return coordinate_errors
+
+
+def parse_input_uncertainty_section(input_file, atom_symbols):
+    # reading in coordinate uncertainties, if any
+    uncertainty_matches = get_uncertainty_matches(input_file)
+    if uncertainty_matches is None:
+        return None
+    uncertainty_section = get_uncertainty_section(uncertainty_matches)
+
+    return get_uncertainty_info(uncertainty_section, atom_symbols)
+
+
+def tokenize_sections(input_file):
+    """Find every section of an input file in a single pass
+
+    Parameters
+    ----------
+    input_file : str
+        Contents of the input file.
+
+    Returns
+    -------
+    section_spans : dict[str, list[tuple]]
+        key = section name, one of SECTION_NAMES
+        value = ``(start, end)`` offsets of each header of that section, from
+        the end of the header word to the start of the first blank line after
+        it (``end`` is None if there is none).  ``input_file[start:end]`` is
+        the section as returned by ``get_coordinate_section`` and friends.
+    """
+    section_spans = {section_name: [] for section_name in SECTION_NAMES}
+    unterminated = []
+    first_header = FIRST_SECTION_HEADER_PATTERN.match(input_file)
+    tokens = SECTION_TOKEN_PATTERN.finditer(input_file)
+    for match in itertools.chain([first_header] if first_header else [], tokens):
+        if match.lastgroup == "header":
+            spans = section_spans[match.group("header").lower()]
+            unterminated.append((spans, len(spans)))
+            spans.append((match.end(), None))
+        else:
+            for spans, i in unterminated:
+                spans[i] = (spans[i][0], match.start())
+            unterminated.clear()
+
+    return section_spans
+
+
+def get_section_text(
+    input_file, section_spans, section_name, error_message, missing_message=None
+):
+    """Slice one section out of an input file, given its ``tokenize_sections`` spans
+
+    Raises the same errors as the ``get_*_matches`` and ``get_*_section``
+    functions.  Returns None for a missing section when ``missing_message``
+    is None, i.e. for optional sections.
+    """
+    spans = section_spans[section_name]
+    if len(spans) > 1:
+        raise ValueError(
+            error_message(f"Input file contains multiple {section_name} sections.")
+        )
+    if not spans:
+        if missing_message is None:
+            return None
+        raise ValueError(error_message(missing_message))
+
+    start, end = spans[0]
+    if end is None:
+        raise ValueError(
+            error_message(
+                f"Could not find end of {section_name} section; make sure there is a blank line at the end of the section."
+            )
+        )
+    return input_file[start:end]
+
+
+def check_for_duplicate_sections(input_file, section_spans=None):
     """Check all section headers for duplicates and raise a ValueError listing all duplicates."""
-    section_patterns = [
-        ("coordinates", "(?m)^coordinates"),
-        ("dipole", "(?m)^dipole"),
-        ("isotopologues", "(?m)^isotopologues"),
-    ]
+    if section_spans is None:
+        section_spans = tokenize_sections(input_file)
 
-    duplicate_sections = []
-    for section_name, pattern in section_patterns:
-        if len(re.split(pattern, input_file, flags=re.IGNORECASE)) > 2:
-            duplicate_sections.append(section_name)
+    duplicate_sections = [
+        section_name
+        for section_name in SECTION_NAMES
+        if len(section_spans[section_name]) > 1
+    ]
 
     if duplicate_sections:
         raise ValueError(
             f"Input file contains duplicate sections: {duplicate_sections}. "
-            "Each section type (coordinates, dipole, isotopologues) must appear exactly once."
+            "Each section type (coordinates, dipole, isotopologues, enumerate, uncertainties) "
+            "may appear only once."
+        )
+
+
+def get_invalid_mass_numbers(mass_numbers, atom_symbols):
+    """Find the mass numbers that are not isotopes of their atom's element
+
+    Parameters
+    ----------
+    mass_numbers : array-like[int]
+        Array of shape (n_iso, n_atoms) of mass numbers.
+    atom_symbols : list[str]
+        Element symbols of the ``n_atoms`` atoms; unknown symbols have no
+        valid mass numbers.
+
+    Returns
+    -------
+    np.ndarray[int], shape (n_invalid, 2)
+        ``(isotopologue, atom)`` index pairs, in row-major order.
+    """
+    from com_pac.isotopes import ATOMIC_NUMBERS
+
+    mass_numbers = np.asarray(mass_numbers)
+    if mass_numbers.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    atomic_numbers = np.array([ATOMIC_NUMBERS.get(x, 0) for x in atom_symbols])
+    # Blocks of rows keep the int64 temporaries small for large arrays
+    invalid = []
+    for start in range(0, len(mass_numbers), ISOTOPOLOGUE_CHUNK_SIZE):
+        block = mass_numbers[start : start + ISOTOPOLOGUE_CHUNK_SIZE]
+        known = get_known_isotope_mask(block, atomic_numbers)
+        invalid.append(np.argwhere(~known) + (start, 0))
+    return np.concatenate(invalid)
+
+
+def get_known_isotope_mask(mass_numbers, atomic_numbers):
+    # Look up each distinct (atomic number, mass number) pair once, packed
+    # into one integer; mass numbers too far apart to pack are ranked first
+    from com_pac.isotopes import is_known_isotope
+
+    mass_numbers = mass_numbers.astype(np.int64)
+    unique_atomic_numbers, atom_ranks = np.unique(atomic_numbers, return_inverse=True)
+    n_elements = len(unique_atomic_numbers)
+    min_mass_number = mass_numbers.min()
+    mass_range = int(mass_numbers.max()) - int(min_mass_number)
+    if mass_range < np.iinfo(np.int64).max // n_elements:
+        key_mass_numbers = None
+        mass_keys = mass_numbers - min_mass_number
+    else:
+        key_mass_numbers, mass_keys = np.unique(mass_numbers, return_inverse=True)
+        mass_keys = mass_keys.reshape(mass_numbers.shape)
+    pairs, pair_indices = np.unique(
+        mass_keys * n_elements + atom_ranks, return_inverse=True
+    )
+    pair_mass_keys = pairs // n_elements
+    valid = is_known_isotope(
+        unique_atomic_numbers[pairs % n_elements],
+        (
+            pair_mass_keys + min_mass_number
+            if key_mass_numbers is None
+            else key_mass_numbers[pair_mass_keys]
+        ),
+    )
+    return valid[pair_indices.reshape(mass_numbers.shape)]
+
+
+def check_mass_number_array_is_valid(
+    mass_numbers, atom_symbols, isotopologue_names=None, atom_numbering=None
+):
+    """Raise a ValueError listing every invalid mass number of an array
+
+    ``isotopologue_names`` and ``atom_numbering`` label the rows and columns
+    of ``mass_numbers`` in the message; they default to the indices and to
+    the symbols numbered from 1.
+    """
+    invalid = get_invalid_mass_numbers(mass_numbers, atom_symbols)
+    if len(invalid) == 0:
+        return
+
+    mass_numbers = np.asarray(mass_numbers)
+    if isotopologue_names is None:
+        isotopologue_names = range(len(mass_numbers))
+    if atom_numbering is None:
+        atom_numbering = [f"{x}{i}" for i, x in enumerate(atom_symbols, 1)]
+    details = [
+        f"{isotopologue_names[i]}: {atom_numbering[j]} with mass number "
+        f"{mass_numbers[i, j]}"
+        for i, j in invalid
+    ]
+    raise ValueError(
+        isotopologue_error_message(
+            f"Found {len(invalid)} mass number(s) that are not known isotopes of their element:",
+            *details,
         )
+    )
 
 
-def check_mass_numbers_are_valid(isotopologue_dict, atom_symbols):
-    # TODO: Add check that mass number provided in isotopologue section is
-    #       indeed a valid mass number for the corresponding atom in the
-    #       atom_symbols list. Raise an explanatory error if not.
+def check_mass_numbers_are_valid(isotopologue_dict, atom_symbols, atom_numbering=None):
+    # Raise an explanatory error for every mass number in the isotopologue
+    # section that is not an isotope of the corresponding atom's element.
+    isotopologue_names = list(isotopologue_dict)
+    check_mass_number_array_is_valid(
+        [isotopologue_dict[iso] for iso in isotopologue_names],
+        atom_symbols,
+        isotopologue_names,
+        atom_numbering,
+    )
 
-    pass
 
+def parse_input_file(input_file, as_arrays=False):
+    """Parse the contents of an input file
 
-def parse_input_file(input_file):
-    check_for_duplicate_sections(input_file)
+    With ``as_arrays``, the isotopologue names and mass numbers are returned
+    as the arrays of ``get_isotopologue_arrays`` in place of the name list
+    and ``isotopologue_dict``, which takes much less memory, and a little less
+    time, for large Isotopologues sections.  The rest of the tuple is the same.
 
-    n_atoms, atom_symbols, mol_coordinates, atom_numbering = (
-        parse_input_coordinate_section(input_file)
+    Besides full lines of mass numbers, the Isotopologues section may hold
+    compact lines ``label = parent Atom:mass ...``, which substitute the
+    listed atoms (numbered as in the output, e.g. ``H6:2``) of the full line
+    labelled ``parent`` above them.
+    """
+    # Locate every section once, then read each one from its span
+    section_spans = tokenize_sections(input_file)
+    check_for_duplicate_sections(input_file, section_spans)
+
+    coordinate_section = get_section_text(
+        input_file,
+        section_spans,
+        "coordinates",
+        coordinates_error_message,
+        'Could not find line starting with "coordinates" (case insensitive).',
+    )
+    n_atoms, atom_symbols, mol_coordinates, atom_numbering = get_coordinate_info(
+        coordinate_section
     )
 
-    mol_dipole = parse_input_dipole_section(input_file)
+    dipole_section = get_section_text(
+        input_file,
+        section_spans,
+        "dipole",
+        dipole_error_message,
+        'Could not find line starting with "dipole" (case insensitive).',
+    )
+    mol_dipole = get_dipole_info(dipole_section)
 
-    isotopologue_names, isotopologue_dict = parse_input_isotopologue_section(
-        input_file, n_atoms
+    enumerate_section = get_section_text(
+        input_file, section_spans, "enumerate", enumerate_error_message
     )
+    if enumerate_section is None:
+        isotopologue_section = get_section_text(
+            input_file,
+            section_spans,
+            "isotopologues",
+            isotopologue_error_message,
+            'Could not find line starting with "isotopologues" (case insensitive)',
+        )
+        if as_arrays:
+            isotopologue_names, isotopologue_dict = get_isotopologue_arrays(
+                isotopologue_section, n_atoms, atom_numbering
+            )
+        else:
+            isotopologue_names, isotopologue_dict = get_isotopologue_info(
+                isotopologue_section, n_atoms, atom_numbering
+            )
+    else:
+        enumerate_info = get_enumerate_info(enumerate_section)
+        if section_spans["isotopologues"]:
+            raise ValueError(
+                enumerate_error_message(
+                    "Input file contains both isotopologues and enumerate sections."
+                )
+            )
+        isotopologue_names, isotopologue_dict = get_enumerated_isotopologues(
+            enumerate_info, atom_symbols, atom_numbering, as_arrays=as_arrays
+        )
 
     # Raises an explanatory exception if not, silently continues if yes.
-    check_mass_numbers_are_valid(isotopologue_dict, atom_symbols)
+    if as_arrays:
+        check_mass_number_array_is_valid(
+            isotopologue_dict, atom_symbols, isotopologue_names, atom_numbering
+        )
+    else:
+        check_mass_numbers_are_valid(isotopologue_dict, atom_symbols, atom_numbering)
 
     return (
         isotopologue_names,
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+from com_pac.isotopes import get_atomic_numbers, lookup_isotope_abundances
+
+# k / h in MHz per Kelvin, so that kT/h and the rotational constants share units
+BOLTZMANN_MHZ_PER_K = 20836.61912
+
+
+def get_rotational_partition_functions(
+    rotational_constants, temperatures, symmetry_number=1, J_max=None
+):
+    """Rigid rotor partition functions on a temperature grid
+
+    Parameters
+    ----------
+    rotational_constants : array-like
+        Array of shape (n_iso, 3) of rotational constants A, B, C in MHz.
+    temperatures : array-like
+        Array of shape (n_T,) of temperatures in Kelvin.
+    symmetry_number : int, default 1
+        Rotational symmetry number sigma.
+    J_max : int, optional
+        Sum over the levels up to J_max instead of using the classical limit.
+
+    Returns
+    -------
+    np.ndarray, shape (n_iso, n_T)
+
+    Notes
+    -----
+    The classical limit is ``Q = sqrt(pi) / sigma * sqrt((kT/h)^3 / (A B C))``
+    for nonlinear molecules and ``Q = kT / (sigma h B)`` for linear ones, whose
+    A constant is infinite.  It underestimates the sum over levels by a few
+    percent once kT/h is no longer large compared to the constants, e.g. in
+    jet-cooled spectra.  The sum ``sum (2J + 1) exp(-E / kT) / sigma`` uses the
+    levels of ``com_pac.spectrum``, and ignores nuclear spin statistics.
+    """
+    rotational_constants = np.asarray(rotational_constants, dtype=float)
+    temperatures = np.asarray(temperatures, dtype=float)
+    if np.any(temperatures <= 0):
+        raise ValueError("Temperatures must be positive.")
+
+    kT = BOLTZMANN_MHZ_PER_K * temperatures
+    A, B, C = (rotational_constants[:, [i]] for i in range(3))
+    linear = ~np.isfinite(A[:, 0])
+
+    if J_max is None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nonlinear_Q = np.sqrt(np.pi * kT**3 / (A * B * C))
+        return np.where(linear[:, np.newaxis], kT / B, nonlinear_Q) / symmetry_number
+
+    from com_pac.spectrum import get_level_labels, get_rotational_energies
+
+    J = get_level_labels(J_max)[:, 0]
+    energies = np.empty((len(rotational_constants), len(J)))
+    energies[~linear] = get_rotational_energies(rotational_constants[~linear], J_max)
+    # One level per J for a linear molecule; the other slots get no weight
+    first_of_J = np.arange(len(J)) == J**2
+    energies[linear] = np.where(first_of_J, B[linear] * J * (J + 1), np.inf)
+    weights = np.where(np.isfinite(energies), 2 * J + 1, 0)
+    boltzmann = np.exp(-energies[:, :, np.newaxis] / kT)
+    return np.einsum("il,ilt->it", weights, boltzmann) / symmetry_number
+
+
+def get_natural_abundances(mass_numbers, atom_symbols):
+    """Natural abundance of every isotopologue
+
+    Parameters
+    ----------
+    mass_numbers : array-like[int]
+        Array of shape (n_iso, n_atoms) of mass numbers.
+    atom_symbols : list[str]
+        Element symbols of the ``n_atoms`` atoms.
+
+    Returns
+    -------
+    np.ndarray, shape (n_iso,)
+        Product of the natural abundances (fractions) of the atoms of each
+        isotopologue; 0 if any isotope does not occur naturally.
+    """
+    atomic_numbers = get_atomic_numbers(atom_symbols)
+    abundances = lookup_isotope_abundances(atomic_numbers, mass_numbers)
+    return np.prod(abundances, axis=-1)
+
+
+def get_relative_intensities(abundances, pa_dipoles, partition_functions):
+    """Relative intensity factors of the isotopologues at each temperature
+
+    Parameters
+    ----------
+    abundances : array-like
+        Array of shape (n_iso,) of natural abundances.
+    pa_dipoles : array-like
+        Array of shape (n_iso, 3) of principal axes dipole components.
+    partition_functions : array-like
+        Array of shape (n_iso, n_T) of rotational partition functions.
+
+    Returns
+    -------
+    np.ndarray, shape (n_iso, n_T)
+        ``abundance * |mu|^2 / Q(T)``, scaled so that the strongest
+        isotopologue at each temperature is 1 (NaN if all are 0).
+    """
+    abundances = np.asarray(abundances, dtype=float)
+    pa_dipoles = np.asarray(pa_dipoles, dtype=float)
+    intensities = (abundances * np.sum(pa_dipoles**2, axis=-1))[
+        :, np.newaxis
+    ] / np.asarray(partition_functions, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return intensities / np.max(intensities, axis=0)
+
+
+def get_partition_values(
+    isotopologue_names,
+    isotopologue_dict,
+    atom_symbols,
+    rotational_constants,
+    pa_dipoles,
+    temperatures,
+    symmetry_number=1,
+    J_max=None,
+):
+    """Partition functions and relative intensities of every isotopologue
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names.
+    isotopologue_dict : dict[str, list[int]]
+        Mass numbers of each isotopologue, as returned by ``parse_input_file``.
+    atom_symbols : list[str]
+        Element symbols of the atoms.
+    rotational_constants : dict
+        key = isotopologue_name: str
+        value = np.array[float] of A, B, C in MHz
+    pa_dipoles : dict
+        key = isotopologue_name: str
+        value = np.array[float] of mu_A, mu_B, mu_C
+    temperatures : array-like
+        Temperatures in Kelvin.
+    symmetry_number : int, default 1
+        Rotational symmetry number sigma, shared by all isotopologues.
+    J_max : int, optional
+        See ``get_rotational_partition_functions``.
+
+    Returns
+    -------
+    partition_data : dict
+        "temperatures": np.ndarray of shape (n_T,),
+        "abundances": np.ndarray of shape (n_iso,),
+        "partition_functions": np.ndarray of shape (n_iso, n_T),
+        "intensities": np.ndarray of shape (n_iso, n_T) of
+        ``get_relative_intensities``.
+    """
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    mass_numbers = np.array([isotopologue_dict[iso] for iso in isotopologue_names])
+    abundances = get_natural_abundances(mass_numbers, atom_symbols)
+    partition_functions = get_rotational_partition_functions(
+        [rotational_constants[iso] for iso in isotopologue_names],
+        temperatures,
+        symmetry_number=symmetry_number,
+        J_max=J_max,
+    )
+    intensities = get_relative_intensities(
+        abundances,
+        [pa_dipoles[iso] for iso in isotopologue_names],
+        partition_functions,
+    )
+    return {
+        "temperatures": temperatures,
+        "abundances": abundances,
+        "partition_functions": partition_functions,
+        "intensities": intensities,
+    }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+ROTATION_LABELS = (
+    "q_w",
+    "q_x",
+    "q_y",
+    "q_z",
+    "angle",
+    "axis_a",
+    "axis_b",
+    "axis_c",
+    "alpha",
+    "beta",
+    "gamma",
+)
+
+
+def get_relative_rotations(eigenvectors):
+    """Calculate the rotation from the parent principal axes to each isotopologue's
+
+    Parameters
+    ----------
+    eigenvectors : array-like
+        Array of shape (n_iso, 3, 3) of the principal axes (as columns) of each
+        isotopologue; row 0 is the parent.
+
+    Returns
+    -------
+    np.ndarray, shape (n_iso, 3, 3)
+        Rotation matrices ``R = V_parent^T V_iso``, whose columns are the a, b, c
+        axes of each isotopologue in the parent principal axes frame.
+
+    Notes
+    -----
+    Principal axes are only defined up to their sign, so the axes of each
+    isotopologue are flipped to give ``R`` a non-negative diagonal, i.e. the
+    smallest rotation that relates the two frames.  If that would make ``R``
+    improper, the axis with the smallest diagonal element keeps its sign.
+    """
+    eigenvectors = np.asarray(eigenvectors, dtype=float)
+    rotations = np.swapaxes(eigenvectors[0], -2, -1) @ eigenvectors
+
+    diagonals = np.diagonal(rotations, axis1=-2, axis2=-1)
+    signs = np.where(diagonals < 0, -1.0, 1.0)
+    improper = np.linalg.det(rotations) * np.prod(signs, axis=-1) < 0
+    smallest = np.argmin(np.abs(diagonals), axis=-1)
+    signs[improper, smallest[improper]] *= -1
+    return rotations * signs[:, np.newaxis, :]
+
+
+def rotation_to_quaternion(rotations):
+    """Convert a stack of rotation matrices to unit quaternions
+
+    Parameters
+    ----------
+    rotations : array-like
+        Array of shape (..., 3, 3) of proper rotation matrices.
+
+    Returns
+    -------
+    np.ndarray, shape (..., 4)
+        Quaternions ``(w, x, y, z)`` with ``w >= 0``.
+
+    Notes
+    -----
+    Uses Shepperd's method: the largest of ``|w|, |x|, |y|, |z|`` comes from a
+    square root of a diagonal combination of ``R`` and the other three from
+    off-diagonal sums divided by it.  All four candidates are formed for the
+    whole stack and the best conditioned one is picked per matrix.
+    """
+    r = np.asarray(rotations, dtype=float)
+    pivots = np.stack(
+        [
+            1 + r[..., 0, 0] + r[..., 1, 1] + r[..., 2, 2],
+            1 + r[..., 0, 0] - r[..., 1, 1] - r[..., 2, 2],
+            1 - r[..., 0, 0] + r[..., 1, 1] - r[..., 2, 2],
+            1 - r[..., 0, 0] - r[..., 1, 1] + r[..., 2, 2],
+        ],
+        axis=-1,
+    )
+    # Candidate k is 4 * q_k * (w, x, y, z); its pivot entry is 4 * q_k^2
+    wx = r[..., 2, 1] - r[..., 1, 2]
+    wy = r[..., 0, 2] - r[..., 2, 0]
+    wz = r[..., 1, 0] - r[..., 0, 1]
+    xy = r[..., 0, 1] + r[..., 1, 0]
+    xz = r[..., 0, 2] + r[..., 2, 0]
+    yz = r[..., 1, 2] + r[..., 2, 1]
+    candidates = np.stack(
+        [
+            np.stack([pivots[..., 0], wx, wy, wz], axis=-1),
+            np.stack([wx, pivots[..., 1], xy, xz], axis=-1),
+            np.stack([wy, xy, pivots[..., 2], yz], axis=-1),
+            np.stack([wz, xz, yz, pivots[..., 3]], axis=-1),
+        ],
+        axis=-2,
+    )
+    best = np.argmax(pivots, axis=-1)
+    quaternions = np.take_along_axis(
+        candidates, best[..., np.newaxis, np.newaxis], axis=-2
+    )[..., 0, :]
+    quaternions /= 2 * np.sqrt(np.take_along_axis(pivots, best[..., np.newaxis], -1))
+    return np.where(quaternions[..., :1] < 0, -quaternions, quaternions)
+
+
+def quaternion_to_axis_angle(quaternions):
+    """Convert unit quaternions ``(w, x, y, z)`` to rotation angles and axes
+
+    Returns
+    -------
+    angles : np.ndarray, shape (...,)
+        Rotation angles in degrees, in [0, 180].
+    axes : np.ndarray, shape (..., 3)
+        Unit rotation axes; NaN for a zero rotation, whose axis is undefined.
+    """
+    quaternions = np.asarray(quaternions, dtype=float)
+    vector_norms = np.linalg.norm(quaternions[..., 1:], axis=-1)
+    angles = np.degrees(2 * np.arctan2(vector_norms, np.abs(quaternions[..., 0])))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        axes = quaternions[..., 1:] / vector_norms[..., np.newaxis]
+    axes[vector_norms == 0] = np.nan
+    return angles, axes
+
+
+def rotation_to_euler_angles(rotations):
+    """Convert a stack of rotation matrices to Tait-Bryan angles
+
+    Parameters
+    ----------
+    rotations : array-like
+        Array of shape (..., 3, 3) of proper rotation matrices.
+
+    Returns
+    -------
+    np.ndarray, shape (..., 3)
+        Angles ``(alpha, beta, gamma)`` in degrees about the c, b and a axes,
+        with ``R = R_c(alpha) R_b(beta) R_a(gamma)``.
+
+    Notes
+    -----
+    For a planar molecule the rotation is about the c axis only, so
+    ``beta = gamma = 0`` and ``alpha`` is the in-plane angle ``theta`` of
+    ``tan(2 theta) = 2 I_ab / (I_aa - I_bb)``, with the isotopologue inertia
+    tensor taken in the parent axes about its own center of mass (modulo 90
+    degrees where the a and b axes exchange order).  The ``theta_7`` of
+    ``get_theta_values_batch`` takes that tensor about the parent's center of
+    mass instead, so the two only agree for substitutions that do not move
+    the center of mass.
+    """
+    rotations = np.asarray(rotations, dtype=float)
+    alpha = np.arctan2(rotations[..., 1, 0], rotations[..., 0, 0])
+    beta = np.arcsin(np.clip(-rotations[..., 2, 0], -1, 1))
+    gamma = np.arctan2(rotations[..., 2, 1], rotations[..., 2, 2])
+    return np.degrees(np.stack([alpha, beta, gamma], axis=-1))
+
+
+def get_rotation_values(isotopologue_names, eigenvectors):
+    """Calculate the frame rotation of every isotopologue relative to the parent
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names; the first one is the parent.
+    eigenvectors : dict
+        key = isotopologue_name: str
+        value = np.array[float] of shape (3, 3), principal axes as columns
+
+    Returns
+    -------
+    rotation_data : dict
+        key = isotopologue_name: str
+        value = dict of the quaternion "q_w", "q_x", "q_y", "q_z", the
+        rotation "angle" (degrees) about the unit axis "axis_a", "axis_b",
+        "axis_c" of the parent frame, and the Tait-Bryan angles "alpha",
+        "beta", "gamma" (degrees) of ``rotation_to_euler_angles``
+    """
+    rotations = get_relative_rotations(
+        [eigenvectors[iso] for iso in isotopologue_names]
+    )
+    quaternions = rotation_to_quaternion(rotations)
+    angles, axes = quaternion_to_axis_angle(quaternions)
+    euler_angles = rotation_to_euler_angles(rotations)
+
+    values = np.concatenate(
+        [quaternions, angles[:, np.newaxis], axes, euler_angles], axis=-1
+    )
+    return {
+        iso: dict(zip(ROTATION_LABELS, iso_values))
+        for iso, iso_values in zip(isotopologue_names, values)
+    }
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+SPECTRUM_DIPOLE_THRESHOLD = 1e-6
+TRANSITION_TYPES = ("a", "b", "c")
+# Change of the (Ka, Kc) parities allowed by each dipole component
+TRANSITION_PARITIES = {"a": (0, 1), "b": (1, 1), "c": (1, 0)}
+# Wang blocks as (name, parity of K, sign of the |K> +- |-K> combination)
+WANG_BLOCKS = (("E+", 0, 1), ("E-", 0, -1), ("O+", 1, 1), ("O-", 1, -1))
+
+# The Wang block matrices and transition pairs only depend on J, so they are
+# built once per process and shared by every isotopologue and every call.
+SPECTRUM_CACHE = {}
+
+
+def clear_spectrum_cache():
+    SPECTRUM_CACHE.clear()
+
+
+def get_level_labels(J_max):
+    """Label the rotational levels of an asymmetric top up to J_max
+
+    Parameters
+    ----------
+    J_max : int
+        Highest rotational quantum number J.
+
+    Returns
+    -------
+    np.ndarray[int], shape ((J_max + 1)**2, 3)
+        (J, Ka, Kc) of every level.  The levels of each J start at row ``J**2``
+        and are in order of increasing ``tau = Ka - Kc``, i.e. of energy.
+    """
+    cache_key = ("labels", J_max)
+    if cache_key not in SPECTRUM_CACHE:
+        J = np.repeat(np.arange(J_max + 1), 2 * np.arange(J_max + 1) + 1)
+        n = np.arange(len(J)) - J**2
+        SPECTRUM_CACHE[cache_key] = np.stack([J, (n + 1) // 2, J - n // 2], axis=-1)
+    return SPECTRUM_CACHE[cache_key]
+
+
+def get_wang_matrices(J):
+    """Structural matrices of the Wang blocks of the rigid rotor Hamiltonian
+
+    Parameters
+    ----------
+    J : int
+        Rotational quantum number.
+
+    Returns
+    -------
+    list[tuple[np.ndarray, np.ndarray]]
+        One ``(level_indices, matrices)`` per non-empty Wang block.
+        ``matrices`` has shape (3, d, d) such that the block Hamiltonian is
+        ``A * matrices[0] + B * matrices[1] + C * matrices[2]``, and
+        ``level_indices`` are the positions (in the order of
+        ``get_level_labels``) of the block's levels, in order of energy.
+
+    Notes
+    -----
+    Uses the I^r representation (z = a, x = b, y = c) in the symmetric top
+    basis |J, K>, where ``H = A K^2 + (B + C)/2 (J(J+1) - K^2)`` on the
+    diagonal and ``(B - C)/4 sqrt(J(J+1) - K(K+1)) sqrt(J(J+1) - (K+1)(K+2))``
+    couples K and K + 2.  The Wang combinations ``(|K> +- |-K>) / sqrt(2)``
+    split it into the E+, E-, O+ and O- blocks, whose levels have Ka of the
+    parity of K and Kc of the parity of J (E+, O-) or J + 1 (E-, O+).
+    """
+    cache_key = ("wang", J)
+    if cache_key in SPECTRUM_CACHE:
+        return SPECTRUM_CACHE[cache_key]
+
+    K = np.arange(-J, J + 1)
+    jj = J * (J + 1)
+    lower_K = K[:-2]
+    off_diagonal = np.zeros((2 * J + 1, 2 * J + 1))
+    off_diagonal[lower_K + J, lower_K + J + 2] = np.sqrt(
+        jj - lower_K * (lower_K + 1)
+    ) * np.sqrt(jj - (lower_K + 1) * (lower_K + 2))
+    off_diagonal += off_diagonal.T
+    symmetric = np.diag((jj - K**2) / 2.0)
+    structure = np.array(
+        [
+            np.diag(K**2.0),
+            symmetric + off_diagonal / 4,
+            symmetric - off_diagonal / 4,
+        ]
+    )
+
+    labels = get_level_labels(J)[J**2 :]
+    blocks = []
+    for _, k_parity, sign in WANG_BLOCKS:
+        transform = []
+        for k in range(k_parity, J + 1, 2):
+            column = np.zeros(2 * J + 1)
+            if k == 0:
+                if sign < 0:
+                    continue
+                column[J] = 1.0
+            else:
+                column[J + k] = 1.0 / np.sqrt(2)
+                column[J - k] = sign / np.sqrt(2)
+            transform.append(column)
+        if not transform:
+            continue
+        transform = np.array(transform).T
+        kc_parity = (J + k_parity + (sign < 0)) % 2
+        level_indices = np.flatnonzero(
+            (labels[:, 1] % 2 == k_parity) & (labels[:, 2] % 2 == kc_parity)
+        )
+        blocks.append((level_indices, transform.T @ structure @ transform))
+
+    SPECTRUM_CACHE[cache_key] = blocks
+    return blocks
+
+
+def get_rotational_energies(rotational_constants, J_max):
+    """Rigid rotor energy levels of a stack of asymmetric tops
+
+    Parameters
+    ----------
+    rotational_constants : array-like
+        Array of shape (n_iso, 3) of rotational constants A, B, C.
+    J_max : int
+        Highest rotational quantum number J.
+
+    Returns
+    -------
+    np.ndarray, shape (n_iso, (J_max + 1)**2)
+        Energies, in the units of the constants, of the levels of
+        ``get_level_labels(J_max)``.
+
+    Notes
+    -----
+    Each Wang block is diagonalized for all isotopologues at once with one
+    stacked ``eigvalsh`` call.
+    """
+    rotational_constants = np.asarray(rotational_constants, dtype=float)
+    energies = np.empty((len(rotational_constants), (J_max + 1) ** 2))
+    for J in range(J_max + 1):
+        for level_indices, matrices in get_wang_matrices(J):
+            hamiltonians = np.tensordot(rotational_constants, matrices, axes=1)
+            energies[:, J**2 + level_indices] = np.linalg.eigvalsh(hamiltonians)
+    return energies
+
+
+def get_transition_pairs(J_max, transition_type, max_delta_k=1):
+    """Level pairs connected by one type of rotational transition
+
+    Parameters
+    ----------
+    J_max : int
+        Highest rotational quantum number J.
+    transition_type : str
+        "a", "b" or "c".
+    max_delta_k : int, default 1
+        Largest |delta Ka| and |delta Kc|.  The default keeps the strong
+        branches: delta Ka = 0 and delta Kc = +-1 for a-type, delta Ka = +-1
+        and delta Kc = +-1 for b-type, delta Ka = +-1 and delta Kc = 0 for
+        c-type.
+
+    Returns
+    -------
+    np.ndarray[int], shape (n_pairs, 2)
+        Indices into ``get_level_labels(J_max)`` of the two levels of each
+        pair, with delta J = 0 or +1 from the first to the second.
+    """
+    if transition_type not in TRANSITION_PARITIES:
+        raise ValueError(
+            f"Unknown transition type {transition_type!r}; "
+            f"expected one of {TRANSITION_TYPES}."
+        )
+    cache_key = ("pairs", J_max, transition_type, max_delta_k)
+    if cache_key in SPECTRUM_CACHE:
+        return SPECTRUM_CACHE[cache_key]
+
+    labels = get_level_labels(J_max)
+    ka_change, kc_change = TRANSITION_PARITIES[transition_type]
+    pairs = []
+    for J in range(J_max + 1):
+        first = np.arange(J**2, (J + 1) ** 2)
+        for J_second in (J, J + 1):
+            if J_second > J_max:
+                continue
+            second = np.arange(J_second**2, (J_second + 1) ** 2)
+            delta = labels[second][np.newaxis, :, 1:] - labels[first][:, np.newaxis, 1:]
+            allowed = (
+                (delta[..., 0] % 2 == ka_change)
+                & (delta[..., 1] % 2 == kc_change)
+                & np.all(np.abs(delta) <= max_delta_k, axis=-1)
+            )
+            if J_second == J:
+                # Each Q-branch pair once
+                allowed &= first[:, np.newaxis] < second[np.newaxis, :]
+            i, j = np.nonzero(allowed)
+            pairs.append(np.stack([first[i], second[j]], axis=-1))
+
+    pairs = np.concatenate(pairs)
+    SPECTRUM_CACHE[cache_key] = pairs
+    return pairs
+
+
+def get_transitions(
+    rotational_constants,
+    pa_dipoles,
+    J_max,
+    frequency_window=(0.0, np.inf),
+    max_delta_k=1,
+    dipole_threshold=SPECTRUM_DIPOLE_THRESHOLD,
+):
+    """Predict the rigid rotor transitions of a stack of asymmetric tops
+
+    Parameters
+    ----------
+    rotational_constants : array-like
+        Array of shape (n_iso, 3) of rotational constants A, B, C.
+    pa_dipoles : array-like
+        Array of shape (n_iso, 3) of principal axes dipole components.  The
+        a-, b- and c-type transitions of an isotopologue are kept when
+        ``|mu_a|``, ``|mu_b|`` and ``|mu_c|``, respectively, exceed
+        ``dipole_threshold``.
+    J_max : int
+        Highest rotational quantum number J of either level.
+    frequency_window : tuple[float, float], default (0, inf)
+        Lowest and highest frequency, in the units of the constants.
+    max_delta_k : int, default 1
+        See ``get_transition_pairs``.
+    dipole_threshold : float, default SPECTRUM_DIPOLE_THRESHOLD
+
+    Returns
+    -------
+    dict
+        "isotopologue": np.ndarray[int] of row indices of the inputs,
+        "type": np.ndarray[str] of transition types,
+        "upper", "lower": np.ndarray[int] of shape (n, 3) of (J, Ka, Kc),
+        "frequency": np.ndarray[float], sorted by isotopologue and frequency.
+    """
+    rotational_constants = np.asarray(rotational_constants, dtype=float)
+    pa_dipoles = np.abs(np.asarray(pa_dipoles, dtype=float))
+    low, high = frequency_window
+    labels = get_level_labels(J_max)
+    energies = get_rotational_energies(rotational_constants, J_max)
+
+    isotopologues, types, uppers, lowers, frequencies = [], [], [], [], []
+    for axis, transition_type in enumerate(TRANSITION_TYPES):
+        selected = np.flatnonzero(pa_dipoles[:, axis] > dipole_threshold)
+        if len(selected) == 0:
+            continue
+        pairs = get_transition_pairs(J_max, transition_type, max_delta_k)
+        differences = (
+            energies[selected][:, pairs[:, 1]] - energies[selected][:, pairs[:, 0]]
+        )
+        iso_rows, pair_rows = np.nonzero(
+            (np.abs(differences) >= low) & (np.abs(differences) <= high)
+        )
+        differences = differences[iso_rows, pair_rows]
+        # The second level of a pair is not always the upper one
+        upward = differences >= 0
+        upper = np.where(upward, pairs[pair_rows, 1], pairs[pair_rows, 0])
+        lower = np.where(upward, pairs[pair_rows, 0], pairs[pair_rows, 1])
+
+        isotopologues.append(selected[iso_rows])
+        types.append(np.full(len(iso_rows), transition_type))
+        uppers.append(labels[upper])
+        lowers.append(labels[lower])
+        frequencies.append(np.abs(differences))
+
+    if not frequencies:
+        return {
+            "isotopologue": np.empty(0, dtype=int),
+            "type": np.empty(0, dtype=str),
+            "upper": np.empty((0, 3), dtype=int),
+            "lower": np.empty((0, 3), dtype=int),
+            "frequency": np.empty(0),
+        }
+
+    isotopologues = np.concatenate(isotopologues)
+    frequencies = np.concatenate(frequencies)
+    order = np.lexsort((frequencies, isotopologues))
+    return {
+        "isotopologue": isotopologues[order],
+        "type": np.concatenate(types)[order],
+        "upper": np.concatenate(uppers)[order],
+        "lower": np.concatenate(lowers)[order],
+        "frequency": frequencies[order],
+    }
+
+
+def get_spectrum_values(
+    isotopologue_names,
+    rotational_constants,
+    pa_dipoles,
+    J_max,
+    frequency_window=(0.0, np.inf),
+    max_delta_k=1,
+):
+    """Predict the rigid rotor transitions of every isotopologue
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names.
+    rotational_constants : dict
+        key = isotopologue_name: str
+        value = np.array[float] of A, B, C in MHz
+    pa_dipoles : dict
+        key = isotopologue_name: str
+        value = np.array[float] of mu_A, mu_B, mu_C
+    J_max : int
+        Highest rotational quantum number J.
+    frequency_window : tuple[float, float], default (0, inf)
+        Lowest and highest frequency in MHz.
+    max_delta_k : int, default 1
+        See ``get_transition_pairs``.
+
+    Returns
+    -------
+    spectrum_data : dict
+        The output of ``get_transitions``, with "isotopologue" holding the
+        isotopologue names.
+    """
+    constants = np.array([rotational_constants[iso] for iso in isotopologue_names])
+    dipoles = np.array([pa_dipoles[iso] for iso in isotopologue_names])
+
+    # Linear molecules have no finite A constant
+    finite = np.all(np.isfinite(constants), axis=-1)
+    for iso in np.array(isotopologue_names)[~finite]:
+        print(
+            f"WARNING: {iso} has a non-finite rotational constant; "
+            "no transitions are predicted for it."
+        )
+
+    spectrum_data = get_transitions(
+        constants[finite],
+        dipoles[finite],
+        J_max,
+        frequency_window=frequency_window,
+        max_delta_k=max_delta_k,
+    )
+    names = np.array(isotopologue_names, dtype=object)[finite]
+    spectrum_data["isotopologue"] = names[spectrum_data["isotopologue"]]
+    return spectrum_data
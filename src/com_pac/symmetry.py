@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import numpy as np
+
+from com_pac.diagonalize import (
+    get_COM_coordinates,
+    get_COM_inertia_matrices_gemm,
+    get_eigens,
+    get_inertia_matrix,
+    get_principal_axes_batch,
+)
+
+# Largest displacement of an atom from the image of its symmetry partner,
+# relative to the size of the molecule, and largest relative change of the
+# dipole.  Coordinates given to fewer digits are not symmetric to this
+# tolerance, and are computed directly.
+SYMMETRY_TOLERANCE = 1e-8
+# Largest difference, relative to their largest element, of the fanned-out
+# inertia tensors from those of get_COM_inertia_matrices_gemm
+SYMMETRY_CHECK_TOLERANCE = 1e-9
+# Highest order of the rotations tried about the unique axis of symmetric tops
+MAX_ROTATION_ORDER = 8
+
+
+def _candidate_operations(com_coordinates, inertia, tolerance):
+    """Orthogonal matrices that may map the molecule onto itself"""
+    eigenvalues, eigenvectors = get_eigens(inertia)
+    # Identity first and proper rotations before reflections, so that they
+    # are kept over reflections that permute the atoms in the same way
+    signs = np.array(
+        [[sa, sb, sa * sb * sc] for sc in (1, -1) for sa in (1, -1) for sb in (1, -1)],
+        dtype=float,
+    )
+    candidates = [eigenvectors @ np.diag(s) @ eigenvectors.T for s in signs]
+    candidates[0] = np.eye(3)
+
+    # Symmetric tops: rotations about the unique axis and vertical mirror
+    # planes, whose orientation the degenerate eigenvectors do not fix
+    gaps = np.abs(np.diff(eigenvalues)) <= tolerance * eigenvalues[-1]
+    if np.count_nonzero(gaps) == 1:
+        axis = eigenvectors[:, 2] if gaps[0] else eigenvectors[:, 0]
+        cross = np.array(
+            [
+                [0.0, -axis[2], axis[1]],
+                [axis[2], 0.0, -axis[0]],
+                [-axis[1], axis[0], 0.0],
+            ]
+        )
+        for order in range(2, MAX_ROTATION_ORDER + 1):
+            for k in range(1, order):
+                angle = 2 * np.pi * k / order
+                candidates.append(
+                    np.eye(3)
+                    + np.sin(angle) * cross.T
+                    + (1 - np.cos(angle)) * (cross.T @ cross.T)
+                )
+        size = np.max(np.linalg.norm(com_coordinates, axis=-1))
+        for position in com_coordinates:
+            normal = np.cross(axis, position)
+            if np.linalg.norm(normal) > tolerance * size:
+                normal /= np.linalg.norm(normal)
+                candidates.append(np.eye(3) - 2 * np.outer(normal, normal))
+
+    return np.array(candidates)
+
+
+def find_symmetry_operations(
+    mol_coordinates, mol_masses, mol_dipole=None, tolerance=SYMMETRY_TOLERANCE
+):
+    """Find the point group operations of a molecule as atom permutations
+
+    Parameters
+    ----------
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of Cartesian coordinates.
+    mol_masses : array-like
+        Array of shape (n_atoms,) of the (parent) atomic masses; only atoms of
+        equal mass can be exchanged.
+    mol_dipole : array-like, optional
+        Dipole vector; if given, operations that change it are rejected.
+    tolerance : float, default SYMMETRY_TOLERANCE
+        Largest displacement of an atom from the image of its partner,
+        relative to the largest distance of an atom from the center of mass,
+        and largest change of the dipole relative to its length.
+
+    Returns
+    -------
+    center : np.ndarray, shape (3,)
+        Center of mass, the fixed point of the operations.
+    rotations : np.ndarray, shape (n_ops, 3, 3)
+        Orthogonal matrices ``R`` of the operations, acting on row vectors.
+    permutations : np.ndarray[int], shape (n_ops, n_atoms)
+        ``X[permutations[g, j]] = X[j] @ rotations[g]`` for the COM
+        coordinates ``X``.  Row 0 is the identity, and the rows are closed
+        under composition.
+
+    Notes
+    -----
+    The candidates are the axis sign changes of the principal axes (C2 axes,
+    mirror planes and the inversion of Abelian groups) and, for symmetric
+    tops, the rotations about the unique axis up to order
+    ``MAX_ROTATION_ORDER`` and the vertical mirror planes through each atom.
+    Products of the operations found are added until the group is closed.
+    The extra operations of spherical tops are not searched for.
+    """
+    mol_coordinates = np.asarray(mol_coordinates, dtype=float)
+    mol_masses = np.asarray(mol_masses, dtype=float)
+    com_coordinates, center = get_COM_coordinates(mol_masses, mol_coordinates)
+    inertia = get_inertia_matrix(com_coordinates, mol_masses)
+
+    candidates = _candidate_operations(com_coordinates, inertia, tolerance)
+    if mol_dipole is not None:
+        dipole = np.asarray(mol_dipole, dtype=float)
+        candidates = candidates[
+            np.linalg.norm(dipole @ candidates - dipole, axis=-1)
+            <= tolerance * np.linalg.norm(dipole)
+        ]
+
+    # Distances from every transformed atom to every atom
+    images = com_coordinates @ candidates
+    distances = np.linalg.norm(
+        images[:, :, np.newaxis, :] - com_coordinates[np.newaxis, np.newaxis, :, :],
+        axis=-1,
+    )
+    distances[..., mol_masses[:, np.newaxis] != mol_masses[np.newaxis, :]] = np.inf
+    permutations = np.argmin(distances, axis=-1)
+    size = np.max(np.linalg.norm(com_coordinates, axis=-1))
+    matched = np.all(np.min(distances, axis=-1) <= tolerance * size, axis=-1)
+
+    rotations = []
+    operations = {}
+    for rotation, permutation in zip(candidates[matched], permutations[matched]):
+        key = tuple(permutation)
+        if len(set(key)) == len(key) and key not in operations:
+            operations[key] = len(rotations)
+            rotations.append(rotation)
+
+    # Close the group under composition
+    keys = list(operations)
+    i = 0
+    while i < len(keys):
+        for j in range(i + 1):
+            for first, second in ((i, j), (j, i)):
+                product = tuple(np.array(keys[second])[list(keys[first])])
+                if product not in operations:
+                    operations[product] = len(rotations)
+                    keys.append(product)
+                    rotations.append(rotations[first] @ rotations[second])
+        i += 1
+
+    return center, np.array(rotations), np.array(keys, dtype=int)
+
+
+def canonicalize_isotopologues(mass_matrix, permutations):
+    """Group the isotopologues that are related by the symmetry operations
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses (or mass numbers).
+    permutations : array-like[int]
+        Array of shape (n_ops, n_atoms) of ``find_symmetry_operations``.
+
+    Returns
+    -------
+    canonical_rows : np.ndarray, shape (n_classes, n_atoms)
+        The lexicographically smallest permuted row of each class.
+    class_indices : np.ndarray[int], shape (n_iso,)
+        Row of ``canonical_rows`` of every isotopologue.
+    operation_indices : np.ndarray[int], shape (n_iso,)
+        Operation ``g`` with ``mass_matrix[i, permutations[g]]`` equal to the
+        canonical row of isotopologue ``i``.
+    """
+    mass_matrix = np.asarray(mass_matrix)
+    permutations = np.asarray(permutations)
+    n_iso, n_atoms = mass_matrix.shape
+
+    # Every permuted row of every isotopologue, ranked lexicographically
+    permuted = mass_matrix[:, permutations]
+    _, ranks = np.unique(permuted.reshape(-1, n_atoms), axis=0, return_inverse=True)
+    operation_indices = np.argmin(ranks.reshape(n_iso, -1), axis=-1)
+    canonical = permuted[np.arange(n_iso), operation_indices]
+    canonical_rows, class_indices = np.unique(canonical, axis=0, return_inverse=True)
+    return canonical_rows, class_indices.reshape(-1), operation_indices
+
+
+def get_principal_axes_batch_symmetric(
+    mol_masses,
+    mol_coordinates,
+    mol_dipole,
+    tolerance=SYMMETRY_TOLERANCE,
+    eigen_backend=None,
+    inertia_method="direct",
+):
+    """``get_principal_axes_batch`` computed once per symmetry-equivalent class
+
+    Parameters
+    ----------
+    mol_masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses; row 0 (the parent)
+        sets the symmetry of the molecule.
+    mol_coordinates, mol_dipole, eigen_backend, inertia_method
+        See ``get_principal_axes_batch``.
+    tolerance : float, default SYMMETRY_TOLERANCE
+        See ``find_symmetry_operations``.
+
+    Returns
+    -------
+    tuple
+        The outputs of ``get_principal_axes_batch``, in the same order.
+
+    Notes
+    -----
+    An isotopologue whose masses are those of its class representative
+    permuted by an operation ``(R, p)`` is the representative moved by ``R``
+    with atom ``j`` relabelled ``p[j]``.  Its COM coordinates, COM values,
+    COM inertia matrix and eigenvectors follow by applying ``R``, while its
+    principal axes quantities are those of the representative, with atoms
+    permuted and, for an improper ``R``, the c axis negated to keep the frame
+    right-handed.  Axis signs may therefore differ from a direct calculation,
+    which are arbitrary in both cases.
+
+    Every fanned-out COM inertia tensor is checked against the GEMM
+    evaluation, which is cheap next to the diagonalizations.  Isotopologues
+    whose tensors differ by more than ``SYMMETRY_CHECK_TOLERANCE``, e.g.
+    because a loose ``tolerance`` accepted an approximate symmetry, are
+    computed directly instead.
+    """
+    mol_masses = np.asarray(mol_masses, dtype=float)
+    mol_coordinates = np.asarray(mol_coordinates, dtype=float)
+    center, rotations, permutations = find_symmetry_operations(
+        mol_coordinates, mol_masses[0], mol_dipole, tolerance=tolerance
+    )
+    canonical_masses, class_indices, operation_indices = canonicalize_isotopologues(
+        mol_masses, permutations
+    )
+
+    (
+        _,
+        rotational_constants,
+        pa_dipoles,
+        pa_coordinates,
+        pa_inertias,
+        com_coordinates,
+        com_inertias,
+        eigenvectors,
+        eigenvalues,
+        COM_values,
+    ) = get_principal_axes_batch(
+        canonical_masses,
+        mol_coordinates,
+        mol_dipole,
+        eigen_backend=eigen_backend,
+        inertia_method=inertia_method,
+    )
+
+    # Fan the representatives out to the isotopologues
+    R = rotations[operation_indices]
+    R_T = np.swapaxes(R, -2, -1)
+    inverse_permutations = np.argsort(permutations[operation_indices], axis=-1)
+    handedness = np.ones((len(mol_masses), 3))
+    handedness[:, 2] = np.sign(np.linalg.det(R))
+    # Representatives themselves are copied exactly
+    identity = (operation_indices == 0)[:, np.newaxis]
+    COM_values = COM_values[class_indices]
+
+    def permute_atoms(coordinates):
+        return np.take_along_axis(
+            coordinates, inverse_permutations[..., np.newaxis], axis=1
+        )
+
+    results = [
+        mol_masses,
+        rotational_constants[class_indices],
+        pa_dipoles[class_indices],
+        permute_atoms(pa_coordinates[class_indices] * handedness[:, np.newaxis, :]),
+        pa_inertias[class_indices]
+        * handedness[:, :, np.newaxis]
+        * handedness[:, np.newaxis, :],
+        permute_atoms(com_coordinates[class_indices] @ R),
+        R_T @ com_inertias[class_indices] @ R,
+        (R_T @ eigenvectors[class_indices]) * handedness[:, np.newaxis, :],
+        eigenvalues[class_indices],
+        np.where(
+            identity,
+            COM_values,
+            ((COM_values - center)[:, np.newaxis, :] @ R)[:, 0, :] + center,
+        ),
+    ]
+
+    expected_inertias, _ = get_COM_inertia_matrices_gemm(mol_masses, mol_coordinates)
+    mismatched = np.max(
+        np.abs(results[6] - expected_inertias), axis=(-2, -1)
+    ) > SYMMETRY_CHECK_TOLERANCE * np.max(np.abs(expected_inertias), axis=(-2, -1))
+    if np.any(mismatched):
+        direct = get_principal_axes_batch(
+            mol_masses[mismatched],
+            mol_coordinates,
+            mol_dipole,
+            eigen_backend=eigen_backend,
+            inertia_method=inertia_method,
+        )
+        for result, values in zip(results[1:], direct[1:]):
+            result[mismatched] = values
+    return tuple(results)
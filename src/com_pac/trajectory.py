@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+# ========= #
+#  Imports  #
+# ========= #
+import mmap
+
+import numpy as np
+
+from com_pac.diagonalize import (
+    get_COM_inertia_matrices_gemm,
+    get_eigens_batch,
+    get_principal_axes_batch,
+    inertia_to_rot_const,
+    transform_dipole,
+)
+
+# Frames read and processed together; bounds the (chunk, n_iso, n_atoms, 3)
+# principal axes coordinate stacks.
+TRAJECTORY_CHUNK_SIZE = 1024
+TRAJECTORY_QUANTITIES = ("A", "B", "C", "mu_A", "mu_B", "mu_C")
+
+
+def _parse_xyz_frames(lines, atom_symbols, first_frame):
+    """Parse the lines of whole XYZ frames into a (n_frames, n_atoms, 3) array"""
+    n_atoms = len(atom_symbols)
+    frame_lines = np.array(lines, dtype=object).reshape(-1, n_atoms + 2)
+
+    for i, count_line in enumerate(frame_lines[:, 0]):
+        try:
+            count = int(count_line)
+        except ValueError:
+            count = None
+        if count != n_atoms:
+            raise ValueError(
+                f"Frame {first_frame + i} of the trajectory does not start with the "
+                f"number of atoms {n_atoms}: {count_line.strip()!r}"
+            )
+
+    tokens = b" ".join(frame_lines[:, 2:].ravel()).split()
+    if len(tokens) != len(frame_lines) * n_atoms * 4:
+        raise ValueError(
+            "Atom lines of the trajectory must read 'Symbol x y z' "
+            f"(frames {first_frame} to {first_frame + len(frame_lines) - 1})."
+        )
+    tokens = np.array(tokens).reshape(len(frame_lines), n_atoms, 4)
+
+    mismatched = np.any(tokens[..., 0] != np.array(atom_symbols, dtype="S"), axis=-1)
+    if np.any(mismatched):
+        raise ValueError(
+            f"Atoms of trajectory frame {first_frame + np.argmax(mismatched)} do not "
+            f"match the order of the coordinates section {list(atom_symbols)}."
+        )
+    return tokens[..., 1:].astype(float)
+
+
+def iterate_xyz_frames(trajectory_path, atom_symbols, chunk_size=TRAJECTORY_CHUNK_SIZE):
+    """Stream the frames of a multi-frame XYZ file in chunks
+
+    Parameters
+    ----------
+    trajectory_path : str or Path
+        Multi-frame XYZ file: every frame is a line with the number of atoms,
+        a comment line, and one "Symbol x y z" line per atom.
+    atom_symbols : list[str]
+        Element symbols in the order of the Coordinates section; every frame
+        must list its atoms in the same order.
+    chunk_size : int, optional
+        Maximum number of frames per chunk.
+
+    Yields
+    ------
+    np.ndarray, shape (n_chunk, n_atoms, 3)
+        Coordinates of the frames of the chunk.
+
+    Notes
+    -----
+    The file is memory-mapped and read line by line, so only the current
+    chunk is ever held in memory.  A file without any frame, even if it
+    holds blank lines, raises a ValueError.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    lines_per_chunk = chunk_size * (len(atom_symbols) + 2)
+
+    with open(trajectory_path, "rb") as infile:
+        try:
+            mapped_file = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise ValueError(f"Trajectory file {trajectory_path} is empty.") from exc
+
+        with mapped_file:
+            first_frame = 0
+            while True:
+                lines = []
+                while len(lines) < lines_per_chunk:
+                    line = mapped_file.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+
+                if len(lines) % (len(atom_symbols) + 2):
+                    # Only blank lines may follow the last complete frame
+                    n_whole = len(lines) - len(lines) % (len(atom_symbols) + 2)
+                    if any(line.strip() for line in lines[n_whole:]):
+                        raise ValueError(
+                            f"Trajectory frame {first_frame + n_whole // (len(atom_symbols) + 2)} "
+                            "is incomplete."
+                        )
+                    lines = lines[:n_whole]
+                if not lines:
+                    if first_frame == 0:
+                        raise ValueError(f"Trajectory file {trajectory_path} is empty.")
+                    return
+
+                frames = _parse_xyz_frames(lines, atom_symbols, first_frame)
+                first_frame += len(frames)
+                yield frames
+
+
+def get_frame_principal_axes(mol_masses, frames, mol_dipole, reference_pa_coordinates):
+    """Calculate the constants of every frame and isotopologue of a chunk
+
+    Parameters
+    ----------
+    mol_masses : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses.
+    frames : array-like
+        Array of shape (n_frames, n_atoms, 3) of Cartesian coordinates.
+    mol_dipole : array-like
+        Dipole vector of length 3 in the frame of the coordinates.
+    reference_pa_coordinates : array-like
+        Array of shape (n_iso, n_atoms, 3) of principal axes coordinates of a
+        reference geometry, used to fix the direction of each principal axis.
+
+    Returns
+    -------
+    rotational_constants : np.ndarray, shape (n_frames, n_iso, 3)
+    pa_dipoles : np.ndarray, shape (n_frames, n_iso, 3)
+    pa_coordinates : np.ndarray, shape (n_frames, n_iso, n_atoms, 3)
+
+    Notes
+    -----
+    Each principal axis is only defined up to its sign, so every axis is
+    flipped where needed to make ``sum_k m_k p_kg p_kg^ref`` non-negative.
+    This criterion does not depend on the orientation of the frame, so PA
+    coordinates average consistently even for freely rotating trajectories.
+    Near-degenerate moments (e.g. A close to B) still let the two axes mix
+    between frames, which shows up as large PA coordinate deviations.
+    The dipole components assume the frames share the orientation of the
+    Coordinates section.
+    """
+    mol_masses = np.asarray(mol_masses, dtype=float)
+    frames = np.asarray(frames, dtype=float)
+    n_frames, n_iso = len(frames), len(mol_masses)
+
+    com_inertias, COM = get_COM_inertia_matrices_gemm(mol_masses, frames)
+    eigenvalues, eigenvectors = get_eigens_batch(com_inertias.reshape(-1, 3, 3))
+    eigenvalues = eigenvalues.reshape(n_frames, n_iso, 3)
+    eigenvectors = eigenvectors.reshape(n_frames, n_iso, 3, 3)
+
+    com_coordinates = frames[:, np.newaxis, :, :] - COM[:, :, np.newaxis, :]
+    pa_coordinates = com_coordinates @ eigenvectors
+    overlaps = np.einsum(
+        "ik,fikg,ikg->fig", mol_masses, pa_coordinates, reference_pa_coordinates
+    )
+    signs = np.where(overlaps < 0, -1.0, 1.0)
+    pa_coordinates *= signs[:, :, np.newaxis, :]
+
+    rotational_constants = inertia_to_rot_const(eigenvalues)
+    pa_dipoles = transform_dipole(mol_dipole, eigenvectors)
+    return rotational_constants, pa_dipoles, pa_coordinates
+
+
+def _merge_moments(moments, samples):
+    """Fold a chunk of samples into running (count, mean, M2) moments"""
+    count, mean, m2 = moments
+    chunk_count = len(samples)
+    chunk_mean = samples.mean(axis=0)
+    chunk_m2 = np.sum((samples - chunk_mean) ** 2, axis=0)
+
+    total = count + chunk_count
+    delta = chunk_mean - mean
+    mean = mean + delta * chunk_count / total
+    m2 = m2 + chunk_m2 + delta**2 * count * chunk_count / total
+    return total, mean, m2
+
+
+def get_trajectory_averages(
+    mass_matrix,
+    mol_coordinates,
+    mol_dipole,
+    trajectory_path,
+    atom_symbols,
+    chunk_size=TRAJECTORY_CHUNK_SIZE,
+):
+    """Average the principal axes quantities of every isotopologue over a trajectory
+
+    Parameters
+    ----------
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, see ``get_mass_matrix``.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of the reference (Coordinates section)
+        geometry, which fixes the direction of each principal axis.
+    mol_dipole : array-like
+        Dipole vector of length 3.
+    trajectory_path : str or Path
+        Multi-frame XYZ file, see ``iterate_xyz_frames``.
+    atom_symbols : list[str]
+        Element symbols in the order of the Coordinates section.
+    chunk_size : int, optional
+        Number of frames processed together.
+
+    Returns
+    -------
+    trajectory_data : dict
+        "n_frames": int
+        "rotational_constants", "pa_dipoles", "pa_coordinates": dict with the
+        "mean" and "std" over the frames, of shape (n_iso, 3) or
+        (n_iso, n_atoms, 3).
+
+    Notes
+    -----
+    Means and variances are accumulated chunk by chunk with the pairwise
+    update of Chan et al., so the trajectory is never held in memory.
+    """
+    mass_matrix = np.asarray(mass_matrix, dtype=float)
+    reference_pa_coordinates = get_principal_axes_batch(
+        mass_matrix, mol_coordinates, mol_dipole
+    )[3]
+
+    quantities = ("rotational_constants", "pa_dipoles", "pa_coordinates")
+    shapes = (
+        (len(mass_matrix), 3),
+        (len(mass_matrix), 3),
+        reference_pa_coordinates.shape,
+    )
+    moments = {
+        quantity: (0, np.zeros(shape), np.zeros(shape))
+        for quantity, shape in zip(quantities, shapes)
+    }
+
+    for frames in iterate_xyz_frames(trajectory_path, atom_symbols, chunk_size):
+        chunk_results = get_frame_principal_axes(
+            mass_matrix, frames, mol_dipole, reference_pa_coordinates
+        )
+        for quantity, samples in zip(quantities, chunk_results):
+            moments[quantity] = _merge_moments(moments[quantity], samples)
+
+    n_frames = moments["rotational_constants"][0]
+    trajectory_data = {"n_frames": n_frames}
+    for quantity, (count, mean, m2) in moments.items():
+        trajectory_data[quantity] = {
+            "mean": mean,
+            "std": np.sqrt(m2 / (count - 1)) if count > 1 else np.full_like(m2, np.nan),
+        }
+    return trajectory_data
+
+
+def get_trajectory_values(
+    isotopologue_names,
+    mass_matrix,
+    mol_coordinates,
+    mol_dipole,
+    trajectory_path,
+    atom_symbols,
+    atom_numbering,
+    chunk_size=TRAJECTORY_CHUNK_SIZE,
+):
+    """Calculate trajectory averages of every isotopologue
+
+    Parameters
+    ----------
+    isotopologue_names : list[str]
+        List of isotopologue names, in the row order of ``mass_matrix``.
+    mass_matrix : array-like
+        Array of shape (n_iso, n_atoms) of atomic masses, see ``get_mass_matrix``.
+    mol_coordinates : array-like
+        Array of shape (n_atoms, 3) of the Coordinates section geometry.
+    mol_dipole : array-like
+        Dipole vector of length 3.
+    trajectory_path : str or Path
+        Multi-frame XYZ file, see ``iterate_xyz_frames``.
+    atom_symbols : list[str]
+        Element symbols in the order of the Coordinates section.
+    atom_numbering : list[str]
+        Atom labels of the form "<Symbol><AtomNumber>".
+    chunk_size : int, optional
+        Number of frames processed together.
+
+    Returns
+    -------
+    trajectory_data : dict
+        key = (isotopologue_name, quantity): tuple[str, str], with quantity one
+        of "A", "B", "C" (MHz) or "mu_A", "mu_B", "mu_C"
+        value = dict with the "mean" and "std" over the frames
+    trajectory_pa_data : dict
+        key = (isotopologue_name, atom_label): tuple[str, str]
+        value = dict with the mean "a", "b", "c" principal axes coordinates
+        and their "std_a", "std_b", "std_c"
+    """
+    averages = get_trajectory_averages(
+        mass_matrix,
+        mol_coordinates,
+        mol_dipole,
+        trajectory_path,
+        atom_symbols,
+        chunk_size=chunk_size,
+    )
+    if averages["n_frames"] < 2:
+        print(
+            "WARNING: Trajectory has fewer than two frames - standard deviations "
+            "are undefined!"
+        )
+
+    means = np.concatenate(
+        [averages[key]["mean"] for key in ("rotational_constants", "pa_dipoles")],
+        axis=-1,
+    )
+    stds = np.concatenate(
+        [averages[key]["std"] for key in ("rotational_constants", "pa_dipoles")],
+        axis=-1,
+    )
+
+    trajectory_data = {}
+    trajectory_pa_data = {}
+    for i, iso in enumerate(isotopologue_names):
+        for j, quantity in enumerate(TRAJECTORY_QUANTITIES):
+            trajectory_data[(iso, quantity)] = {
+                "mean": means[i, j],
+                "std": stds[i, j],
+            }
+        for k, atom_label in enumerate(atom_numbering):
+            mean = averages["pa_coordinates"]["mean"][i, k]
+            std = averages["pa_coordinates"]["std"][i, k]
+            trajectory_pa_data[(iso, atom_label)] = {
+                "a": mean[0],
+                "b": mean[1],
+                "c": mean[2],
+                "std_a": std[0],
+                "std_b": std[1],
+                "std_c": std[2],
+            }
+    return trajectory_data, trajectory_pa_data
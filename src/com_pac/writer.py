@@ -62,6 +62,11 @@ def _build_preamble_section(num_of_decimals, csv_output_name):
     return preamble
 
 
+def _build_noted_section(title, note, *blocks):
+    """Join a section header, its note in parentheses and its text blocks"""
+    return "\n".join([header_creator(title), f"({note})\n", *blocks])
+
+
 def _build_input_section(input_file):
     return "\n".join([header_creator("Raw Input"), input_file.strip()])
 
@@ -239,6 +244,178 @@ def _build_theta_results_section(
     )
 
 
+def _build_inertial_quantities_section(inertial_df, num_of_decimals):
+    """Build the inertial quantities section of the output file.
+
+    Parameters
+    ----------
+    inertial_df : pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = "P_aa", "P_bb", "P_cc", "Delta", "kappa"
+        Value = float
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted inertial quantities section.
+    """
+    return _build_noted_section(
+        "Inertial Quantities",
+        (
+            "Planar moments P_gg and inertial defect Delta = I_c - I_a - I_b in"
+            " amu Angstrom^2,\n Ray's asymmetry parameter kappa = (2B - A - C)"
+            " / (A - C)."
+        ),
+        df_text_export(inertial_df, n_decimals=num_of_decimals),
+    )
+
+
+def _build_rotation_section(rotation_df, num_of_decimals):
+    """Build the frame rotation section of the output file.
+
+    Parameters
+    ----------
+    rotation_df : pd.DataFrame
+        RowLabel = isotopologue_name: str
+        ColumnLabel = rotation label: str
+        Value = float
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted frame rotation section.
+    """
+    return _build_noted_section(
+        "Principal Axes Rotations",
+        (
+            "Rotation from the parent principal axes to each isotopologue's, as a"
+            " quaternion,\n an angle (degrees) about a unit axis in the parent frame,"
+            " and Tait-Bryan angles\n (degrees) with R = R_c(alpha) R_b(beta)"
+            " R_a(gamma).\n For planar molecules, alpha is the in-plane rotation about"
+            " each isotopologue's own\n center of mass, and differs from theta_7,"
+            " which uses the parent's center of mass."
+        ),
+        df_text_export(rotation_df, n_decimals=num_of_decimals),
+    )
+
+
+def _build_kraitchman_section(kraitchman_df, num_of_decimals):
+    """Build the Kraitchman substitution coordinates section of the output file.
+
+    Parameters
+    ----------
+    kraitchman_df : pd.DataFrame
+        RowLabel = (Isotopologue, Atom)
+        ColumnLabel = coordinate or Costain error label: str
+        Value = Angstrom: float
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted Kraitchman section.
+    """
+    return _build_noted_section(
+        "Kraitchman Substitution Coordinates",
+        (
+            "Parent principal axes frame, in Angstrom. d|g| are Costain errors,"
+            " 0.0015 / |g|;\n nan marks imaginary coordinates."
+        ),
+        df_text_export(kraitchman_df, n_decimals=num_of_decimals),
+    )
+
+
+def _build_monte_carlo_section(monte_carlo_df, num_of_decimals):
+    """Build the Monte Carlo uncertainties section of the output file.
+
+    Parameters
+    ----------
+    monte_carlo_df : pd.DataFrame
+        RowLabel = (Isotopologue, Quantity)
+        ColumnLabel = statistic label: str
+        Value = statistic: float
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted Monte Carlo section.
+    """
+    return _build_noted_section(
+        "Monte Carlo Uncertainties",
+        (
+            "Statistics over geometries drawn from the Uncertainties section;"
+            " A, B, C in MHz,\n mu_A, mu_B, mu_C in the units of the Dipole section."
+        ),
+        df_text_export(monte_carlo_df, n_decimals=num_of_decimals),
+    )
+
+
+def _build_trajectory_section(trajectory_df, trajectory_pa_df, num_of_decimals):
+    """Build the trajectory averages section of the output file.
+
+    Parameters
+    ----------
+    trajectory_df : pd.DataFrame
+        RowLabel = (Isotopologue, Quantity)
+        ColumnLabel = "mean", "std"
+    trajectory_pa_df : pd.DataFrame
+        RowLabel = (Isotopologue, Atom)
+        ColumnLabel = "a", "b", "c", "std_a", "std_b", "std_c"
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted trajectory section.
+    """
+    return _build_noted_section(
+        "Trajectory Averages",
+        (
+            "Mean and sample standard deviation over the trajectory frames;"
+            " A, B, C in MHz,\n mu_A, mu_B, mu_C in the units of the Dipole section."
+        ),
+        df_text_export(trajectory_df, n_decimals=num_of_decimals),
+        "\nAveraged principal axes coordinates (Angstrom)\n",
+        df_text_export(trajectory_pa_df, n_decimals=num_of_decimals),
+    )
+
+
+def _build_spectrum_section(spectrum_df, num_of_decimals):
+    """Build the predicted transitions section of the output file.
+
+    Parameters
+    ----------
+    spectrum_df : pd.DataFrame
+        RowLabel = (Isotopologue, Type, J', Ka', Kc', J", Ka", Kc")
+        ColumnLabel = "Frequency"
+        Value = MHz: float
+    num_of_decimals : int
+        Number of decimal places for formatting.
+
+    Returns
+    -------
+    str
+        Formatted transitions section.
+    """
+    return _build_noted_section(
+        "Rigid Rotor Transitions",
+        (
+            "Upper level ', lower level \", frequencies in MHz; a-, b- and c-type"
+            " lines are\n listed for the nonzero dipole components of each"
+            " isotopologue."
+        ),
+        df_text_export(spectrum_df, n_decimals=num_of_decimals),
+    )
+
+
 def generate_output_file(
     num_of_decimals,
     csv_output_name,
@@ -257,6 +434,13 @@ def generate_output_file(
     com_values_df,
     text_output_path,
     theta_df_dict=None,
+    kraitchman_df=None,
+    monte_carlo_df=None,
+    trajectory_df=None,
+    trajectory_pa_df=None,
+    rotation_df=None,
+    inertial_df=None,
+    spectrum_df=None,
 ):
     # TEXT OUTPUT
     #
@@ -292,6 +476,11 @@ def generate_output_file(
         ),
     ]
 
+    if inertial_df is not None:
+        sections_list.append(
+            _build_inertial_quantities_section(inertial_df, num_of_decimals)
+        )
+
     if theta_df_dict is not None:
         sections_list.append(
             _build_theta_results_section(
@@ -301,6 +490,25 @@ def generate_output_file(
             )
         )
 
+    if rotation_df is not None:
+        sections_list.append(_build_rotation_section(rotation_df, num_of_decimals))
+
+    if kraitchman_df is not None:
+        sections_list.append(_build_kraitchman_section(kraitchman_df, num_of_decimals))
+
+    if monte_carlo_df is not None:
+        sections_list.append(
+            _build_monte_carlo_section(monte_carlo_df, num_of_decimals)
+        )
+
+    if trajectory_df is not None:
+        sections_list.append(
+            _build_trajectory_section(trajectory_df, trajectory_pa_df, num_of_decimals)
+        )
+
+    if spectrum_df is not None:
+        sections_list.append(_build_spectrum_section(spectrum_df, num_of_decimals))
+
     sections_delimiter = "\n\n"
     file_string = "{}\n\n".format(sections_delimiter.join(sections_list))
 
@@ -314,24 +522,58 @@ def generate_csv_output(
     dipole_components_df,
     atom_masses_df,
     csv_output_path,
+    kraitchman_df=None,
+    monte_carlo_df=None,
+    trajectory_df=None,
+    trajectory_pa_df=None,
+    rotation_df=None,
+    inertial_df=None,
+    spectrum_df=None,
+    partition_df=None,
 ):
     # .csv file
     # Outputs all data without formatting; scientific notation may be used in the values.
 
     all_pa_coordinates = pd.concat(pa_coordinates_df_dict, axis="columns")
 
-    csv_file_string = "\n".join(
-        [
-            "Rotational Constants",
-            rotational_constants_df.to_csv(),
-            "Dipole Components",
-            dipole_components_df.to_csv(),
-            "Principal Axes Coordinates",
-            all_pa_coordinates.to_csv(),
-            "Atomic Masses",
-            atom_masses_df.to_csv(),
+    csv_sections = [
+        "Rotational Constants",
+        rotational_constants_df.to_csv(),
+        "Dipole Components",
+        dipole_components_df.to_csv(),
+        "Principal Axes Coordinates",
+        all_pa_coordinates.to_csv(),
+        "Atomic Masses",
+        atom_masses_df.to_csv(),
+    ]
+
+    if inertial_df is not None:
+        csv_sections += ["Inertial Quantities", inertial_df.to_csv()]
+
+    if partition_df is not None:
+        csv_sections += ["Rotational Partition Functions", partition_df.to_csv()]
+
+    if rotation_df is not None:
+        csv_sections += ["Principal Axes Rotations", rotation_df.to_csv()]
+
+    if kraitchman_df is not None:
+        csv_sections += ["Kraitchman Substitution Coordinates", kraitchman_df.to_csv()]
+
+    if monte_carlo_df is not None:
+        csv_sections += ["Monte Carlo Uncertainties", monte_carlo_df.to_csv()]
+
+    if trajectory_df is not None:
+        csv_sections += [
+            "Trajectory Averages",
+            trajectory_df.to_csv(),
+            "Trajectory Principal Axes Coordinates",
+            trajectory_pa_df.to_csv(),
         ]
-    )
+
+    if spectrum_df is not None:
+        csv_sections += ["Rigid Rotor Transitions", spectrum_df.to_csv()]
+
+    csv_file_string = "\n".join(csv_sections)
 
     with open(csv_output_path, "w") as outfile:
         outfile.write(csv_file_string)
@@ -2,11 +2,19 @@
 Unit tests for functions in core.py
 """
 
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
-from com_pac.core import _non_negative_int, build_parser, read_args
+from com_pac.core import _non_negative_int, build_parser, main, parse_args, read_args
 
-import argparse
+# Cumulative import time allowed for com_pac.core (microseconds). A cold start
+# is ~25 ms; pulling numpy or pandas back in costs well over this budget.
+IMPORT_TIME_BUDGET_US = 150_000
+HEAVY_MODULES = ("numpy", "pandas", "mendeleev")
 
 
 class Test_non_negative_int:
@@ -151,3 +159,249 @@ class Test_read_args:
         with pytest.raises(SystemExit) as exc_info:
             read_args()
         assert exc_info.value.code != 0
+
+
+class Test_parse_args:
+    def test_returns_namespace_with_all_options(self, tmp_path):
+        args = parse_args([str(tmp_path / "input.txt"), "--theta", "--kraitchman"])
+        assert isinstance(args, argparse.Namespace)
+        assert args.theta is True
+        assert args.kraitchman is True
+
+    def test_rotation_default_is_false(self, tmp_path):
+        args = parse_args([str(tmp_path / "input.txt")])
+        assert args.rotation is False
+
+    def test_kraitchman_default_is_false(self, tmp_path):
+        args = parse_args([str(tmp_path / "input.txt")])
+        assert args.kraitchman is False
+
+    def test_symmetry_tolerance_requires_symmetry(self, tmp_path, capsys):
+        input_file = str(tmp_path / "input.txt")
+        args = parse_args([input_file, "--symmetry", "--symmetry-tolerance", "1e-6"])
+        assert args.symmetry_tolerance == 1e-6
+        with pytest.raises(SystemExit):
+            parse_args([input_file, "--symmetry-tolerance", "1e-6"])
+        assert "--symmetry-tolerance requires --symmetry" in capsys.readouterr().err
+
+    def test_seed_requires_monte_carlo(self, tmp_path, capsys):
+        input_file = str(tmp_path / "input.txt")
+        args = parse_args([input_file, "--monte-carlo", "10", "--seed", "3"])
+        assert args.seed == 3
+        with pytest.raises(SystemExit):
+            parse_args([input_file, "--seed", "3"])
+        assert "--seed requires --monte-carlo" in capsys.readouterr().err
+
+    def test_frequency_window_requires_spectrum(self, tmp_path, capsys):
+        input_file = str(tmp_path / "input.txt")
+        window = ["--frequency-window", "1000", "2000"]
+        args = parse_args([input_file, "--spectrum", "5", *window])
+        assert args.frequency_window == [1000.0, 2000.0]
+        with pytest.raises(SystemExit):
+            parse_args([input_file, *window])
+        assert "--frequency-window requires --spectrum" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("sigma", ["1", "2"])
+    def test_symmetry_number_requires_temperatures(self, tmp_path, capsys, sigma):
+        input_file = str(tmp_path / "input.txt")
+        args = parse_args(
+            [input_file, "--temperatures", "300", "--symmetry-number", sigma]
+        )
+        assert args.symmetry_number == int(sigma)
+        with pytest.raises(SystemExit):
+            parse_args([input_file, "--symmetry-number", sigma])
+        assert "--symmetry-number requires --temperatures" in capsys.readouterr().err
+
+
+class Test_main:
+    @pytest.fixture
+    def input_file(self, tmp_path):
+        source = Path(__file__).parents[1] / "latest.txt"
+        input_file = tmp_path / "latest.txt"
+        input_file.write_text(source.read_text())
+        return input_file
+
+    def test_kraitchman_flag_adds_sections(self, monkeypatch, input_file):
+        monkeypatch.setattr("sys.argv", ["com-pac", str(input_file), "--kraitchman"])
+        main()
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Kraitchman Substitution Coordinates" in out_text
+        assert "Kraitchman Substitution Coordinates" in csv_text
+        assert "iso005,H1," in csv_text
+
+    def test_no_kraitchman_sections_by_default(self, monkeypatch, input_file):
+        monkeypatch.setattr("sys.argv", ["com-pac", str(input_file)])
+        main()
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        assert "Kraitchman" not in out_text
+
+    def test_inertial_quantities_always_written(self, input_file):
+        main([str(input_file)])
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Inertial Quantities" in out_text
+        block = csv_text.split("Inertial Quantities\n", 1)[1].splitlines()
+        assert block[0] == "Isotopologue,P_aa,P_bb,P_cc,Delta,kappa"
+        # HN3 is planar: no out-of-plane planar moment
+        assert float(block[1].split(",")[3]) == pytest.approx(0, abs=1e-10)
+
+    def test_monte_carlo_flag_adds_sections(self, monkeypatch, input_file):
+        text = input_file.read_text()
+        input_file.write_text(
+            text.replace(
+                "# Adapted",
+                "Uncertainties\nH 0.005\nN 0.002\nN 0.002\nN 0.002\n\n# Adapted",
+            )
+        )
+        argv = ["com-pac", str(input_file), "--monte-carlo", "20", "--seed", "1"]
+        monkeypatch.setattr("sys.argv", argv)
+        main()
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Monte Carlo Uncertainties" in out_text
+        assert "Monte Carlo Uncertainties" in csv_text
+        assert "iso005,mu_C," in csv_text
+
+    def test_index_and_match(self, input_file, capsys):
+        index_path = input_file.parent / "latest_index.npz"
+        main([str(input_file), "--index", str(index_path)])
+        assert index_path.exists()
+        capsys.readouterr()
+
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        rotational_constants = csv_text.split("\n")[2:5]
+        iso005 = [float(row.split(",")[5]) for row in rotational_constants]
+        main(["match", str(index_path), *map(str, iso005), "--tolerance", "0.01"])
+        output = capsys.readouterr().out.splitlines()
+        assert output[1].split()[:2] == ["1", "iso005"]
+        assert len(output) == 2
+
+    @pytest.mark.parametrize(
+        "args, message",
+        [
+            (["1", "2", "3", "--tolerance", "0"], "not a positive number"),
+            (["1", "2", "3", "--tolerance", "-1"], "not a positive number"),
+            (["1", "2", "3", "--tolerance", "nan"], "not a positive number"),
+            (["nan", "nan", "nan"], "at least one of A, B and C must be observed"),
+        ],
+    )
+    def test_match_rejects_bad_arguments(self, tmp_path, capsys, args, message):
+        with pytest.raises(SystemExit):
+            main(["match", str(tmp_path / "index.npz"), *args])
+        assert message in capsys.readouterr().err
+
+    def test_rotation_flag_adds_sections(self, input_file):
+        main([str(input_file), "--rotation"])
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Principal Axes Rotations" in out_text
+        block = csv_text.split("Principal Axes Rotations\n", 1)[1].splitlines()
+        assert block[0].startswith("Isotopologue,q_w,q_x,q_y,q_z,angle,")
+        assert block[1].startswith("iso001,1.0,")
+
+    def test_trajectory_flag_adds_sections(self, input_file):
+        trajectory = input_file.parent / "traj.xyz"
+        frame = "4\nframe\nH -1.59 0.83 0.0\nN -1.16 -0.09 0.0\n"
+        frame += "N 0.07 0.04 0.0\nN 1.20 -0.01 0.0\n"
+        trajectory.write_text(frame + frame.replace("-1.59", "-1.58"))
+        main([str(input_file), "--trajectory", str(trajectory)])
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Trajectory Averages" in out_text
+        assert "Trajectory Principal Axes Coordinates" in csv_text
+        assert "iso005,mu_C," in csv_text
+        assert "iso005,N4," in csv_text
+
+    def test_spectrum_flag_adds_sections(self, input_file):
+        main([str(input_file), "--spectrum", "3", "--frequency-window", "1e3", "1e5"])
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Rigid Rotor Transitions" in out_text
+        block = csv_text.split("Rigid Rotor Transitions\n", 1)[1].splitlines()
+        assert (
+            block[0] == 'Isotopologue,Type,J\',Ka\',Kc\',"J""","Ka""","Kc""",Frequency'
+        )
+        frequencies = [float(line.split(",")[-1]) for line in block[1:]]
+        assert 1e3 <= min(frequencies) and max(frequencies) <= 1e5
+
+    def test_temperatures_flag_adds_csv_block(self, input_file):
+        main([str(input_file), "--temperatures", "5", "298.15"])
+        out_text = (input_file.parent / "latest_pac.out").read_text()
+        csv_text = (input_file.parent / "latest_pac.csv").read_text()
+        assert "Partition" not in out_text
+        block = csv_text.split("Rotational Partition Functions\n", 1)[1].splitlines()
+        assert block[0] == (
+            "Isotopologue,abundance,Q(5 K),Q(298.15 K),I(5 K),I(298.15 K)"
+        )
+        assert block[1].startswith("iso001,0.98")
+
+    def test_symmetry_flag_keeps_output(self, input_file):
+        """HN3 has no symmetry, so every isotopologue is its own representative"""
+        main([str(input_file)])
+        expected = (input_file.parent / "latest_pac.csv").read_text()
+        main([str(input_file), "--symmetry"])
+        assert (input_file.parent / "latest_pac.csv").read_text() == expected
+        main([str(input_file), "--symmetry", "--symmetry-tolerance", "0.1"])
+        assert (input_file.parent / "latest_pac.csv").read_text() == expected
+
+    def test_temperatures_must_be_positive(self, input_file):
+        with pytest.raises(SystemExit):
+            main([str(input_file), "--temperatures", "-5"])
+
+    def test_monte_carlo_requires_uncertainties(self, monkeypatch, input_file):
+        argv = ["com-pac", str(input_file), "--monte-carlo", "20"]
+        monkeypatch.setattr("sys.argv", argv)
+        with pytest.raises(ValueError) as exc:
+            main()
+        assert "requires an Uncertainties section" in str(exc.value)
+
+
+def _run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _parse_importtime(stderr):
+    """Return {module: cumulative_us} from `python -X importtime` output."""
+    cumulative_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        cumulative_times[module.strip()] = int(cumulative)
+    return cumulative_times
+
+
+class Test_import_time:
+    """Heavy dependencies are only imported by the stages of main() that need them."""
+
+    def test_core_does_not_import_heavy_modules(self):
+        result = _run_python("import com_pac.core", "-X", "importtime")
+        imported = _parse_importtime(result.stderr)
+        for module in HEAVY_MODULES:
+            assert module not in imported
+
+    def test_core_import_time_budget(self):
+        result = _run_python("import com_pac.core", "-X", "importtime")
+        imported = _parse_importtime(result.stderr)
+        assert imported["com_pac.core"] < IMPORT_TIME_BUDGET_US
+
+    @pytest.mark.parametrize("flag", ["--version", "--help"])
+    def test_cli_flags_do_not_import_heavy_modules(self, flag):
+        code = (
+            "import sys\n"
+            "from com_pac.core import main\n"
+            f"sys.argv = ['com-pac', '{flag}']\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print(sorted(set({HEAVY_MODULES!r}) & set(sys.modules)))\n"
+        )
+        result = _run_python(code)
+        assert result.stdout.strip().splitlines()[-1] == "[]"
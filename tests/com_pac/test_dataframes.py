@@ -2,21 +2,28 @@
 Unit tests for functions in dataframes.py
 """
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from com_pac.dataframes import (
-    get_atom_masses_df,
-    get_rotational_constants_df,
-    get_dipole_components_df,
-    get_COM_values_df,
     get_atom_indexed_df,
+    get_atom_masses_df,
     get_axis_indexed_df,
+    get_COM_values_df,
     get_dataframes,
+    get_dipole_components_df,
+    get_inertial_quantities_df,
+    get_kraitchman_df,
+    get_monte_carlo_df,
+    get_partition_df,
+    get_rotation_df,
+    get_rotational_constants_df,
+    get_spectrum_df,
     get_theta_df,
+    get_trajectory_df,
 )
 
-import pytest
-import numpy as np
-import pandas as pd
-
 
 def assert_equal_df_float(df1, df2, **kwargs):
     """
@@ -503,6 +510,7 @@ class Test_get_dataframes:
             result_pa_coordinates_df_dict,
             result_com_values_df,
             result_theta_df,
+            result_inertial_df,
         ) = get_dataframes(
             atom_masses=atom_masses,
             atom_symbols=atom_symbols,
@@ -528,6 +536,17 @@ class Test_get_dataframes:
         assert_equal_df_float(result_com_values_df, com_values_df)
         # theta_df should be None when theta_data is not provided
         assert result_theta_df is None
+        # planar moments sum to the principal moments, e.g. I_a = P_bb + P_cc
+        assert list(result_inertial_df.index) == list(isotopologue_names)
+        planar_moments = result_inertial_df[["P_aa", "P_bb", "P_cc"]].to_numpy()
+        principal_moments = np.array(
+            [np.diagonal(pa_inertias[iso]) for iso in isotopologue_names]
+        )
+        np.testing.assert_allclose(
+            planar_moments.sum(axis=1, keepdims=True) - planar_moments,
+            principal_moments,
+            rtol=1e-6,
+        )
 
         for iso in isotopologue_names:
             # compare result_com_coordinates_df_dict to com_coordinates_df_dict
@@ -597,3 +616,183 @@ class Test_get_theta_df:
             index=pd.Index(["iso1", "iso2"]),
         )
         pd.testing.assert_frame_equal(result, expected)
+
+
+class Test_get_kraitchman_df:
+    def test_expected_results(self):
+        """get_kraitchman_df indexes the substitution data by isotopologue and atom."""
+        kraitchman_data = {
+            "iso2": {
+                "atom": "N2",
+                "|a|": 1.0,
+                "|b|": 2.0,
+                "|c|": np.nan,
+                "d|a|": 0.0015,
+                "d|b|": 0.00075,
+                "d|c|": np.nan,
+            },
+            "iso5": {
+                "atom": "H1",
+                "|a|": 3.0,
+                "|b|": 0.5,
+                "|c|": 0.0,
+                "d|a|": 0.0005,
+                "d|b|": 0.003,
+                "d|c|": np.inf,
+            },
+        }
+        result = get_kraitchman_df(kraitchman_data)
+        expected = pd.DataFrame(
+            {
+                "|a|": [1.0, 3.0],
+                "|b|": [2.0, 0.5],
+                "|c|": [np.nan, 0.0],
+                "d|a|": [0.0015, 0.0005],
+                "d|b|": [0.00075, 0.003],
+                "d|c|": [np.nan, np.inf],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [("iso2", "N2"), ("iso5", "H1")], names=["Isotopologue", "Atom"]
+            ),
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class Test_get_monte_carlo_df:
+    def test_expected_results(self):
+        """get_monte_carlo_df indexes the statistics by isotopologue and quantity."""
+        monte_carlo_data = {
+            ("iso1", "A"): {"mean": 10.0, "std": 0.5, "p50": 9.9},
+            ("iso1", "mu_A"): {"mean": 1.0, "std": 0.01, "p50": 1.0},
+            ("iso2", "A"): {"mean": 9.0, "std": np.nan, "p50": 9.0},
+        }
+        result = get_monte_carlo_df(monte_carlo_data)
+        expected = pd.DataFrame(
+            {
+                "mean": [10.0, 1.0, 9.0],
+                "std": [0.5, 0.01, np.nan],
+                "p50": [9.9, 1.0, 9.0],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [("iso1", "A"), ("iso1", "mu_A"), ("iso2", "A")],
+                names=["Isotopologue", "Quantity"],
+            ),
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class Test_get_trajectory_df:
+    def test_expected_results(self):
+        """get_trajectory_df indexes averages by isotopologue and quantity or atom."""
+        trajectory_data = {
+            ("iso1", "A"): {"mean": 10.0, "std": 0.5},
+            ("iso1", "mu_A"): {"mean": 1.0, "std": 0.01},
+        }
+        trajectory_pa_data = {
+            ("iso1", "H1"): {
+                "a": 1.0,
+                "b": 2.0,
+                "c": 0.0,
+                "std_a": 0.1,
+                "std_b": 0.2,
+                "std_c": 0.3,
+            },
+        }
+        trajectory_df, trajectory_pa_df = get_trajectory_df(
+            trajectory_data, trajectory_pa_data
+        )
+        expected = pd.DataFrame(
+            {"mean": [10.0, 1.0], "std": [0.5, 0.01]},
+            index=pd.MultiIndex.from_tuples(
+                [("iso1", "A"), ("iso1", "mu_A")],
+                names=["Isotopologue", "Quantity"],
+            ),
+        )
+        pd.testing.assert_frame_equal(trajectory_df, expected)
+        assert trajectory_pa_df.index.names == ["Isotopologue", "Atom"]
+        assert trajectory_pa_df.loc[("iso1", "H1"), "std_c"] == 0.3
+
+
+class Test_get_rotation_df:
+    def test_expected_results(self):
+        """get_rotation_df indexes the rotation values by isotopologue."""
+        rotation_data = {
+            "iso1": {"q_w": 1.0, "angle": 0.0, "axis_a": np.nan},
+            "iso2": {"q_w": 0.5, "angle": 120.0, "axis_a": 1.0},
+        }
+        result = get_rotation_df(rotation_data)
+        expected = pd.DataFrame(
+            {"q_w": [1.0, 0.5], "angle": [0.0, 120.0], "axis_a": [np.nan, 1.0]},
+            index=pd.Index(["iso1", "iso2"], name="Isotopologue"),
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class Test_get_inertial_quantities_df:
+    def test_expected_results(self):
+        """get_inertial_quantities_df splits the planar moments into columns."""
+        inertial_data = {
+            "planar_moments": np.array([[3.0, 2.0, 0.0], [4.0, 1.0, 0.5]]),
+            "inertial_defect": np.array([0.0, -1.0]),
+            "kappa": np.array([-0.5, np.nan]),
+        }
+        result = get_inertial_quantities_df(["iso1", "iso2"], inertial_data)
+        expected = pd.DataFrame(
+            {
+                "P_aa": [3.0, 4.0],
+                "P_bb": [2.0, 1.0],
+                "P_cc": [0.0, 0.5],
+                "Delta": [0.0, -1.0],
+                "kappa": [-0.5, np.nan],
+            },
+            index=pd.Index(["iso1", "iso2"], name="Isotopologue"),
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class Test_get_spectrum_df:
+    def test_expected_results(self):
+        """get_spectrum_df indexes the frequencies by isotopologue and levels."""
+        spectrum_data = {
+            "isotopologue": np.array(["iso1", "iso2"], dtype=object),
+            "type": np.array(["a", "b"]),
+            "upper": np.array([[1, 0, 1], [2, 1, 2]]),
+            "lower": np.array([[0, 0, 0], [1, 0, 1]]),
+            "frequency": np.array([14593.2, 24925.7]),
+        }
+        result = get_spectrum_df(spectrum_data)
+        assert result.index.names == [
+            "Isotopologue",
+            "Type",
+            "J'",
+            "Ka'",
+            "Kc'",
+            'J"',
+            'Ka"',
+            'Kc"',
+        ]
+        assert result.index[1] == ("iso2", "b", 2, 1, 2, 1, 0, 1)
+        np.testing.assert_array_equal(result["Frequency"], [14593.2, 24925.7])
+
+
+class Test_get_partition_df:
+    def test_expected_results(self):
+        """get_partition_df gives one column per quantity and temperature."""
+        partition_data = {
+            "temperatures": np.array([2.0, 298.15]),
+            "abundances": np.array([0.9, 0.01]),
+            "partition_functions": np.array([[20.0, 4000.0], [21.0, 4200.0]]),
+            "intensities": np.array([[1.0, 1.0], [0.01, 0.01]]),
+        }
+        result = get_partition_df(["iso1", "iso2"], partition_data)
+        expected = pd.DataFrame(
+            {
+                "abundance": [0.9, 0.01],
+                "Q(2 K)": [20.0, 21.0],
+                "Q(298.15 K)": [4000.0, 4200.0],
+                "I(2 K)": [1.0, 0.01],
+                "I(298.15 K)": [1.0, 0.01],
+            },
+            index=pd.Index(["iso1", "iso2"], name="Isotopologue"),
+        )
+        pd.testing.assert_frame_equal(result, expected)
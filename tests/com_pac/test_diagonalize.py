@@ -3,31 +3,55 @@ Unit tests for functions in diagonalize.py
 """
 
 from decimal import DivisionByZero
+from pathlib import Path
 
+import numpy as np
+import pytest
 from mendeleev.fetch import fetch_table
 from mendeleev.mendeleev import element
 
-import pytest
-import numpy as np
 import com_pac.diagonalize as diagonalize
 from com_pac.diagonalize import (
+    THETA_7_UNDEFINED,
+    THETA_8_UNDEFINED,
+    THETA_9_UNDEFINED,
+    THETA_NONPLANAR_PARENT,
+    check_for_bad_diagonal,
+    check_for_length_mismatch,
+    clear_principal_axes_cache,
+    get_atom_inertia_tensors,
+    get_bad_diagonal_mask,
+    get_COM_coordinates,
+    get_COM_coordinates_batch,
+    get_COM_inertia_matrices_gemm,
+    get_eigen_backend,
+    get_eigens,
+    get_eigens_analytic,
+    get_eigens_batch,
+    get_eigenvalue_jacobians,
     get_inertia_matrix,
-    inertia_to_rot_const,
-    get_mol_masses,
+    get_inertia_matrix_batch,
+    get_inertial_quantities_batch,
     get_isotopes_dict,
-    get_unique_isotopes,
     get_isotopes_mass,
+    get_isotopologue_principal_axes,
+    get_mass_matrix,
+    get_mass_matrix_from_mass_numbers,
+    get_mol_masses,
+    get_principal_axes,
+    get_principal_axes_batch,
+    get_principal_axes_cache_info,
+    get_rot_const_jacobians,
+    get_theta_values,
+    get_theta_values_batch,
+    get_unique_isotopes,
     get_unique_isotopes_mass_dict,
-    get_COM_coordinates,
-    get_eigens,
+    get_unique_mass_rows,
+    inertia_to_rot_const,
     rotate_coordinates,
-    get_principal_axes,
-    get_isotopologue_principal_axes,
-    check_for_length_mismatch,
-    check_for_bad_diagonal,
     transform_dipole,
-    get_theta_values,
 )
+from com_pac.parser import parse_input_file
 
 
 @pytest.fixture
@@ -1160,7 +1184,8 @@ class Test_get_unique_isotopes:
 
 class Test_get_isotopes_mass:
     """
-    Only simple testing, since this function is effectively a wrapper for the Mendeleev method.
+    Only simple testing, since this function is effectively a wrapper for the
+    vendored isotope table (see test_isotopes.py).
     """
 
     @pytest.mark.parametrize(
@@ -1202,15 +1227,13 @@ class Test_get_isotopes_mass_cache:
     def test_repeated_lookup_hits_cache(self, monkeypatch):
         calls = []
 
-        class _MockIsotope:
-            def __init__(self, mass):
-                self.mass = mass
-
-        def mock_isotope(symbol, mass_number):
+        def mock_lookup_isotope_mass(symbol, mass_number):
             calls.append((symbol, mass_number))
-            return _MockIsotope(1.2345)
+            return 1.2345
 
-        monkeypatch.setattr(diagonalize, "isotope", mock_isotope)
+        monkeypatch.setattr(
+            diagonalize, "lookup_isotope_mass", mock_lookup_isotope_mass
+        )
 
         result1 = get_isotopes_mass("H", 1)
         result2 = get_isotopes_mass("H", 1)
@@ -1226,15 +1249,13 @@ class Test_get_isotopes_mass_cache:
             ("H", 2): 2.0,
         }
 
-        class _MockIsotope:
-            def __init__(self, mass):
-                self.mass = mass
-
-        def mock_isotope(symbol, mass_number):
+        def mock_lookup_isotope_mass(symbol, mass_number):
             calls.append((symbol, mass_number))
-            return _MockIsotope(mass_map[(symbol, mass_number)])
+            return mass_map[(symbol, mass_number)]
 
-        monkeypatch.setattr(diagonalize, "isotope", mock_isotope)
+        monkeypatch.setattr(
+            diagonalize, "lookup_isotope_mass", mock_lookup_isotope_mass
+        )
 
         assert np.allclose(get_isotopes_mass("H", 1), 1.0)
         assert np.allclose(get_isotopes_mass("H", 2), 2.0)
@@ -1353,6 +1374,89 @@ class Test_get_mol_masses:
         assert np.allclose(inputs_result, fixture_result)
 
 
+class Test_get_mass_matrix_from_mass_numbers:
+    def test_expected_output(
+        self,
+        hn3_symbols,
+        hn3_mass_numbers,
+        dn3_mass_numbers,
+        hn3_mol_masses,
+        dn3_mol_masses,
+    ):
+        result = get_mass_matrix_from_mass_numbers(
+            [hn3_mass_numbers, dn3_mass_numbers, hn3_mass_numbers], hn3_symbols
+        )
+        assert result.shape == (3, 4)
+        assert np.allclose(result, [hn3_mol_masses, dn3_mol_masses, hn3_mol_masses])
+
+    def test_matches_get_mol_masses(self, pyridazine_inputs):
+        atom_symbols, atom_mass_numbers, n_atoms = pyridazine_inputs
+        result = get_mass_matrix_from_mass_numbers([atom_mass_numbers], atom_symbols)
+        np.testing.assert_array_equal(
+            result[0], get_mol_masses(atom_symbols, atom_mass_numbers, n_atoms)
+        )
+
+    def test_unique_isotopes_resolved_once(self, monkeypatch, hn3_symbols):
+        calls = []
+        real_get_isotopes_mass = diagonalize.get_isotopes_mass
+
+        def counting_get_isotopes_mass(symbol, mass_number):
+            calls.append((symbol, mass_number))
+            return real_get_isotopes_mass(symbol, mass_number)
+
+        monkeypatch.setattr(
+            diagonalize, "get_isotopes_mass", counting_get_isotopes_mass
+        )
+        mass_numbers = [[1, 14, 14, 14], [2, 14, 15, 14], [1, 15, 14, 14]] * 10
+        get_mass_matrix_from_mass_numbers(mass_numbers, hn3_symbols)
+        assert sorted(calls) == [("H", 1), ("H", 2), ("N", 14), ("N", 15)]
+
+    def test_unknown_isotope(self, hn3_symbols):
+        with pytest.raises(ValueError) as exc:
+            get_mass_matrix_from_mass_numbers(
+                [[1, 14, 14, 14], [1, 14, 99, 14]], hn3_symbols
+            )
+        assert "Isotopic mass not found for N with mass number 99." in str(exc.value)
+
+    def test_non_integer_mass_numbers(self, hn3_symbols):
+        with pytest.raises(ValueError) as exc:
+            get_mass_matrix_from_mass_numbers([[1.0, 14, 14, 14]], hn3_symbols)
+        assert "Mass numbers must be integers" in str(exc.value)
+
+    def test_symbol_length_mismatch(self, hn3_symbols):
+        with pytest.raises(ValueError):
+            get_mass_matrix_from_mass_numbers([[1, 14, 14]], hn3_symbols)
+
+    def test_no_isotopologues(self, hn3_symbols):
+        result = get_mass_matrix_from_mass_numbers(
+            np.zeros((0, 4), dtype=int), hn3_symbols
+        )
+        assert result.shape == (0, 4)
+
+
+class Test_get_mass_matrix:
+    def test_expected_output(
+        self,
+        hn3_symbols,
+        hn3_mass_numbers,
+        dn3_mass_numbers,
+        hn3_mol_masses,
+        dn3_mol_masses,
+    ):
+        result = get_mass_matrix(
+            ["dn3", "hn3"],
+            {"hn3": hn3_mass_numbers, "dn3": dn3_mass_numbers},
+            4,
+            hn3_symbols,
+        )
+        assert np.allclose(result, [dn3_mol_masses, hn3_mol_masses])
+
+    def test_length_mismatch(self, hn3_symbols):
+        with pytest.raises(ValueError) as exc:
+            get_mass_matrix(["hn3"], {"hn3": [1, 14, 14]}, 4, hn3_symbols)
+        assert "isotopologue_dict[hn3]" in str(exc.value)
+
+
 class Test_get_COM_coordinates:
     @pytest.mark.parametrize(
         "f_masses,f_coordinates,f_COM_coordinates,f_COM_value",
@@ -2098,6 +2202,675 @@ class Test_get_principal_axes:
             ]
         )
 
+    def test_precomputed_mass_matrix(
+        self,
+        hn3_mass_numbers,
+        dn3_mass_numbers,
+        hn3_symbols,
+        hn3_coords,
+        hn3_dipole,
+    ):
+        isotopologue_names = ["iso001", "iso002"]
+        isotopologue_dict = {"iso001": hn3_mass_numbers, "iso002": dn3_mass_numbers}
+        args = (isotopologue_names, isotopologue_dict, 4, hn3_symbols)
+        mass_matrix = get_mass_matrix(*args)
+
+        expected = get_principal_axes(*args, hn3_coords, hn3_dipole)
+        result = get_principal_axes(
+            *args, hn3_coords, hn3_dipole, mass_matrix=mass_matrix
+        )
+        for r_dict, e_dict in zip(result, expected):
+            for iso in isotopologue_names:
+                np.testing.assert_array_equal(r_dict[iso], e_dict[iso])
+
+    def test_mass_matrix_shape_mismatch(
+        self, hn3_mass_numbers, hn3_symbols, hn3_coords, hn3_dipole
+    ):
+        with pytest.raises(ValueError) as exc:
+            get_principal_axes(
+                ["iso001"],
+                {"iso001": hn3_mass_numbers},
+                4,
+                hn3_symbols,
+                hn3_coords,
+                hn3_dipole,
+                mass_matrix=np.ones((2, 4)),
+            )
+        assert "Shape of mass_matrix" in str(exc.value)
+
+    @pytest.fixture
+    def batch_calls(self, monkeypatch):
+        """Number of isotopologues passed to each get_principal_axes_batch call"""
+        calls = []
+
+        def counting_batch(mol_masses, *args, **kwargs):
+            calls.append(len(mol_masses))
+            return get_principal_axes_batch(mol_masses, *args, **kwargs)
+
+        monkeypatch.setattr(diagonalize, "get_principal_axes_batch", counting_batch)
+        clear_principal_axes_cache()
+        yield calls
+        clear_principal_axes_cache()
+
+    def test_duplicate_mass_rows_computed_once(
+        self,
+        batch_calls,
+        hn3_mass_numbers,
+        dn3_mass_numbers,
+        hn3_symbols,
+        hn3_coords,
+        hn3_dipole,
+    ):
+        isotopologue_names = ["iso001", "iso002", "iso003"]
+        isotopologue_dict = {
+            "iso001": hn3_mass_numbers,
+            "iso002": dn3_mass_numbers,
+            "iso003": hn3_mass_numbers,
+        }
+        result = get_principal_axes(
+            isotopologue_names,
+            isotopologue_dict,
+            4,
+            hn3_symbols,
+            hn3_coords,
+            hn3_dipole,
+        )
+        assert batch_calls == [2]
+        for r_dict in result:
+            np.testing.assert_array_equal(r_dict["iso003"], r_dict["iso001"])
+
+    def test_cache_across_calls(
+        self,
+        batch_calls,
+        monkeypatch,
+        hn3_mass_numbers,
+        dn3_mass_numbers,
+        hn3_symbols,
+        hn3_coords,
+        hn3_dipole,
+    ):
+        isotopologue_dict = {"iso001": hn3_mass_numbers, "iso002": dn3_mass_numbers}
+        args = (4, hn3_symbols, hn3_coords, hn3_dipole)
+
+        expected = get_principal_axes(["iso001", "iso002"], isotopologue_dict, *args)
+        first = get_principal_axes(["iso001"], isotopologue_dict, *args, cache=True)
+        second = get_principal_axes(
+            ["iso002", "iso001"], isotopologue_dict, *args, cache=True
+        )
+        assert batch_calls == [2, 1, 1]
+        assert get_principal_axes_cache_info() == {
+            "hits": 1,
+            "misses": 2,
+            "size": 2,
+            "maxsize": diagonalize.PRINCIPAL_AXES_CACHE_MAXSIZE,
+        }
+        for e_dict, f_dict, s_dict in zip(expected, first, second):
+            np.testing.assert_allclose(f_dict["iso001"], e_dict["iso001"], atol=1e-12)
+            for iso in isotopologue_dict:
+                np.testing.assert_allclose(s_dict[iso], e_dict[iso], atol=1e-12)
+
+        # A different geometry misses, and evicts the least recently used row
+        monkeypatch.setattr(diagonalize, "PRINCIPAL_AXES_CACHE_MAXSIZE", 2)
+        get_principal_axes(
+            ["iso001"],
+            isotopologue_dict,
+            4,
+            hn3_symbols,
+            hn3_coords + 1.0,
+            hn3_dipole,
+            cache=True,
+        )
+        assert get_principal_axes_cache_info()["misses"] == 3
+        get_principal_axes(["iso002"], isotopologue_dict, *args, cache=True)
+        assert batch_calls == [2, 1, 1, 1]
+        get_principal_axes(["iso001"], isotopologue_dict, *args, cache=True)
+        assert batch_calls == [2, 1, 1, 1, 1]
+        assert get_principal_axes_cache_info()["size"] == 2
+
+
+class Test_get_unique_mass_rows:
+    def test_expected_output(self):
+        mass_numbers = np.array([[2, 14], [1, 14], [2, 14], [1, 15], [1, 14]])
+        unique_rows, inverse = get_unique_mass_rows(mass_numbers)
+        np.testing.assert_array_equal(unique_rows, [[2, 14], [1, 14], [1, 15]])
+        np.testing.assert_array_equal(inverse, [0, 1, 0, 2, 1])
+
+
+class Test_get_inertia_matrix_batch:
+    @pytest.mark.parametrize(
+        "f_coordinates,f_masses",
+        [
+            ("random_coords1", "random_masses1"),
+            ("random_coords2", "random_masses2"),
+            ("random_coords3", "random_masses3"),
+            ("random_coords4", "random_masses4"),
+            ("random_coords5", "random_masses5"),
+            ("random_coords6", "random_masses6"),
+        ],
+    )
+    def test_matches_get_inertia_matrix(self, f_coordinates, f_masses, request):
+        coordinates = request.getfixturevalue(f_coordinates)
+        masses = request.getfixturevalue(f_masses)
+        # Stack the same geometry with a few different mass vectors.
+        masses_stack = np.array([masses, masses[::-1], 2 * masses])
+        coordinates_stack = np.broadcast_to(
+            coordinates, (len(masses_stack),) + coordinates.shape
+        )
+
+        result = get_inertia_matrix_batch(coordinates_stack, masses_stack)
+
+        assert result.shape == (3, 3, 3)
+        for i in range(len(masses_stack)):
+            np.testing.assert_allclose(
+                result[i], get_inertia_matrix(coordinates, masses_stack[i])
+            )
+
+
+class Test_get_COM_coordinates_batch:
+    def test_hn3_dn3(
+        self,
+        hn3_coords,
+        hn3_mol_masses,
+        dn3_mol_masses,
+        hn3_COM_coords,
+        dn3_COM_coords,
+        hn3_COM_value,
+        dn3_COM_value,
+    ):
+        masses = np.array([hn3_mol_masses, dn3_mol_masses])
+
+        com_coordinates, COM = get_COM_coordinates_batch(masses, hn3_coords)
+
+        assert np.allclose(com_coordinates, [hn3_COM_coords, dn3_COM_coords])
+        assert np.allclose(COM, [hn3_COM_value, dn3_COM_value])
+
+    def test_mismatched_lengths(self, random_masses1, random_coords3):
+        with pytest.raises(ValueError) as exc:
+            get_COM_coordinates_batch(np.array([random_masses1]), random_coords3)
+        assert (exc.type is ValueError) and (
+            'Length of "masses" array must match length of "coordinates" array.'
+            in str(exc.value)
+        )
+
+    def test_zero_masses(self, random_masses1, random_coords1):
+        masses = np.array([random_masses1, np.zeros(len(random_masses1))])
+        with pytest.raises(ValueError) as exc:
+            get_COM_coordinates_batch(masses, random_coords1)
+        assert (exc.type is ValueError) and (
+            'Sum of "masses" array is zero!' in str(exc.value)
+        )
+
+
+class Test_get_atom_inertia_tensors:
+    def test_sum_is_inertia_about_centroid(self, random_coords2, random_masses2):
+        centroid, centered, atom_tensors = get_atom_inertia_tensors(random_coords2)
+
+        assert np.allclose(centroid, np.mean(random_coords2, axis=0))
+        assert np.allclose(centered, random_coords2 - centroid)
+        assert atom_tensors.shape == (len(random_coords2), 9)
+        assert np.allclose(
+            (random_masses2 @ atom_tensors).reshape(3, 3),
+            get_inertia_matrix(centered, random_masses2),
+        )
+
+
+class Test_get_COM_inertia_matrices_gemm:
+    @pytest.mark.parametrize(
+        "f_coordinates,f_masses",
+        [
+            ("random_coords1", "random_masses1"),
+            ("random_coords4", "random_masses4"),
+            ("random_coords6", "random_masses6"),
+        ],
+    )
+    def test_matches_direct_calculation(self, f_coordinates, f_masses, request):
+        coordinates = request.getfixturevalue(f_coordinates)
+        masses = request.getfixturevalue(f_masses)
+        rng = np.random.default_rng(11)
+        mass_matrix = masses * rng.uniform(0.5, 2.0, size=(50, len(masses)))
+
+        com_inertias, COM = get_COM_inertia_matrices_gemm(mass_matrix, coordinates)
+
+        com_coordinates, e_COM = get_COM_coordinates_batch(mass_matrix, coordinates)
+        e_com_inertias = get_inertia_matrix_batch(com_coordinates, mass_matrix)
+        scale = np.abs(e_com_inertias).max()
+        np.testing.assert_allclose(com_inertias, e_com_inertias, atol=1e-12 * scale)
+        np.testing.assert_allclose(COM, e_COM, rtol=1e-12, atol=1e-12)
+
+    def test_hn3_dn3(
+        self,
+        hn3_coords,
+        hn3_mol_masses,
+        dn3_mol_masses,
+        hn3_COM_inertia,
+        dn3_COM_inertia,
+        hn3_COM_value,
+        dn3_COM_value,
+    ):
+        masses = np.array([hn3_mol_masses, dn3_mol_masses])
+        atom_inertia_tensors = get_atom_inertia_tensors(hn3_coords)
+
+        com_inertias, COM = get_COM_inertia_matrices_gemm(
+            masses, hn3_coords, atom_inertia_tensors
+        )
+
+        assert np.allclose(com_inertias, [hn3_COM_inertia, dn3_COM_inertia])
+        assert np.allclose(COM, [hn3_COM_value, dn3_COM_value])
+
+    def test_stacked_geometries(self, random_coords4, random_masses4):
+        rng = np.random.default_rng(5)
+        mass_matrix = random_masses4 * rng.uniform(
+            0.5, 2.0, size=(7, len(random_masses4))
+        )
+        geometries = random_coords4 + rng.normal(
+            scale=0.1, size=(4, *random_coords4.shape)
+        )
+
+        com_inertias, COM = get_COM_inertia_matrices_gemm(mass_matrix, geometries)
+
+        assert com_inertias.shape == (4, 7, 3, 3) and COM.shape == (4, 7, 3)
+        for k, geometry in enumerate(geometries):
+            e_com_inertias, e_COM = get_COM_inertia_matrices_gemm(mass_matrix, geometry)
+            np.testing.assert_allclose(com_inertias[k], e_com_inertias, rtol=1e-12)
+            np.testing.assert_allclose(COM[k], e_COM, rtol=1e-12, atol=1e-12)
+
+    def test_mismatched_lengths(self, random_masses1, random_coords3):
+        with pytest.raises(ValueError) as exc:
+            get_COM_inertia_matrices_gemm(np.array([random_masses1]), random_coords3)
+        assert 'Length of "masses" array must match length of "coordinates" array.' in (
+            str(exc.value)
+        )
+
+    def test_zero_masses(self, random_masses1, random_coords1):
+        masses = np.array([random_masses1, np.zeros(len(random_masses1))])
+        with pytest.raises(ValueError) as exc:
+            get_COM_inertia_matrices_gemm(masses, random_coords1)
+        assert 'Sum of "masses" array is zero!' in str(exc.value)
+
+
+class Test_get_rot_const_jacobians:
+    @pytest.fixture
+    def asymmetric_top(self, random_coords4, random_masses4):
+        rng = np.random.default_rng(3)
+        mass_matrix = random_masses4 * rng.uniform(
+            0.5, 2.0, size=(3, len(random_masses4))
+        )
+        return mass_matrix, random_coords4
+
+    @staticmethod
+    def _results(mass_matrix, coordinates):
+        results = get_principal_axes_batch(mass_matrix, coordinates, np.zeros(3))
+        return results[0], results[1], results[5], results[7], results[8]
+
+    def test_coordinates_match_finite_differences(self, asymmetric_top):
+        mass_matrix, coordinates = asymmetric_top
+        masses, _, com_coordinates, eigenvectors, eigenvalues = self._results(
+            mass_matrix, coordinates
+        )
+
+        eval_jacobians, _ = get_eigenvalue_jacobians(
+            masses, com_coordinates, eigenvectors
+        )
+        result, _ = get_rot_const_jacobians(
+            masses, com_coordinates, eigenvectors, eigenvalues
+        )
+
+        step = 1e-6
+        assert result.shape == (3, 3, len(coordinates), 3)
+        for atom, axis in np.ndindex(coordinates.shape):
+            shift = np.zeros_like(coordinates)
+            shift[atom, axis] = step
+            plus = self._results(mass_matrix, coordinates + shift)
+            minus = self._results(mass_matrix, coordinates - shift)
+            np.testing.assert_allclose(
+                eval_jacobians[:, :, atom, axis],
+                (plus[4] - minus[4]) / (2 * step),
+                rtol=1e-5,
+                atol=1e-6 * np.abs(eval_jacobians).max(),
+            )
+            np.testing.assert_allclose(
+                result[:, :, atom, axis],
+                (plus[1] - minus[1]) / (2 * step),
+                rtol=1e-5,
+                atol=1e-6 * np.abs(result).max(),
+            )
+
+    def test_masses_match_finite_differences(self, asymmetric_top):
+        mass_matrix, coordinates = asymmetric_top
+        masses, _, com_coordinates, eigenvectors, eigenvalues = self._results(
+            mass_matrix, coordinates
+        )
+
+        _, result = get_rot_const_jacobians(
+            masses, com_coordinates, eigenvectors, eigenvalues
+        )
+
+        step = 1e-6
+        assert result.shape == (3, 3, len(coordinates))
+        for atom in range(len(coordinates)):
+            shift = np.zeros_like(mass_matrix)
+            shift[:, atom] = step
+            plus = self._results(mass_matrix + shift, coordinates)
+            minus = self._results(mass_matrix - shift, coordinates)
+            np.testing.assert_allclose(
+                result[:, :, atom],
+                (plus[1] - minus[1]) / (2 * step),
+                rtol=1e-5,
+                atol=1e-6 * np.abs(result).max(),
+            )
+
+    def test_translation_and_rotation_invariance(self, asymmetric_top):
+        """Rigid translations and rotations leave the rotational constants unchanged"""
+        mass_matrix, coordinates = asymmetric_top
+        masses, _, com_coordinates, eigenvectors, eigenvalues = self._results(
+            mass_matrix, coordinates
+        )
+
+        result, _ = get_rot_const_jacobians(
+            masses, com_coordinates, eigenvectors, eigenvalues
+        )
+
+        scale = np.abs(result).max()
+        np.testing.assert_allclose(result.sum(axis=2), 0, atol=1e-10 * scale)
+        torques = np.cross(com_coordinates[:, np.newaxis], result).sum(axis=2)
+        np.testing.assert_allclose(torques, 0, atol=1e-10 * scale)
+
+
+class Test_get_eigens_batch:
+    _inertia_fixtures = (
+        "random_COM_inertias1",
+        "random_COM_inertias2",
+        "random_COM_inertias3",
+        "random_COM_inertias4",
+        "random_COM_inertias5",
+        "random_COM_inertias6",
+    )
+
+    @pytest.mark.parametrize(
+        "sign_convention,right_handed",
+        [(False, True), (True, True), (False, False), (True, False)],
+    )
+    def test_matches_get_eigens(self, sign_convention, right_handed, request):
+        matrices = np.array(
+            [request.getfixturevalue(f) for f in self._inertia_fixtures]
+        )
+
+        r_evals, r_evecs = get_eigens_batch(
+            matrices, sign_convention=sign_convention, right_handed=right_handed
+        )
+
+        for i, matrix in enumerate(matrices):
+            evals, evecs = get_eigens(
+                matrix, sign_convention=sign_convention, right_handed=right_handed
+            )
+            np.testing.assert_array_equal(r_evals[i], evals)
+            np.testing.assert_array_equal(r_evecs[i], evecs)
+
+    def test_right_handed_coordinate_system(self, request):
+        matrices = np.array(
+            [request.getfixturevalue(f) for f in self._inertia_fixtures]
+        )
+        _, evecs = get_eigens_batch(matrices)
+        assert np.allclose(np.linalg.det(evecs), 1.0)
+
+    @pytest.mark.parametrize("sign_convention", [False, True])
+    def test_analytic_backend_matches_eigh(self, sign_convention, request):
+        matrices = np.array(
+            [request.getfixturevalue(f) for f in self._inertia_fixtures]
+        )
+        e_evals, e_evecs = get_eigens_batch(
+            matrices, sign_convention=sign_convention, backend="eigh"
+        )
+        r_evals, r_evecs = get_eigens_batch(
+            matrices, sign_convention=sign_convention, backend="analytic"
+        )
+
+        assert np.allclose(r_evals, e_evals, rtol=1e-12, atol=0)
+        # Eigenvectors are only defined up to sign without the sign convention
+        if sign_convention:
+            assert np.allclose(r_evecs, e_evecs, atol=1e-10)
+        else:
+            assert np.allclose(np.abs(r_evecs), np.abs(e_evecs), atol=1e-10)
+        assert np.allclose(np.linalg.det(r_evecs), 1.0)
+
+
+class Test_get_eigen_backend:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("COM_PAC_EIGEN_BACKEND", raising=False)
+        assert get_eigen_backend() == "eigh"
+
+    def test_environment_variable(self, monkeypatch):
+        monkeypatch.setenv("COM_PAC_EIGEN_BACKEND", "Analytic")
+        assert get_eigen_backend() == "analytic"
+        assert get_eigen_backend("eigh") == "eigh"
+
+    def test_unknown_backend(self, monkeypatch):
+        monkeypatch.setenv("COM_PAC_EIGEN_BACKEND", "jacobi")
+        with pytest.raises(ValueError) as exc:
+            get_eigen_backend()
+        assert "Unknown eigensolver backend 'jacobi'" in str(exc.value)
+
+    def test_environment_variable_selects_get_eigens_backend(
+        self, monkeypatch, random_COM_inertias1
+    ):
+        calls = []
+        real_get_eigens_analytic = diagonalize.get_eigens_analytic
+
+        def counting_get_eigens_analytic(matrices):
+            calls.append(matrices.shape)
+            return real_get_eigens_analytic(matrices)
+
+        monkeypatch.setattr(
+            diagonalize, "get_eigens_analytic", counting_get_eigens_analytic
+        )
+        monkeypatch.setenv("COM_PAC_EIGEN_BACKEND", "analytic")
+        get_eigens(random_COM_inertias1)
+        get_eigens_batch(np.array([random_COM_inertias1] * 2))
+        assert calls == [(1, 3, 3), (2, 3, 3)]
+
+
+class Test_get_eigens_analytic:
+    @staticmethod
+    def _check_decomposition(matrices, evals, evecs):
+        expected_evals = np.linalg.eigvalsh(matrices)
+        scale = np.abs(expected_evals).max(axis=-1, keepdims=True)
+        assert np.all(np.abs(evals - expected_evals) <= 1e-12 * scale)
+        # A v = lambda v, with orthonormal, right-handed eigenvectors
+        residuals = matrices @ evecs - evecs * evals[:, np.newaxis, :]
+        assert np.all(np.abs(residuals) <= 1e-12 * scale[..., np.newaxis])
+        gram = np.swapaxes(evecs, -1, -2) @ evecs
+        assert np.allclose(gram, np.eye(3), atol=1e-12)
+        assert np.allclose(np.linalg.det(evecs), 1.0)
+
+    def test_random_symmetric_matrices(self):
+        rng = np.random.default_rng(20240601)
+        matrices = rng.normal(size=(2000, 3, 3))
+        matrices = matrices + np.swapaxes(matrices, -1, -2)
+
+        evals, evecs = get_eigens_analytic(matrices)
+
+        self._check_decomposition(matrices, evals, evecs)
+
+    def test_random_inertia_tensors(self):
+        rng = np.random.default_rng(7)
+        coordinates = rng.normal(scale=2.0, size=(500, 12, 3))
+        masses = rng.uniform(1.0, 130.0, size=(500, 12))
+        masses_sum = masses.sum(axis=-1)[:, np.newaxis]
+        COM = np.einsum("ki,kia->ka", masses, coordinates) / masses_sum
+        matrices = get_inertia_matrix_batch(coordinates - COM[:, np.newaxis], masses)
+
+        evals, evecs = get_eigens_analytic(matrices)
+
+        self._check_decomposition(matrices, evals, evecs)
+
+    @pytest.mark.parametrize(
+        "matrix",
+        [
+            np.zeros((3, 3)),
+            np.eye(3) * 5.0,  # spherical top
+            np.diag([0.0, 3.0, 3.0]),  # linear molecule
+            np.diag([2.0, 2.0, 4.0]),  # oblate symmetric top
+            np.diag([1.0, 3.0, 3.0 + 1e-9]),  # near-prolate symmetric top
+        ],
+    )
+    def test_degenerate_matrices_fall_back_to_eigh(self, monkeypatch, matrix):
+        calls = []
+        real_eigh = np.linalg.eigh
+
+        def counting_eigh(matrices):
+            calls.append(len(matrices))
+            return real_eigh(matrices)
+
+        monkeypatch.setattr(np.linalg, "eigh", counting_eigh)
+        rotation = np.linalg.qr(np.arange(1.0, 10.0).reshape(3, 3) ** 2)[0]
+        matrices = np.array([rotation @ matrix @ rotation.T, np.diag([1.0, 2.0, 3.0])])
+
+        evals, evecs = get_eigens_analytic(matrices)
+
+        assert calls == [1]
+        np.testing.assert_allclose(evals[0], np.sort(np.diag(matrix)), atol=1e-12)
+        np.testing.assert_allclose(evals[1], [1.0, 2.0, 3.0])
+        self._check_decomposition(matrices, evals, evecs)
+
+    def test_empty_stack(self):
+        evals, evecs = get_eigens_analytic(np.zeros((0, 3, 3)))
+        assert evals.shape == (0, 3) and evecs.shape == (0, 3, 3)
+
+
+class Test_get_bad_diagonal_mask:
+    def test_flags_only_bad_diagonals(self):
+        matrices = np.array(
+            [
+                np.diag([1.0, 2.0, 3.0]),
+                [[1.0, 0.5, 0.0], [0.5, 2.0, 0.0], [0.0, 0.0, 3.0]],
+            ]
+        )
+        eigenvalues = np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+
+        result = get_bad_diagonal_mask(matrices, eigenvalues)
+
+        assert result.tolist() == [False, True]
+
+
+class Test_get_principal_axes_batch:
+    @pytest.mark.parametrize(
+        "f_coords,f_symbols,f_dipole,f_mass_numbers",
+        [
+            ("hn3_coords", "hn3_symbols", "hn3_dipole", "hn3_mass_numbers"),
+            ("hn3_coords", "hn3_symbols", "hn3_dipole", "dn3_mass_numbers"),
+            (
+                "pyridazine_coords",
+                "pyridazine_symbols",
+                "pyridazine_dipole",
+                "pyridazine_mass_numbers",
+            ),
+            (
+                "pyridazine_coords",
+                "pyridazine_symbols",
+                "pyridazine_dipole",
+                "pheavy_mass_numbers",
+            ),
+        ],
+    )
+    def test_matches_per_isotopologue_path(
+        self, f_coords, f_symbols, f_dipole, f_mass_numbers, request
+    ):
+        coords = request.getfixturevalue(f_coords)
+        symbols = request.getfixturevalue(f_symbols)
+        dipole = request.getfixturevalue(f_dipole)
+        mass_numbers = request.getfixturevalue(f_mass_numbers)
+        n_atoms = len(symbols)
+
+        (
+            mol_masses,
+            com_coords,
+            com_inertia,
+            evecs,
+            evals,
+            pa_coords,
+            pa_inertia,
+            COM_value,
+        ) = get_isotopologue_principal_axes(coords, mass_numbers, symbols, n_atoms)
+
+        (
+            r_masses,
+            r_rot_consts,
+            r_pa_dipoles,
+            r_pa_coords,
+            r_pa_inertias,
+            r_com_coords,
+            r_com_inertias,
+            r_evecs,
+            r_evals,
+            r_COM_values,
+        ) = get_principal_axes_batch(mol_masses[np.newaxis, :], coords, dipole)
+
+        for batch_value, single_value in (
+            (r_masses[0], mol_masses),
+            (r_rot_consts[0], list(map(inertia_to_rot_const, evals))),
+            (r_pa_dipoles[0], transform_dipole(dipole, evecs)),
+            (r_pa_coords[0], pa_coords),
+            (r_pa_inertias[0], pa_inertia),
+            (r_com_coords[0], com_coords),
+            (r_com_inertias[0], com_inertia),
+            (r_evecs[0], evecs),
+            (r_evals[0], evals),
+            (r_COM_values[0], COM_value),
+        ):
+            np.testing.assert_allclose(
+                batch_value, single_value, rtol=1e-12, atol=1e-12
+            )
+
+    def test_stacked_golden_fixtures(
+        self,
+        hn3_coords,
+        hn3_dipole,
+        hn3_mol_masses,
+        dn3_mol_masses,
+        hn3_rot_consts,
+        dn3_rot_consts,
+        hn3_evecs,
+        dn3_evecs,
+        hn3_evals,
+        dn3_evals,
+        hn3_pa_coords,
+        dn3_pa_coords,
+    ):
+        masses = np.array([hn3_mol_masses, dn3_mol_masses])
+
+        result = get_principal_axes_batch(masses, hn3_coords, hn3_dipole)
+
+        assert np.allclose(result[1], [hn3_rot_consts, dn3_rot_consts])
+        assert np.allclose(result[3], [hn3_pa_coords, dn3_pa_coords])
+        assert np.allclose(result[7], [hn3_evecs, dn3_evecs])
+        assert np.allclose(result[8], [hn3_evals, dn3_evals])
+
+    def test_gemm_inertia_method(
+        self, pyridazine_coords, pyridazine_dipole, pyridazine_mol_masses
+    ):
+        rng = np.random.default_rng(3)
+        masses = pyridazine_mol_masses * rng.uniform(0.9, 1.1, size=(20, 1))
+
+        expected = get_principal_axes_batch(
+            masses, pyridazine_coords, pyridazine_dipole
+        )
+        result = get_principal_axes_batch(
+            masses, pyridazine_coords, pyridazine_dipole, inertia_method="gemm"
+        )
+
+        for r_value, e_value in zip(result, expected):
+            np.testing.assert_allclose(r_value, e_value, rtol=1e-9, atol=1e-9)
+
+    def test_unknown_inertia_method(self, hn3_coords, hn3_dipole, hn3_mol_masses):
+        with pytest.raises(ValueError) as exc:
+            get_principal_axes_batch(
+                hn3_mol_masses[np.newaxis, :],
+                hn3_coords,
+                hn3_dipole,
+                inertia_method="loop",
+            )
+        assert "Unknown inertia_method 'loop'" in str(exc.value)
+
 
 class Test_get_theta_values:
     # Simple planar 3-atom molecule fixtures (all z=0, COM at origin, in PA frame).
@@ -2198,3 +2971,108 @@ class Test_get_theta_values:
 
         assert result is not None
         assert set(result.keys()) == set(isotopologue_names)
+
+    def test_undefined_values_warn_once(self, capsys):
+        """Undefined theta values become NaN with one warning line per theta."""
+        # A square of equal masses has iaa == ibb and iab == 0, so every ratio is 0/0
+        square = np.array(
+            [[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, -1.0, 0.0]]
+        )
+        masses = np.ones(4)
+        result = get_theta_values(
+            isotopologue_names=["parent", "iso"],
+            atom_masses={"parent": masses, "iso": masses},
+            pa_coordinates={"parent": square, "iso": square},
+        )
+        output = capsys.readouterr().out
+        assert np.isnan(result["iso"]["theta_8"])
+        assert "WARNING: theta_8 is undefined for parent, iso" in output
+        assert len(output.splitlines()) == 3
+
+
+@pytest.fixture(scope="module")
+def oxazole_theta():
+    input_path = Path(__file__).parents[2] / "docs/example/oxazole/full-isos.txt"
+    names, iso_dict, n_atoms, symbols, coordinates, dipole, _ = parse_input_file(
+        input_path.read_text()
+    )
+    mass_matrix = get_mass_matrix(names, iso_dict, n_atoms, symbols)
+    pa_coordinates = get_principal_axes_batch(mass_matrix, coordinates, dipole)[3]
+    return names, get_theta_values_batch(mass_matrix, pa_coordinates)
+
+
+class Test_get_theta_values_batch:
+    def test_matches_oxazole_reference(self, oxazole_theta):
+        """Values of the per-isotopologue implementation on the oxazole example."""
+        names, result = oxazole_theta
+        expected = {
+            "iso002": [7.004827439065563, 8.207986922737323, 6.923673916474983],
+            "iso003": [-17.55407841205926, 17.492671022390567, -17.58439359981576],
+            "iso007": [-6.565901989192786, np.nan, 6.763004008988483],
+            "iso008": [-42.67960799269391, 42.647164534860075, np.nan],
+        }
+        for iso, thetas in expected.items():
+            i = names.index(iso)
+            np.testing.assert_allclose(
+                [result["theta_7"][i], result["theta_8"][i], result["theta_9_par"][i]],
+                thetas,
+                rtol=1e-9,
+            )
+        assert result["reason_codes"][names.index("iso007")] == THETA_8_UNDEFINED
+        assert result["reason_codes"][names.index("iso008")] == THETA_9_UNDEFINED
+
+    def test_reason_codes_match_nan(self, oxazole_theta):
+        _, result = oxazole_theta
+        for label, flag in (
+            ("theta_7", THETA_7_UNDEFINED),
+            ("theta_8", THETA_8_UNDEFINED),
+            ("theta_9_par", THETA_9_UNDEFINED),
+        ):
+            np.testing.assert_array_equal(
+                np.isnan(result[label]), (result["reason_codes"] & flag) > 0
+            )
+
+    def test_nonplanar_parent(self):
+        non_planar_coords = np.array(
+            [[1.0, -1 / 3, 1.0], [-1.0, -1 / 3, -1.0], [0.0, 2 / 3, 0.0]]
+        )
+        with np.errstate(all="raise"):
+            result = get_theta_values_batch(np.ones((2, 3)), [non_planar_coords] * 2)
+        assert np.all(result["reason_codes"] & THETA_NONPLANAR_PARENT)
+        assert np.all(np.isnan(result["theta_7"]))
+
+
+class Test_get_inertial_quantities_batch:
+    def test_limiting_tops(self):
+        """kappa is -1 for prolate, +1 for oblate and NaN for spherical tops"""
+        eigenvalues = np.array(
+            [
+                [0.0, 2.0, 2.0],  # linear
+                [1.0, 2.0, 2.0],  # prolate symmetric top
+                [1.0, 1.0, 2.0],  # oblate symmetric top
+                [2.0, 2.0, 2.0],  # spherical top
+            ]
+        )
+        result = get_inertial_quantities_batch(
+            np.ones((4, 1)), np.zeros((4, 1, 3)), eigenvalues
+        )
+        np.testing.assert_array_equal(result["kappa"], [-1.0, -1.0, 1.0, np.nan])
+        np.testing.assert_array_equal(result["inertial_defect"], [0.0, -1.0, 0.0, -2.0])
+
+    def test_planar_molecule(self, hn3_mol_masses, hn3_COM_coords):
+        """A planar molecule has P_cc = 0 and no inertial defect"""
+        principal_axes = get_principal_axes_batch(
+            [hn3_mol_masses], hn3_COM_coords * [1, 1, 0], np.zeros(3)
+        )
+        result = get_inertial_quantities_batch(
+            principal_axes[0], principal_axes[3], principal_axes[8]
+        )
+        assert result["planar_moments"][0, 2] == pytest.approx(0, abs=1e-12)
+        assert result["inertial_defect"][0] == pytest.approx(0, abs=1e-12)
+        np.testing.assert_allclose(
+            result["planar_moments"].sum(axis=1) - result["planar_moments"],
+            principal_axes[8],
+        )
+        rotational_constants = principal_axes[1][0]
+        A, B, C = rotational_constants
+        assert result["kappa"][0] == pytest.approx((2 * B - A - C) / (A - C))
@@ -0,0 +1,158 @@
+"""
+Unit tests for functions in enumeration.py
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import (
+    get_mass_matrix_from_mass_numbers,
+    get_principal_axes_batch,
+)
+from com_pac.enumeration import (
+    build_enumeration,
+    decode_isotopologue_ids,
+    get_isotopologue_name,
+    get_isotopologue_names,
+    iterate_isotopologue_blocks,
+    iterate_principal_axes,
+)
+
+
+@pytest.fixture
+def hn3_isotopes():
+    return {"H": [1, 2, 3], "N": [14, 15]}
+
+
+def all_mass_numbers(enumeration):
+    return decode_isotopologue_ids(enumeration, np.arange(enumeration["count"]))
+
+
+class Test_build_enumeration:
+    @pytest.mark.parametrize("mode,count", [("single", 6), ("double", 10), ("all", 24)])
+    def test_counts(self, hn3_symbols, hn3_isotopes, mode, count):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, mode)
+        assert enumeration["count"] == count
+        assert enumeration["atom_numbering"] == ["H1", "N2", "N3", "N4"]
+
+    def test_unknown_mode(self, hn3_symbols, hn3_isotopes):
+        with pytest.raises(ValueError) as exc:
+            build_enumeration(hn3_symbols, hn3_isotopes, "triple")
+        assert "Unknown enumeration mode 'triple'" in str(exc.value)
+
+    def test_missing_element(self, hn3_symbols):
+        with pytest.raises(ValueError) as exc:
+            build_enumeration(hn3_symbols, {"H": [1, 2]})
+        assert "No isotopes listed for elements: ['N']" in str(exc.value)
+
+    def test_repeated_isotopes(self, hn3_symbols):
+        with pytest.raises(ValueError) as exc:
+            build_enumeration(hn3_symbols, {"H": [1, 2, 1], "N": [14]})
+        assert "without repeats: ['H']" in str(exc.value)
+
+    def test_too_many_isotopologues(self):
+        with pytest.raises(ValueError) as exc:
+            build_enumeration(["C"] * 64, {"C": [12, 13, 14]}, "all")
+        assert "does not fit in 64-bit ids" in str(exc.value)
+
+
+class Test_decode_isotopologue_ids:
+    def test_single(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "single")
+        assert all_mass_numbers(enumeration).tolist() == [
+            [1, 14, 14, 14],
+            [2, 14, 14, 14],
+            [3, 14, 14, 14],
+            [1, 15, 14, 14],
+            [1, 14, 15, 14],
+            [1, 14, 14, 15],
+        ]
+
+    def test_double_matches_combinations(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "double")
+        parent = [1, 14, 14, 14]
+        expected = [parent]
+        for first, second in itertools.combinations(range(4), 2):
+            for a, b in itertools.product(
+                hn3_isotopes[hn3_symbols[first]][1:],
+                hn3_isotopes[hn3_symbols[second]][1:],
+            ):
+                mass_numbers = list(parent)
+                mass_numbers[first], mass_numbers[second] = a, b
+                expected.append(mass_numbers)
+        assert all_mass_numbers(enumeration).tolist() == expected
+
+    def test_all_matches_product(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        expected = itertools.product(*[hn3_isotopes[sym] for sym in hn3_symbols])
+        assert all_mass_numbers(enumeration).tolist() == [list(x) for x in expected]
+
+    def test_dtype(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        assert decode_isotopologue_ids(enumeration, [0, 5]).dtype == np.int16
+
+    @pytest.mark.parametrize("iso_id", [-1, 6])
+    def test_out_of_range(self, hn3_symbols, hn3_isotopes, iso_id):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "single")
+        with pytest.raises(ValueError) as exc:
+            decode_isotopologue_ids(enumeration, [0, iso_id])
+        assert "must be in [0, 6)" in str(exc.value)
+
+
+class Test_get_isotopologue_names:
+    def test_expected_output(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        result = get_isotopologue_names(enumeration, [0, 1, 23])
+        assert result == ["parent", "N4:15", "H1:3_N2:15_N3:15_N4:15"]
+
+    def test_atom_numbering(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(
+            hn3_symbols, hn3_isotopes, "single", atom_numbering=["Ha", "Na", "Nb", "Nc"]
+        )
+        assert get_isotopologue_name(enumeration, 4) == "Nb:15"
+
+    def test_names_are_unique(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        names = get_isotopologue_names(enumeration, range(enumeration["count"]))
+        assert len(set(names)) == enumeration["count"]
+
+
+class Test_iterate_isotopologue_blocks:
+    def test_chunks_cover_enumeration(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        chunks = list(iterate_isotopologue_blocks(enumeration, chunk_size=5))
+
+        assert [len(ids) for ids, _ in chunks] == [5, 5, 5, 5, 4]
+        ids = np.concatenate([ids for ids, _ in chunks])
+        mass_numbers = np.concatenate([block for _, block in chunks])
+        assert ids.tolist() == list(range(24))
+        np.testing.assert_array_equal(mass_numbers, all_mass_numbers(enumeration))
+
+    def test_bad_chunk_size(self, hn3_symbols, hn3_isotopes):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes)
+        with pytest.raises(ValueError):
+            next(iterate_isotopologue_blocks(enumeration, chunk_size=0))
+
+
+class Test_iterate_principal_axes:
+    def test_matches_single_batch(
+        self, hn3_symbols, hn3_isotopes, hn3_coords, hn3_dipole
+    ):
+        enumeration = build_enumeration(hn3_symbols, hn3_isotopes, "all")
+        mass_matrix = get_mass_matrix_from_mass_numbers(
+            all_mass_numbers(enumeration), hn3_symbols
+        )
+        expected = get_principal_axes_batch(mass_matrix, hn3_coords, hn3_dipole)
+
+        chunks = list(
+            iterate_principal_axes(
+                enumeration, hn3_symbols, hn3_coords, hn3_dipole, chunk_size=7
+            )
+        )
+
+        assert np.concatenate([ids for ids, _ in chunks]).tolist() == list(range(24))
+        for i, expected_result in enumerate(expected):
+            result = np.concatenate([results[i] for _, results in chunks])
+            np.testing.assert_allclose(result, expected_result)
@@ -0,0 +1,176 @@
+"""
+Unit tests for functions in fitting.py
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import get_mass_matrix, get_principal_axes_batch
+from com_pac.fitting import (
+    fit_structure,
+    get_coordinate_displacements,
+    get_internal_displacements,
+    get_predicted_constants,
+)
+from com_pac.parser import parse_input_file
+
+
+@pytest.fixture(scope="module")
+def oxazole():
+    """Planar oxazole and its 33 isotopologues from the documentation example"""
+    input_path = Path(__file__).parents[2] / "docs/example/oxazole/full-isos.txt"
+    names, iso_dict, n_atoms, symbols, coordinates, dipole, _ = parse_input_file(
+        input_path.read_text()
+    )
+    mass_matrix = get_mass_matrix(names, iso_dict, n_atoms, symbols)
+    observed = get_principal_axes_batch(mass_matrix, coordinates, dipole)[1]
+    return mass_matrix, coordinates, observed
+
+
+@pytest.fixture
+def in_plane_mask(oxazole):
+    """In-plane coordinates of four ring atoms; the rest fixes the rigid modes"""
+    _, coordinates, _ = oxazole
+    mask = np.zeros(coordinates.shape, dtype=bool)
+    mask[2:6, :2] = True
+    return mask
+
+
+class Test_get_coordinate_displacements:
+    def test_expected_output(self):
+        result = get_coordinate_displacements(
+            [[True, False, False], [False, True, True]]
+        )
+        expected = np.zeros((3, 2, 3))
+        expected[0, 0, 0] = expected[1, 1, 1] = expected[2, 1, 2] = 1.0
+        np.testing.assert_array_equal(result, expected)
+
+
+class Test_get_internal_displacements:
+    def test_orthogonal_to_rigid_modes(self, oxazole):
+        _, coordinates, _ = oxazole
+        result = get_internal_displacements(coordinates)
+
+        assert result.shape == (3 * len(coordinates) - 6, *coordinates.shape)
+        flat = result.reshape(len(result), -1)
+        np.testing.assert_allclose(flat @ flat.T, np.eye(len(result)), atol=1e-12)
+        # Rigid translations and rotations about the origin
+        rigid = np.concatenate(
+            [
+                np.broadcast_to(np.eye(3)[:, np.newaxis], (3, *coordinates.shape)),
+                np.cross(np.eye(3)[:, np.newaxis], coordinates),
+            ]
+        ).reshape(6, -1)
+        np.testing.assert_allclose(flat @ rigid.T, 0, atol=1e-12)
+
+    def test_linear(self):
+        coordinates = np.zeros((3, 3))
+        coordinates[:, 2] = [-1.2, 0.0, 1.1]
+        assert get_internal_displacements(coordinates).shape == (4, 3, 3)
+
+
+class Test_get_predicted_constants:
+    def test_matches_principal_axes(self, oxazole):
+        mass_matrix, coordinates, observed = oxazole
+        constants, jacobians = get_predicted_constants(mass_matrix, coordinates)
+        np.testing.assert_allclose(constants, observed)
+        assert jacobians.shape == (len(mass_matrix), 3, len(coordinates), 3)
+
+
+class Test_fit_structure:
+    def test_recovers_structure(self, oxazole, in_plane_mask):
+        mass_matrix, coordinates, observed = oxazole
+        rng = np.random.default_rng(0)
+        start = coordinates + in_plane_mask * rng.normal(
+            scale=0.02, size=coordinates.shape
+        )
+
+        result = fit_structure(
+            mass_matrix, start, observed, 0.01, coordinate_mask=in_plane_mask
+        )
+
+        assert result["converged"] and result["rank"] == 8
+        np.testing.assert_allclose(result["coordinates"], coordinates, atol=1e-9)
+        np.testing.assert_allclose(result["residuals"], 0, atol=1e-6)
+        assert result["correlation"].shape == (8, 8)
+        np.testing.assert_allclose(np.diag(result["correlation"]), 1)
+
+    def test_uncertainties_and_unobserved_constants(self, oxazole, in_plane_mask):
+        mass_matrix, coordinates, observed = oxazole
+        rng = np.random.default_rng(1)
+        noisy = observed + rng.normal(scale=0.05, size=observed.shape)
+        noisy[1:, 0] = np.nan
+
+        result = fit_structure(
+            mass_matrix, coordinates, noisy, 0.05, coordinate_mask=in_plane_mask
+        )
+
+        assert result["converged"]
+        assert np.all(np.isnan(result["residuals"][1:, 0]))
+        np.testing.assert_allclose(
+            result["residuals"][~np.isnan(noisy)],
+            (noisy - result["predicted_constants"])[~np.isnan(noisy)],
+        )
+        # Coordinates move by about their standard errors
+        assert np.all(result["uncertainties"] > 0)
+        assert np.all(np.abs(result["parameters"]) < 5 * result["uncertainties"])
+        np.testing.assert_allclose(result["covariance"], result["covariance"].T)
+
+    def test_displacements(self, oxazole):
+        """A displacement pattern moves several atoms with one parameter"""
+        mass_matrix, coordinates, observed = oxazole
+        displacements = np.zeros((1, *coordinates.shape))
+        displacements[0, 6:, :2] = coordinates[6:, :2] / np.linalg.norm(
+            coordinates[6:, :2], axis=1, keepdims=True
+        )
+        start = coordinates + 0.03 * displacements[0]
+
+        result = fit_structure(
+            mass_matrix, start, observed, displacements=displacements
+        )
+
+        np.testing.assert_allclose(result["parameters"], [-0.03], atol=1e-10)
+        np.testing.assert_allclose(result["coordinates"], coordinates, atol=1e-10)
+
+    def test_rank_deficient(self, oxazole, capsys):
+        """Out-of-plane displacements leave planar constants unchanged"""
+        mass_matrix, coordinates, observed = oxazole
+        with pytest.warns(RuntimeWarning, match="Jacobian has rank"):
+            result = fit_structure(mass_matrix, coordinates, observed)
+        # The default leaves out the rigid modes, but not the out-of-plane ones
+        assert len(result["parameters"]) == coordinates.size - 6
+        assert result["rank"] < len(result["parameters"])
+        assert capsys.readouterr().out == ""
+
+    def test_full_rank_without_warning(self, oxazole, in_plane_mask, recwarn):
+        mass_matrix, coordinates, observed = oxazole
+        result = fit_structure(
+            mass_matrix, coordinates, observed, coordinate_mask=in_plane_mask
+        )
+        assert result["rank"] == len(result["parameters"])
+        assert not recwarn.list
+
+    def test_mismatched_observations(self, oxazole):
+        mass_matrix, coordinates, observed = oxazole
+        with pytest.raises(ValueError) as exc:
+            fit_structure(mass_matrix, coordinates, observed[1:])
+        assert "Shape of observed_constants" in str(exc.value)
+
+    def test_bad_uncertainties(self, oxazole):
+        mass_matrix, coordinates, observed = oxazole
+        with pytest.raises(ValueError) as exc:
+            fit_structure(mass_matrix, coordinates, observed, 0.0)
+        assert "must be positive" in str(exc.value)
+
+    def test_nothing_to_fit(self, oxazole):
+        mass_matrix, coordinates, observed = oxazole
+        with pytest.raises(ValueError) as exc:
+            fit_structure(
+                mass_matrix,
+                coordinates,
+                observed,
+                coordinate_mask=np.zeros(coordinates.shape, dtype=bool),
+            )
+        assert "Nothing to fit" in str(exc.value)
@@ -0,0 +1,129 @@
+"""
+Unit tests for functions in isotopes.py
+"""
+
+import numpy as np
+import pytest
+from mendeleev.fetch import fetch_table
+
+from com_pac import isotopes
+from com_pac.isotopes import (
+    ELEMENT_SYMBOLS,
+    get_atomic_numbers,
+    is_known_isotope,
+    load_isotope_table,
+    lookup_isotope_abundances,
+    lookup_isotope_mass,
+    lookup_isotope_masses,
+)
+
+
+@pytest.fixture(scope="module")
+def mendeleev_isotopes_df():
+    return fetch_table("isotopes")
+
+
+class Test_vendored_table:
+    """The vendored table must stay in sync with the mendeleev database."""
+
+    def test_element_symbols_match_mendeleev(self):
+        assert tuple(fetch_table("elements").symbol.values) == ELEMENT_SYMBOLS
+
+    def test_all_masses_match_mendeleev(self, mendeleev_isotopes_df):
+        result = lookup_isotope_masses(
+            mendeleev_isotopes_df.atomic_number.values,
+            mendeleev_isotopes_df.mass_number.values,
+        )
+        np.testing.assert_array_equal(result, mendeleev_isotopes_df.mass.values)
+
+    def test_all_abundances_match_mendeleev(self, mendeleev_isotopes_df):
+        result = lookup_isotope_abundances(
+            mendeleev_isotopes_df.atomic_number.values,
+            mendeleev_isotopes_df.mass_number.values,
+        )
+        np.testing.assert_allclose(
+            result, mendeleev_isotopes_df.abundance.fillna(0.0).values / 100
+        )
+
+    def test_table_is_memory_mapped(self):
+        isotopes.clear_isotope_table_cache()
+        _, masses = load_isotope_table()
+        assert isinstance(masses, np.memmap)
+
+
+class Test_get_atomic_numbers:
+    def test_expected_output(self):
+        result = get_atomic_numbers(["H", "C", "N", "O", "Og"])
+        assert result.tolist() == [1, 6, 7, 8, 118]
+
+    def test_unknown_symbols(self):
+        with pytest.raises(ValueError) as exc:
+            get_atomic_numbers(["H", "Xx", "D", "H"])
+        assert "Unknown element symbols: ['D', 'Xx']" in str(exc.value)
+
+
+class Test_lookup_isotope_masses:
+    def test_broadcasting(self):
+        result = lookup_isotope_masses([1, 6], [[1, 12], [2, 13]])
+        np.testing.assert_allclose(
+            result,
+            [[1.007825031898, 12.0], [2.014101777844, 13.00335483534]],
+        )
+
+    @pytest.mark.parametrize(
+        "atomic_number,mass_number",
+        [(1, 0), (1, 123123), (6, -13), (0, 1), (119, 300), (-1, 1)],
+    )
+    def test_unknown_isotopes_are_nan(self, atomic_number, mass_number):
+        assert np.isnan(lookup_isotope_masses(atomic_number, mass_number))
+
+
+class Test_lookup_isotope_mass:
+    @pytest.mark.parametrize(
+        "symbol,mass_number,mass",
+        [
+            ("H", 1, 1.007825031898),
+            ("C", 13, 13.00335483534),
+            ("N", np.int16(15), 15.00010889827),
+            (1, 2, 2.014101777844),
+        ],
+    )
+    def test_masses(self, symbol, mass_number, mass):
+        result = lookup_isotope_mass(symbol, mass_number)
+        assert isinstance(result, float) and result == mass
+
+    @pytest.mark.parametrize(
+        "symbol,mass_number,exc_type",
+        [
+            ("H", 123123, KeyError),
+            ("AF", 123, KeyError),
+            ("Xx", 14, KeyError),
+            (1, "H", TypeError),
+            ("N", "14", TypeError),
+            ("N", 14.0, TypeError),
+        ],
+    )
+    def test_bad_isotopes(self, symbol, mass_number, exc_type):
+        with pytest.raises(exc_type):
+            lookup_isotope_mass(symbol, mass_number)
+
+
+class Test_is_known_isotope:
+    def test_expected_output(self):
+        result = is_known_isotope([[1], [6], [0]], [1, 7, 8, 13])
+        np.testing.assert_array_equal(
+            result,
+            [[True, True, False, False], [False, False, True, True], [False] * 4],
+        )
+
+
+class Test_lookup_isotope_abundances:
+    def test_expected_output(self):
+        result = lookup_isotope_abundances([1, 1, 1, 6], [1, 2, 3, 5])
+        np.testing.assert_allclose(result[:3], [0.999855, 0.000145, 0.0])
+        assert np.isnan(result[3])
+
+    def test_loaded_before_masses(self):
+        isotopes.clear_isotope_table_cache()
+        lookup_isotope_abundances(1, 2)
+        assert lookup_isotope_mass("H", 2) == pytest.approx(2.014101777844)
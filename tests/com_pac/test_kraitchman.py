@@ -0,0 +1,166 @@
+"""
+Unit tests for functions in kraitchman.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import get_principal_axes
+from com_pac.kraitchman import (
+    get_kraitchman_coordinates,
+    get_kraitchman_values,
+    get_planar_moments,
+    get_single_substitutions,
+)
+
+
+@pytest.fixture
+def pyridazine_substitutions(pyridazine_mass_numbers):
+    """Parent plus one single substitution per atom, one double substitution"""
+    heavier = {"N": 15, "C": 13, "H": 2}
+    symbols = ["N", "N", "C", "C", "C", "C", "H", "H", "H", "H"]
+    isotopologue_dict = {"parent": list(pyridazine_mass_numbers)}
+    for site, symbol in enumerate(symbols):
+        mass_numbers = list(pyridazine_mass_numbers)
+        mass_numbers[site] = heavier[symbol]
+        isotopologue_dict[f"{symbol}{site + 1}"] = mass_numbers
+    isotopologue_dict["double"] = [15, 15] + list(pyridazine_mass_numbers[2:])
+    return list(isotopologue_dict), isotopologue_dict
+
+
+class Test_get_planar_moments:
+    def test_expected_output(self):
+        result = get_planar_moments([[2.0, 3.0, 5.0], [1.0, 1.0, 2.0]])
+        assert np.allclose(result, [[3.0, 2.0, 0.0], [1.0, 1.0, 0.0]])
+
+    def test_sum_of_squares(self, pyridazine_coords, pyridazine_mol_masses):
+        masses = pyridazine_mol_masses
+        com = pyridazine_coords - masses @ pyridazine_coords / masses.sum()
+        inertia = (masses * (com**2).sum(axis=1)).sum() * np.eye(3)
+        inertia -= (com * masses[:, np.newaxis]).T @ com
+        evals, evecs = np.linalg.eigh(inertia)
+
+        result = get_planar_moments(evals)
+
+        assert np.allclose(result, masses @ (com @ evecs) ** 2)
+
+
+class Test_get_single_substitutions:
+    def test_expected_output(self):
+        mass_numbers = [
+            [1, 14, 14, 14],
+            [2, 14, 14, 14],
+            [1, 15, 15, 14],
+            [1, 14, 14, 15],
+            [1, 14, 14, 14],
+            [3, 14, 14, 14],
+        ]
+        iso_indices, sites = get_single_substitutions(mass_numbers)
+        assert iso_indices.tolist() == [1, 3, 5]
+        assert sites.tolist() == [0, 3, 0]
+
+    def test_no_substitutions(self):
+        iso_indices, sites = get_single_substitutions([[1, 14], [2, 15]])
+        assert len(iso_indices) == 0 and len(sites) == 0
+
+
+class Test_get_kraitchman_coordinates:
+    def test_recovers_parent_coordinates(
+        self,
+        pyridazine_substitutions,
+        pyridazine_symbols,
+        pyridazine_coords,
+        pyridazine_dipole,
+    ):
+        """Kraitchman's equations are exact for a rigid, non-planar geometry"""
+        isotopologue_names, isotopologue_dict = pyridazine_substitutions
+        results = get_principal_axes(
+            isotopologue_names,
+            isotopologue_dict,
+            10,
+            pyridazine_symbols,
+            pyridazine_coords,
+            pyridazine_dipole,
+        )
+        atom_masses, pa_coordinates, eigenvalues = results[0], results[3], results[8]
+        parent, substituted = isotopologue_names[0], isotopologue_names[1:-1]
+
+        coordinates, costain_errors, squared_coordinates = get_kraitchman_coordinates(
+            eigenvalues[parent],
+            np.array([eigenvalues[iso] for iso in substituted]),
+            atom_masses[parent].sum(),
+            np.array(
+                [
+                    atom_masses[iso][i] - atom_masses[parent][i]
+                    for i, iso in enumerate(substituted)
+                ]
+            ),
+        )
+
+        expected = np.abs(pa_coordinates[parent])
+        assert np.allclose(coordinates, expected, rtol=1e-7, atol=1e-7)
+        assert np.allclose(squared_coordinates, expected**2, rtol=1e-7, atol=1e-7)
+        assert np.allclose(costain_errors, 0.0015 / coordinates)
+
+    def test_imaginary_coordinates_are_nan(self):
+        # Planar moments (18, 8, 2); the substitution lowers P_c to 1.9: c^2 < 0
+        parent_moments = np.array([10.0, 20.0, 26.0])
+        substituted_moments = np.array([[10.5, 20.5, 27.2]])
+
+        coordinates, costain_errors, squared_coordinates = get_kraitchman_coordinates(
+            parent_moments, substituted_moments, 50.0, np.array([1.0])
+        )
+
+        assert squared_coordinates[0, 2] < 0
+        assert np.isnan(coordinates[0, 2]) and np.isnan(costain_errors[0, 2])
+        assert np.all(np.isfinite(coordinates[0, :2]))
+
+
+class Test_get_kraitchman_values:
+    def test_only_single_substitutions(
+        self,
+        pyridazine_substitutions,
+        pyridazine_symbols,
+        pyridazine_coords,
+        pyridazine_dipole,
+    ):
+        isotopologue_names, isotopologue_dict = pyridazine_substitutions
+        results = get_principal_axes(
+            isotopologue_names,
+            isotopologue_dict,
+            10,
+            pyridazine_symbols,
+            pyridazine_coords,
+            pyridazine_dipole,
+        )
+        atom_numbering = [f"{sym}{i + 1}" for i, sym in enumerate(pyridazine_symbols)]
+
+        result = get_kraitchman_values(
+            isotopologue_names,
+            isotopologue_dict,
+            results[0],
+            results[8],
+            atom_numbering,
+        )
+
+        assert list(result) == isotopologue_names[1:-1]
+        for iso, values in result.items():
+            assert values["atom"] == iso
+            assert list(values) == ["atom", "|a|", "|b|", "|c|", "d|a|", "d|b|", "d|c|"]
+        parent_pa_coordinates = results[3][isotopologue_names[0]]
+        assert np.allclose(
+            [result["C3"]["|a|"], result["C3"]["|b|"], result["C3"]["|c|"]],
+            np.abs(parent_pa_coordinates[2]),
+            atol=1e-7,
+        )
+
+    def test_no_single_substitutions(self, capsys):
+        result = get_kraitchman_values(
+            ["iso1", "iso2"],
+            {"iso1": [1, 14], "iso2": [2, 15]},
+            {},
+            {},
+            ["H1", "N2"],
+        )
+        assert result is None
+        assert "No singly-substituted isotopologues" in capsys.readouterr().out
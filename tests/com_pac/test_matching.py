@@ -0,0 +1,136 @@
+"""
+Unit tests for functions in matching.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.matching import (
+    build_constants_index,
+    format_matches,
+    load_constants_index,
+    query_constants_index,
+    save_constants_index,
+)
+
+
+@pytest.fixture(scope="module")
+def random_constants():
+    rng = np.random.default_rng(0)
+    return np.sort(rng.uniform(1000.0, 10000.0, size=(5000, 3)), axis=1)[:, ::-1]
+
+
+@pytest.fixture(scope="module")
+def random_index(random_constants):
+    return build_constants_index(random_constants)
+
+
+def linear_scan(constants, observed, tolerance, k):
+    residuals = observed - constants
+    scaled = np.where(np.isnan(observed), 0.0, np.abs(residuals) / tolerance)
+    within = np.flatnonzero(np.all(scaled <= 1, axis=-1))
+    scores = np.sqrt(np.sum(scaled[within] ** 2, axis=-1))
+    order = np.lexsort((within, scores))[:k]
+    return within[order], scores[order]
+
+
+class Test_build_constants_index:
+    def test_from_dict(self):
+        rotational_constants = {
+            "iso1": np.array([30.0, 20.0, 10.0]),
+            "iso2": np.array([25.0, 21.0, 9.0]),
+        }
+        result = build_constants_index(rotational_constants)
+        assert result["labels"].tolist() == ["iso1", "iso2"]
+        np.testing.assert_array_equal(result["orders"], [[1, 0], [0, 1], [1, 0]])
+        np.testing.assert_array_equal(
+            result["sorted_constants"], [[25.0, 30.0], [20.0, 21.0], [9.0, 10.0]]
+        )
+
+    def test_default_labels(self, random_index):
+        assert random_index["labels"][:3].tolist() == ["0", "1", "2"]
+
+    def test_mismatched_labels(self, random_constants):
+        with pytest.raises(ValueError) as exc:
+            build_constants_index(random_constants, labels=["a", "b"])
+        assert "Number of labels (2)" in str(exc.value)
+
+
+class Test_query_constants_index:
+    @pytest.mark.parametrize(
+        "observed,tolerance",
+        [
+            ([5000.0, 3000.0, 2000.0], 200.0),
+            ([5000.0, np.nan, 2000.0], 100.0),
+            ([np.nan, 3000.0, np.nan], 5.0),
+            ([5000.0, 3000.0, 2000.0], [300.0, 50.0, 100.0]),
+        ],
+    )
+    def test_matches_linear_scan(
+        self, random_constants, random_index, observed, tolerance
+    ):
+        result = query_constants_index(random_index, observed, tolerance, k=5)
+
+        indices, scores = linear_scan(
+            random_constants, np.array(observed), np.array(tolerance), 5
+        )
+        np.testing.assert_array_equal(result["indices"], indices)
+        np.testing.assert_allclose(result["scores"], scores)
+        np.testing.assert_allclose(
+            result["residuals"], observed - random_constants[indices]
+        )
+        assert result["labels"].tolist() == [str(i) for i in indices]
+
+    def test_exact_match_ranks_first(self, random_constants, random_index):
+        result = query_constants_index(random_index, random_constants[1234], 50.0)
+        assert result["indices"][0] == 1234 and result["scores"][0] == 0
+
+    def test_no_matches(self, random_index):
+        result = query_constants_index(random_index, [1.0, 1.0, 1.0], 0.1)
+        assert len(result["indices"]) == 0
+
+    def test_nothing_observed(self, random_index):
+        with pytest.raises(ValueError) as exc:
+            query_constants_index(random_index, [np.nan] * 3, 1.0)
+        assert "At least one observed constant" in str(exc.value)
+
+    def test_bad_tolerance(self, random_index):
+        with pytest.raises(ValueError) as exc:
+            query_constants_index(random_index, [1.0, 1.0, 1.0], 0.0)
+        assert "Tolerances must be positive" in str(exc.value)
+
+
+class Test_save_constants_index:
+    def test_round_trip(self, tmp_path, random_index):
+        path = tmp_path / "index.npz"
+        save_constants_index(random_index, path)
+        result = load_constants_index(path)
+        assert sorted(result) == sorted(random_index)
+        for key, values in random_index.items():
+            np.testing.assert_array_equal(result[key], values)
+
+
+class Test_format_matches:
+    def test_expected_output(self):
+        matches = {
+            "labels": np.array(["iso1"]),
+            "residuals": np.array([[0.5, np.nan, -0.25]]),
+            "scores": np.array([0.559]),
+        }
+        lines = format_matches(matches).splitlines()
+        assert lines[0].split() == [
+            "Rank",
+            "Candidate",
+            "dA",
+            "(MHz)",
+            "dB",
+            "(MHz)",
+            "dC",
+            "(MHz)",
+            "Score",
+        ]
+        assert lines[1].split() == ["1", "iso1", "0.5000", "nan", "-0.2500", "0.5590"]
+
+    def test_no_matches(self):
+        matches = {"labels": [], "residuals": [], "scores": []}
+        assert "No candidates within tolerance." in format_matches(matches)
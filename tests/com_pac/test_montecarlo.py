@@ -0,0 +1,139 @@
+"""
+Unit tests for functions in montecarlo.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import get_principal_axes_batch
+from com_pac.montecarlo import (
+    MONTE_CARLO_QUANTITIES,
+    get_monte_carlo_samples,
+    get_monte_carlo_values,
+    get_perturbed_geometries,
+    get_sample_statistics,
+)
+
+
+@pytest.fixture
+def hn3_dn3_masses(hn3_mol_masses, dn3_mol_masses):
+    return np.array([hn3_mol_masses, dn3_mol_masses])
+
+
+class Test_get_perturbed_geometries:
+    def test_expected_spread(self, hn3_coords):
+        errors = np.zeros_like(hn3_coords)
+        errors[0] = [0.1, 0.2, 0.0]
+        geometries = get_perturbed_geometries(
+            hn3_coords, errors, 20000, np.random.default_rng(0)
+        )
+
+        assert geometries.shape == (20000, 4, 3)
+        np.testing.assert_allclose(
+            geometries.std(axis=0), errors, rtol=0.05, atol=1e-15
+        )
+        np.testing.assert_allclose(geometries.mean(axis=0), hn3_coords, atol=0.01)
+
+    def test_mismatched_shape(self, hn3_coords):
+        with pytest.raises(ValueError) as exc:
+            get_perturbed_geometries(
+                hn3_coords, np.zeros((3, 3)), 2, np.random.default_rng(0)
+            )
+        assert "Shape of coordinate_errors (3, 3)" in str(exc.value)
+
+
+class Test_get_monte_carlo_samples:
+    def test_zero_errors_give_nominal_values(
+        self, hn3_dn3_masses, hn3_coords, hn3_dipole
+    ):
+        rotational_constants, pa_dipoles = get_monte_carlo_samples(
+            hn3_dn3_masses, hn3_coords, np.zeros_like(hn3_coords), hn3_dipole, 5
+        )
+        nominal = get_principal_axes_batch(hn3_dn3_masses, hn3_coords, hn3_dipole)
+
+        assert rotational_constants.shape == pa_dipoles.shape == (5, 2, 3)
+        np.testing.assert_allclose(
+            rotational_constants, np.broadcast_to(nominal[1], (5, 2, 3))
+        )
+        np.testing.assert_allclose(
+            pa_dipoles, np.broadcast_to(nominal[2], (5, 2, 3)), atol=1e-12
+        )
+
+    def test_matches_per_geometry_calculation(
+        self, hn3_dn3_masses, hn3_coords, hn3_dipole
+    ):
+        errors = np.full_like(hn3_coords, 0.01)
+        rotational_constants, pa_dipoles = get_monte_carlo_samples(
+            hn3_dn3_masses, hn3_coords, errors, hn3_dipole, 10, seed=4, chunk_size=3
+        )
+
+        geometries = get_perturbed_geometries(
+            hn3_coords, errors, 10, np.random.default_rng(4)
+        )
+        for k, geometry in enumerate(geometries):
+            expected = get_principal_axes_batch(hn3_dn3_masses, geometry, hn3_dipole)
+            np.testing.assert_allclose(rotational_constants[k], expected[1])
+            np.testing.assert_allclose(pa_dipoles[k], expected[2], atol=1e-12)
+
+    def test_chunk_size_does_not_change_samples(
+        self, hn3_dn3_masses, hn3_coords, hn3_dipole
+    ):
+        errors = np.full_like(hn3_coords, 0.01)
+        results = [
+            get_monte_carlo_samples(
+                hn3_dn3_masses, hn3_coords, errors, hn3_dipole, 9, seed=2, chunk_size=n
+            )
+            for n in (1, 4, 9)
+        ]
+        for rotational_constants, pa_dipoles in results[1:]:
+            np.testing.assert_allclose(rotational_constants, results[0][0])
+            np.testing.assert_allclose(pa_dipoles, results[0][1])
+
+    @pytest.mark.parametrize("n_samples,chunk_size", [(0, 10), (10, 0)])
+    def test_bad_sizes(
+        self, hn3_dn3_masses, hn3_coords, hn3_dipole, n_samples, chunk_size
+    ):
+        with pytest.raises(ValueError):
+            get_monte_carlo_samples(
+                hn3_dn3_masses,
+                hn3_coords,
+                np.zeros_like(hn3_coords),
+                hn3_dipole,
+                n_samples,
+                chunk_size=chunk_size,
+            )
+
+
+class Test_get_sample_statistics:
+    def test_expected_output(self):
+        samples = np.arange(1.0, 102.0)[:, np.newaxis]
+        result = get_sample_statistics(samples, percentiles=(10, 50))
+        assert list(result) == ["mean", "std", "p10", "p50"]
+        np.testing.assert_allclose(result["mean"], [51.0])
+        np.testing.assert_allclose(result["std"], [np.std(samples, ddof=1)])
+        np.testing.assert_allclose(result["p10"], [11.0])
+        np.testing.assert_allclose(result["p50"], [51.0])
+
+    def test_single_sample(self):
+        result = get_sample_statistics(np.ones((1, 2)))
+        assert np.all(np.isnan(result["std"]))
+        np.testing.assert_allclose(result["p97.5"], [1.0, 1.0])
+
+
+class Test_get_monte_carlo_values:
+    def test_keys_and_reproducibility(self, hn3_dn3_masses, hn3_coords, hn3_dipole):
+        errors = np.full_like(hn3_coords, 0.005)
+        args = (["hn3", "dn3"], hn3_dn3_masses, hn3_coords, errors, hn3_dipole, 50)
+
+        result = get_monte_carlo_values(*args, seed=7)
+
+        assert list(result) == [
+            (iso, quantity)
+            for iso in ["hn3", "dn3"]
+            for quantity in MONTE_CARLO_QUANTITIES
+        ]
+        assert list(result[("hn3", "A")]) == ["mean", "std", "p2.5", "p50", "p97.5"]
+        assert result == get_monte_carlo_values(*args, seed=7)
+        assert result != get_monte_carlo_values(*args, seed=8)
+        for statistics in result.values():
+            assert statistics["p2.5"] <= statistics["p50"] <= statistics["p97.5"]
@@ -2,29 +2,48 @@
 Unit tests for functions in core.py
 """
 
+import itertools
+
+import numpy as np
+import pytest
 from mendeleev.fetch import fetch_table
 from mendeleev.mendeleev import element
 
-import pytest
-import numpy as np
 from com_pac.parser import (
+    COMPACT_ISOTOPOLOGUE_FORMAT,
+    check_for_duplicate_sections,
+    check_mass_number_array_is_valid,
+    check_mass_numbers_are_valid,
+    convert_numeric_fields,
     coordinates_error_message,
     dipole_error_message,
-    isotopologue_error_message,
+    enumerate_error_message,
+    get_coordinate_info,
     get_coordinate_matches,
     get_coordinate_section,
-    get_coordinate_info,
-    parse_input_coordinate_section,
+    get_dipole_info,
     get_dipole_matches,
     get_dipole_section,
-    get_dipole_info,
-    parse_input_dipole_section,
+    get_enumerate_info,
+    get_enumerate_matches,
+    get_invalid_mass_numbers,
+    get_isotopologue_arrays,
+    get_isotopologue_info,
     get_isotopologue_matches,
     get_isotopologue_section,
-    get_isotopologue_info,
-    parse_input_isotopologue_section,
-    check_for_duplicate_sections,
+    get_section_text,
+    get_uncertainty_info,
+    isotopologue_error_message,
+    iterate_isotopologue_section_blocks,
+    parse_input_coordinate_section,
+    parse_input_dipole_section,
+    parse_input_enumerate_section,
     parse_input_file,
+    parse_input_isotopologue_section,
+    parse_input_uncertainty_section,
+    read_isotopologue_lines,
+    tokenize_sections,
+    uncertainty_error_message,
 )
 
 
@@ -294,6 +313,19 @@ class Test_get_coordinate_info:
             )
         )
 
+    def test_reports_bad_line(self):
+        coord_section = " # header\nH 0 1 2\n\t\nN 0 1.0.0 2  # bad\nN 0 1 2"
+        with pytest.raises(ValueError) as exc:
+            get_coordinate_info(coord_section)
+        assert str(exc.value) == coordinates_error_message(
+            "Could not read line 3 of the section: 'N 0 1.0.0 2'"
+        )
+
+    def test_fallback_accepts_python_floats(self):
+        """Anything float() reads is accepted, even if the bulk conversion fails"""
+        result = get_coordinate_info("\nH 1_0 -inf 2 extra  # comment\nH 0 0 0")
+        np.testing.assert_array_equal(result[2], [[10.0, -np.inf, 2.0], [0, 0, 0]])
+
 
 @pytest.fixture
 def example_A_input_coordinates():
@@ -850,6 +882,49 @@ class Test_get_isotopologue_info:
         result = get_isotopologue_info(input_text, 3)
         assert result == (["iso000"], {"iso000": [1, 2, 3]})
 
+    def test_reports_bad_line(self):
+        input_text = "\n1 2 3 iso000\n\n1 2 x iso001 # comment\n1 2 3 iso002"
+        with pytest.raises(ValueError) as exc:
+            get_isotopologue_info(input_text, 3)
+        assert str(exc.value) == isotopologue_error_message(
+            "Could not read line 3 of the section: '1 2 x iso001 # comment'"
+        )
+
+    def test_extra_fields_ignored(self):
+        input_text = "\n1 2 3 iso000 extra fields\n+1 2 3 iso001 #comment\n"
+        result = get_isotopologue_info(input_text, 3)
+        assert result == (
+            ["iso000", "iso001"],
+            {"iso000": [1, 2, 3], "iso001": [1, 2, 3]},
+        )
+        assert all(type(x) is int for x in result[1]["iso000"])
+
+    def test_hash_inside_label(self):
+        """Only a "#" that starts a token starts a comment"""
+        input_text = "\n1 2 3 iso#1\n1 2 4 iso#2 # comment\n1 2 5 iso # #3"
+        result = get_isotopologue_info(input_text, 3)
+        assert result[0] == ["iso#1", "iso#2", "iso"]
+
+    def test_comment_only_lines_keep_bulk_path(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "com_pac.parser.convert_numeric_fields",
+            lambda *args: calls.append(args) or convert_numeric_fields(*args),
+        )
+        input_text = "\n# first\n1 2 3 iso000\n   # indented\n2 3 4 iso001 # last\n"
+        result = get_isotopologue_info(input_text, 3)
+        assert result == (
+            ["iso000", "iso001"],
+            {"iso000": [1, 2, 3], "iso001": [2, 3, 4]},
+        )
+        assert len(calls) == 1
+
+        names, mass_numbers = read_isotopologue_lines(
+            ["1 2 3 iso000", "  # comment", "2 3 4 iso001"], 3
+        )
+        assert names == ["iso000", "iso001"] and len(calls) == 2
+        np.testing.assert_array_equal(mass_numbers, [[1, 2, 3], [2, 3, 4]])
+
     def test_duplicate_isolabel(self):
         input_text = "\n1 2 3 iso000 #first one\n2 3 4 iso000 #second one"
         with pytest.raises(ValueError) as exc:
@@ -953,6 +1028,194 @@ class Test_parse_input_isotopologue_section:
         )
 
 
+OUT_OF_RANGE_HINT = "Mass numbers beyond +/-32767 are not known isotopes."
+
+
+class Test_iterate_isotopologue_section_blocks:
+    def test_blocks(self, example_A_input_isotopologues):
+        section = example_A_input_isotopologues.split("Isotopologues", 1)[1]
+        result = list(iterate_isotopologue_section_blocks(section, 2, chunk_size=2))
+
+        assert [names for names, _ in result] == [["iso000", "iso001"], ["iso002"]]
+        assert all(mass_numbers.dtype == np.int16 for _, mass_numbers in result)
+        np.testing.assert_array_equal(result[1][1], [[2, 2]])
+
+    def test_duplicate_label_in_later_block(self):
+        section = "\n1 2 3 iso000\n\t\n2 3 4 iso001\n2 3 4 iso000 # again"
+        blocks = iterate_isotopologue_section_blocks(section, 3, chunk_size=1)
+        assert next(blocks)[0] == ["iso000"]
+        assert next(blocks)[0] == ["iso001"]
+        with pytest.raises(ValueError) as exc:
+            next(blocks)
+        assert "duplicate labels: ['iso000']" in str(exc.value)
+
+    @pytest.mark.parametrize(
+        "section, line, hints",
+        [
+            ("\n1 2 iso000", "1 2 iso000", ()),
+            (
+                "\n1 2 3 iso000\n\n1 2.5 3 iso001 # comment",
+                "1 2.5 3 iso001 # comment",
+                (),
+            ),
+            ("\n1 2 40000 iso000", "1 2 40000 iso000", (OUT_OF_RANGE_HINT,)),
+            (
+                "\n# only a comment\n1 2 40000 iso001",
+                "1 2 40000 iso001",
+                (OUT_OF_RANGE_HINT,),
+            ),
+        ],
+    )
+    def test_bad_lines(self, section, line, hints):
+        with pytest.raises(ValueError) as exc:
+            list(iterate_isotopologue_section_blocks(section, 3, chunk_size=1))
+        line_number = section.count("\n", 0, section.index(line))
+        assert str(exc.value) == isotopologue_error_message(
+            f"Could not read line {line_number} of the section: {line!r}", *hints
+        )
+
+
+class Test_get_isotopologue_arrays:
+    @pytest.mark.parametrize("example", ["A", "B"])
+    def test_matches_get_isotopologue_info(
+        self,
+        example,
+        example_A_input_isotopologues,
+        example_B_input_isotopologues,
+    ):
+        input_text, n_atoms = {
+            "A": (example_A_input_isotopologues, 2),
+            "B": (example_B_input_isotopologues, 4),
+        }[example]
+        section = input_text.split("Isotopologues", 1)[1]
+        names, isotopologue_dict = get_isotopologue_info(section, n_atoms)
+
+        result_names, mass_numbers = get_isotopologue_arrays(section, n_atoms)
+
+        assert result_names.tolist() == names
+        assert mass_numbers.dtype == np.int16
+        assert mass_numbers.tolist() == [isotopologue_dict[x] for x in names]
+
+    def test_empty_section(self):
+        names, mass_numbers = get_isotopologue_arrays("  # nothing", 3)
+        assert names.shape == (0,) and mass_numbers.shape == (0, 3)
+
+
+class Test_compact_isotopologue_lines:
+    atom_numbering = ("H1", "N2", "N3", "N4")
+    section = (
+        "\n1 14 14 14 hn3  # parent\n"
+        "iso001 = hn3 H1:2\n"
+        "iso002=hn3 N2:15 N4:15  # two sites\n"
+        "\n"
+        "2 14 14 14 dn3\n"
+        "iso003 = dn3 N3:15\n"
+        "iso004 = hn3"
+    )
+    expected = (
+        ("hn3", [1, 14, 14, 14]),
+        ("iso001", [2, 14, 14, 14]),
+        ("iso002", [1, 15, 14, 15]),
+        ("dn3", [2, 14, 14, 14]),
+        ("iso003", [2, 14, 15, 14]),
+        ("iso004", [1, 14, 14, 14]),
+    )
+
+    def test_get_isotopologue_info(self):
+        names, isotopologue_dict = get_isotopologue_info(
+            self.section, 4, self.atom_numbering
+        )
+        assert names == [name for name, _ in self.expected]
+        assert isotopologue_dict == dict(self.expected)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 4096])
+    def test_parents_in_earlier_blocks(self, chunk_size):
+        blocks = iterate_isotopologue_section_blocks(
+            self.section, 4, chunk_size, self.atom_numbering
+        )
+        names, mass_numbers = zip(*blocks)
+
+        assert list(itertools.chain.from_iterable(names)) == [
+            name for name, _ in self.expected
+        ]
+        assert np.concatenate(mass_numbers).tolist() == [
+            row for _, row in self.expected
+        ]
+
+    def test_parse_input_file(self, example_B_inputs):
+        coord, dip, iso = example_B_inputs
+        full_input = f"{coord}\n\n{dip}\n\n{iso}\n\n"
+        compact_input = full_input.replace("2 14 14 14 iso001", "iso001 = iso000 H1:2")
+        assert compact_input != full_input
+
+        for as_arrays in (False, True):
+            expected = parse_input_file(full_input, as_arrays)
+            result = parse_input_file(compact_input, as_arrays)
+            np.testing.assert_array_equal(result[0], expected[0])
+            if as_arrays:
+                np.testing.assert_array_equal(result[1], expected[1])
+            else:
+                assert result[1] == expected[1]
+
+    @pytest.mark.parametrize(
+        "line, reason",
+        [
+            (
+                "iso002 = dn3 H1:2",
+                "The parent 'dn3' is not the label of a full line above.",
+            ),
+            (
+                "iso002 = iso001 N2:15",
+                "The parent 'iso001' is not the label of a full line above.",
+            ),
+            ("iso002 = hn3 H5:2", "'H5' is not one of the atom labels H1, N2, N3, N4."),
+            ("iso002 = hn3 H1:2.5", COMPACT_ISOTOPOLOGUE_FORMAT),
+            ("iso002 = hn3 H1", COMPACT_ISOTOPOLOGUE_FORMAT),
+            ("iso 002 = hn3 H1:2", COMPACT_ISOTOPOLOGUE_FORMAT),
+            ("iso002 =  # nothing", COMPACT_ISOTOPOLOGUE_FORMAT),
+            ("iso002=hn3 H1:x", COMPACT_ISOTOPOLOGUE_FORMAT),
+        ],
+    )
+    def test_bad_lines(self, line, reason):
+        section = f"\n1 14 14 14 hn3\niso001 = hn3 H1:2\n{line}\n2 14 14 14 dn3"
+        with pytest.raises(ValueError) as exc:
+            get_isotopologue_info(section, 4, self.atom_numbering)
+        assert str(exc.value) == isotopologue_error_message(
+            f"Could not read line 3 of the section: {line!r}", reason
+        )
+
+    def test_labels_with_equals_sign_are_full_lines(self):
+        full_lines = "\n1 14 14 14 a=b\n2 14 14 14 iso001 = x\n1 15 14 14 c = d"
+        # Parsed as before compact lines existed, without atom labels
+        assert get_isotopologue_info(full_lines, 4) == (
+            ["a=b", "iso001", "c"],
+            {
+                "a=b": [1, 14, 14, 14],
+                "iso001": [2, 14, 14, 14],
+                "c": [1, 15, 14, 14],
+            },
+        )
+
+        section = full_lines + "\niso002 = a=b N3:15  # compact\ne=f = a=b"
+        names, isotopologue_dict = get_isotopologue_info(
+            section, 4, self.atom_numbering
+        )
+        assert names == ["a=b", "iso001", "c", "iso002", "e=f"]
+        assert isotopologue_dict["iso002"] == [1, 14, 15, 14]
+        assert isotopologue_dict["e=f"] == [1, 14, 14, 14]
+
+        result_names, mass_numbers = get_isotopologue_arrays(
+            section, 4, self.atom_numbering
+        )
+        assert result_names.tolist() == names
+        assert mass_numbers.tolist() == list(isotopologue_dict.values())
+
+    def test_needs_atom_numbering(self):
+        with pytest.raises(ValueError) as exc:
+            get_isotopologue_info(self.section, 4)
+        assert "need the atom labels of the Coordinates section" in str(exc.value)
+
+
 # ---------------------------------
 # Tests for the whole input_parser!
 # ---------------------------------
@@ -1351,3 +1614,302 @@ class Test_check_for_duplicate_sections:
         assert (exc.type is ValueError) and (
             "coordinates" in error_msg
         ) and ("dipole" in error_msg)
+
+
+class Test_get_invalid_mass_numbers:
+    def test_expected_output(self):
+        result = get_invalid_mass_numbers(
+            np.array([[1, 14, 15], [8, 14, 99], [2, 50, 14]], dtype=np.int16),
+            ["H", "N", "N"],
+        )
+        np.testing.assert_array_equal(result, [[1, 0], [1, 2], [2, 1]])
+
+    def test_unknown_symbol_and_empty(self):
+        np.testing.assert_array_equal(
+            get_invalid_mass_numbers([[1, 1]], ["H", "Xx"]), [[0, 1]]
+        )
+        assert get_invalid_mass_numbers(np.empty((0, 2)), ["H", "H"]).shape == (0, 2)
+
+    def test_huge_mass_numbers(self):
+        """Only the distinct pairs are looked up, not the range between them"""
+        result = get_invalid_mass_numbers(
+            [[12, 16, 2, 100_000_000], [12, 16, 1, 16], [-(2**62), 16, 1, 16]],
+            ["C", "O", "H", "O"],
+        )
+        np.testing.assert_array_equal(result, [[0, 3], [2, 0]])
+
+    def test_several_blocks(self):
+        mass_numbers = np.tile(np.array([1, 14], dtype=np.int16), (10_000, 1))
+        mass_numbers[[0, 4095, 4096, 9999], [1, 0, 1, 0]] = 99
+        np.testing.assert_array_equal(
+            get_invalid_mass_numbers(mass_numbers, ["H", "N"]),
+            [[0, 1], [4095, 0], [4096, 1], [9999, 0]],
+        )
+
+
+class Test_check_mass_numbers_are_valid:
+    def test_valid(self):
+        check_mass_numbers_are_valid({"a": [1, 14], "b": [2, 15]}, ["H", "N"])
+        check_mass_number_array_is_valid(np.array([[1, 14]]), ["H", "N"])
+
+    def test_reports_every_invalid_pair(self):
+        with pytest.raises(ValueError) as exc:
+            check_mass_numbers_are_valid(
+                {"hn": [1, 14], "xn": [8, 14], "hx": [1, 41], "xx": [0, 5]},
+                ["H", "N"],
+                ["H1", "N2"],
+            )
+        assert str(exc.value) == isotopologue_error_message(
+            "Found 4 mass number(s) that are not known isotopes of their element:",
+            "xn: H1 with mass number 8",
+            "hx: N2 with mass number 41",
+            "xx: H1 with mass number 0",
+            "xx: N2 with mass number 5",
+        )
+
+    def test_array_default_labels(self):
+        with pytest.raises(ValueError) as exc:
+            check_mass_number_array_is_valid([[1, 14], [1, 4]], ["H", "N"])
+        assert "1: N2 with mass number 4" in str(exc.value)
+
+    @pytest.mark.parametrize("as_arrays", [False, True])
+    def test_parse_input_file(self, example_B_inputs, as_arrays):
+        coord, dip, iso = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\n{iso}\n1 14 14 41 iso_bad\n\n"
+        with pytest.raises(ValueError) as exc:
+            parse_input_file(input_text, as_arrays=as_arrays)
+        assert "iso_bad: N4 with mass number 41" in str(exc.value)
+
+    def test_huge_mass_number(self, example_B_inputs):
+        coord, dip, iso = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\n{iso}\n1 14 14 100000000 iso_bad\n\n"
+        with pytest.raises(ValueError) as exc:
+            parse_input_file(input_text)
+        assert "iso_bad: N4 with mass number 100000000" in str(exc.value)
+
+
+class Test_tokenize_sections:
+    def test_spans_match_section_functions(self, example_A_inputs):
+        coord, dip, iso = example_A_inputs
+        input_text = f"Header\n\n{coord}\n \t\n\n{dip}\n\n{iso}\n\nOther stuff"
+        result = tokenize_sections(input_text)
+
+        assert [len(spans) for spans in result.values()] == [1, 1, 1, 0, 0]
+        for section_name, get_matches, get_section in (
+            ("coordinates", get_coordinate_matches, get_coordinate_section),
+            ("dipole", get_dipole_matches, get_dipole_section),
+            ("isotopologues", get_isotopologue_matches, get_isotopologue_section),
+        ):
+            start, end = result[section_name][0]
+            assert input_text[start:end] == get_section(get_matches(input_text))
+
+    def test_unterminated_and_duplicate_sections(self):
+        input_text = "coordinates\nH 0 0 0\n\nCOORDINATES\nH 1 1 1\nDipole\n1 2 3"
+        result = tokenize_sections(input_text)
+        assert result["coordinates"] == [(11, 19), (32, None)]
+        assert result["dipole"] == [(47, None)]
+
+
+class Test_get_section_text:
+    @pytest.mark.parametrize(
+        "input_text, expected",
+        [
+            ("Dipole\n1 2 3\n", "Could not find end of dipole section"),
+            ("dipole\n1 2 3\n\ndipole\n1 2 3\n\n", "multiple dipole sections"),
+            ("Coordinates\nH 0 0 0\n\n", 'starting with "dipole"'),
+        ],
+    )
+    def test_same_errors_as_section_functions(self, input_text, expected):
+        with pytest.raises(ValueError) as exc:
+            get_section_text(
+                input_text,
+                tokenize_sections(input_text),
+                "dipole",
+                dipole_error_message,
+                'Could not find line starting with "dipole" (case insensitive).',
+            )
+        with pytest.raises(ValueError) as old_exc:
+            get_dipole_section(get_dipole_matches(input_text))
+        assert expected in str(exc.value)
+        assert str(exc.value) == str(old_exc.value)
+
+    def test_optional_section(self):
+        input_text = "Dipole\n1 2 3\n\n"
+        result = get_section_text(
+            input_text,
+            tokenize_sections(input_text),
+            "uncertainties",
+            uncertainty_error_message,
+        )
+        assert result is None
+
+
+@pytest.fixture
+def example_B_input_enumerate():
+    return """Enumerate double  # Example B
+H 1 2 3
+N 14 15  # nitrogen"""
+
+
+class Test_get_enumerate_matches:
+    def test_missing_section(self, example_B_inputs):
+        coord, dip, iso = example_B_inputs
+        assert get_enumerate_matches(f"{coord}\n\n{dip}\n\n{iso}\n\n") is None
+
+    def test_multiple_sections(self, example_B_input_enumerate):
+        with pytest.raises(ValueError) as exc:
+            get_enumerate_matches(
+                f"{example_B_input_enumerate}\n\n{example_B_input_enumerate}\n\n"
+            )
+        assert "Input file contains multiple enumerate sections." in str(exc.value)
+
+
+class Test_get_enumerate_info:
+    def test_expected_output(self):
+        result = get_enumerate_info(" double  # Example B\nH 1 2 3\nN 14 15  # N")
+        assert result == ("double", {"H": [1, 2, 3], "N": [14, 15]})
+
+    def test_default_mode(self):
+        assert get_enumerate_info("   # comment\nH 1 2") == (
+            "single",
+            {"H": [1, 2]},
+        )
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError) as exc:
+            get_enumerate_info(" triple\nH 1 2")
+        assert "Unknown enumeration mode 'triple'" in str(exc.value)
+
+    def test_bad_mass_number(self):
+        with pytest.raises(ValueError) as exc:
+            get_enumerate_info("\nH 1 two")
+        assert str(exc.value) == enumerate_error_message()
+
+    def test_duplicate_elements(self):
+        with pytest.raises(ValueError) as exc:
+            get_enumerate_info("\nH 1 2\nH 1 3")
+        assert "duplicate elements: ['H']" in str(exc.value)
+
+
+class Test_parse_input_enumerate_section:
+    def test_missing_end_of_section(self, example_B_input_enumerate):
+        with pytest.raises(ValueError) as exc:
+            parse_input_enumerate_section(example_B_input_enumerate)
+        assert "Could not find end of enumerate section" in str(exc.value)
+
+    def test_expected_output(self, example_B_input_enumerate):
+        result = parse_input_enumerate_section(f"{example_B_input_enumerate}\n\n")
+        assert result == ("double", {"H": [1, 2, 3], "N": [14, 15]})
+
+
+class Test_parse_input_file_enumerate:
+    def test_replaces_isotopologues(
+        self, example_B_inputs, example_B_input_enumerate, example_B_parsed
+    ):
+        coord, dip, _ = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\n{example_B_input_enumerate}\n\n"
+
+        result = parse_input_file(input_text)
+
+        assert result[0] == [
+            "parent",
+            "H1:2_N2:15",
+            "H1:3_N2:15",
+            "H1:2_N3:15",
+            "H1:3_N3:15",
+            "H1:2_N4:15",
+            "H1:3_N4:15",
+            "N2:15_N3:15",
+            "N2:15_N4:15",
+            "N3:15_N4:15",
+        ]
+        assert result[1]["parent"] == [1, 14, 14, 14]
+        assert result[1]["H1:3_N4:15"] == [3, 14, 14, 15]
+        assert all(type(x) is int for x in result[1]["N2:15_N3:15"])
+        assert result[2:4] == example_B_parsed[0][:2]
+
+    def test_as_arrays(self, example_B_inputs, example_B_input_enumerate):
+        coord, dip, iso = example_B_inputs
+        for sections in (f"{iso}\n\n", f"{example_B_input_enumerate}\n\n"):
+            input_text = f"{coord}\n\n{dip}\n\n{sections}"
+            expected = parse_input_file(input_text)
+
+            result = parse_input_file(input_text, as_arrays=True)
+
+            assert result[0].tolist() == expected[0]
+            assert result[1].dtype == np.int16
+            assert result[1].tolist() == [expected[1][x] for x in expected[0]]
+            assert result[2:4] == expected[2:4]
+
+    def test_both_sections(self, example_B_inputs, example_B_input_enumerate):
+        coord, dip, iso = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\n{iso}\n\n{example_B_input_enumerate}\n\n"
+        with pytest.raises(ValueError) as exc:
+            parse_input_file(input_text)
+        assert "both isotopologues and enumerate sections" in str(exc.value)
+
+    def test_missing_element(self, example_B_inputs):
+        coord, dip, _ = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\nEnumerate\nH 1 2\n\n"
+        with pytest.raises(ValueError) as exc:
+            parse_input_file(input_text)
+        assert "No isotopes listed for elements: ['N']" in str(exc.value)
+
+    def test_too_many_isotopologues(self, example_B_inputs, monkeypatch):
+        monkeypatch.setattr("com_pac.parser.MAX_ENUMERATED_ISOTOPOLOGUES", 5)
+        coord, dip, _ = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\nEnumerate all\nH 1 2\nN 14 15\n\n"
+        with pytest.raises(ValueError) as exc:
+            parse_input_file(input_text)
+        assert "Enumeration yields 16 isotopologues" in str(exc.value)
+
+
+class Test_get_uncertainty_info:
+    def test_expected_output(self):
+        section = "   # comment\nH 0.01  # isotropic\nN 0.1 0.2 0.3\n"
+        result = get_uncertainty_info(section, ["H", "N"])
+        np.testing.assert_array_equal(result, [[0.01] * 3, [0.1, 0.2, 0.3]])
+
+    def test_mismatched_atoms(self):
+        with pytest.raises(ValueError) as exc:
+            get_uncertainty_info("\nH 0.01\nN 0.01", ["H", "C"])
+        assert "do not match the coordinates section" in str(exc.value)
+
+    def test_missing_atoms(self):
+        with pytest.raises(ValueError) as exc:
+            get_uncertainty_info("\nH 0.01", ["H", "N"])
+        assert "do not match the coordinates section" in str(exc.value)
+
+    @pytest.mark.parametrize("line", ["H", "H 0.1 0.2", "H x 0.2 0.3"])
+    def test_bad_values(self, line):
+        with pytest.raises(ValueError) as exc:
+            get_uncertainty_info(f"\n{line}", ["H"])
+        assert str(exc.value) == uncertainty_error_message()
+
+    def test_negative_values(self):
+        with pytest.raises(ValueError) as exc:
+            get_uncertainty_info("\nH 0.1 -0.2 0.3", ["H"])
+        assert "finite and non-negative" in str(exc.value)
+
+
+class Test_parse_input_uncertainty_section:
+    def test_missing_section(self, example_B_inputs):
+        coord, dip, iso = example_B_inputs
+        input_text = f"{coord}\n\n{dip}\n\n{iso}\n\n"
+        assert parse_input_uncertainty_section(input_text, ["H"] + ["N"] * 3) is None
+
+    def test_expected_output(self, example_B_inputs):
+        coord, dip, iso = example_B_inputs
+        input_text = (
+            f"{coord}\n\nUncertainties\nH 0.01\nN 0.002\nN 0.002\nN 0.002\n\n"
+            f"{dip}\n\n{iso}\n\n"
+        )
+        result = parse_input_uncertainty_section(input_text, ["H"] + ["N"] * 3)
+        assert result.shape == (4, 3) and result[0, 0] == 0.01
+        # The extra section leaves the rest of the input file unchanged
+        assert parse_input_file(input_text)[2] == 4
+
+    def test_missing_end_of_section(self):
+        with pytest.raises(ValueError) as exc:
+            parse_input_uncertainty_section("Uncertainties\nH 0.01", ["H"])
+        assert "Could not find end of uncertainties section" in str(exc.value)
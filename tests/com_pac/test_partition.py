@@ -0,0 +1,110 @@
+"""
+Unit tests for functions in partition.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.partition import (
+    BOLTZMANN_MHZ_PER_K,
+    get_natural_abundances,
+    get_partition_values,
+    get_relative_intensities,
+    get_rotational_partition_functions,
+)
+
+
+@pytest.fixture(scope="module")
+def temperatures():
+    return np.array([2.0, 10.0, 50.0, 298.15])
+
+
+class Test_get_rotational_partition_functions:
+    def test_classical_limit(self, temperatures):
+        constants = np.array([[9000.0, 4000.0, 2500.0], [np.inf, 5000.0, 5000.0]])
+        result = get_rotational_partition_functions(
+            constants, temperatures, symmetry_number=2
+        )
+
+        kT = BOLTZMANN_MHZ_PER_K * temperatures
+        assert result.shape == (2, 4)
+        np.testing.assert_allclose(
+            result[0], np.sqrt(np.pi * kT**3 / (9000.0 * 4000.0 * 2500.0)) / 2
+        )
+        np.testing.assert_allclose(result[1], kT / 5000.0 / 2)
+
+    def test_sum_approaches_classical_limit(self, temperatures):
+        constants = np.array([[9000.0, 4000.0, 2500.0], [np.inf, 5000.0, 5000.0]])
+        classical = get_rotational_partition_functions(constants, temperatures[:3])
+        summed = get_rotational_partition_functions(
+            constants, temperatures[:3], J_max=150
+        )
+
+        # Linear molecules: Q = kT/hB + 1/3 + O(hB/kT)
+        np.testing.assert_allclose(summed[1], classical[1] + 1 / 3, rtol=1e-3)
+        relative_errors = summed[0] / classical[0] - 1
+        assert np.all(relative_errors > 0)
+        assert np.all(np.diff(relative_errors) < 0)
+        assert relative_errors[-1] < 1e-3
+
+    def test_ground_state_only(self):
+        """At very low temperature only J = 0 is populated"""
+        result = get_rotational_partition_functions(
+            [[9000.0, 4000.0, 2500.0]], [0.01], J_max=5
+        )
+        np.testing.assert_allclose(result, 1.0)
+
+    def test_bad_temperature(self):
+        with pytest.raises(ValueError) as exc:
+            get_rotational_partition_functions([[3.0, 2.0, 1.0]], [10.0, 0.0])
+        assert "Temperatures must be positive" in str(exc.value)
+
+
+class Test_get_natural_abundances:
+    def test_expected_output(self):
+        result = get_natural_abundances(
+            [[1, 14, 14, 14], [2, 14, 14, 14], [3, 14, 14, 14], [1, 99, 14, 14]],
+            ["H", "N", "N", "N"],
+        )
+        np.testing.assert_allclose(
+            result[:3],
+            [0.999855 * 0.996205**3, 0.000145 * 0.996205**3, 0.0],
+            rtol=1e-4,
+        )
+        assert np.isnan(result[3])
+
+
+class Test_get_relative_intensities:
+    def test_expected_output(self):
+        result = get_relative_intensities(
+            [0.9, 0.01, 0.01],
+            [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 0.0]],
+            [[10.0, 100.0], [20.0, 200.0], [10.0, 100.0]],
+        )
+        np.testing.assert_allclose(
+            result, [[1.0, 1.0], [0.02 / 0.9, 0.02 / 0.9], [0.0, 0.0]]
+        )
+
+
+class Test_get_partition_values:
+    def test_expected_keys(self, temperatures):
+        result = get_partition_values(
+            ["hn3", "dn3"],
+            {"hn3": [1, 14, 14, 14], "dn3": [2, 14, 14, 14]},
+            ["H", "N", "N", "N"],
+            {
+                "hn3": np.array([611000.0, 12000.0, 11800.0]),
+                "dn3": np.array([330000.0, 11500.0, 11100.0]),
+            },
+            {"hn3": np.array([0.8, 1.5, 0.0]), "dn3": np.array([0.6, 1.6, 0.0])},
+            temperatures,
+        )
+        assert sorted(result) == [
+            "abundances",
+            "intensities",
+            "partition_functions",
+            "temperatures",
+        ]
+        assert result["partition_functions"].shape == (2, 4)
+        np.testing.assert_array_equal(result["intensities"][0], 1.0)
+        assert np.all(result["intensities"][1] < 1e-3)
@@ -0,0 +1,214 @@
+"""
+Unit tests for functions in rotation.py
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import (
+    get_COM_coordinates_batch,
+    get_inertia_matrix_batch,
+    get_mass_matrix,
+    get_principal_axes,
+    get_principal_axes_batch,
+    get_theta_values_batch,
+)
+from com_pac.parser import parse_input_file
+from com_pac.rotation import (
+    ROTATION_LABELS,
+    get_relative_rotations,
+    get_rotation_values,
+    quaternion_to_axis_angle,
+    rotation_to_euler_angles,
+    rotation_to_quaternion,
+)
+
+
+def quaternion_to_rotation(quaternions):
+    w, x, y, z = np.moveaxis(quaternions, -1, 0)
+    return np.moveaxis(
+        np.array(
+            [
+                [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+                [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+                [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+            ]
+        ),
+        (0, 1),
+        (-2, -1),
+    )
+
+
+@pytest.fixture(scope="module")
+def random_rotations():
+    rng = np.random.default_rng(0)
+    rotations = np.linalg.qr(rng.normal(size=(200, 3, 3)))[0]
+    rotations *= np.linalg.det(rotations)[:, np.newaxis, np.newaxis]
+    # Identity and half turns, where naive conversions lose accuracy
+    rotations[:4] = [
+        np.eye(3),
+        np.diag([1.0, -1.0, -1.0]),
+        np.diag([-1.0, 1.0, -1.0]),
+        np.diag([-1.0, -1.0, 1.0]),
+    ]
+    return rotations
+
+
+@pytest.fixture(scope="module")
+def oxazole():
+    input_path = Path(__file__).parents[2] / "docs/example/oxazole/full-isos.txt"
+    names, iso_dict, n_atoms, symbols, coordinates, dipole, _ = parse_input_file(
+        input_path.read_text()
+    )
+    return names, iso_dict, n_atoms, symbols, coordinates, dipole
+
+
+class Test_get_relative_rotations:
+    def test_recovers_applied_rotation(self, random_rotations):
+        rng = np.random.default_rng(1)
+        parent = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+        # Arbitrary axis signs on the isotopologue side
+        signs = np.array([1.0, -1.0, -1.0])
+        eigenvectors = np.array([parent, parent @ random_rotations[5] * signs])
+
+        result = get_relative_rotations(eigenvectors)
+
+        np.testing.assert_allclose(result[0], np.eye(3), atol=1e-15)
+        assert np.linalg.det(result[1]) == pytest.approx(1)
+        np.testing.assert_allclose(np.abs(result[1]), np.abs(random_rotations[5]))
+        # The smallest rotation of the four proper axis sign choices
+        proper_signs = [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]
+        traces = [np.trace(random_rotations[5] * s) for s in proper_signs]
+        assert np.trace(result[1]) == pytest.approx(max(traces))
+
+    def test_axis_signs_do_not_matter(self, random_rotations):
+        eigenvectors = random_rotations[4:10]
+        flipped = eigenvectors * np.array([-1.0, -1.0, 1.0])
+        np.testing.assert_allclose(
+            get_relative_rotations(eigenvectors),
+            get_relative_rotations(np.concatenate([eigenvectors[:1], flipped[1:]])),
+            atol=1e-14,
+        )
+
+
+class Test_rotation_to_quaternion:
+    def test_round_trip(self, random_rotations):
+        quaternions = rotation_to_quaternion(random_rotations)
+        np.testing.assert_allclose(np.linalg.norm(quaternions, axis=-1), 1, rtol=1e-14)
+        assert np.all(quaternions[:, 0] >= 0)
+        np.testing.assert_allclose(
+            quaternion_to_rotation(quaternions), random_rotations, atol=1e-14
+        )
+
+    def test_half_turn(self):
+        np.testing.assert_array_equal(
+            rotation_to_quaternion(np.diag([-1.0, 1.0, -1.0])), [0, 0, 1, 0]
+        )
+
+
+class Test_quaternion_to_axis_angle:
+    def test_expected_output(self):
+        half_angle = np.radians(30.0)
+        quaternions = np.array(
+            [
+                [np.cos(half_angle), 0.0, 0.0, np.sin(half_angle)],
+                [1.0, 0.0, 0.0, 0.0],
+            ]
+        )
+        angles, axes = quaternion_to_axis_angle(quaternions)
+        np.testing.assert_allclose(angles, [60.0, 0.0])
+        np.testing.assert_allclose(axes[0], [0, 0, 1])
+        assert np.all(np.isnan(axes[1]))
+
+
+class Test_rotation_to_euler_angles:
+    def test_round_trip(self, random_rotations):
+        alpha, beta, gamma = np.radians(rotation_to_euler_angles(random_rotations)).T
+
+        def about(axis, angles):
+            """Rotations about one axis, turning the lower other axis toward the higher"""
+            rotation = np.zeros((len(angles), 3, 3))
+            i, j = [k for k in range(3) if k != axis]
+            rotation[:, axis, axis] = 1
+            rotation[:, i, i] = rotation[:, j, j] = np.cos(angles)
+            rotation[:, j, i] = np.sin(angles)
+            rotation[:, i, j] = -np.sin(angles)
+            return rotation
+
+        np.testing.assert_allclose(
+            about(2, alpha) @ about(1, -beta) @ about(0, gamma),
+            random_rotations,
+            atol=1e-14,
+        )
+
+
+class Test_get_rotation_values:
+    def test_reduces_to_planar_theta(self, oxazole):
+        """For planar oxazole, alpha is the in-plane rotation of the theta formula"""
+        names, iso_dict, n_atoms, symbols, coordinates, dipole = oxazole
+        mass_matrix = get_mass_matrix(names, iso_dict, n_atoms, symbols)
+        principal_axes = get_principal_axes_batch(mass_matrix, coordinates, dipole)
+        eigenvectors = dict(zip(names, principal_axes[7]))
+
+        result = get_rotation_values(names, eigenvectors)
+
+        # Isotopologue inertia tensors in the parent frame, about their own COM
+        com_coordinates, _ = get_COM_coordinates_batch(
+            mass_matrix, principal_axes[3][0]
+        )
+        inertias = get_inertia_matrix_batch(com_coordinates, mass_matrix)
+        theta = np.degrees(
+            np.arctan(2 * inertias[:, 0, 1] / (inertias[:, 0, 0] - inertias[:, 1, 1]))
+            / 2
+        )
+        alpha = np.array([result[iso]["alpha"] for iso in names])
+        # Isotopologues whose a and b axes exchange order differ by 90 degrees
+        np.testing.assert_allclose((alpha - theta + 45) % 90 - 45, 0, atol=1e-9)
+        for iso in names:
+            assert result[iso]["beta"] == pytest.approx(0, abs=1e-9)
+            assert result[iso]["gamma"] == pytest.approx(0, abs=1e-9)
+            assert result[iso]["angle"] == pytest.approx(abs(result[iso]["alpha"]))
+        assert list(result[names[0]]) == list(ROTATION_LABELS)
+
+    def test_planar_theta_7(self):
+        """alpha is theta_7 only for substitutions that keep the center of mass"""
+        # Centrosymmetric and planar, with the center of mass at the origin
+        coordinates = np.array(
+            [[1.0, 0.2, 0.0], [-1.0, -0.2, 0.0], [0.3, 1.1, 0.0], [-0.3, -1.1, 0.0]]
+        )
+        mass_matrix = np.array(
+            [
+                [12.0, 12.0, 16.0, 16.0],
+                [13.0, 13.0, 16.0, 16.0],
+                [13.0, 12.0, 16.0, 16.0],
+            ]
+        )
+        principal_axes = get_principal_axes_batch(mass_matrix, coordinates, np.zeros(3))
+        names = ["parent", "pair", "single"]
+
+        result = get_rotation_values(names, dict(zip(names, principal_axes[7])))
+
+        alpha = np.array([result[iso]["alpha"] for iso in names])
+        theta_7 = get_theta_values_batch(mass_matrix, principal_axes[3])["theta_7"]
+        np.testing.assert_allclose(alpha[:2], theta_7[:2], atol=1e-9)
+        # theta_7 takes the inertia tensor about the parent's center of mass
+        assert abs(alpha[2] - theta_7[2]) > 0.01
+
+    def test_non_planar(self, hn3_inputs, hn3_coords, hn3_dipole):
+        symbols, mass_numbers, n_atoms = hn3_inputs
+        names = ["hn3", "dn3"]
+        iso_dict = {"hn3": mass_numbers, "dn3": [2, *mass_numbers[1:]]}
+        eigenvectors = get_principal_axes(
+            names, iso_dict, n_atoms, symbols, hn3_coords, hn3_dipole
+        )[7]
+
+        result = get_rotation_values(names, eigenvectors)
+
+        quaternion = [result["dn3"][label] for label in ("q_w", "q_x", "q_y", "q_z")]
+        expected = get_relative_rotations([eigenvectors["hn3"], eigenvectors["dn3"]])
+        np.testing.assert_allclose(
+            quaternion_to_rotation(np.array(quaternion)), expected[1], atol=1e-12
+        )
+        assert result["dn3"]["angle"] > 0
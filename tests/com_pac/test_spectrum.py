@@ -0,0 +1,175 @@
+"""
+Unit tests for functions in spectrum.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.spectrum import (
+    TRANSITION_PARITIES,
+    get_level_labels,
+    get_rotational_energies,
+    get_spectrum_values,
+    get_transition_pairs,
+    get_transitions,
+)
+
+
+@pytest.fixture(scope="module")
+def random_constants():
+    rng = np.random.default_rng(0)
+    return np.sort(rng.uniform(1000.0, 10000.0, size=(20, 3)), axis=1)[:, ::-1]
+
+
+def dense_hamiltonian(constants, J):
+    """Rigid rotor Hamiltonian in the full |J, K> basis"""
+    A, B, C = constants
+    K = np.arange(-J, J + 1)
+    jj = J * (J + 1)
+    hamiltonian = np.diag(A * K**2 + (B + C) / 2 * (jj - K**2))
+    for i, k in enumerate(K[:-2]):
+        element = (B - C) / 4 * np.sqrt(jj - k * (k + 1))
+        element *= np.sqrt(jj - (k + 1) * (k + 2))
+        hamiltonian[i, i + 2] = hamiltonian[i + 2, i] = element
+    return hamiltonian
+
+
+class Test_get_level_labels:
+    def test_expected_output(self):
+        np.testing.assert_array_equal(
+            get_level_labels(2),
+            [
+                [0, 0, 0],
+                [1, 0, 1],
+                [1, 1, 1],
+                [1, 1, 0],
+                [2, 0, 2],
+                [2, 1, 2],
+                [2, 1, 1],
+                [2, 2, 1],
+                [2, 2, 0],
+            ],
+        )
+
+
+class Test_get_rotational_energies:
+    def test_matches_dense_diagonalization(self, random_constants):
+        result = get_rotational_energies(random_constants, 12)
+        for J in range(13):
+            levels = result[:, J**2 : (J + 1) ** 2]
+            # Levels of each J are in order of energy, up to K-doublets that
+            # are degenerate to machine precision
+            assert np.all(np.diff(levels, axis=-1) > -1e-12 * levels[:, -1:])
+            for constants, energies in zip(random_constants, levels):
+                np.testing.assert_allclose(
+                    energies, np.linalg.eigvalsh(dense_hamiltonian(constants, J))
+                )
+
+    def test_prolate_symmetric_top(self):
+        A, B = 9000.0, 3000.0
+        labels = get_level_labels(8)
+        result = get_rotational_energies([[A, B, B]], 8)[0]
+        # Ka = K for the pair of levels of each K > 0 of a prolate top
+        J, K = labels[:, 0], labels[:, 1]
+        np.testing.assert_allclose(result, B * J * (J + 1) + (A - B) * K**2)
+
+    def test_oblate_symmetric_top(self):
+        B, C = 9000.0, 3000.0
+        labels = get_level_labels(8)
+        result = get_rotational_energies([[B, B, C]], 8)[0]
+        J, K = labels[:, 0], labels[:, 2]
+        np.testing.assert_allclose(result, B * J * (J + 1) + (C - B) * K**2)
+
+
+class Test_get_transition_pairs:
+    @pytest.mark.parametrize("transition_type", ["a", "b", "c"])
+    def test_selection_rules(self, transition_type):
+        labels = get_level_labels(10)
+        pairs = get_transition_pairs(10, transition_type, max_delta_k=3)
+        first, second = labels[pairs[:, 0]], labels[pairs[:, 1]]
+        delta = second - first
+        assert set(delta[:, 0]) == {0, 1}
+        np.testing.assert_array_equal(
+            delta[:, 1:] % 2,
+            np.broadcast_to(TRANSITION_PARITIES[transition_type], delta[:, 1:].shape),
+        )
+        assert np.abs(delta[:, 1:]).max() == 3
+        assert len(np.unique(pairs, axis=0)) == len(pairs)
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError) as exc:
+            get_transition_pairs(3, "d")
+        assert "Unknown transition type 'd'" in str(exc.value)
+
+
+class Test_get_transitions:
+    def test_lowest_transitions(self):
+        """1_01, 1_11 and 1_10 lie B + C, A + C and A + B above 0_00"""
+        result = get_transitions([[3.0, 2.0, 1.0]], [[1.0, 1.0, 1.0]], 1)
+        np.testing.assert_allclose(result["frequency"], [1.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        assert result["type"].tolist() == ["c", "a", "b", "a", "b", "c"]
+        np.testing.assert_array_equal(
+            result["upper"][3:], [[1, 0, 1], [1, 1, 1], [1, 1, 0]]
+        )
+        np.testing.assert_array_equal(result["lower"][3:], np.zeros((3, 3)))
+
+    def test_dipole_components_select_types(self, random_constants):
+        dipoles = np.zeros((len(random_constants), 3))
+        dipoles[:10, 0] = 1.0
+        dipoles[10:, 1] = -2.0
+        dipoles[10:, 2] = 1e-9
+
+        result = get_transitions(random_constants, dipoles, 5)
+
+        assert set(result["type"][result["isotopologue"] < 10]) == {"a"}
+        assert set(result["type"][result["isotopologue"] >= 10]) == {"b"}
+        assert np.all(np.diff(result["isotopologue"]) >= 0)
+
+    def test_frequency_window(self, random_constants):
+        dipoles = np.ones((len(random_constants), 3))
+        full = get_transitions(random_constants, dipoles, 6)
+        result = get_transitions(random_constants, dipoles, 6, (20000.0, 40000.0))
+
+        in_window = (full["frequency"] >= 20000.0) & (full["frequency"] <= 40000.0)
+        assert len(result["frequency"]) == np.count_nonzero(in_window)
+        np.testing.assert_allclose(
+            np.sort(result["frequency"]), np.sort(full["frequency"][in_window])
+        )
+        energies = get_rotational_energies(random_constants, 6)
+        labels = get_level_labels(6)
+        level_index = {tuple(label): i for i, label in enumerate(labels)}
+        for iso, upper, lower, frequency in zip(
+            result["isotopologue"],
+            result["upper"],
+            result["lower"],
+            result["frequency"],
+        ):
+            expected = (
+                energies[iso, level_index[tuple(upper)]]
+                - energies[iso, level_index[tuple(lower)]]
+            )
+            assert frequency == pytest.approx(expected)
+
+    def test_no_dipole(self):
+        result = get_transitions([[3.0, 2.0, 1.0]], [[0.0, 0.0, 0.0]], 3)
+        assert len(result["frequency"]) == 0
+        assert result["upper"].shape == (0, 3)
+
+
+class Test_get_spectrum_values:
+    def test_names_and_linear_warning(self, capsys):
+        rotational_constants = {
+            "bent": np.array([30000.0, 10000.0, 7000.0]),
+            "linear": np.array([np.inf, 5000.0, 5000.0]),
+        }
+        pa_dipoles = {"bent": np.array([0.0, 1.5, 0.0]), "linear": np.ones(3)}
+
+        result = get_spectrum_values(
+            ["bent", "linear"], rotational_constants, pa_dipoles, 2
+        )
+
+        assert "WARNING: linear has a non-finite rotational constant" in (
+            capsys.readouterr().out
+        )
+        assert set(result["isotopologue"]) == {"bent"}
+        assert set(result["type"]) == {"b"}
@@ -0,0 +1,252 @@
+"""
+Unit tests for functions in symmetry.py
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import (
+    get_mass_matrix_from_mass_numbers,
+    get_principal_axes,
+    get_principal_axes_batch,
+)
+from com_pac.symmetry import (
+    canonicalize_isotopologues,
+    find_symmetry_operations,
+    get_principal_axes_batch_symmetric,
+)
+
+
+def random_frame(coordinates, seed=0):
+    """Rotate and translate coordinates away from any symmetry-adapted frame"""
+    rng = np.random.default_rng(seed)
+    rotation = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+    return coordinates @ rotation + rng.normal(size=3), rotation
+
+
+@pytest.fixture(scope="module")
+def c2v_pyridazine():
+    """Planar C2v pyridazine, with singly and doubly substituted isotopologues"""
+    half = np.array(
+        [
+            [0.665, 1.200, 0.0],
+            [1.330, 0.050, 0.0],
+            [0.700, -1.180, 0.0],
+            [2.410, 0.100, 0.0],
+            [1.250, -2.120, 0.0],
+        ]
+    )
+    coordinates, rotation = random_frame(np.concatenate([half, half * [-1, 1, 1]]))
+    symbols = ["N", "C", "C", "H", "H"] * 2
+    parent = [14, 12, 12, 1, 1] * 2
+    heavy = {"N": 15, "C": 13, "H": 2}
+
+    mass_numbers = [parent]
+    for n_substitutions in (1, 2):
+        for atoms in itertools.combinations(range(10), n_substitutions):
+            row = list(parent)
+            for atom in atoms:
+                row[atom] = heavy[symbols[atom]]
+            mass_numbers.append(row)
+    masses = get_mass_matrix_from_mass_numbers(np.array(mass_numbers), symbols)
+    return masses, coordinates, np.array([0.0, 4.2, 0.0]) @ rotation
+
+
+@pytest.fixture(scope="module")
+def benzene():
+    angles = np.arange(6) * np.pi / 3
+    ring = np.stack([np.cos(angles), np.sin(angles), np.zeros(6)], axis=-1)
+    coordinates, _ = random_frame(np.concatenate([1.39 * ring, 2.47 * ring]), seed=1)
+    symbols = ["C"] * 6 + ["H"] * 6
+    mass_numbers = np.array(
+        [
+            [12] * 6 + [1] * 6,
+            [13] + [12] * 5 + [1] * 6,
+            [12] * 3 + [13] + [12] * 2 + [1] * 6,
+            [12] * 6 + [2] + [1] * 5,
+            [12] * 6 + [1, 2] + [1] * 4,
+        ]
+    )
+    return get_mass_matrix_from_mass_numbers(mass_numbers, symbols), coordinates
+
+
+def ammonia(sin_60):
+    """NH3 with the H atoms at 0.94 from the C3 axis, at angles of 120 degrees"""
+    return np.array(
+        [
+            [0.0, 0.0, 0.38],
+            [0.94, 0.0, 0.0],
+            [-0.47, 0.94 * sin_60, 0.0],
+            [-0.47, -0.94 * sin_60, 0.0],
+        ]
+    )
+
+
+def assert_matches_direct(direct, result):
+    """Equal outputs, up to the arbitrary signs of the principal axes"""
+    for i, (expected, value) in enumerate(zip(direct, result)):
+        if i in (3, 4, 7):
+            # Principal axes coordinates, inertias and eigenvectors
+            np.testing.assert_allclose(np.abs(value), np.abs(expected), atol=1e-9)
+        else:
+            np.testing.assert_allclose(value, expected, rtol=1e-10, atol=1e-9)
+    masses, pa_coordinates, com_coordinates, eigenvectors = (
+        result[0],
+        result[3],
+        result[5],
+        result[7],
+    )
+    np.testing.assert_allclose(np.linalg.det(eigenvectors), 1.0)
+    np.testing.assert_allclose(
+        com_coordinates @ eigenvectors, pa_coordinates, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        np.einsum("ij,ijk->ik", masses, com_coordinates), 0, atol=1e-10
+    )
+
+
+class Test_find_symmetry_operations:
+    def test_c2v(self, c2v_pyridazine):
+        masses, coordinates, dipole = c2v_pyridazine
+        center, rotations, permutations = find_symmetry_operations(
+            coordinates, masses[0], dipole
+        )
+
+        # The molecular plane leaves every atom in place, so C2 and the
+        # perpendicular mirror plane are the only non-trivial permutation
+        np.testing.assert_array_equal(
+            permutations, [np.arange(10), [5, 6, 7, 8, 9, 0, 1, 2, 3, 4]]
+        )
+        np.testing.assert_allclose(rotations[0], np.eye(3), atol=1e-12)
+        np.testing.assert_allclose(
+            (coordinates - center) @ rotations[1],
+            (coordinates - center)[permutations[1]],
+            atol=1e-12,
+        )
+
+    def test_dipole_breaks_symmetry(self, c2v_pyridazine):
+        masses, coordinates, _ = c2v_pyridazine
+        _, _, permutations = find_symmetry_operations(
+            coordinates, masses[0], [1.0, 1.0, 1.0]
+        )
+        np.testing.assert_array_equal(permutations, [np.arange(10)])
+
+    def test_symmetric_tops(self, benzene):
+        masses, coordinates = benzene
+        center, rotations, permutations = find_symmetry_operations(
+            coordinates, masses[0]
+        )
+        assert len(permutations) == 12
+        # Each rotation moves every atom onto its permuted partner
+        com_coordinates = coordinates - center
+        for rotation, permutation in zip(rotations, permutations):
+            np.testing.assert_allclose(
+                com_coordinates[permutation], com_coordinates @ rotation, atol=1e-9
+            )
+        # Closed under composition
+        products = {
+            tuple(second[first]) for first in permutations for second in permutations
+        }
+        assert products == {tuple(permutation) for permutation in permutations}
+
+        _, _, permutations = find_symmetry_operations(
+            ammonia(np.sqrt(3) / 2), [14.0, 1.0, 1.0, 1.0], [0.0, 0.0, 1.47]
+        )
+        assert len(permutations) == 6
+
+    def test_near_symmetric_top(self):
+        """Rounded coordinates only keep the mirror plane that stays exact"""
+        masses = [14.0, 1.0, 1.0, 1.0]
+        _, _, permutations = find_symmetry_operations(
+            ammonia(0.866), masses, [0.0, 0.0, 1.47]
+        )
+        np.testing.assert_array_equal(permutations, [np.arange(4), [0, 1, 3, 2]])
+
+        _, _, permutations = find_symmetry_operations(
+            ammonia(0.866), masses, [0.0, 0.0, 1.47], tolerance=1e-3
+        )
+        assert len(permutations) == 6
+
+    def test_asymmetric_molecule(self, hn3_coords, hn3_mol_masses):
+        _, rotations, permutations = find_symmetry_operations(
+            hn3_coords, hn3_mol_masses
+        )
+        np.testing.assert_array_equal(permutations, [np.arange(4)])
+        np.testing.assert_allclose(rotations, [np.eye(3)], atol=1e-12)
+
+
+class Test_canonicalize_isotopologues:
+    def test_expected_output(self):
+        mass_numbers = np.array(
+            [[14, 14, 1, 1], [15, 14, 1, 1], [14, 15, 1, 1], [14, 15, 2, 1]]
+        )
+        permutations = np.array([[0, 1, 2, 3], [1, 0, 3, 2]])
+
+        canonical_rows, class_indices, operation_indices = canonicalize_isotopologues(
+            mass_numbers, permutations
+        )
+
+        np.testing.assert_array_equal(
+            canonical_rows, [[14, 14, 1, 1], [14, 15, 1, 1], [14, 15, 2, 1]]
+        )
+        np.testing.assert_array_equal(class_indices, [0, 1, 1, 2])
+        np.testing.assert_array_equal(operation_indices, [0, 1, 0, 0])
+        np.testing.assert_array_equal(
+            mass_numbers[np.arange(4)[:, np.newaxis], permutations[operation_indices]],
+            canonical_rows[class_indices],
+        )
+
+
+class Test_get_principal_axes_batch_symmetric:
+    def test_matches_direct_c2v(self, c2v_pyridazine):
+        masses, coordinates, dipole = c2v_pyridazine
+        _, _, permutations = find_symmetry_operations(coordinates, masses[0], dipole)
+        _, class_indices, _ = canonicalize_isotopologues(masses, permutations)
+        # 1 + 10 + 45 isotopologues, 1 + 5 + 25 classes
+        assert len(masses) == 56 and class_indices.max() + 1 == 31
+
+        assert_matches_direct(
+            get_principal_axes_batch(masses, coordinates, dipole),
+            get_principal_axes_batch_symmetric(masses, coordinates, dipole),
+        )
+
+    def test_matches_direct_benzene(self, benzene):
+        masses, coordinates = benzene
+        assert_matches_direct(
+            get_principal_axes_batch(masses, coordinates, np.zeros(3)),
+            get_principal_axes_batch_symmetric(masses, coordinates, np.zeros(3)),
+        )
+
+    @pytest.mark.parametrize("tolerance", [None, 1e-3])
+    def test_matches_direct_near_symmetric(self, tolerance):
+        """Also if the symmetry is only found with a loose tolerance"""
+        coordinates, _ = random_frame(ammonia(0.866), seed=2)
+        parent = [14, 1, 1, 1]
+        mass_numbers = [parent, [14, 2, 1, 1], [14, 1, 2, 1], [14, 2, 2, 1]]
+        masses = get_mass_matrix_from_mass_numbers(
+            np.array(mass_numbers), ["N", "H", "H", "H"]
+        )
+        dipole = np.zeros(3)
+        options = {} if tolerance is None else {"tolerance": tolerance}
+
+        assert_matches_direct(
+            get_principal_axes_batch(masses, coordinates, dipole),
+            get_principal_axes_batch_symmetric(masses, coordinates, dipole, **options),
+        )
+
+    def test_get_principal_axes_option(self, hn3_inputs, hn3_coords, hn3_dipole):
+        symbols, mass_numbers, n_atoms = hn3_inputs
+        names = ["hn3", "dn3"]
+        iso_dict = {"hn3": mass_numbers, "dn3": [2, *mass_numbers[1:]]}
+        expected = get_principal_axes(
+            names, iso_dict, n_atoms, symbols, hn3_coords, hn3_dipole
+        )
+        result = get_principal_axes(
+            names, iso_dict, n_atoms, symbols, hn3_coords, hn3_dipole, symmetry=True
+        )
+        # Without symmetry every isotopologue is its own representative
+        for expected_dict, result_dict in zip(expected, result):
+            for iso in names:
+                np.testing.assert_array_equal(result_dict[iso], expected_dict[iso])
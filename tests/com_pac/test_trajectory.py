@@ -0,0 +1,182 @@
+"""
+Unit tests for functions in trajectory.py
+"""
+
+import numpy as np
+import pytest
+
+from com_pac.diagonalize import get_principal_axes_batch
+from com_pac.trajectory import (
+    TRAJECTORY_QUANTITIES,
+    get_frame_principal_axes,
+    get_trajectory_averages,
+    get_trajectory_values,
+    iterate_xyz_frames,
+)
+
+
+@pytest.fixture
+def hn3_dn3_masses(hn3_mol_masses):
+    dn3_mol_masses = hn3_mol_masses.copy()
+    dn3_mol_masses[0] = 2.01410178
+    return np.array([hn3_mol_masses, dn3_mol_masses])
+
+
+@pytest.fixture
+def hn3_frames(hn3_coords):
+    """Vibrating, rotating and translating HN3 frames"""
+    rng = np.random.default_rng(0)
+    frames = hn3_coords + rng.normal(scale=0.01, size=(50, *hn3_coords.shape))
+    rotations = np.linalg.qr(rng.normal(size=(50, 3, 3)))[0]
+    rotations *= np.sign(np.linalg.det(rotations))[:, np.newaxis, np.newaxis]
+    return frames @ rotations + rng.normal(size=(50, 1, 3))
+
+
+def write_xyz(path, symbols, frames, trailer=""):
+    with open(path, "w") as outfile:
+        for i, frame in enumerate(frames):
+            outfile.write(f"{len(symbols)}\nframe {i}\n")
+            outfile.writelines(
+                f"{symbol} {x:.17g} {y:.17g} {z:.17g}\n"
+                for symbol, (x, y, z) in zip(symbols, frame)
+            )
+        outfile.write(trailer)
+    return path
+
+
+class Test_iterate_xyz_frames:
+    def test_chunks_round_trip(self, tmp_path, hn3_symbols, hn3_frames):
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_frames, "\n\n")
+        chunks = list(iterate_xyz_frames(path, hn3_symbols, chunk_size=16))
+        assert [len(chunk) for chunk in chunks] == [16, 16, 16, 2]
+        np.testing.assert_array_equal(np.concatenate(chunks), hn3_frames)
+
+    @pytest.mark.parametrize("text", ["", "\n\n\n"])
+    def test_empty_file(self, tmp_path, hn3_symbols, text):
+        path = tmp_path / "traj.xyz"
+        path.write_text(text)
+        with pytest.raises(ValueError) as exc:
+            list(iterate_xyz_frames(path, hn3_symbols))
+        assert "is empty" in str(exc.value)
+
+    def test_incomplete_frame(self, tmp_path, hn3_symbols, hn3_frames):
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_frames[:3], "4\n")
+        with pytest.raises(ValueError) as exc:
+            list(iterate_xyz_frames(path, hn3_symbols))
+        assert "Trajectory frame 3 is incomplete" in str(exc.value)
+
+    def test_wrong_atom_count(self, tmp_path, hn3_symbols, hn3_frames):
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_frames[:3])
+        path.write_text(path.read_text().replace("4\nframe 2", "5\nframe 2"))
+        with pytest.raises(ValueError) as exc:
+            list(iterate_xyz_frames(path, hn3_symbols))
+        assert "Frame 2 of the trajectory" in str(exc.value)
+
+    def test_wrong_atom_order(self, tmp_path, hn3_frames):
+        path = write_xyz(tmp_path / "traj.xyz", ["H", "N", "N", "N"], hn3_frames)
+        with pytest.raises(ValueError) as exc:
+            list(iterate_xyz_frames(path, ["N", "H", "N", "N"], chunk_size=8))
+        assert "frame 0 do not match" in str(exc.value)
+
+
+class Test_get_frame_principal_axes:
+    def test_matches_single_geometries(self, hn3_dn3_masses, hn3_coords, hn3_frames):
+        dipole = np.array([0.8, 1.5, 0.1])
+        reference = get_principal_axes_batch(hn3_dn3_masses, hn3_coords, dipole)[3]
+        rotational_constants, pa_dipoles, pa_coordinates = get_frame_principal_axes(
+            hn3_dn3_masses, hn3_frames, dipole, reference
+        )
+
+        assert pa_coordinates.shape == (50, 2, 4, 3)
+        for frame, constants, dipoles, coordinates in zip(
+            hn3_frames, rotational_constants, pa_dipoles, pa_coordinates
+        ):
+            expected = get_principal_axes_batch(hn3_dn3_masses, frame, dipole)
+            np.testing.assert_allclose(constants, expected[1])
+            # Same dipoles and coordinates up to the sign of each axis
+            np.testing.assert_allclose(np.abs(dipoles), np.abs(expected[2]))
+            np.testing.assert_allclose(np.abs(coordinates), np.abs(expected[3]))
+        # Axis signs follow the reference geometry
+        np.testing.assert_allclose(
+            pa_coordinates, np.broadcast_to(reference, pa_coordinates.shape), atol=0.05
+        )
+
+
+class Test_get_trajectory_averages:
+    def test_matches_in_memory_statistics(
+        self, tmp_path, hn3_symbols, hn3_dn3_masses, hn3_coords, hn3_frames
+    ):
+        dipole = np.array([0.8, 1.5, 0.1])
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_frames)
+        result = get_trajectory_averages(
+            hn3_dn3_masses, hn3_coords, dipole, path, hn3_symbols, chunk_size=7
+        )
+        reference = get_principal_axes_batch(hn3_dn3_masses, hn3_coords, dipole)[3]
+        expected = get_frame_principal_axes(
+            hn3_dn3_masses, hn3_frames, dipole, reference
+        )
+
+        assert result["n_frames"] == 50
+        for key, samples in zip(
+            ("rotational_constants", "pa_dipoles", "pa_coordinates"), expected
+        ):
+            np.testing.assert_allclose(result[key]["mean"], samples.mean(axis=0))
+            np.testing.assert_allclose(
+                result[key]["std"], samples.std(axis=0, ddof=1), atol=1e-12
+            )
+
+    def test_blank_file(self, tmp_path, hn3_symbols, hn3_dn3_masses, hn3_coords):
+        path = tmp_path / "traj.xyz"
+        path.write_text("\n\n\n")
+        with pytest.raises(ValueError) as exc:
+            get_trajectory_averages(
+                hn3_dn3_masses, hn3_coords, np.zeros(3), path, hn3_symbols
+            )
+        assert "is empty" in str(exc.value)
+
+
+class Test_get_trajectory_values:
+    def test_expected_keys(
+        self, tmp_path, hn3_symbols, hn3_dn3_masses, hn3_coords, hn3_frames
+    ):
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_frames)
+        atom_numbering = ["H1", "N2", "N3", "N4"]
+        trajectory_data, trajectory_pa_data = get_trajectory_values(
+            ["hn3", "dn3"],
+            hn3_dn3_masses,
+            hn3_coords,
+            np.array([0.8, 1.5, 0.1]),
+            path,
+            hn3_symbols,
+            atom_numbering,
+        )
+
+        assert list(trajectory_data) == [
+            (iso, quantity)
+            for iso in ("hn3", "dn3")
+            for quantity in TRAJECTORY_QUANTITIES
+        ]
+        assert list(trajectory_pa_data) == [
+            (iso, atom) for iso in ("hn3", "dn3") for atom in atom_numbering
+        ]
+        assert sorted(trajectory_pa_data[("dn3", "H1")]) == sorted(
+            ["a", "b", "c", "std_a", "std_b", "std_c"]
+        )
+
+    def test_single_frame_warns(
+        self, tmp_path, capsys, hn3_symbols, hn3_dn3_masses, hn3_coords
+    ):
+        path = write_xyz(tmp_path / "traj.xyz", hn3_symbols, hn3_coords[np.newaxis])
+        trajectory_data, _ = get_trajectory_values(
+            ["hn3", "dn3"],
+            hn3_dn3_masses,
+            hn3_coords,
+            np.zeros(3),
+            path,
+            hn3_symbols,
+            ["H1", "N2", "N3", "N4"],
+        )
+        assert (
+            "WARNING: Trajectory has fewer than two frames" in capsys.readouterr().out
+        )
+        assert np.isnan(trajectory_data[("hn3", "A")]["std"])
@@ -2,28 +2,36 @@
 Unit tests for functions in writer.py
 """
 
-import pytest
-import tempfile
 import os
 import re
+import tempfile
+
 import numpy as np
+import pytest
+
 from com_pac.writer import (
-    generate_output_file,
-    generate_csv_output,
-    _build_preamble_section,
-    _build_input_section,
     _build_atomic_masses_section,
-    _build_rotational_constants_section,
-    _build_dipole_components_section,
-    _build_com_values_section,
     _build_com_coordinates_section,
     _build_com_inertias_section,
+    _build_com_values_section,
+    _build_dipole_components_section,
     _build_eigens_section,
+    _build_inertial_quantities_section,
+    _build_input_section,
+    _build_kraitchman_section,
+    _build_monte_carlo_section,
     _build_pa_inertias_section,
+    _build_preamble_section,
     _build_results_section,
+    _build_rotation_section,
+    _build_rotational_constants_section,
+    _build_spectrum_section,
     _build_theta_results_section,
-    header_creator,
+    _build_trajectory_section,
     df_text_export,
+    generate_csv_output,
+    generate_output_file,
+    header_creator,
 )
 
 
@@ -986,3 +994,349 @@ class Test_build_theta_results_section:
         numbers = _parse_float_values(result)
         expected = theta_df.to_numpy().flatten()
         assert np.allclose(numbers, expected, rtol=1e-6, atol=1e-8)
+
+
+class Test_build_kraitchman_section:
+    @pytest.fixture
+    def kraitchman_df(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "|a|": [1.160760, 1.589833],
+                "|b|": [0.089015, 0.831364],
+                "|c|": [np.nan, 0.0],
+                "d|a|": [0.001292, 0.000943],
+                "d|b|": [0.016851, 0.001804],
+                "d|c|": [np.nan, np.inf],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [("iso2", "N2"), ("iso5", "H1")], names=["Isotopologue", "Atom"]
+            ),
+        )
+
+    def test_kraitchman_section_contains_header(self, kraitchman_df):
+        result = _build_kraitchman_section(kraitchman_df, 6)
+        assert "Kraitchman Substitution Coordinates" in result
+
+    def test_kraitchman_section_contains_labels(self, kraitchman_df):
+        result = _build_kraitchman_section(kraitchman_df, 6)
+        assert re.search(r"iso2\s+N2", result)
+        assert re.search(r"iso5\s+H1", result)
+
+    def test_kraitchman_section_numeric_values(self, kraitchman_df):
+        result = _build_kraitchman_section(kraitchman_df, 6)
+        table = result.split("imaginary coordinates.)", 1)[1]
+        numbers = _parse_float_values(table.replace("nan", "").replace("inf", ""))
+        expected = kraitchman_df.to_numpy().flatten()
+        assert np.allclose(numbers, expected[np.isfinite(expected)])
+
+    def test_kraitchman_block_in_csv(
+        self,
+        tmp_path,
+        kraitchman_df,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            kraitchman_df=kraitchman_df,
+        )
+        csv_text = csv_path.read_text()
+        block = csv_text.split("Kraitchman Substitution Coordinates\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,Atom,|a|,|b|,|c|,d|a|,d|b|,d|c|"
+        assert block.splitlines()[2].startswith("iso5,H1,1.589833,")
+
+
+class Test_build_monte_carlo_section:
+    @pytest.fixture
+    def monte_carlo_df(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "mean": [609524.190455, 0.836994],
+                "std": [7407.072366, 0.001730],
+                "p50": [609483.798137, 0.836971],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [("iso001", "A"), ("iso001", "mu_A")],
+                names=["Isotopologue", "Quantity"],
+            ),
+        )
+
+    def test_monte_carlo_section_contains_header(self, monte_carlo_df):
+        result = _build_monte_carlo_section(monte_carlo_df, 6)
+        assert "Monte Carlo Uncertainties" in result
+
+    def test_monte_carlo_section_numeric_values(self, monte_carlo_df):
+        result = _build_monte_carlo_section(monte_carlo_df, 6)
+        table = result.split("units of the Dipole section.)", 1)[1]
+        numbers = _parse_float_values(table)
+        assert np.allclose(numbers, monte_carlo_df.to_numpy().flatten())
+
+    def test_monte_carlo_block_in_csv(
+        self,
+        tmp_path,
+        monte_carlo_df,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            monte_carlo_df=monte_carlo_df,
+        )
+        csv_text = csv_path.read_text()
+        assert "Kraitchman" not in csv_text
+        block = csv_text.split("Monte Carlo Uncertainties\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,Quantity,mean,std,p50"
+        assert block.splitlines()[2].startswith("iso001,mu_A,0.836994,")
+
+
+class Test_build_trajectory_section:
+    @pytest.fixture
+    def trajectory_dfs(self):
+        import pandas as pd
+
+        trajectory_df = pd.DataFrame(
+            {"mean": [609524.190455, 0.836994], "std": [7407.072366, 0.001730]},
+            index=pd.MultiIndex.from_tuples(
+                [("iso001", "A"), ("iso001", "mu_A")],
+                names=["Isotopologue", "Quantity"],
+            ),
+        )
+        trajectory_pa_df = pd.DataFrame(
+            {
+                "a": [-1.9531],
+                "b": [-0.3255],
+                "c": [0.0001],
+                "std_a": [0.01],
+                "std_b": [0.02],
+                "std_c": [0.03],
+            },
+            index=pd.MultiIndex.from_tuples(
+                [("iso001", "H1")], names=["Isotopologue", "Atom"]
+            ),
+        )
+        return trajectory_df, trajectory_pa_df
+
+    def test_trajectory_section_numeric_values(self, trajectory_dfs):
+        result = _build_trajectory_section(*trajectory_dfs, 6)
+        assert "Trajectory Averages" in result
+        constants, coordinates = result.split("units of the Dipole section.)", 1)[
+            1
+        ].split("Averaged principal axes coordinates (Angstrom)")
+        assert np.allclose(
+            _parse_float_values(constants), trajectory_dfs[0].to_numpy().flatten()
+        )
+        assert np.allclose(
+            _parse_float_values(coordinates), trajectory_dfs[1].to_numpy().flatten()
+        )
+
+    def test_trajectory_blocks_in_csv(
+        self,
+        tmp_path,
+        trajectory_dfs,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            trajectory_df=trajectory_dfs[0],
+            trajectory_pa_df=trajectory_dfs[1],
+        )
+        csv_text = csv_path.read_text()
+        block = csv_text.split("Trajectory Averages\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,Quantity,mean,std"
+        block = csv_text.split("Trajectory Principal Axes Coordinates\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,Atom,a,b,c,std_a,std_b,std_c"
+        assert block.splitlines()[1].startswith("iso001,H1,-1.9531,")
+
+
+class Test_build_rotation_section:
+    @pytest.fixture
+    def rotation_df(self):
+        import pandas as pd
+
+        rotation_df = pd.DataFrame(
+            {"q_w": [1.0, 0.998], "q_z": [0.0, 0.0595], "alpha": [0.0, 6.8225]},
+            index=["iso001", "iso002"],
+        )
+        rotation_df.index.name = "Isotopologue"
+        return rotation_df
+
+    def test_rotation_section_numeric_values(self, rotation_df):
+        result = _build_rotation_section(rotation_df, 6)
+        assert "Principal Axes Rotations" in result
+        table = result.split("center of mass.)", 1)[1]
+        assert np.allclose(_parse_float_values(table), rotation_df.to_numpy().flatten())
+
+    def test_rotation_block_in_csv(
+        self,
+        tmp_path,
+        rotation_df,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            rotation_df=rotation_df,
+        )
+        block = csv_path.read_text().split("Principal Axes Rotations\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,q_w,q_z,alpha"
+        assert block.splitlines()[2] == "iso002,0.998,0.0595,6.8225"
+
+
+class Test_build_inertial_quantities_section:
+    @pytest.fixture
+    def inertial_df(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "P_aa": [52.345444],
+                "P_bb": [49.987828],
+                "P_cc": [0.0],
+                "Delta": [-0.000001],
+                "kappa": [0.823899],
+            },
+            index=pd.Index(["iso001"], name="Isotopologue"),
+        )
+
+    def test_inertial_section_numeric_values(self, inertial_df):
+        result = _build_inertial_quantities_section(inertial_df, 6)
+        assert "Inertial Quantities" in result
+        table = result.split("/ (A - C).)", 1)[1]
+        assert np.allclose(_parse_float_values(table), inertial_df.to_numpy().flatten())
+
+    def test_inertial_block_in_csv(
+        self,
+        tmp_path,
+        inertial_df,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            inertial_df=inertial_df,
+        )
+        block = csv_path.read_text().split("Inertial Quantities\n", 1)[1]
+        assert block.splitlines()[0] == "Isotopologue,P_aa,P_bb,P_cc,Delta,kappa"
+        assert block.splitlines()[1].startswith("iso001,52.345444,")
+
+
+class Test_build_spectrum_section:
+    @pytest.fixture
+    def spectrum_df(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {"Frequency": [14593.249382, 15048.601398]},
+            index=pd.MultiIndex.from_tuples(
+                [("iso001", "a", 1, 0, 1, 0, 0, 0), ("iso001", "b", 1, 1, 1, 0, 0, 0)],
+                names=["Isotopologue", "Type", "J'", "Ka'", "Kc'", 'J"', 'Ka"', 'Kc"'],
+            ),
+        )
+
+    def test_spectrum_section_numeric_values(self, spectrum_df):
+        result = _build_spectrum_section(spectrum_df, 6)
+        assert "Rigid Rotor Transitions" in result
+        table = result.split("each isotopologue.)", 1)[1]
+        assert np.allclose(_parse_float_values(table), spectrum_df["Frequency"])
+        assert table.splitlines()[-1].split() == [
+            "b",
+            "1",
+            "1",
+            "1",
+            "0",
+            "0",
+            "0",
+            "15048.601398",
+        ]
+
+    def test_spectrum_block_in_csv(
+        self,
+        tmp_path,
+        spectrum_df,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            spectrum_df=spectrum_df,
+        )
+        block = csv_path.read_text().split("Rigid Rotor Transitions\n", 1)[1]
+        assert block.splitlines()[2] == "iso001,b,1,1,1,0,0,0,15048.601398"
+
+
+class Test_partition_block_in_csv:
+    def test_partition_block_in_csv(
+        self,
+        tmp_path,
+        hn3_dn3_pa_coordinates_df_dict,
+        hn3_dn3_rotational_constants_df,
+        hn3_dn3_dipole_components_df,
+        hn3_dn3_atom_masses_df,
+    ):
+        import pandas as pd
+
+        partition_df = pd.DataFrame(
+            {"abundance": [0.98], "Q(10 K)": [250.0], "I(10 K)": [1.0]},
+            index=pd.Index(["iso001"], name="Isotopologue"),
+        )
+        csv_path = tmp_path / "out.csv"
+        generate_csv_output(
+            pa_coordinates_df_dict=hn3_dn3_pa_coordinates_df_dict,
+            rotational_constants_df=hn3_dn3_rotational_constants_df,
+            dipole_components_df=hn3_dn3_dipole_components_df,
+            atom_masses_df=hn3_dn3_atom_masses_df,
+            csv_output_path=csv_path,
+            partition_df=partition_df,
+        )
+        block = csv_path.read_text().split("Rotational Partition Functions\n", 1)[1]
+        assert block.splitlines()[:2] == [
+            "Isotopologue,abundance,Q(10 K),I(10 K)",
+            "iso001,0.98,250.0,1.0",
+        ]